@@ -0,0 +1,48 @@
+"""Micro-benchmarks for performance-sensitive parts of pymap.
+
+These are not run as part of the test suite. Run each module directly from
+the repository root, e.g.::
+
+    $ python -m bench.sequenceset
+
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import ParamSpec
+
+from pymap.interfaces.message import LoadedMessageInterface
+from pymap.message import BaseMessage
+from pymap.parsing.specials import FetchRequirement
+from pymap.parsing.specials.flag import Flag
+
+__all__ = ['Message', 'build_messages', 'timed']
+
+_P = ParamSpec('_P')
+
+
+class Message(BaseMessage):
+    """A message with no content, for benchmarks that only need metadata."""
+
+    async def load_content(self, requirement: FetchRequirement) \
+            -> LoadedMessageInterface:
+        raise RuntimeError()
+
+
+def build_messages(uids: Iterable[int],
+                   flags: Iterable[Flag] = ()) -> list[Message]:
+    """Build a list of content-less messages with the given UIDs."""
+    when = datetime.now()
+    flag_set = frozenset(flags)
+    return [Message(uid, when, flag_set) for uid in uids]
+
+
+def timed(func: Callable[_P, object],
+          *args: _P.args, **kwargs: _P.kwargs) -> float:
+    """Return the wall time, in seconds, of calling ``func``."""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
@@ -0,0 +1,88 @@
+"""Reports the bytes copied to serialize a ``FETCH BODY[]`` response, per
+response, comparing the previous serialization, which rendered the response
+into a single :class:`bytes` object, against writing it to a
+:class:`~pymap.bytes.ScatterStream` of segments for
+:meth:`~asyncio.WriteTransport.writelines`.
+
+The message content is parsed beforehand, as it is owned by the backend, so
+only the copies made by serialization are measured.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from collections.abc import Callable, Sequence
+from datetime import datetime
+
+from pymap.bytes import ScatterStream
+from pymap.fetch import MessageAttributes
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.interfaces.message import LoadedMessageInterface
+from pymap.message import BaseMessage, BaseLoadedMessage
+from pymap.mime import MessageContent
+from pymap.parsing.response.specials import FetchResponse
+from pymap.parsing.specials import FetchAttribute, FetchRequirement, \
+    ObjectId
+from pymap.selected import SelectedMailbox
+
+_Segments = Sequence[bytes | bytearray | memoryview]
+
+
+class _Message(BaseMessage):
+
+    content = MessageContent.parse(b'')
+
+    async def load_content(self, requirement: FetchRequirement) \
+            -> LoadedMessageInterface:
+        return BaseLoadedMessage(self, requirement, self.content)
+
+
+def _legacy(resp: FetchResponse) -> _Segments:
+    return [bytes(resp)]
+
+
+def _current(resp: FetchResponse) -> _Segments:
+    stream = ScatterStream()
+    resp.write(stream)
+    return stream.pop()
+
+
+def _measure(func: Callable[[FetchResponse], _Segments],
+             size: int) -> float:
+    _Message.content = MessageContent.parse(
+        b'Subject: test\r\n\r\n' + (b'x' * 78 + b'\r\n') * (size // 80))
+    selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                               PermanentFlags([]), SessionFlags([]))
+    attr = FetchAttribute(b'BODY', FetchAttribute.Section(()))
+    count = 10
+
+    async def run() -> int:
+        copied = 0
+        for uid in range(1, count + 1):
+            msg = _Message(uid, datetime.now(), [])
+            attrs = MessageAttributes(msg, selected, [attr])
+            resp = FetchResponse(uid, attrs, writing_hook=attrs.load_hook())
+            async with resp.writing_hook:
+                tracemalloc.start()
+                before, _ = tracemalloc.get_traced_memory()
+                result = func(resp)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del result
+            copied += peak - before
+        return copied
+    return asyncio.run(run()) / count
+
+
+def main() -> None:
+    for size in (10_000, 1_000_000, 25_000_000):
+        before = _measure(_legacy, size)
+        after = _measure(_current, size)
+        print(f'{size:>10} byte message: before {before:.0f} B/FETCH, '
+              f'after {after:.0f} B/FETCH')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Measures a flag synchronization, ``UID FETCH 1:* (UID FLAGS)``, on a large
+mailbox, comparing the responses built from
+:class:`~pymap.fetch.MessageAttributes` against those rendered by
+:class:`~pymap.fetch.FetchRenderer`.
+
+Both build the untagged responses for every message and write them to a
+:class:`~pymap.bytes.ScatterStream`, as the connection would.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+
+from pymap.bytes import ScatterStream
+from pymap.fetch import FetchRenderer, MessageAttributes
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.interfaces.message import LoadedMessageInterface
+from pymap.message import BaseLoadedMessage
+from pymap.parsing.response import ResponseOk
+from pymap.parsing.response.specials import FetchResponse
+from pymap.parsing.specials import FetchAttribute, FetchRequirement, \
+    ObjectId
+from pymap.parsing.specials.flag import Flag, Seen, Flagged, Answered
+from pymap.selected import SelectedMailbox
+
+from . import Message, build_messages, timed
+
+_attrs = [FetchAttribute(b'UID'), FetchAttribute(b'FLAGS')]
+
+
+class _Message(Message):
+
+    async def load_content(self, requirement: FetchRequirement) \
+            -> LoadedMessageInterface:
+        return BaseLoadedMessage(self, requirement, None)
+
+
+def _write(resp: ResponseOk) -> None:
+    stream = ScatterStream()
+
+    async def drain() -> None:
+        stream.pop()
+    asyncio.run(resp.async_write(stream, drain=drain))
+
+
+def _legacy(selected: SelectedMailbox, messages: Sequence[_Message]) -> None:
+    resp = ResponseOk(b'.', b'UID FETCH completed.')
+    for seq, msg in enumerate(messages, 1):
+        msg_attrs = MessageAttributes(msg, selected, _attrs)
+        resp.add_untagged(FetchResponse(
+            seq, msg_attrs, writing_hook=msg_attrs.load_hook()))
+    _write(resp)
+
+
+def _current(selected: SelectedMailbox, messages: Sequence[_Message],
+             renderer: FetchRenderer) -> None:
+    resp = ResponseOk(b'.', b'UID FETCH completed.')
+    render = renderer.render
+    for seq, msg in enumerate(messages, 1):
+        resp.add_untagged(FetchResponse(
+            seq, render(msg, selected, _attrs)))
+    _write(resp)
+
+
+def main() -> None:
+    selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                               PermanentFlags([Seen, Flagged, Answered]),
+                               SessionFlags([]))
+    flag_sets: list[list[Flag]] = [[], [Seen], [Seen, Flagged],
+                                   [Seen, Answered]]
+    renderer = FetchRenderer()
+    for count in (10_000, 100_000):
+        messages = [_Message(msg.uid, msg.internal_date,
+                             flag_sets[msg.uid % len(flag_sets)])
+                    for msg in build_messages(range(1, count + 1))]
+        before = timed(_legacy, selected, messages)
+        after = timed(_current, selected, messages, renderer)
+        print(f'{count:>8} messages: before {before:.3f}s, '
+              f'after {after:.3f}s ({before / after:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
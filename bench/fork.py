@@ -0,0 +1,42 @@
+"""Measures the cost of :meth:`~pymap.selected.SelectedMailbox.fork`, which
+runs after every command that returns untagged updates, on a large mailbox
+with few changes between commands.
+
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.parsing.command.any import NoOpCommand
+from pymap.parsing.specials import ObjectId
+from pymap.parsing.specials.flag import Seen
+from pymap.selected import SelectedMailbox
+
+from . import build_messages, timed
+
+
+def main() -> None:
+    command = NoOpCommand(b'.')
+    for count in (10_000, 200_000):
+        selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                                   PermanentFlags([Seen]), SessionFlags([]))
+        selected.add_updates(build_messages(range(1, count + 1)), [])
+        selected, _ = selected.fork(command)
+        selected, _ = selected.fork(command)
+        noop = timed(selected.fork, command)
+        selected, _ = selected.fork(command)
+        selected.add_updates(build_messages([count // 2], [Seen]),
+                             [count])
+        tracemalloc.start()
+        changed = timed(selected.fork, command)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{count:>8} messages: noop fork {noop * 1000:.3f} ms, '
+              f'changed fork {changed * 1000:.3f} ms, '
+              f'peak {peak / 1024:.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
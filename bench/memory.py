@@ -0,0 +1,74 @@
+"""Reports the memory used by each selected session to track the messages in
+a mailbox, in bytes per message, compared to the previous representation.
+
+The message objects themselves are created beforehand and shared, as they are
+owned by the backend, so only the per-session overhead is measured.
+
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from collections.abc import Callable, Sequence
+
+from pymap.interfaces.message import CachedMessage, FlagsKey
+from pymap.parsing.specials.flag import Flag, Seen, Flagged, Answered
+from pymap.selected import SynchronizedMessages
+
+from . import Message, build_messages
+
+
+class _Legacy:
+
+    def __init__(self, messages: Sequence[CachedMessage]) -> None:
+        super().__init__()
+        self.uids: set[int] = set()
+        self.sorted: list[int] = []
+        self.seqs_cache: dict[int, int] = {}
+        self.cache: dict[int, CachedMessage] = {}
+        self.flags_key_map: dict[int, FlagsKey] = {}
+        self.flags_key_set: set[FlagsKey] = set()
+        for msg in messages:
+            self.uids.add(msg.uid)
+            self.sorted.append(msg.uid)
+            self.cache[msg.uid] = msg
+            flags_key = (msg.uid, frozenset(msg.permanent_flags))
+            self.flags_key_map[msg.uid] = flags_key
+            self.flags_key_set.add(flags_key)
+        self.seqs_cache = {uid: seq for seq, uid in enumerate(self.sorted, 1)}
+
+
+def _current(messages: Sequence[CachedMessage]) -> SynchronizedMessages:
+    synced = SynchronizedMessages()
+    synced._apply(messages, (), None, False)
+    return synced
+
+
+def _measure(func: Callable[[Sequence[CachedMessage]], object],
+             messages: Sequence[CachedMessage]) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = func(messages)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (after - before) / len(messages)
+
+
+def main() -> None:
+    flag_sets: list[list[Flag]] = [[], [Seen], [Seen, Flagged],
+                                   [Seen, Answered]]
+    for count in (10_000, 300_000):
+        messages: list[Message] = []
+        for i, flags in enumerate(flag_sets):
+            uids = range(i + 1, count + 1, len(flag_sets))
+            messages.extend(build_messages(uids, flags))
+        messages.sort(key=lambda msg: msg.uid)
+        before = _measure(_Legacy, messages)
+        after = _measure(_current, messages)
+        print(f'{count:>8} messages: before {before:.1f} B/msg, '
+              f'after {after:.1f} B/msg')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Measures downloading a large message in partial chunks, as clients do with
+``FETCH BODY[]<start.length>`` and ``FETCH BINARY[1]<start.length>``,
+comparing the previous approach, which converted the entire section to
+:class:`bytes` and decoded it again for every chunk, against
+:meth:`~pymap.bytes.Writeable.slice` and the cache of decoded sections.
+
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Sequence
+from datetime import datetime
+
+from pymap.bytes import ScatterStream, Writeable
+from pymap.message import BaseLoadedMessage
+from pymap.mime import MessageContent
+from pymap.mime.cte import MessageDecoder
+from pymap.parsing.specials import FetchRequirement, ObjectId
+
+from . import Message, timed
+
+_Fetch = Callable[[BaseLoadedMessage, Sequence[int] | None, bool, int, int],
+                  Writeable]
+
+_chunk = 64 * 1024
+
+
+def _legacy(loaded: BaseLoadedMessage, section: Sequence[int] | None,
+            binary: bool, start: int, end: int) -> Writeable:
+    if binary:
+        msg = loaded.content.body.nested[0]
+        data = MessageDecoder.of(msg.header).decode(msg.body)
+    else:
+        data = loaded.get_body(section)
+    return Writeable.wrap(bytes(data)[start:end])
+
+
+def _current(loaded: BaseLoadedMessage, section: Sequence[int] | None,
+             binary: bool, start: int, end: int) -> Writeable:
+    return loaded.get_body(section, binary).slice(start, end)
+
+
+def _download(func: _Fetch, loaded: BaseLoadedMessage,
+              section: Sequence[int] | None, binary: bool,
+              size: int) -> None:
+    stream = ScatterStream()
+    for start in range(0, size, _chunk):
+        func(loaded, section, binary, start, start + _chunk).write(stream)
+        stream.pop()
+
+
+def main() -> None:
+    for size in (1_000_000, 10_000_000):
+        data = base64.encodebytes(b'x' * size).replace(b'\n', b'\r\n')
+        content = MessageContent.parse(
+            b'Content-Type: multipart/mixed; boundary=b\r\n\r\n'
+            b'--b\r\nContent-Transfer-Encoding: base64\r\n\r\n'
+            + data + b'\r\n--b--\r\n')
+        msg = Message(1, datetime.now(), [],
+                      email_id=ObjectId.random_email_id())
+        loaded = BaseLoadedMessage(msg, FetchRequirement.CONTENT, content)
+        for name, section, binary, length in (
+                ('BODY[]', None, False, len(content)),
+                ('BINARY[1]', [1], True, size)):
+            before = timed(_download, _legacy, loaded, section, binary,
+                           length)
+            after = timed(_download, _current, loaded, section, binary,
+                          length)
+            print(f'{size:>10} bytes, {name:<9}: before {before:.3f}s, '
+                  f'after {after:.3f}s ({before / after:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
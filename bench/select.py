@@ -0,0 +1,56 @@
+"""Measures the initial load of a large mailbox on ``SELECT``, comparing
+:meth:`~pymap.selected.SelectedMailbox.set_messages`, which needs the
+metadata of every message to be decoded, against
+:meth:`~pymap.selected.SelectedMailbox.set_uids`.
+
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import msgpack
+
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.parsing.specials import ObjectId
+from pymap.parsing.specials.flag import Flag, Seen
+from pymap.selected import SelectedMailbox
+
+from . import Message, timed
+
+
+def _new_selected() -> SelectedMailbox:
+    return SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                           PermanentFlags([Seen]), SessionFlags([]))
+
+
+def _eager(raw: dict[bytes, bytes]) -> None:
+    messages: list[Message] = []
+    for uid, msg_raw in raw.items():
+        msg = msgpack.unpackb(msg_raw, raw=True)
+        msg_flags = {Flag(flag) for flag in msg[b'flags']}
+        msg_time = datetime.fromisoformat(msg[b'date'].decode('ascii'))
+        messages.append(Message(int(uid), msg_time, msg_flags))
+    _new_selected().set_messages(messages)
+
+
+def _lazy(raw: dict[bytes, bytes]) -> None:
+    _new_selected().set_uids(int(uid) for uid in raw)
+
+
+def main() -> None:
+    date = datetime.now().isoformat().encode('ascii')
+    for count in (100_000, 1_000_000):
+        raw = {b'%i' % uid: msgpack.packb({b'flags': [b'\\Seen'],
+                                           b'date': date,
+                                           b'email_id': None,
+                                           b'thread_id': None})
+               for uid in range(1, count + 1)}
+        eager = timed(_eager, raw)
+        lazy = timed(_lazy, raw)
+        print(f'{count:>8} messages: set_messages {eager:.2f} s, '
+              f'set_uids {lazy:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
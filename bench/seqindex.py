@@ -0,0 +1,101 @@
+"""Compares :class:`~pymap.seqindex.SequenceIndex` against the previous
+approach of a sorted list plus a UID to sequence number dict, which was
+rebuilt after every expunge and renumbered after every out-of-order insert.
+
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from collections.abc import Sequence
+
+from pymap.seqindex import SequenceIndex
+
+from . import timed
+
+
+class _Legacy:
+
+    def __init__(self, uids: Sequence[int]) -> None:
+        super().__init__()
+        self.uids = set(uids)
+        self.sorted = sorted(uids)
+        self.seqs = {uid: seq for seq, uid in enumerate(self.sorted, 1)}
+
+    def add(self, uids: Sequence[int]) -> None:
+        lowest_idx = len(self.sorted)
+        for uid in uids:
+            self.uids.add(uid)
+            idx = bisect_right(self.sorted, uid)
+            lowest_idx = min(lowest_idx, idx)
+            self.sorted.insert(idx, uid)
+        for seq, uid in enumerate(self.sorted[lowest_idx:], lowest_idx + 1):
+            self.seqs[uid] = seq
+
+    def remove(self, uids: Sequence[int]) -> None:
+        self.uids.difference_update(uids)
+        self.sorted = sorted(self.uids)
+        self.seqs = {uid: seq for seq, uid in enumerate(self.sorted, 1)}
+
+
+def _expunge(index: SequenceIndex | _Legacy,
+             batches: Sequence[Sequence[int]]) -> None:
+    if isinstance(index, _Legacy):
+        for batch in batches:
+            index.remove(batch)
+    else:
+        for batch in batches:
+            for uid in batch:
+                index.remove(uid)
+
+
+def _insert(index: SequenceIndex | _Legacy,
+            batches: Sequence[Sequence[int]]) -> None:
+    if isinstance(index, _Legacy):
+        for batch in batches:
+            index.add(batch)
+    else:
+        for batch in batches:
+            index.update(batch)
+
+
+def _lookup(index: SequenceIndex | _Legacy, uids: Sequence[int]) -> None:
+    if isinstance(index, _Legacy):
+        for uid in uids:
+            index.sorted[index.seqs[uid] - 1]
+    else:
+        for uid in uids:
+            index[index.index(uid)]
+
+
+def main() -> None:
+    rand = random.Random(0)  # noqa: S311
+    count = 200_000
+    uids = range(2, count * 2 + 2, 2)
+    expunged = rand.sample(uids, count // 2)
+    expunge_batches = [expunged[i:i + 100]
+                       for i in range(0, len(expunged), 100)]
+    inserted = rand.sample(range(1, count * 2, 2), 10_000)
+    insert_batches = [inserted[i:i + 10]
+                      for i in range(0, len(inserted), 10)]
+    lookups = rand.sample(uids, 100_000)
+    print(f'{count} messages')
+    print(f'{"operation":<40} {"before (s)":>11} {"after (s)":>11}')
+    results = [
+        ('load', timed(_Legacy, uids), timed(SequenceIndex, uids)),
+        ('uid -> seq -> uid (100k lookups)',
+         timed(_lookup, _Legacy(uids), lookups),
+         timed(_lookup, SequenceIndex(uids), lookups)),
+        ('expunge 100k (batches of 100)',
+         timed(_expunge, _Legacy(uids), expunge_batches),
+         timed(_expunge, SequenceIndex(uids), expunge_batches)),
+        ('out-of-order insert 10k (batches of 10)',
+         timed(_insert, _Legacy(uids), insert_batches),
+         timed(_insert, SequenceIndex(uids), insert_batches))]
+    for name, before, after in results:
+        print(f'{name:<40} {before:>11.4f} {after:>11.4f}')
+
+
+if __name__ == '__main__':
+    main()
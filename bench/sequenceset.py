@@ -0,0 +1,62 @@
+"""Compares sequence set resolution in
+:class:`~pymap.selected.SynchronizedMessages` against the previous approach,
+which flattened the sequence set and scanned the entire mailbox.
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence, Set
+
+from pymap.parsing.specials import SequenceSet
+from pymap.parsing.specials.sequenceset import MaxValue
+from pymap.selected import SynchronizedMessages
+
+from . import build_messages, timed
+
+
+def _legacy_get_uids(uid_set: Set[int], sorted_uids: Sequence[int],
+                     seq_set: SequenceSet) -> Sequence[tuple[int, int]]:
+    if seq_set.uid:
+        all_uids = seq_set.flatten(sorted_uids[-1]) & uid_set
+        return [(seq, uid) for seq, uid in enumerate(sorted_uids, 1)
+                if uid in all_uids]
+    else:
+        all_seqs = seq_set.flatten(len(sorted_uids))
+        return [(seq, uid) for seq, uid in enumerate(sorted_uids, 1)
+                if seq in all_seqs]
+
+
+def _build(uids: range) -> SynchronizedMessages:
+    messages = SynchronizedMessages()
+    messages._apply(build_messages(uids), (), None, False)
+    return messages
+
+
+def main() -> None:
+    uid_ranges = {
+        'dense 1M': range(1, 1_000_001),
+        'sparse 100k': range(1, 10_000_001, 100),
+    }
+    seq_sets = {
+        'UID 1:*': SequenceSet([(1, MaxValue())], uid=True),
+        'UID *:*': SequenceSet([MaxValue()], uid=True),
+        'UID 500000:500100': SequenceSet([(500_000, 500_100)], uid=True),
+        '1:100,*': SequenceSet([(1, 100), MaxValue()]),
+    }
+    print(f'{"mailbox":<12} {"sequence set":<20} '
+          f'{"before (s)":>11} {"after (s)":>11} {"matched":>9}')
+    for mbx_name, uids in uid_ranges.items():
+        messages = _build(uids)
+        uid_set = frozenset(uids)
+        for seq_name, seq_set in seq_sets.items():
+            before = timed(_legacy_get_uids, uid_set, uids, seq_set)
+            after = timed(messages.get_uids, seq_set)
+            matched = len(messages.get_uids(seq_set))
+            assert matched == len(_legacy_get_uids(uid_set, uids, seq_set))
+            print(f'{mbx_name:<12} {seq_name:<20} '
+                  f'{before:>11.4f} {after:>11.4f} {matched:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Measures the memory and update cost of many sessions selecting the same
+mailbox, with and without a shared :class:`~pymap.selected.SelectedSet`.
+
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.parsing.command.any import NoOpCommand
+from pymap.parsing.specials import ObjectId
+from pymap.parsing.specials.flag import Seen
+from pymap.selected import SelectedSet, SelectedMailbox
+
+from . import Message, build_messages
+
+
+def _select(selected_set: SelectedSet | None,
+            messages: list[Message]) -> SelectedMailbox:
+    selected = SelectedMailbox(ObjectId(b'shared'), False,
+                               PermanentFlags([Seen]), SessionFlags([]),
+                               selected_set=selected_set)
+    if selected.mod_sequence is None:
+        selected.mod_sequence = 1
+        selected.add_updates(messages, [])
+    else:
+        selected.add_updates([], [])
+    selected, _ = selected.fork(NoOpCommand(b'.'))
+    return selected
+
+
+def _run(name: str, shared: bool, sessions: int, count: int) -> None:
+    messages = build_messages(range(1, count + 1))
+    command = NoOpCommand(b'.')
+    selected_set = SelectedSet() if shared else None
+    tracemalloc.start()
+    all_selected = [_select(selected_set, messages)
+                    for _ in range(sessions)]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    updated = build_messages([count // 2], [Seen])
+    start = time.perf_counter()
+    for i, selected in enumerate(all_selected):
+        if shared and i > 0:
+            selected.add_updates([], [])
+        else:
+            selected.add_updates(updated, [count])
+        all_selected[i], _ = selected.fork(command)
+    elapsed = time.perf_counter() - start
+    print(f'{name:>8}: {sessions} sessions x {count} messages, '
+          f'{memory / 1024 / 1024:.1f} MiB, '
+          f'update all {elapsed * 1000:.1f} ms')
+
+
+def main() -> None:
+    for shared in (False, True):
+        _run('shared' if shared else 'separate', shared, 200, 20_000)
+
+
+if __name__ == '__main__':
+    main()
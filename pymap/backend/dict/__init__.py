@@ -107,7 +107,8 @@ class Config(IMAPConfig):
 
     @property
     def backend_capability(self) -> BackendCapability:
-        return BackendCapability(idle=True, object_id=True, multi_append=True)
+        return BackendCapability(idle=True, object_id=True, multi_append=True,
+                                 mod_sequence=True)
 
     @property
     def demo_data(self) -> bool:
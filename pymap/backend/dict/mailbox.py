@@ -16,8 +16,9 @@ from pymap.listtree import ListTree
 from pymap.mailbox import MailboxSnapshot
 from pymap.message import BaseMessage, BaseLoadedMessage
 from pymap.mime import MessageContent
+from pymap.mime.preview import get_preview
 from pymap.parsing.message import AppendMessage
-from pymap.parsing.specials import ObjectId, FetchRequirement
+from pymap.parsing.specials import ObjectId, FetchRequirement, SequenceSet
 from pymap.parsing.specials.flag import Flag, Seen
 from pymap.selected import SelectedSet, SelectedMailbox
 from pymap.threads import ThreadKey
@@ -34,12 +35,13 @@ class Message(BaseMessage):
     def __init__(self, uid: int, internal_date: datetime,
                  permanent_flags: Iterable[Flag], *, expunged: bool = False,
                  email_id: ObjectId | None = None,
-                 thread_id: ObjectId | None = None,
-                 recent: bool = False,
+                 thread_id: ObjectId | None = None, mod_seq: int = 0,
+                 preview: str | None = None, recent: bool = False,
                  content: MessageContent | None = None) -> None:
         super().__init__(uid, internal_date, permanent_flags,
                          expunged=expunged, email_id=email_id,
-                         thread_id=thread_id)
+                         thread_id=thread_id, mod_seq=mod_seq,
+                         preview=preview)
         self._recent = recent
         self._content = content
 
@@ -50,8 +52,8 @@ class Message(BaseMessage):
             uid = msg.uid
         return cls(uid, msg.internal_date, msg.permanent_flags,
                    expunged=expunged, email_id=msg.email_id,
-                   thread_id=msg.thread_id, recent=recent,
-                   content=msg._content)
+                   thread_id=msg.thread_id, mod_seq=msg.mod_seq,
+                   preview=msg.preview, recent=recent, content=msg._content)
 
     @property
     def recent(self) -> bool:
@@ -93,7 +95,7 @@ class _ModSequenceMapping:
                 del data[prev_mod_seq]
                 self._mod_seqs_order.remove(prev_mod_seq)
 
-    def _set(self, uids: Iterable[int], data: dict[int, set[int]]) -> None:
+    def _set(self, uids: Iterable[int], data: dict[int, set[int]]) -> int:
         self._highest = mod_seq = self._highest + 1
         self._mod_seqs_order.append(mod_seq)
         new_uid_set = data.setdefault(mod_seq, set())
@@ -104,11 +106,12 @@ class _ModSequenceMapping:
             if prev_mod_seq is not None:
                 self._remove_prev(uid, prev_mod_seq, self._updates)
                 self._remove_prev(uid, prev_mod_seq, self._expunges)
+        return mod_seq
 
-    def update(self, uids: Iterable[int]) -> None:
+    def update(self, uids: Iterable[int]) -> int:
         return self._set(uids, self._updates)
 
-    def expunge(self, uids: Iterable[int]) -> None:
+    def expunge(self, uids: Iterable[int]) -> int:
         return self._set(uids, self._expunges)
 
     def find_updated(self, mod_seq: int) \
@@ -193,7 +196,6 @@ class MailboxData(MailboxDataInterface[Message]):
         self._content_cache = content_cache
         self._thread_cache = thread_cache
         self._readonly = False
-        self._updated = subsystem.get().new_event()
         self._messages_lock = subsystem.get().new_rwlock()
         self._selected_set = SelectedSet()
         self._uid_validity = MailboxSnapshot.new_uid_validity()
@@ -224,8 +226,7 @@ class MailboxData(MailboxDataInterface[Message]):
     async def update_selected(self, selected: SelectedMailbox, *,
                               wait_on: Event | None = None) -> SelectedMailbox:
         if wait_on is not None:
-            either_event = wait_on.or_event(self._updated)
-            await either_event.wait()
+            await self._selected_set.wait_updated(selected, wait_on)
         mod_sequence = selected.mod_sequence
         selected.mod_sequence = self._mod_sequences.highest
         if mod_sequence is None:
@@ -241,17 +242,19 @@ class MailboxData(MailboxDataInterface[Message]):
     async def append(self, append_msg: AppendMessage, *,
                      recent: bool = False) -> Message:
         when = append_msg.when or datetime.now()
-        content = MessageContent.parse(append_msg.literal)
+        content = MessageContent.parse(bytes(append_msg.literal))
         email_id = self._content_cache.add(content)
         thread_id = self._thread_cache.add(content)
+        preview = get_preview(content)
         async with self.messages_lock.write_lock():
             self._max_uid = new_uid = self._max_uid + 1
             message = Message(new_uid, when, append_msg.flag_set,
                               email_id=email_id, thread_id=thread_id,
-                              recent=recent, content=content)
+                              preview=preview, recent=recent,
+                              content=content)
             self._messages[new_uid] = message
-            self._mod_sequences.update([new_uid])
-            self._updated.set()
+            message.mod_seq = self._mod_sequences.update([new_uid])
+            self._selected_set.notify()
             return message
 
     async def copy(self, uid: int, destination: MailboxData, *,
@@ -265,8 +268,8 @@ class MailboxData(MailboxDataInterface[Message]):
             destination._max_uid = dest_uid = destination._max_uid + 1
             new_msg = Message.copy(message, uid=dest_uid, recent=recent)
             destination._messages[dest_uid] = new_msg
-            destination._mod_sequences.update([dest_uid])
-            destination._updated.set()
+            new_msg.mod_seq = destination._mod_sequences.update([dest_uid])
+            destination._selected_set.notify()
         return dest_uid
 
     async def move(self, uid: int, destination: MailboxData, *,
@@ -277,13 +280,13 @@ class MailboxData(MailboxDataInterface[Message]):
             except KeyError:
                 return None
             self._mod_sequences.expunge([uid])
-            self._updated.set()
+            self._selected_set.notify()
         async with destination.messages_lock.write_lock():
             destination._max_uid = dest_uid = destination._max_uid + 1
             new_msg = Message.copy(message, uid=dest_uid, recent=recent)
             destination._messages[dest_uid] = new_msg
-            destination._mod_sequences.update([dest_uid])
-            destination._updated.set()
+            new_msg.mod_seq = destination._mod_sequences.update([dest_uid])
+            destination._selected_set.notify()
         return dest_uid
 
     async def get(self, uid: int, cached_msg: CachedMessage) -> Message:
@@ -298,11 +301,15 @@ class MailboxData(MailboxDataInterface[Message]):
         return msg
 
     async def update(self, uid: int, cached_msg: CachedMessage,
-                     flag_set: frozenset[Flag], mode: FlagOp) -> Message:
+                     flag_set: frozenset[Flag], mode: FlagOp, *,
+                     unchanged_since: int | None = None) -> Message | None:
         msg = await self.get(uid, cached_msg)
+        if unchanged_since is not None and not msg.expunged \
+                and msg.mod_seq > unchanged_since:
+            return None
         msg.permanent_flags = mode.apply(msg.permanent_flags, flag_set)
-        self._mod_sequences.update([uid])
-        self._updated.set()
+        msg.mod_seq = self._mod_sequences.update([uid])
+        self._selected_set.notify()
         return msg
 
     async def delete(self, uids: Iterable[int]) -> None:
@@ -313,18 +320,19 @@ class MailboxData(MailboxDataInterface[Message]):
                 except KeyError:
                     pass
             self._mod_sequences.expunge(uids)
-            self._updated.set()
+            self._selected_set.notify()
 
     async def claim_recent(self, selected: SelectedMailbox) -> None:
-        uids: list[int] = []
+        claimed: list[Message] = []
         async for msg in self.messages():
             if msg.recent:
                 msg.recent = False
-                msg_uid = msg.uid
-                selected.session_flags.add_recent(msg_uid)
-                uids.append(msg_uid)
-        self._mod_sequences.update(uids)
-        self._updated.set()
+                selected.session_flags.add_recent(msg.uid)
+                claimed.append(msg)
+        mod_seq = self._mod_sequences.update(msg.uid for msg in claimed)
+        for msg in claimed:
+            msg.mod_seq = mod_seq
+        self._selected_set.notify()
 
     async def cleanup(self) -> None:
         pass
@@ -351,7 +359,19 @@ class MailboxData(MailboxDataInterface[Message]):
         return MailboxSnapshot(self.mailbox_id, self.readonly,
                                self.uid_validity, self.permanent_flags,
                                self.session_flags, exists, recent, unseen,
-                               first_unseen, next_uid)
+                               first_unseen, next_uid,
+                               highest_mod_seq=self._mod_sequences.highest)
+
+    async def find_changed(self, seq_set: SequenceSet,
+                           selected: SelectedMailbox, changed_since: int) \
+            -> AsyncIterable[tuple[int, Message]]:
+        updated, _ = self._mod_sequences.find_updated(changed_since + 1)
+        async with self.messages_lock.read_lock():
+            found = [(seq, self._messages.get(uid)) for seq, uid
+                     in selected.messages.find_uids(seq_set, updated)]
+        for seq, msg in found:
+            if msg is not None:
+                yield (seq, msg)
 
 
 class MailboxSet(MailboxSetInterface[MailboxData]):
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections.abc import Iterable, Sequence, AsyncIterable
-from typing import TypeVar, Protocol, Any
+from collections.abc import Awaitable, Callable, Iterable, Mapping, \
+    Sequence, AsyncIterable
+from typing import Any, ClassVar, Protocol, TypeVar
 
 from pymap.concurrent import Event
 from pymap.flags import FlagOp
@@ -30,6 +31,9 @@ MailboxDataT_co = TypeVar('MailboxDataT_co', bound='MailboxDataInterface[Any]',
 class MailboxDataInterface(Protocol[MessageT_co]):
     """Manages the messages and metadata associated with a single mailbox."""
 
+    #: The maximum number of messages passed to each :meth:`.load_cached`.
+    load_page_size: ClassVar[int] = 1000
+
     @property
     @abstractmethod
     def mailbox_id(self) -> ObjectId:
@@ -78,7 +82,10 @@ class MailboxDataInterface(Protocol[MessageT_co]):
         Args:
             selected: the selected mailbox object.
             wait_on: If given, block until this event signals or mailbox
-                activity occurs.
+                activity occurs. Implementations should wait with
+                :meth:`~pymap.selected.SelectedSet.wait_updated`, and call
+                :meth:`~pymap.selected.SelectedSet.notify` whenever the
+                mailbox is modified.
 
         """
         ...
@@ -137,14 +144,19 @@ class MailboxDataInterface(Protocol[MessageT_co]):
 
     @abstractmethod
     async def update(self, uid: int, cached_msg: CachedMessage,
-                     flag_set: frozenset[Flag], mode: FlagOp) -> MessageT_co:
-        """Update the permanent flags of the message.
+                     flag_set: frozenset[Flag], mode: FlagOp, *,
+                     unchanged_since: int | None = None) \
+            -> MessageT_co | None:
+        """Update the permanent flags of the message. If *unchanged_since* is
+        given and the message has a greater modification sequence, the
+        message is not updated and None is returned.
 
         Args:
             uid: The message UID.
             cached_msg: The last known cached message.
             flag_set: The set of flags for the update operation.
             flag_op: The mode to change the flags.
+            unchanged_since: The ``UNCHANGEDSINCE`` modifier value.
 
         """
         ...
@@ -186,6 +198,38 @@ class MailboxDataInterface(Protocol[MessageT_co]):
         """Returns a snapshot of the current state of the mailbox."""
         ...
 
+    async def load_cached(self, uids: Sequence[int]) \
+            -> Iterable[CachedMessage]:
+        """Load the cached metadata of messages that were added to a selected
+        mailbox by :meth:`~pymap.selected.SelectedMailbox.set_uids`.
+        Implementations that call that method must override this method.
+
+        Args:
+            uids: The message UIDs.
+
+        """
+        return []
+
+    async def get_cached(self, seq_set: SequenceSet,
+                         selected: SelectedMailbox) \
+            -> Sequence[tuple[int, CachedMessage]]:
+        """Return the cached messages, and their message sequence numbers,
+        that are contained in the given sequence set. Any messages without
+        cached metadata are first loaded with :meth:`.load_cached`, at most
+        :attr:`.load_page_size` messages at a time.
+
+        Args:
+            seq_set: The sequence set of the desired messages.
+            selected: The selected mailbox session.
+
+        """
+        unloaded = selected.messages.get_unloaded(seq_set)
+        page_size = self.load_page_size
+        for i in range(0, len(unloaded), page_size):
+            page = unloaded[i:i + page_size]
+            selected.add_cached(await self.load_cached(page))
+        return selected.messages.get_all(seq_set)
+
     async def find(self, seq_set: SequenceSet, selected: SelectedMailbox) \
             -> AsyncIterable[tuple[int, MessageT_co]]:
         """Find the active message UID and message pairs in the mailbox that
@@ -197,11 +241,29 @@ class MailboxDataInterface(Protocol[MessageT_co]):
             selected: The selected mailbox session.
 
         """
-        for seq, cached_msg in selected.messages.get_all(seq_set):
+        for seq, cached_msg in await self.get_cached(seq_set, selected):
             msg = await self.get(cached_msg.uid, cached_msg)
             if msg is not None:
                 yield (seq, msg)
 
+    async def find_changed(self, seq_set: SequenceSet,
+                           selected: SelectedMailbox, changed_since: int) \
+            -> AsyncIterable[tuple[int, MessageT_co]]:
+        """Like :meth:`.find`, but only messages with a modification sequence
+        greater than *changed_since* are found. Implementations that can
+        look up recent changes should override this method, so that the cost
+        is proportional to the number of changes.
+
+        Args:
+            seq_set: The sequence set of the desired messages.
+            selected: The selected mailbox session.
+            changed_since: The ``CHANGEDSINCE`` modifier value.
+
+        """
+        async for seq, msg in self.find(seq_set, selected):
+            if msg.mod_seq > changed_since:
+                yield (seq, msg)
+
     async def find_deleted(self, seq_set: SequenceSet,
                            selected: SelectedMailbox) -> Sequence[int]:
         """Return all the active message UIDs that have the ``\\Deleted`` flag.
@@ -273,6 +335,73 @@ class MailboxSetInterface(Protocol[MailboxDataT_co]):
         """
         ...
 
+    async def snapshot_mailboxes(self, names: Sequence[str]) \
+            -> Mapping[str, MailboxSnapshot]:
+        """Return a snapshot of the current state of each of the given
+        mailboxes. Mailboxes that do not exist are left out of the result.
+        Implementations should override this method, so that many mailboxes
+        are snapshotted in a single backend operation.
+
+        See Also:
+            :meth:`~pymap.interfaces.session.SessionInterface.get_mailboxes`
+
+        Args:
+            names: The names of the mailboxes.
+
+        """
+        ret: dict[str, MailboxSnapshot] = {}
+        for name in names:
+            try:
+                mbx = await self.get_mailbox(name)
+            except KeyError:
+                continue
+            ret[name] = await mbx.snapshot()
+        return ret
+
+    async def watch_mailboxes(self, names: Sequence[str]) \
+            -> Callable[[Event], Awaitable[bool]]:
+        """Start watching the given mailboxes for changes. The returned
+        function blocks for a short time, until the given event is signalled
+        or a change is found, and returns True if a change was found since
+        the previous call, or since this method was called.
+
+        The default implementation only finds changes signalled by
+        :meth:`~pymap.selected.SelectedSet.notify` in this process.
+        Implementations should override this method if mailboxes may be
+        changed by other processes.
+
+        See Also:
+            :meth:`~pymap.interfaces.session.SessionInterface.watch_mailboxes`
+
+        Args:
+            names: The names of the mailboxes.
+
+        """
+        selected_sets: list[SelectedSet] = []
+        for name in names:
+            try:
+                mbx = await self.get_mailbox(name)
+            except KeyError:
+                continue
+            selected_sets.append(mbx.selected_set)
+        notified = [selected_set.notified for selected_set in selected_sets]
+
+        def changed() -> bool:
+            current = [selected_set.notified
+                       for selected_set in selected_sets]
+            if current == notified:
+                return False
+            notified[:] = current
+            return True
+
+        async def watch(wait_on: Event) -> bool:
+            if not changed():
+                either_event = wait_on.or_event(*(
+                    selected_set.updated for selected_set in selected_sets))
+                await either_event.wait(timeout=SelectedSet.watch_interval)
+            return changed()
+        return watch
+
     @abstractmethod
     async def add_mailbox(self, name: str) -> ObjectId:
         """Create a new mailbox, returning its object ID.
@@ -120,7 +120,8 @@ class Config(IMAPConfig):
 
     @property
     def backend_capability(self) -> BackendCapability:
-        return BackendCapability(idle=True, object_id=True, multi_append=True)
+        return BackendCapability(idle=True, object_id=True, multi_append=True,
+                                 mod_sequence=True)
 
     @property
     def base_dir(self) -> str:
@@ -1,13 +1,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import binascii
 import errno
 import os
 import os.path
-from collections.abc import Iterable, AsyncIterable
+import shutil
+from contextlib import contextmanager
+from collections.abc import Awaitable, Callable, Iterable, Iterator, \
+    AsyncIterable, Mapping, Sequence
+from base64 import b64encode, b64decode
 from datetime import datetime
 from mailbox import Maildir as _Maildir, MaildirMessage
-from typing import Any, Final, Literal, Self
+from mmap import mmap, ACCESS_READ
+from typing import Any, BinaryIO, Final, Literal, Self
 
 from pymap.concurrent import Event, ReadWriteLock
 from pymap.context import subsystem
@@ -18,6 +25,7 @@ from pymap.listtree import ListTree
 from pymap.mailbox import MailboxSnapshot
 from pymap.message import BaseMessage, BaseLoadedMessage
 from pymap.mime import MessageContent
+from pymap.mime.preview import get_preview
 from pymap.parsing.message import AppendMessage
 from pymap.parsing.specials import ObjectId, FetchRequirement
 from pymap.parsing.specials.flag import Flag, Seen
@@ -32,6 +40,15 @@ from ..mailbox import MailboxDataInterface, MailboxSetInterface
 __all__ = ['Maildir', 'Message', 'MailboxData', 'MailboxSet']
 
 
+class _StreamMessage(MaildirMessage):
+    # The message contents are copied from the stream as-is when it is added
+    # to the maildir, rather than parsed and generated in memory.
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__()
+        self.stream = stream
+
+
 class Maildir(_Maildir):
 
     @property
@@ -62,6 +79,13 @@ class Maildir(_Maildir):
     def _update(self, key: str, subpath: str) -> None:
         self._toc[key] = subpath  # type: ignore
 
+    def _dump_message(self, message: Any, target: Any,
+                      mangle_from_: bool = False) -> None:
+        if isinstance(message, _StreamMessage):
+            shutil.copyfileobj(message.stream, target)
+        else:
+            super()._dump_message(message, target, mangle_from_)
+
     def claim_new(self) -> Iterable[str]:
         """Checks for messages in the ``new`` subdirectory, moving them to
         ``cur`` and returning their keys.
@@ -103,6 +127,31 @@ class Maildir(_Maildir):
         msg.set_date(os.path.getmtime(self._join(subpath)))
         return msg
 
+    @contextmanager
+    def map_message(self, key: str) -> Iterator[bytes | mmap]:
+        """Like :meth:`~mailbox.Maildir.get_bytes` but the message file is
+        mapped into memory as read-only, rather than read from disk. The map
+        is closed when the context exits, so nothing may keep a reference to
+        its data.
+
+        """
+        subpath = self._lookup(key)
+        with open(self._join(subpath), 'rb') as msg_file:
+            if os.fstat(msg_file.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap(msg_file.fileno(), 0, access=ACCESS_READ) as data:
+                yield data
+
+    def get_mod_seq(self, key: str) -> int:
+        """Returns a modification sequence for the message, from the time in
+        microseconds that its file was last changed. Updating the flags of a
+        message renames its file, which changes this value.
+
+        """
+        subpath = self._lookup(key)
+        return os.stat(self._join(subpath)).st_ctime_ns // 1000
+
     def update_metadata(self, key: str, msg: MaildirMessage) -> None:
         """Uses :func:`os.rename` to atomically update the message filename
         based on :meth:`~mailbox.MaildirMessage.get_info`.
@@ -129,13 +178,14 @@ class Message(BaseMessage):
     def __init__(self, uid: int, internal_date: datetime,
                  permanent_flags: Iterable[Flag], *, expunged: bool = False,
                  email_id: ObjectId | None = None,
-                 thread_id: ObjectId | None = None,
-                 recent: bool = False,
+                 thread_id: ObjectId | None = None, mod_seq: int = 0,
+                 preview: str | None = None, recent: bool = False,
                  maildir: Maildir | None = None,
                  key: str | None = None) -> None:
         super().__init__(uid, internal_date, permanent_flags,
                          expunged=expunged, email_id=email_id,
-                         thread_id=thread_id)
+                         thread_id=thread_id, mod_seq=mod_seq,
+                         preview=preview)
         self.recent: Final = recent
         self._maildir = maildir
         self._key = key
@@ -158,14 +208,15 @@ class Message(BaseMessage):
         assert isinstance(msg, cls)
         return cls(msg.uid, msg.internal_date, msg.permanent_flags,
                    expunged=True, email_id=msg.email_id,
-                   thread_id=msg.thread_id, maildir=msg._maildir, key=msg._key)
+                   thread_id=msg.thread_id, mod_seq=msg.mod_seq,
+                   preview=msg.preview, maildir=msg._maildir, key=msg._key)
 
     @classmethod
     def to_maildir(cls, append_msg: AppendMessage, recent: bool,
-                   maildir_flags: MaildirFlags) -> MaildirMessage:
+                   maildir_flags: MaildirFlags) -> _StreamMessage:
         flag_str = maildir_flags.to_maildir(append_msg.flag_set)
         when = append_msg.when or datetime.now()
-        maildir_msg = MaildirMessage(append_msg.literal)
+        maildir_msg = _StreamMessage(append_msg.open())
         maildir_msg.set_flags(flag_str)
         maildir_msg.set_subdir('new' if recent else 'cur')
         maildir_msg.set_date(when.timestamp())
@@ -176,13 +227,14 @@ class Message(BaseMessage):
                      maildir: Maildir, key: str,
                      email_id: ObjectId | None,
                      thread_id: ObjectId | None,
-                     maildir_flags: MaildirFlags) -> Self:
+                     maildir_flags: MaildirFlags, *,
+                     mod_seq: int = 0, preview: str | None = None) -> Self:
         flag_set = maildir_flags.from_maildir(maildir_msg.get_flags())
         recent = maildir_msg.get_subdir() == 'new'
         msg_dt = datetime.fromtimestamp(maildir_msg.get_date())
         return cls(uid, msg_dt, flag_set,
-                   email_id=email_id, thread_id=thread_id,
-                   recent=recent, maildir=maildir, key=key)
+                   email_id=email_id, thread_id=thread_id, mod_seq=mod_seq,
+                   preview=preview, recent=recent, maildir=maildir, key=key)
 
 
 class LoadedMessage(BaseLoadedMessage):
@@ -201,12 +253,27 @@ class MailboxData(MailboxDataInterface[Message]):
         self._next_uid = 0
         self._flags: MaildirFlags | None = None
         self._messages_lock = subsystem.get().new_rwlock()
-        self._selected_set = SelectedSet()
+        self._selected_set = SelectedSet.for_mailbox(mailbox_id)
+        self._last_modified: tuple[int, ...] = ()
 
     @classmethod
     def _get_object_id(cls, rec: Record, field: str) -> ObjectId | None:
         return ObjectId.maybe(rec.fields.get(field))
 
+    @classmethod
+    def _get_preview(cls, rec: Record) -> str | None:
+        preview = rec.fields.get('P')
+        if preview is None:
+            return None
+        try:
+            return b64decode(preview).decode('utf-8', 'replace')
+        except binascii.Error:
+            return None
+
+    @classmethod
+    def _encode_preview(cls, preview: str) -> str:
+        return b64encode(preview.encode('utf-8')).decode('ascii')
+
     @property
     def mailbox_id(self) -> ObjectId:
         return self._mailbox_id
@@ -239,23 +306,38 @@ class MailboxData(MailboxDataInterface[Message]):
         return self._selected_set
 
     async def _get_maildir_msg(self, uid: int) \
-            -> tuple[Record, MaildirMessage]:
+            -> tuple[Record, MaildirMessage, int]:
         async with UidList.with_read(self._path) as uidl:
             record = uidl.get(uid)
         maildir = self._maildir
         key = record.key
         async with self.messages_lock.read_lock():
             maildir_msg = maildir.get_message_metadata(key)
-        return record, maildir_msg
+            mod_seq = maildir.get_mod_seq(key)
+        return record, maildir_msg, mod_seq
 
     async def update_selected(self, selected: SelectedMailbox, *,
                               wait_on: Event | None = None) -> SelectedMailbox:
         if wait_on is not None:
-            await wait_on.wait(timeout=1.0)
+            await self._selected_set.wait_updated(
+                selected, wait_on, self._wait_updates)
+        self._last_modified = self._get_last_modified()
         all_messages = [msg async for msg in self.messages()]
         selected.set_messages(all_messages)
         return selected
 
+    def _get_last_modified(self) -> tuple[int, ...]:
+        maildir = self._maildir
+        try:
+            return (os.stat(maildir._path_new).st_mtime_ns,
+                    os.stat(maildir._path_cur).st_mtime_ns)
+        except FileNotFoundError:
+            return ()
+
+    async def _wait_updates(self, wait_on: Event) -> bool:
+        await wait_on.wait(timeout=1.0)
+        return self._get_last_modified() != self._last_modified
+
     async def append(self, append_msg: AppendMessage, *,
                      recent: bool = False) -> Message:
         maildir = self._maildir
@@ -264,22 +346,28 @@ class MailboxData(MailboxDataInterface[Message]):
         async with self.messages_lock.write_lock():
             maildir_msg = Message.to_maildir(append_msg, recent,
                                              self.maildir_flags)
-            key = maildir.add(maildir_msg)
+            with maildir_msg.stream:
+                key = maildir.add(maildir_msg)
+            mod_seq = maildir.get_mod_seq(key)
             filename = key + ':' + maildir_msg.get_info()
+        with maildir.map_message(key) as data:
+            preview = get_preview(MessageContent.parse(data))
         async with UidList.with_write(self._path) as uidl:
-            fields = {'E': str(email_id), 'T': str(thread_id)}
+            fields = {'E': str(email_id), 'T': str(thread_id),
+                      'P': self._encode_preview(preview)}
             new_rec = Record(uidl.next_uid, fields, filename)
             uidl.next_uid += 1
             uidl.set(new_rec)
+        self._selected_set.notify()
         return Message.from_maildir(
             new_rec.uid, maildir_msg, maildir, key, email_id, thread_id,
-            self.maildir_flags)
+            self.maildir_flags, mod_seq=mod_seq, preview=preview)
 
     async def copy(self, uid: int, destination: MailboxData, *,
                    recent: bool = False) -> int | None:
         dest_maildir = destination._maildir
         try:
-            record, maildir_msg = await self._get_maildir_msg(uid)
+            record, maildir_msg, _ = await self._get_maildir_msg(uid)
         except KeyError:
             return None
         copy_msg = MaildirMessage(maildir_msg)
@@ -291,6 +379,7 @@ class MailboxData(MailboxDataInterface[Message]):
             new_rec = Record(uidl.next_uid, record.fields, dest_filename)
             uidl.next_uid += 1
             uidl.set(new_rec)
+        destination._selected_set.notify()
         return new_rec.uid
 
     async def move(self, uid: int, destination: MailboxData, *,
@@ -314,33 +403,40 @@ class MailboxData(MailboxDataInterface[Message]):
             new_rec = Record(uidl.next_uid, rec.fields, new_filename)
             uidl.next_uid += 1
             uidl.set(new_rec)
+        self._selected_set.notify()
+        destination._selected_set.notify()
         return new_rec.uid
 
     async def get(self, uid: int, cached_msg: CachedMessage) -> Message:
         maildir = self._maildir
         try:
-            record, maildir_msg = await self._get_maildir_msg(uid)
+            record, maildir_msg, mod_seq = await self._get_maildir_msg(uid)
         except (KeyError, FileNotFoundError):
             return Message.copy_expunged(cached_msg)
         key = record.key
         email_id = self._get_object_id(record, 'E')
         thread_id = self._get_object_id(record, 'T')
+        preview = self._get_preview(record)
         return Message.from_maildir(
             uid, maildir_msg, maildir, key, email_id, thread_id,
-            self.maildir_flags)
+            self.maildir_flags, mod_seq=mod_seq, preview=preview)
 
     async def update(self, uid: int, cached_msg: CachedMessage,
-                     flag_set: frozenset[Flag], mode: FlagOp) -> Message:
+                     flag_set: frozenset[Flag], mode: FlagOp, *,
+                     unchanged_since: int | None = None) -> Message | None:
         maildir = self._maildir
         try:
-            record, maildir_msg = await self._get_maildir_msg(uid)
+            record, maildir_msg, mod_seq = await self._get_maildir_msg(uid)
         except (KeyError, FileNotFoundError):
             msg = Message.copy_expunged(cached_msg)
             msg.permanent_flags = mode.apply(msg.permanent_flags, flag_set)
             return msg
+        if unchanged_since is not None and mod_seq > unchanged_since:
+            return None
         key = record.key
         email_id = self._get_object_id(record, 'E')
         thread_id = self._get_object_id(record, 'T')
+        preview = self._get_preview(record)
         existing_flags = self.maildir_flags.from_maildir(
             maildir_msg.get_flags())
         new_flags = mode.apply(existing_flags, flag_set)
@@ -348,11 +444,14 @@ class MailboxData(MailboxDataInterface[Message]):
         maildir_msg.set_flags(new_flags_str)
         try:
             maildir.update_metadata(key, maildir_msg)
+            mod_seq = maildir.get_mod_seq(key)
         except (KeyError, FileNotFoundError):
             pass
+        else:
+            self._selected_set.notify()
         return Message.from_maildir(
             uid, maildir_msg, maildir, key, email_id, thread_id,
-            self.maildir_flags)
+            self.maildir_flags, mod_seq=mod_seq, preview=preview)
 
     async def delete(self, uids: Iterable[int]) -> None:
         async with UidList.with_read(self._path) as uidl:
@@ -363,6 +462,7 @@ class MailboxData(MailboxDataInterface[Message]):
                     self._maildir.remove(rec.key)
                 except (KeyError, FileNotFoundError):
                     pass
+        self._selected_set.notify()
 
     async def claim_recent(self, selected: SelectedMailbox) -> None:
         async with self.messages_lock.write_lock():
@@ -394,14 +494,17 @@ class MailboxData(MailboxDataInterface[Message]):
             for uid, rec in uids.items():
                 email_id = self._get_object_id(rec, 'E')
                 thread_id = self._get_object_id(rec, 'T')
+                preview = self._get_preview(rec)
                 try:
                     maildir_msg = maildir.get_message_metadata(rec.key)
+                    mod_seq = maildir.get_mod_seq(rec.key)
                 except (KeyError, FileNotFoundError):
                     pass
                 else:
                     yield Message.from_maildir(
                         uid, maildir_msg, maildir, rec.key,
-                        email_id, thread_id, self.maildir_flags)
+                        email_id, thread_id, self.maildir_flags,
+                        mod_seq=mod_seq, preview=preview)
 
     async def reset(self) -> MailboxData:
         keys = await self._get_keys()
@@ -425,8 +528,11 @@ class MailboxData(MailboxDataInterface[Message]):
         unseen = 0
         first_unseen: int | None = None
         next_uid = self._next_uid
+        highest_mod_seq = max((mtime // 1000 for mtime
+                               in self._get_last_modified()), default=0)
         async for msg in self.messages():
             exists += 1
+            highest_mod_seq = max(highest_mod_seq, msg.mod_seq)
             if msg.recent:
                 recent += 1
             if Seen not in msg.permanent_flags:
@@ -436,7 +542,8 @@ class MailboxData(MailboxDataInterface[Message]):
         return MailboxSnapshot(self.mailbox_id, self.readonly,
                                self.uid_validity, self.permanent_flags,
                                self.session_flags, exists, recent, unseen,
-                               first_unseen, next_uid)
+                               first_unseen, next_uid,
+                               highest_mod_seq=highest_mod_seq)
 
     async def _get_keys(self) -> dict[str, str]:
         keys: dict[str, str] = {}
@@ -498,6 +605,41 @@ class MailboxSet(MailboxSetInterface[MailboxData]):
             self._cache[name] = mbx
         return await mbx.reset()
 
+    async def _snapshot_mailbox(self, name: str) -> MailboxSnapshot | None:
+        try:
+            mbx = await self.get_mailbox(name)
+        except KeyError:
+            return None
+        return await mbx.snapshot()
+
+    async def snapshot_mailboxes(self, names: Sequence[str]) \
+            -> Mapping[str, MailboxSnapshot]:
+        snapshots = await asyncio.gather(
+            *(self._snapshot_mailbox(name) for name in names))
+        return {name: snapshot
+                for name, snapshot in zip(names, snapshots, strict=True)
+                if snapshot is not None}
+
+    async def watch_mailboxes(self, names: Sequence[str]) \
+            -> Callable[[Event], Awaitable[bool]]:
+        watch_notified = await super().watch_mailboxes(names)
+        mailboxes: list[MailboxData] = []
+        for name in names:
+            try:
+                mailboxes.append(await self.get_mailbox(name))
+            except KeyError:
+                continue
+        last_modified = [mbx._get_last_modified() for mbx in mailboxes]
+
+        async def watch(wait_on: Event) -> bool:
+            notified = await watch_notified(wait_on)
+            current = [mbx._get_last_modified() for mbx in mailboxes]
+            if current == last_modified:
+                return notified
+            last_modified[:] = current
+            return True
+        return watch
+
     async def add_mailbox(self, name: str) -> ObjectId:
         try:
             self._layout.add_folder(name, self.delimiter)
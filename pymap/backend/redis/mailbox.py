@@ -1,8 +1,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable, \
+    Mapping, Sequence
 from datetime import datetime
+from functools import partial
 from typing import TypeAlias
 
 import msgpack
@@ -16,6 +18,7 @@ from pymap.interfaces.message import CachedMessage
 from pymap.listtree import ListTree
 from pymap.mailbox import MailboxSnapshot
 from pymap.mime import MessageContent
+from pymap.mime.preview import get_preview
 from pymap.parsing.message import AppendMessage
 from pymap.parsing.modutf7 import modutf7_encode, modutf7_decode
 from pymap.parsing.specials import ObjectId, SequenceSet
@@ -50,7 +53,7 @@ class MailboxData(MailboxDataInterface[Message]):
         self._redis = redis
         self._mailbox_id = ObjectId(mailbox_id)
         self._uid_validity = uid_validity
-        self._selected_set = SelectedSet()
+        self._selected_set = SelectedSet.for_mailbox(self._mailbox_id)
         self._keys = keys
         self._ns_keys = ns_keys
         self._cl_keys = cl_keys
@@ -77,17 +80,23 @@ class MailboxData(MailboxDataInterface[Message]):
         msg_email_id = ObjectId.maybe(msg[b'email_id'])
         msg_thread_id = ObjectId.maybe(msg[b'thread_id'])
         msg_time = datetime.fromisoformat(msg[b'date'].decode('ascii'))
+        msg_mod_seq = msg.get(b'modseq', 0)
+        msg_preview: bytes | None = msg.get(b'preview')
+        preview = None if msg_preview is None \
+            else msg_preview.decode('utf-8', 'replace')
         return Message(uid, msg_time, msg_flags,
                        email_id=msg_email_id, thread_id=msg_thread_id,
+                       mod_seq=msg_mod_seq, preview=preview,
                        redis=self._redis, ns_keys=self._ns_keys)
 
     async def update_selected(self, selected: SelectedMailbox, *,
                               wait_on: Event | None = None) -> SelectedMailbox:
         last_mod_seq: bytes = selected.mod_sequence
-        if wait_on is not None:
-            await self._wait_updates(selected, last_mod_seq)
+        if wait_on is not None and last_mod_seq is not None:
+            await self._selected_set.wait_updated(
+                selected, wait_on, partial(self._wait_updates, last_mod_seq))
         if last_mod_seq is None:
-            await self._load_initial(selected)
+            await self._load_uids(selected)
         else:
             await self._load_updates(selected, last_mod_seq)
         return selected
@@ -98,10 +107,12 @@ class MailboxData(MailboxDataInterface[Message]):
         keys = self._keys
         ns_keys = self._ns_keys
         when = append_msg.when or datetime.now()
-        content = MessageContent.parse(append_msg.literal)
+        literal = bytes(append_msg.literal)
+        content = MessageContent.parse(literal)
         content_hash = HashStream().digest(content)
         new_email_id = ObjectId.new_email_id(content_hash)
         ct_keys = ContentKeys(ns_keys, new_email_id)
+        preview = get_preview(content)
         new_uid, email_id, thread_id = await _scripts.add(
             redis, ns_keys, ct_keys, keys,
             recent=recent, flags=[str(flag) for flag in append_msg.flag_set],
@@ -110,11 +121,13 @@ class MailboxData(MailboxDataInterface[Message]):
             thread_id=ObjectId.random_thread_id().value,
             thread_keys=['\0'.join(thread_key) for thread_key in
                          ThreadKey.get_all(content.header)],
-            message=append_msg.literal, message_json=content.json,
-            header=bytes(content.header), header_json=content.header.json)
+            message=literal, message_json=content.json,
+            header=bytes(content.header), header_json=content.header.json,
+            preview=preview.encode('utf-8'))
+        self._selected_set.notify()
         return Message(new_uid, when, append_msg.flag_set,
                        email_id=ObjectId(email_id),
-                       thread_id=ObjectId(thread_id),
+                       thread_id=ObjectId(thread_id), preview=preview,
                        redis=redis, ns_keys=ns_keys)
 
     async def copy(self, uid: int, destination: MailboxData, *,
@@ -130,6 +143,7 @@ class MailboxData(MailboxDataInterface[Message]):
             if 'message not found' in str(exc):
                 return None
             raise
+        destination._selected_set.notify()
         return dest_uid
 
     async def move(self, uid: int, destination: MailboxData, *,
@@ -145,6 +159,8 @@ class MailboxData(MailboxDataInterface[Message]):
             if 'message not found' in str(exc):
                 return None
             raise
+        self._selected_set.notify()
+        destination._selected_set.notify()
         return dest_uid
 
     async def get(self, uid: int, cached_msg: CachedMessage) -> Message:
@@ -156,17 +172,22 @@ class MailboxData(MailboxDataInterface[Message]):
         return self._get_msg(uid, message_raw)
 
     async def update(self, uid: int, cached_msg: CachedMessage,
-                     flag_set: frozenset[Flag], mode: FlagOp) -> Message:
+                     flag_set: frozenset[Flag], mode: FlagOp, *,
+                     unchanged_since: int | None = None) -> Message | None:
         keys = self._keys
         ns_keys = self._ns_keys
         try:
             message_raw = await _scripts.update(
                 self._redis, ns_keys, keys, uid=uid, mode=bytes(mode),
-                flags=[str(flag) for flag in flag_set])
+                flags=[str(flag) for flag in flag_set],
+                unchanged_since=unchanged_since)
         except ResponseError as exc:
-            if 'message not found' not in str(exc):
+            if 'message modified' in str(exc):
+                return None
+            elif 'message not found' not in str(exc):
                 raise
             return Message.copy_expunged(cached_msg)
+        self._selected_set.notify()
         return self._get_msg(uid, message_raw)
 
     async def delete(self, uids: Iterable[int]) -> None:
@@ -177,6 +198,7 @@ class MailboxData(MailboxDataInterface[Message]):
             return
         await _scripts.delete(self._redis, ns_keys, keys, self._cl_keys,
                               uids=uids)
+        self._selected_set.notify()
 
     async def claim_recent(self, selected: SelectedMailbox) -> None:
         keys = self._keys
@@ -198,12 +220,46 @@ class MailboxData(MailboxDataInterface[Message]):
         pass
 
     async def snapshot(self) -> MailboxSnapshot:
-        next_uid, num_exists, num_recent, num_unseen, first_unseen = \
-            await _scripts.snapshot(self._redis, self._keys)
+        values = await _scripts.snapshot(self._redis, self._keys)
+        return self._get_snapshot(values)
+
+    def _get_snapshot(self, values: tuple[int, int, int, int, int | None,
+                                          int]) -> MailboxSnapshot:
+        next_uid, num_exists, num_recent, num_unseen, first_unseen, \
+            highest_mod_seq = values
         return MailboxSnapshot(self.mailbox_id, self.readonly,
                                self.uid_validity, self.permanent_flags,
                                self.session_flags, num_exists, num_recent,
-                               num_unseen, first_unseen, next_uid)
+                               num_unseen, first_unseen, next_uid,
+                               highest_mod_seq=highest_mod_seq)
+
+    async def find_changed(self, seq_set: SequenceSet,
+                           selected: SelectedMailbox, changed_since: int) \
+            -> AsyncIterable[tuple[int, Message]]:
+        keys = self._keys
+        async with self._redis.pipeline() as multi:
+            multi.xrange(keys.changes, count=1)
+            multi.xrange(keys.changes, min=f'{changed_since + 1}-0')
+            first_changes, changes = await multi.execute()
+        if not first_changes or \
+                self._get_change_mod_seq(first_changes[0][0]) > changed_since:
+            async for seq, msg in super().find_changed(
+                    seq_set, selected, changed_since):
+                yield seq, msg
+            return
+        messages, expunged = self._get_changes(changes)
+        uids = {msg.uid for msg in messages}.difference(expunged)
+        found = selected.messages.find_uids(seq_set, uids)
+        loaded = {msg.uid: msg for msg in await self.load_cached(
+            [uid for _, uid in found])}
+        for seq, uid in found:
+            changed = loaded.get(uid)
+            if changed is not None:
+                yield seq, changed
+
+    def _get_change_mod_seq(self, change_id: bytes) -> int:
+        left, _ = change_id.split(b'-', 1)
+        return int(left)
 
     def _get_mod_seq(self, changes: _ChangesRaw) -> bytes:
         try:
@@ -215,6 +271,22 @@ class MailboxData(MailboxDataInterface[Message]):
             next_right = int(right) + 1
             return b'%b-%i' % (left, next_right)
 
+    async def load_cached(self, uids: Sequence[int]) -> Sequence[Message]:
+        msg_raws = await self._redis.hmget(
+            self._keys.uids, [str(uid) for uid in uids])
+        return [self._get_msg(uid, msg_raw)
+                for uid, msg_raw in zip(uids, msg_raws, strict=True)
+                if msg_raw is not None]
+
+    async def _load_uids(self, selected: SelectedMailbox) -> None:
+        keys = self._keys
+        async with self._redis.pipeline() as multi:
+            multi.hkeys(keys.uids)
+            multi.xrevrange(keys.changes, count=1)
+            uids, last_changes = await multi.execute()
+        selected.mod_sequence = self._get_mod_seq(last_changes)
+        selected.set_uids(int(uid) for uid in uids)
+
     async def _load_initial(self, selected: SelectedMailbox) -> None:
         keys = self._keys
         async with self._redis.pipeline() as multi:
@@ -253,11 +325,13 @@ class MailboxData(MailboxDataInterface[Message]):
         selected.mod_sequence = self._get_mod_seq(last_changes)
         selected.add_updates(messages, expunged)
 
-    async def _wait_updates(self, selected: SelectedMailbox,
-                            last_mod_seq: bytes) -> None:
+    async def _wait_updates(self, last_mod_seq: bytes, wait_on: Event) \
+            -> bool:
         keys = self._keys
         redis = self._redis
-        await redis.xread({keys.changes: last_mod_seq}, block=1000, count=1)
+        changes = await redis.xread({keys.changes: last_mod_seq},
+                                    block=1000, count=1)
+        return bool(changes)
 
 
 class MailboxSet(MailboxSetInterface[MailboxData]):
@@ -307,6 +381,56 @@ class MailboxSet(MailboxSetInterface[MailboxData]):
         return MailboxData(redis, mbx_id, uid_val, mbx_keys, self._keys,
                            self._cl_keys)
 
+    async def _get_mailboxes(self, names: Sequence[str]) \
+            -> Sequence[tuple[str, MailboxData]]:
+        redis = self._redis
+        name_keys = [modutf7_encode(name) for name in names]
+        if not name_keys:
+            return []
+        async with redis.pipeline() as multi:
+            multi.hmget(self._keys.mailboxes, name_keys)
+            multi.hmget(self._keys.uid_validity, name_keys)
+            mbx_ids, uid_vals = await multi.execute()
+        found = zip(names, mbx_ids, uid_vals, strict=True)
+        return [(name, MailboxData(redis, mbx_id, int(uid_val),
+                                   MailboxKeys(self._keys, mbx_id),
+                                   self._keys, self._cl_keys))
+                for name, mbx_id, uid_val in found
+                if mbx_id is not None]
+
+    async def snapshot_mailboxes(self, names: Sequence[str]) \
+            -> Mapping[str, MailboxSnapshot]:
+        found = await self._get_mailboxes(names)
+        if not found:
+            return {}
+        all_values = await _scripts.snapshots(
+            self._redis, [mbx._keys for _, mbx in found])
+        return {name: mbx._get_snapshot(values)
+                for (name, mbx), values in zip(found, all_values, strict=True)}
+
+    async def watch_mailboxes(self, names: Sequence[str]) \
+            -> Callable[[Event], Awaitable[bool]]:
+        redis = self._redis
+        found = await self._get_mailboxes(names)
+        async with redis.pipeline() as multi:
+            for _, mbx in found:
+                multi.xrevrange(mbx._keys.changes, count=1)
+            all_last_changes = await multi.execute()
+        streams: dict[bytes, bytes] = {
+            mbx._keys.changes: last_changes[0][0] if last_changes else b'0-0'
+            for (_, mbx), last_changes
+            in zip(found, all_last_changes, strict=True)}
+
+        async def watch(wait_on: Event) -> bool:
+            if not streams:
+                await wait_on.wait(timeout=SelectedSet.watch_interval)
+                return False
+            changes = await redis.xread(streams, block=1000)
+            for key, key_changes in changes:
+                streams[key] = key_changes[-1][0]
+            return bool(changes)
+        return watch
+
     async def add_mailbox(self, name: str) -> ObjectId:
         name_key = modutf7_encode(name)
         mbx_id = ObjectId.random_mailbox_id()
@@ -25,12 +25,14 @@ class Message(BaseMessage):
     def __init__(self, uid: int, internal_date: datetime,
                  permanent_flags: Iterable[Flag], *, expunged: bool = False,
                  email_id: ObjectId | None = None,
-                 thread_id: ObjectId | None = None,
+                 thread_id: ObjectId | None = None, mod_seq: int = 0,
+                 preview: str | None = None,
                  redis: Redis[bytes] | None = None,
                  ns_keys: NamespaceKeys | None = None) -> None:
         super().__init__(uid, internal_date, permanent_flags,
                          expunged=expunged, email_id=email_id,
-                         thread_id=thread_id)
+                         thread_id=thread_id, mod_seq=mod_seq,
+                         preview=preview)
         self._redis = redis
         self._ns_keys = ns_keys
 
@@ -73,7 +75,8 @@ class Message(BaseMessage):
         assert isinstance(msg, cls)
         return cls(msg.uid, msg.internal_date, msg.permanent_flags,
                    expunged=True, email_id=msg.email_id,
-                   thread_id=msg.thread_id, redis=msg._redis,
+                   thread_id=msg.thread_id, mod_seq=msg.mod_seq,
+                   preview=msg.preview, redis=msg._redis,
                    ns_keys=msg._ns_keys)
 
 
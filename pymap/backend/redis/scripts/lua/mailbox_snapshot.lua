@@ -4,6 +4,7 @@ local i, uids_key = next(KEYS, i)
 local i, seq_key = next(KEYS, i)
 local i, recent_key = next(KEYS, i)
 local i, unseen_key = next(KEYS, i)
+local i, changes_key = next(KEYS, i)
 
 local next_uid = (redis.call('GET', max_uid_key) or 0) + 1
 local num_exists = redis.call('HLEN', uids_key)
@@ -18,4 +19,12 @@ else
     first_unseen = ''
 end
 
-return {next_uid, num_exists, num_recent, num_unseen, first_unseen}
+local highest_modseq = 0
+local last_changes = redis.call('XREVRANGE', changes_key, '+', '-',
+    'COUNT', 1)
+if last_changes[1] then
+    highest_modseq = string.match(last_changes[1][1], '^(%d+)-')
+end
+
+return {next_uid, num_exists, num_recent, num_unseen, first_unseen,
+    highest_modseq}
@@ -0,0 +1,35 @@
+local results = {}
+
+for i = 1, #KEYS, 6 do
+    local max_uid_key = KEYS[i]
+    local uids_key = KEYS[i + 1]
+    local seq_key = KEYS[i + 2]
+    local recent_key = KEYS[i + 3]
+    local unseen_key = KEYS[i + 4]
+    local changes_key = KEYS[i + 5]
+
+    local next_uid = (redis.call('GET', max_uid_key) or 0) + 1
+    local num_exists = redis.call('HLEN', uids_key)
+    local num_recent = redis.call('SCARD', recent_key)
+    local num_unseen = redis.call('ZCARD', unseen_key)
+
+    local first_unseen
+    if num_unseen > 0 then
+        local first_unseen_uids = redis.call('ZRANGE', unseen_key, 0, 0)
+        first_unseen = redis.call('ZRANK', seq_key, first_unseen_uids[1])
+    else
+        first_unseen = ''
+    end
+
+    local highest_modseq = 0
+    local last_changes = redis.call('XREVRANGE', changes_key, '+', '-',
+        'COUNT', 1)
+    if last_changes[1] then
+        highest_modseq = string.match(last_changes[1][1], '^(%d+)-')
+    end
+
+    table.insert(results, {next_uid, num_exists, num_recent, num_unseen,
+        first_unseen, highest_modseq})
+end
+
+return results
@@ -22,6 +22,7 @@ local full = ARGV[7]
 local full_json = ARGV[8]
 local header = ARGV[9]
 local header_json = ARGV[10]
+local msg_preview = ARGV[11]
 
 local uid = redis.call('INCR', max_uid_key)
 
@@ -57,18 +58,20 @@ for i, flag in ipairs(msg_flags) do
     end
 end
 
+local modseq = redis.call('INCR', max_modseq_key)
 local message = cmsgpack.pack({
     flags = msg_flags,
     date = msg_date,
     email_id = msg_email_id,
     thread_id = msg_thread_id,
+    modseq = modseq,
+    preview = msg_preview,
 })
 
 redis.call('HSET', uids_key, uid, message)
 redis.call('ZADD', seq_key, uid, uid)
 redis.call('HSET', content_key, uid, msg_email_id)
 
-local modseq = redis.call('INCR', max_modseq_key)
 redis.call('XADD', changes_key, 'MAXLEN', '~', 1000, modseq .. '-1',
     'uid', uid,
     'type', 'fetch',
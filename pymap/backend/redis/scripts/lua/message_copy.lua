@@ -34,11 +34,13 @@ for i, flag in ipairs(msg_flags) do
 end
 
 local dest_uid = redis.call('INCR', dest_max_uid_key)
+local modseq = redis.call('INCR', max_modseq_key)
+message['modseq'] = modseq
+message_str = cmsgpack.pack(message)
 redis.call('HSET', dest_uids_key, dest_uid, message_str)
 redis.call('ZADD', dest_seq_key, dest_uid, dest_uid)
 redis.call('HSET', dest_content_key, dest_uid, msg_email_id)
 
-local modseq = redis.call('INCR', max_modseq_key)
 redis.call('XADD', dest_changes_key, 'MAXLEN', '~', 1000, modseq .. '-1',
     'uid', dest_uid,
     'type', 'fetch',
@@ -23,6 +23,7 @@ local message_str = redis.call('HGET', uids_key, source_uid)
 if not message_str then
     return redis.error_reply('message not found')
 end
+local message = cmsgpack.unpack(message_str)
 
 local msg_email_id = redis.call('HGET', content_key, source_uid)
 
@@ -33,16 +34,19 @@ redis.call('SREM', recent_key, source_uid)
 local msg_deleted = redis.call('SREM', deleted_key, source_uid)
 local msg_unseen = redis.call('ZREM', unseen_key, source_uid)
 
-redis.call('XADD', changes_key, 'MAXLEN', '~', 1000, '*',
+local expunge_modseq = redis.call('INCR', max_modseq_key)
+redis.call('XADD', changes_key, 'MAXLEN', '~', 1000, expunge_modseq .. '-1',
     'uid', source_uid,
     'type', 'expunge')
 
 local dest_uid = redis.call('INCR', dest_max_uid_key)
+local modseq = redis.call('INCR', max_modseq_key)
+message['modseq'] = modseq
+message_str = cmsgpack.pack(message)
 redis.call('HSET', dest_uids_key, dest_uid, message_str)
 redis.call('ZADD', dest_seq_key, dest_uid, dest_uid)
 redis.call('HSET', dest_content_key, dest_uid, msg_email_id)
 
-local modseq = redis.call('INCR', max_modseq_key)
 redis.call('XADD', dest_changes_key, 'MAXLEN', '~', 1000, modseq .. '-1',
     'uid', dest_uid,
     'type', 'fetch',
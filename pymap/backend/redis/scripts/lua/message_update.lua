@@ -8,6 +8,7 @@ local i, max_modseq_key = next(KEYS, i)
 local uid = tonumber(ARGV[1])
 local mode = ARGV[2]
 local flag_set = cmsgpack.unpack(ARGV[3])
+local unchanged_since = tonumber(ARGV[4])
 
 local message_str = redis.call('HGET', uids_key, uid)
 if not message_str then
@@ -16,6 +17,10 @@ end
 local message = cmsgpack.unpack(message_str)
 local msg_flags = message['flags']
 
+if unchanged_since and (message['modseq'] or 0) > unchanged_since then
+    return redis.error_reply('message modified')
+end
+
 local function to_map(list)
     local map = {}
     for i, v in ipairs(list) do
@@ -85,12 +90,13 @@ elseif mode == 'REPLACE' then
 end
 
 if new_flags then
+    local modseq = redis.call('INCR', max_modseq_key)
     message['flags'] = new_flags
+    message['modseq'] = modseq
     message_str = cmsgpack.pack(message)
 
     redis.call('HSET', uids_key, uid, message_str)
 
-    local modseq = redis.call('INCR', max_modseq_key)
     redis.call('XADD', changes_key, 'MAXLEN', '~', 1000, modseq .. '-1',
         'uid', uid,
         'type', 'fetch',
@@ -22,6 +22,7 @@ class MailboxScripts:
         self.update: Final = MessageUpdate()
         self.delete: Final = MessageDelete()
         self.snapshot: Final = MailboxSnapshot()
+        self.snapshots: Final = MailboxSnapshots()
 
 
 class MessageAdd(ScriptBase[tuple[int, bytes, bytes]]):
@@ -39,8 +40,8 @@ class MessageAdd(ScriptBase[tuple[int, bytes, bytes]]):
                        email_id: bytes, thread_id: bytes,
                        thread_keys: Sequence[str],
                        message: bytes, message_json: Mapping[str, Any],
-                       header: bytes, header_json: Mapping[str, Any]) \
-            -> tuple[int, bytes, bytes]:
+                       header: bytes, header_json: Mapping[str, Any],
+                       preview: bytes) -> tuple[int, bytes, bytes]:
         keys = [mbx_keys.max_uid, mbx_keys.uids, mbx_keys.seq,
                 mbx_keys.content, mbx_keys.changes, mbx_keys.recent,
                 mbx_keys.deleted, mbx_keys.unseen,
@@ -50,7 +51,7 @@ class MessageAdd(ScriptBase[tuple[int, bytes, bytes]]):
             int(recent), self._pack(flags), date,
             email_id, thread_id, self._pack(thread_keys),
             message, self._pack(message_json),
-            header, self._pack(header_json)])
+            header, self._pack(header_json), preview])
 
 
 class MessageCopy(ScriptBase[int]):
@@ -102,11 +103,13 @@ class MessageUpdate(ScriptBase[bytes]):
 
     async def __call__(self, redis: Redis[bytes],
                        ns_keys: NamespaceKeys, mbx_keys: MailboxKeys, *,
-                       uid: int, flags: Sequence[str], mode: bytes) -> bytes:
+                       uid: int, flags: Sequence[str], mode: bytes,
+                       unchanged_since: int | None) -> bytes:
         keys = [mbx_keys.uids, mbx_keys.changes, mbx_keys.deleted,
                 mbx_keys.unseen, ns_keys.max_modseq]
         return await self.eval(redis, keys, [
-            uid, mode, self._pack(flags)])
+            uid, mode, self._pack(flags),
+            b'' if unchanged_since is None else unchanged_since])
 
 
 class MessageDelete(ScriptBase[None]):
@@ -126,18 +129,42 @@ class MessageDelete(ScriptBase[None]):
             mbx_keys.root.named['mailbox_id']])
 
 
-class MailboxSnapshot(ScriptBase[tuple[int, int, int, int, int | None]]):
+class MailboxSnapshot(ScriptBase[tuple[int, int, int, int, int | None,
+                                       int]]):
 
     def __init__(self) -> None:
         super().__init__('mailbox_snapshot')
 
-    def _convert(self, ret: tuple[bytes, bytes, bytes, bytes, bytes]) \
-            -> tuple[int, int, int, int, int | None]:
+    def _convert(self, ret: tuple[bytes, bytes, bytes, bytes, bytes, bytes]) \
+            -> tuple[int, int, int, int, int | None, int]:
         return (int(ret[0]), int(ret[1]), int(ret[2]),
-                int(ret[3]), self._maybe_int(ret[4]))
+                int(ret[3]), self._maybe_int(ret[4]), int(ret[5]))
 
     async def __call__(self, redis: Redis[bytes], mbx_keys: MailboxKeys) \
-            -> tuple[int, int, int, int, int | None]:
+            -> tuple[int, int, int, int, int | None, int]:
         keys = [mbx_keys.max_uid, mbx_keys.uids, mbx_keys.seq,
-                mbx_keys.recent, mbx_keys.unseen]
+                mbx_keys.recent, mbx_keys.unseen, mbx_keys.changes]
+        return await self.eval(redis, keys, [])
+
+
+class MailboxSnapshots(ScriptBase[Sequence[tuple[int, int, int, int,
+                                                 int | None, int]]]):
+
+    def __init__(self) -> None:
+        super().__init__('mailbox_snapshots')
+
+    def _convert(self, ret: Sequence[tuple[bytes, bytes, bytes, bytes,
+                                           bytes, bytes]]) \
+            -> Sequence[tuple[int, int, int, int, int | None, int]]:
+        return [(int(item[0]), int(item[1]), int(item[2]),
+                 int(item[3]), self._maybe_int(item[4]), int(item[5]))
+                for item in ret]
+
+    async def __call__(self, redis: Redis[bytes],
+                       all_mbx_keys: Sequence[MailboxKeys]) \
+            -> Sequence[tuple[int, int, int, int, int | None, int]]:
+        keys = [key for mbx_keys in all_mbx_keys
+                for key in (mbx_keys.max_uid, mbx_keys.uids, mbx_keys.seq,
+                            mbx_keys.recent, mbx_keys.unseen,
+                            mbx_keys.changes)]
         return await self.eval(redis, keys, [])
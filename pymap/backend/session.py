@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from asyncio import shield
-from collections.abc import Iterable, Sequence
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
 from typing import Generic, Any
 
 from pymap.concurrent import Event
@@ -11,16 +11,20 @@ from pymap.config import IMAPConfig
 from pymap.exceptions import MailboxNotFound, MailboxConflict, MailboxReadOnly
 from pymap.flags import FlagOp, SessionFlags, PermanentFlags
 from pymap.interfaces.filter import FilterSetInterface
-from pymap.interfaces.message import MessageT
+from pymap.interfaces.message import MessageT, MessageInterface, \
+    CachedMessage
 from pymap.interfaces.session import SessionInterface
 from pymap.mailbox import MailboxSnapshot
 from pymap.parsing.message import AppendMessage
-from pymap.parsing.specials import SequenceSet, SearchKey, ObjectId, \
-    FetchRequirement
+from pymap.parsing.specials import SequenceSet, SearchKey, SortKey, \
+    ObjectId, FetchRequirement, PartialRange
 from pymap.parsing.specials.flag import Flag, Seen
 from pymap.parsing.response.code import AppendUid, CopyUid
 from pymap.search import SearchParams, SearchCriteriaSet
 from pymap.selected import SelectedMailbox
+from pymap.sort import SortHeaders, SortedMessage, sort_messages, \
+    thread_messages
+from pymap.threads import ThreadNode
 
 from .mailbox import MailboxDataInterface, MailboxSetInterface
 
@@ -98,21 +102,38 @@ class BaseSession(SessionInterface, Generic[MessageT]):
             -> MailboxDataInterface[MessageT]:
         return await self._get_mailbox(selected.lookup)
 
-    async def list_mailboxes(self, ref_name: str, filter_: str,
+    async def list_mailboxes(self, ref_name: str,
+                             filter_: str | Sequence[str],
                              subscribed: bool = False,
-                             selected: SelectedMailbox | None = None) \
-            -> tuple[Iterable[tuple[str, str | None, Sequence[bytes]]],
+                             selected: SelectedMailbox | None = None, *,
+                             select_subscribed: bool = False,
+                             return_subscribed: bool = False,
+                             recursive_match: bool = False) \
+            -> tuple[Iterable[tuple[str, str | None, Sequence[bytes],
+                                    Sequence[bytes]]],
                      SelectedMailbox | None]:
         delimiter = self.mailbox_set.delimiter
-        if filter_:
-            if subscribed:
-                list_tree = await self.mailbox_set.list_subscribed()
-            else:
-                list_tree = await self.mailbox_set.list_mailboxes()
-            ret = [(entry.name, delimiter, entry.attributes)
-                   for entry in list_tree.list_matching(ref_name, filter_)]
+        filters = [filter_] if isinstance(filter_, str) else filter_
+        filters = [filter_ for filter_ in filters if filter_]
+        ret: list[tuple[str, str | None, Sequence[bytes], Sequence[bytes]]]
+        if not filters:
+            ret = [("", delimiter, [b'Noselect'], [])]
+        elif subscribed:
+            list_tree = await self.mailbox_set.list_subscribed()
+            ret = [(entry.name, delimiter, entry.attributes, [])
+                   for entry in list_tree.list_matching(ref_name, *filters)]
         else:
-            ret = [("", delimiter, [b'Noselect'])]
+            list_tree = await self.mailbox_set.list_mailboxes()
+            if select_subscribed or return_subscribed:
+                subscribed_tree = await self.mailbox_set.list_subscribed()
+                list_tree.set_subscribed(*(
+                    entry.name for entry in subscribed_tree.list()
+                    if entry.exists))
+            ret = [(entry.name, delimiter, entry.attributes,
+                    entry.child_info if recursive_match else [])
+                   for entry in list_tree.list_matching(
+                       ref_name, *filters, subscribed=select_subscribed,
+                       recursive_match=recursive_match)]
         return ret, await self._load_updates(selected, None)
 
     async def get_mailbox(self, name: str,
@@ -125,6 +146,16 @@ class BaseSession(SessionInterface, Generic[MessageT]):
         snapshot = await mbx.snapshot()
         return snapshot, await self._load_updates(selected, mbx)
 
+    async def get_mailboxes(self, names: Sequence[str],
+                            selected: SelectedMailbox | None = None) \
+            -> tuple[Mapping[str, MailboxSnapshot], SelectedMailbox | None]:
+        snapshots = await self.mailbox_set.snapshot_mailboxes(names)
+        return snapshots, await self._load_updates(selected, None)
+
+    async def watch_mailboxes(self, names: Sequence[str]) \
+            -> Callable[[Event], Awaitable[bool]]:
+        return await self.mailbox_set.watch_mailboxes(names)
+
     async def create_mailbox(self, name: str,
                              selected: SelectedMailbox | None = None) \
             -> tuple[ObjectId, SelectedMailbox | None]:
@@ -205,12 +236,19 @@ class BaseSession(SessionInterface, Generic[MessageT]):
         return await mbx.update_selected(selected, wait_on=wait_on)
 
     async def fetch_messages(self, selected: SelectedMailbox,
-                             sequence_set: SequenceSet, set_seen: bool) \
+                             sequence_set: SequenceSet, set_seen: bool, *,
+                             changed_since: int | None = None) \
             -> tuple[Iterable[tuple[int, MessageT]],
                      SelectedMailbox]:
         mbx = await self._get_selected(selected)
         ret: list[tuple[int, MessageT]] = []
-        for seq, cached_msg in selected.messages.get_all(sequence_set):
+        found: Sequence[tuple[int, CachedMessage]]
+        if changed_since is None:
+            found = await mbx.get_cached(sequence_set, selected)
+        else:
+            found = [(seq, msg) async for seq, msg in mbx.find_changed(
+                sequence_set, selected, changed_since)]
+        for seq, cached_msg in found:
             if set_seen:
                 msg = await mbx.update(cached_msg.uid, cached_msg,
                                        frozenset({Seen}), FlagOp.ADD)
@@ -221,7 +259,8 @@ class BaseSession(SessionInterface, Generic[MessageT]):
         return ret, await mbx.update_selected(selected)
 
     async def search_mailbox(self, selected: SelectedMailbox,
-                             keys: frozenset[SearchKey]) \
+                             keys: frozenset[SearchKey], *,
+                             partial: PartialRange | None = None) \
             -> tuple[Iterable[tuple[int, MessageT]],
                      SelectedMailbox]:
         mbx = await self._get_selected(selected)
@@ -230,12 +269,53 @@ class BaseSession(SessionInterface, Generic[MessageT]):
         params = SearchParams(selected,
                               disabled=self.config.disable_search_keys)
         search = SearchCriteriaSet(keys, params)
-        async for seq, msg in mbx.find(search.sequence_set, selected):
+        seq_set = search.sequence_set
+        if partial is not None and search.sequence_only:
+            page = selected.messages.get_partial(seq_set, partial)
+            seq_set = SequenceSet([uid for _, uid in page], uid=True)
+            partial = None
+        async for seq, msg in mbx.find(seq_set, selected):
             msg_content = await msg.load_content(req)
             if search.matches(seq, msg, msg_content):
                 ret.append((seq, msg))
+        if partial is not None:
+            start, stop = partial.bounds(len(ret))
+            ret = ret[start:stop]
         return ret, await mbx.update_selected(selected)
 
+    async def _get_sort_headers(self, messages: Iterable[tuple[int, MessageT]],
+                                with_size: bool) -> Sequence[SortedMessage]:
+        cache = self.config.sort_headers_cache
+        req = FetchRequirement.CONTENT if with_size \
+            else FetchRequirement.HEADER
+        ret: list[SortedMessage] = []
+        for seq, msg in messages:
+            headers = cache.get(msg.email_id)
+            if headers is None or (with_size and headers.size is None):
+                msg_content = await msg.load_content(req)
+                headers = SortHeaders.parse(msg_content, with_size=with_size)
+                cache.add(msg.email_id, headers)
+            ret.append((seq, msg, headers))
+        return ret
+
+    async def sort_mailbox(self, selected: SelectedMailbox,
+                           sort_keys: Sequence[SortKey],
+                           keys: frozenset[SearchKey]) \
+            -> tuple[Sequence[tuple[int, MessageInterface]], SelectedMailbox]:
+        found, selected = await self.search_mailbox(selected, keys)
+        with_size = any(key.value == b'SIZE' for key in sort_keys)
+        messages = await self._get_sort_headers(found, with_size)
+        return [(seq, msg) for seq, msg, _ in
+                sort_messages(messages, sort_keys)], selected
+
+    async def thread_mailbox(self, selected: SelectedMailbox,
+                             algorithm: bytes, keys: frozenset[SearchKey]) \
+            -> tuple[Sequence[ThreadNode[tuple[int, MessageInterface]]],
+                     SelectedMailbox]:
+        found, selected = await self.search_mailbox(selected, keys)
+        messages = await self._get_sort_headers(found, False)
+        return thread_messages(messages, algorithm), selected
+
     async def expunge_mailbox(self, selected: SelectedMailbox,
                               uid_set: SequenceSet | None = None) \
             -> SelectedMailbox:
@@ -297,7 +377,8 @@ class BaseSession(SessionInterface, Generic[MessageT]):
     async def update_flags(self, selected: SelectedMailbox,
                            sequence_set: SequenceSet,
                            flag_set: frozenset[Flag],
-                           mode: FlagOp = FlagOp.REPLACE) \
+                           mode: FlagOp = FlagOp.REPLACE, *,
+                           unchanged_since: int | None = None) \
             -> tuple[Iterable[tuple[int, MessageT]],
                      SelectedMailbox]:
         if selected.readonly:
@@ -305,10 +386,13 @@ class BaseSession(SessionInterface, Generic[MessageT]):
         mbx = await self._get_selected(selected)
         permanent_flags = selected.permanent_flags & flag_set
         messages: list[tuple[int, MessageT]] = []
-        for seq, cached_msg in selected.messages.get_all(sequence_set):
+        for seq, cached_msg in await mbx.get_cached(sequence_set, selected):
             uid = cached_msg.uid
-            msg = await mbx.update(uid, cached_msg, permanent_flags, mode)
-            if not msg.expunged:
+            msg = await mbx.update(uid, cached_msg, permanent_flags, mode,
+                                   unchanged_since=unchanged_since)
+            if msg is None:
+                continue
+            elif not msg.expunged:
                 selected.session_flags.update(uid, flag_set, mode)
             messages.append((seq, msg))
         return messages, await mbx.update_selected(selected)
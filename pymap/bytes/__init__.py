@@ -12,7 +12,7 @@ from typing import final, Any, Final, TypeAlias, TypeVar, TypeGuard, \
     SupportsBytes, SupportsIndex, Protocol
 
 __all__ = ['MaybeBytes', 'MaybeBytesT', 'has_bytes', 'WriteStream',
-           'Writeable', 'BytesFormat']
+           'ScatterStream', 'Writeable', 'BytesFormat']
 
 #: An object that can be converted to a bytestring.
 MaybeBytes: TypeAlias = bytes | SupportsBytes
@@ -44,7 +44,7 @@ class WriteStream(Protocol):
     """
 
     @abstractmethod
-    def write(self, data: bytes) -> Any:
+    def write(self, data: bytes | bytearray | memoryview) -> Any:
         """Defines an abstract method where ``data`` is written to a stream or
         buffer.
 
@@ -55,6 +55,48 @@ class WriteStream(Protocol):
         ...
 
 
+class ScatterStream(WriteStream):
+    """A stream that collects the data written to it as a list of segments,
+    so that it may be written all at once with vectored I/O, e.g.
+    :meth:`~asyncio.WriteTransport.writelines`. Data of at least
+    *min_segment* bytes, such as message content, becomes its own segment
+    without being copied, and smaller writes are joined together.
+
+    Args:
+        min_segment: The minimum length of data that becomes its own segment.
+
+    """
+
+    __slots__ = ['min_segment', '_segments', '_pending']
+
+    def __init__(self, min_segment: int = 1024) -> None:
+        super().__init__()
+        self.min_segment: Final = min_segment
+        self._segments: list[bytes | bytearray | memoryview] = []
+        self._pending = bytearray()
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if len(data) < self.min_segment:
+            self._pending += data
+        else:
+            self._end_pending()
+            self._segments.append(data)
+
+    def _end_pending(self) -> None:
+        if self._pending:
+            self._segments.append(self._pending)
+            self._pending = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._pending) + sum(len(seg) for seg in self._segments)
+
+    def pop(self) -> Sequence[bytes | bytearray | memoryview]:
+        """Remove and return the segments written to the stream."""
+        self._end_pending()
+        segments, self._segments = self._segments, []
+        return segments
+
+
 class HashStream(WriteStream):
     """A stream that a :class:`Writeable` can use to generate a
     non-cryptographic hash using :func:`zlib.adler32`.
@@ -67,7 +109,7 @@ class HashStream(WriteStream):
         super().__init__()
         self._digest = zlib.adler32(b'')
 
-    def write(self, data: bytes) -> None:
+    def write(self, data: bytes | bytearray | memoryview) -> None:
         self._digest = zlib.adler32(data, self._digest)
 
     def digest(self, data: Writeable | None = None) -> bytes:
@@ -103,8 +145,9 @@ class Writeable(metaclass=ABCMeta):
         return _EmptyWriteable()
 
     @classmethod
-    def wrap(cls, data: MaybeBytes) -> Writeable:
-        """Wrap the bytes in a :class:`Writeable`.
+    def wrap(cls, data: MaybeBytes | memoryview) -> Writeable:
+        """Wrap the bytes in a :class:`Writeable`. A :class:`memoryview` is
+        written without being copied.
 
         Args:
             data: The object to wrap.
@@ -113,7 +156,7 @@ class Writeable(metaclass=ABCMeta):
         return _WrappedWriteable(data)
 
     @classmethod
-    def concat(cls, data: Iterable[MaybeBytes]) -> Writeable:
+    def concat(cls, data: Iterable[MaybeBytes | memoryview]) -> Writeable:
         """Wrap the iterable in a :class:`Writeable` that will write each item.
 
         Args:
@@ -132,6 +175,18 @@ class Writeable(metaclass=ABCMeta):
         """
         writer.write(bytes(self))
 
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        """Return a :class:`Writeable` for a range of the bytes written by
+        this object, as if the bytestring were sliced with ``[start:end]``.
+        Subclasses should avoid converting the entire object to bytes.
+
+        Args:
+            start: The index of the first byte.
+            end: The index after the last byte, or ``None`` for the end.
+
+        """
+        return _WrappedWriteable(bytes(self)[start:end])
+
     def __bool__(self) -> bool:
         return True
 
@@ -153,6 +208,9 @@ class _EmptyWriteable(Writeable):
     def write(self, writer: WriteStream) -> None:
         pass
 
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        return self
+
     def __bytes__(self) -> bytes:
         return b''
 
@@ -164,11 +222,23 @@ class _WrappedWriteable(Writeable):
 
     __slots__ = ['data']
 
-    def __init__(self, data: MaybeBytes) -> None:
-        self.data = bytes(data)
+    def __init__(self, data: MaybeBytes | memoryview) -> None:
+        if isinstance(data, memoryview):
+            self.data: bytes | memoryview = data
+        else:
+            self.data = bytes(data)
+
+    def write(self, writer: WriteStream) -> None:
+        writer.write(self.data)
+
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        return _WrappedWriteable(self.data[start:end])
+
+    def __len__(self) -> int:
+        return len(self.data)
 
     def __bytes__(self) -> bytes:
-        return self.data
+        return bytes(self.data)
 
     def __repr__(self) -> str:
         return f'<Writeable {self.data!r}>'
@@ -178,11 +248,11 @@ class _ConcatWriteable(Writeable):
 
     __slots__ = ['data']
 
-    def __init__(self, data: Iterable[MaybeBytes]) -> None:
+    def __init__(self, data: Iterable[MaybeBytes | memoryview]) -> None:
         self.data = [self._wrap(val) for val in data]
 
     @classmethod
-    def _wrap(cls, val: MaybeBytes) -> Writeable:
+    def _wrap(cls, val: MaybeBytes | memoryview) -> Writeable:
         if isinstance(val, Writeable):
             return val
         else:
@@ -192,6 +262,22 @@ class _ConcatWriteable(Writeable):
         for item in self.data:
             item.write(writer)
 
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        items: list[Writeable] = []
+        offset = 0
+        for item in self.data:
+            if end is not None and offset >= end:
+                break
+            item_len = len(item)
+            if offset + item_len > start:
+                item_end = None if end is None else end - offset
+                items.append(item.slice(max(start - offset, 0), item_end))
+            offset += item_len
+        return _ConcatWriteable(items)
+
+    def __len__(self) -> int:
+        return sum(len(item) for item in self.data)
+
     def __bytes__(self) -> bytes:
         return BytesFormat(b'').join(self.data)
 
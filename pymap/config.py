@@ -19,9 +19,11 @@ from pysasl.hashing import BuiltinHash, HashInterface
 from pysasl.prep import saslprep, Preparation
 
 from .concurrent import Subsystem
-from .context import subsystem
+from .context import subsystem, decoded_cache
+from .mime.cte import DecodedCache
 from .parsing import Params
 from .parsing.commands import Commands
+from .sort import SortHeadersCache
 
 try:
     from passlib.context import CryptContext
@@ -47,6 +49,8 @@ class BackendCapability(Iterable[bytes]):
         idle: The ``IDLE`` extension is supported.
         object_id: The ``OBJECTID`` extension is supported.
         multi_append: The ``MULTIAPPEND`` extension is supported.
+        mod_sequence: The ``CONDSTORE`` and ``QRESYNC`` extensions are
+            supported.
         custom: Optional list of custom capability strings to declare.
 
     """
@@ -57,6 +61,7 @@ class BackendCapability(Iterable[bytes]):
                  idle: bool,
                  object_id: bool,
                  multi_append: bool,
+                 mod_sequence: bool = False,
                  custom: Sequence[bytes] | None = None) -> None:
         super().__init__()
         capability: dict[bytes, bool] = {}
@@ -66,6 +71,9 @@ class BackendCapability(Iterable[bytes]):
             capability[b'OBJECTID'] = True
         if multi_append:
             capability[b'MULTIAPPEND'] = True
+        if mod_sequence:
+            capability[b'CONDSTORE'] = True
+            capability[b'QRESYNC'] = True
         if custom is not None:
             for cap in custom:
                 capability[cap] = True
@@ -119,6 +127,30 @@ class IMAPConfig(metaclass=ABCMeta):
         bad_command_limit: The number of consecutive commands received from
             the client with parsing errors before the client is disconnected.
         disable_idle: Disable the ``IDLE`` capability.
+        write_buffer_limit: The number of bytes of response data that may be
+            buffered for a connection before it waits for the socket to drain.
+        compress_level: The zlib compression level used by the
+            ``COMPRESS=DEFLATE`` extension, or None to disable it.
+        compress_max_memory: The approximate maximum number of bytes used by
+            the zlib compressor of each connection.
+        prefetch_window: The maximum number of messages whose content is
+            loaded ahead of writing their ``FETCH`` responses.
+        prefetch_max_bytes: The number of bytes of message content that may be
+            loaded ahead of writing their ``FETCH`` responses.
+        sort_cache_size: The maximum number of messages whose sort headers
+            are cached for the ``SORT`` and ``THREAD`` commands.
+        decoded_cache_size: The maximum total bytes of decoded message bodies
+            cached for partial ``BINARY[]`` fetches.
+        pipeline_limit: The maximum number of pipelined commands from a
+            connection that may be executed concurrently, or ``1`` to execute
+            every command in turn.
+        spool_literal_len: Commands with a literal of at least this many
+            bytes are written to a temporary file as they are received,
+            instead of held in memory, or None to disable.
+        workers: The number of worker processes serving connections. With
+            more than one, listening sockets are bound with ``SO_REUSEPORT``
+            and the threads of the default CPU subsystem are divided between
+            the workers.
         extra: Additional keywords used for special circumstances.
 
     Attributes:
@@ -145,6 +177,16 @@ class IMAPConfig(metaclass=ABCMeta):
                  bad_command_limit: int | None = 5,
                  disable_search_keys: Iterable[bytes] | None = None,
                  disable_idle: bool = False,
+                 write_buffer_limit: int = 1048576,
+                 compress_level: int | None = 6,
+                 compress_max_memory: int = 262144,
+                 prefetch_window: int = 8,
+                 prefetch_max_bytes: int = 4194304,
+                 sort_cache_size: int = 100000,
+                 decoded_cache_size: int = 67108864,
+                 pipeline_limit: int = 8,
+                 spool_literal_len: int | None = 1048576,
+                 workers: int = 1,
                  **extra: Any) -> None:
         super().__init__()
         self.args = args
@@ -153,12 +195,22 @@ class IMAPConfig(metaclass=ABCMeta):
         self.port: Final = port
         self.subsystem: Final = subsystem or Subsystem.for_asyncio()
         self.bad_command_limit: Final = bad_command_limit
+        self.write_buffer_limit: Final = write_buffer_limit
+        self.compress_level: Final = compress_level
+        self.compress_max_memory: Final = compress_max_memory
+        self.prefetch_window: Final = prefetch_window
+        self.prefetch_max_bytes: Final = prefetch_max_bytes
+        self.sort_headers_cache: Final = SortHeadersCache(sort_cache_size)
+        self.decoded_cache_size: Final = decoded_cache_size
+        self.pipeline_limit: Final = pipeline_limit
+        self.spool_literal_len: Final = spool_literal_len
+        self.workers: Final = workers
         self.disable_search_keys: Final = disable_search_keys or []
         self.admin_key: Final = admin_key
         self.hash_context: Final = hash_context or \
             self._get_hash_context(args.passlib_cfg)
         self.cpu_subsystem: Final = cpu_subsystem or \
-            self._get_cpu_subsystem()
+            self._get_cpu_subsystem(workers)
         self.invalid_user_sleep: Final = invalid_user_sleep
         self.reject_dnsbl: Final = reject_dnsbl
         self._ssl_context = ssl_context or self._load_certs(extra)
@@ -194,7 +246,8 @@ class IMAPConfig(metaclass=ABCMeta):
         parsed_args = cls.parse_args(args)
         return cls(args, host=args.host, port=args.port, debug=args.debug,
                    cert_file=args.cert, key_file=args.key,
-                   tls_enabled=args.tls, **parsed_args, **overrides)
+                   tls_enabled=args.tls, workers=args.workers or 1,
+                   **parsed_args, **overrides)
 
     def apply_context(self) -> None:
         """Apply the configured settings to any :mod:`~pymap.context`
@@ -203,6 +256,7 @@ class IMAPConfig(metaclass=ABCMeta):
         """
         if self.subsystem is not None:
             subsystem.set(self.subsystem)
+        decoded_cache.set(DecodedCache(self.decoded_cache_size))
 
     @property
     @abstractmethod
@@ -228,9 +282,9 @@ class IMAPConfig(metaclass=ABCMeta):
             return BuiltinHash()
 
     @classmethod
-    def _get_cpu_subsystem(cls) -> Subsystem:
+    def _get_cpu_subsystem(cls, workers: int) -> Subsystem:
         cpu_count = os.cpu_count() or 1
-        cpus_minus_one = max(1, cpu_count - 1)
+        cpus_minus_one = max(1, (cpu_count - 1) // workers)
         executor = ThreadPoolExecutor(max_workers=cpus_minus_one)
         return Subsystem.for_threading(executor)
 
@@ -294,9 +348,14 @@ class IMAPConfig(metaclass=ABCMeta):
 
     @property
     def login_capability(self) -> Sequence[bytes]:
-        ret = [b'BINARY', b'UIDPLUS', b'MOVE', b'CHILDREN']
+        ret = [b'BINARY', b'UIDPLUS', b'MOVE', b'CHILDREN', b'ENABLE',
+               b'ESEARCH', b'SEARCHRES', b'SORT', b'THREAD=ORDEREDSUBJECT',
+               b'THREAD=REFERENCES', b'PARTIAL', b'LIST-STATUS',
+               b'LIST-EXTENDED', b'NOTIFY', b'PREVIEW', b'UIDONLY']
         if self._max_append_len is not None:
             ret.append(b'APPENDLIMIT=%i' % self._max_append_len)
+        if self.compress_level is not None:
+            ret.append(b'COMPRESS=DEFLATE')
         ret.extend(self.backend_capability)
         return ret
 
@@ -15,10 +15,11 @@ from proxyprotocol.sock import SocketInfo
 
 from .cluster import ClusterMetadata
 from .concurrent import Subsystem
+from .mime.cte import DecodedCache
 from .parsing.command import Command
 
 __all__ = ['subsystem', 'current_command', 'socket_info', 'language_code',
-           'connection_exit', 'cluster_metadata']
+           'connection_exit', 'cluster_metadata', 'decoded_cache']
 
 #: The :class:`~pymap.concurrent.Subsystem` for concurrency primitives.
 subsystem: ContextVar[Subsystem] = ContextVar(
@@ -42,3 +43,7 @@ connection_exit: ContextVar[AsyncExitStack] = ContextVar('connection_exit')
 #: metadata.
 cluster_metadata: ContextVar[ClusterMetadata] = ContextVar(
     'cluster_metdata', default=ClusterMetadata())
+
+#: The :class:`~pymap.mime.cte.DecodedCache` of recently decoded message
+#: bodies.
+decoded_cache: ContextVar[DecodedCache] = ContextVar('decoded_cache')
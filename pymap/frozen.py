@@ -98,7 +98,7 @@ class FrozenList(Sequence[ValueT], Hashable):
         return self._sequence.__iter__()
 
     def __reversed__(self) -> Any:
-        return self._sequence.__reversed__()
+        return reversed(self._sequence)
 
     def index(self, value: Any, *args: Any, **kwargs: Any) -> Any:
         return self._sequence.index(value, *args, **kwargs)
@@ -8,16 +8,18 @@ import re
 import sys
 from argparse import ArgumentParser
 from asyncio import shield, StreamReader, StreamWriter, AbstractServer, \
-    CancelledError, TimeoutError
+    CancelledError, Future, Queue, Semaphore, TimeoutError
 from base64 import b64encode, b64decode
-from collections.abc import Awaitable, Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from contextlib import closing, AsyncExitStack
+from functools import partial
 from ssl import SSLError
-from typing import TypeVar
+from typing import ClassVar, TypeAlias, TypeVar
 
 from proxyprotocol.reader import ProxyProtocolReader
 from proxyprotocol.sock import SocketInfo
 from proxyprotocol.version import ProxyProtocolVersion
+from pymap.bytes import ScatterStream
 from pymap.concurrent import Event
 from pymap.config import IMAPConfig
 from pymap.context import subsystem, current_command, socket_info, \
@@ -27,6 +29,7 @@ from pymap.interfaces.backend import ServiceInterface
 from pymap.interfaces.login import LoginInterface
 from pymap.parsing.command import Command
 from pymap.parsing.commands import Commands
+from pymap.parsing.command.auth import CompressCommand
 from pymap.parsing.command.nonauth import AuthenticateCommand, StartTLSCommand
 from pymap.parsing.command.select import IdleCommand
 from pymap.parsing.response import ResponseContinuation, Response, \
@@ -39,17 +42,23 @@ from pysasl.creds.server import ServerCredentials
 from pysasl.exception import AuthenticationError
 from pysasl.mechanism import ServerChallenge, ChallengeResponse
 
+from .compress import DeflateReader, DeflateWriter
+from .spool import CommandBuffer
 from .state import ConnectionState
 
 __all__ = ['IMAPService', 'IMAPServer', 'IMAPConnection']
 
 _Ret = TypeVar('_Ret')
+_Finish: TypeAlias = Callable[[], CommandResponse]
+_Pipelined: TypeAlias = tuple[Command, Future[_Finish] | None]
 _log = logging.getLogger(__name__)
 
 
 class IMAPService(ServiceInterface):  # pragma: no cover
     """A pymap service implementing an IMAP server."""
 
+    per_worker = True
+
     @classmethod
     def add_arguments(cls, parser: ArgumentParser) -> None:
         group = parser.add_argument_group('imap service')
@@ -87,7 +96,8 @@ class IMAPService(ServiceInterface):  # pragma: no cover
                     imap_server_cb, sock=sock))
         else:
             servers.append(await asyncio.start_server(
-                imap_server_cb, host=config.host, port=config.port))
+                imap_server_cb, host=config.host, port=config.port,
+                reuse_port=config.workers > 1))
         for server in servers:
             await stack.enter_async_context(server)
             task = asyncio.create_task(server.serve_forever())
@@ -137,9 +147,15 @@ class IMAPConnection:
 
     _lines = re.compile(r'\r?\n')
     _literal_plus = re.compile(br'{(\d+)\+}\r?\n$')
+    _append_command = re.compile(br'[^ \r\n]+ +APPEND ', re.I)
+
+    #: Untagged responses are passed to the output stream once at least this
+    #: many bytes are ready, rather than one at a time.
+    write_chunk_len: ClassVar[int] = 16384
 
     __slots__ = ['commands', 'config', 'params', 'bad_command_limit',
-                 'reader', 'writer', 'pp_reader', 'pp_result']
+                 'write_buffer_limit', 'reader', 'writer', 'pp_reader',
+                 'pp_result']
 
     def __init__(self, commands: Commands, config: IMAPConfig,
                  reader: StreamReader, writer: StreamWriter,
@@ -149,15 +165,18 @@ class IMAPConnection:
         self.config = config
         self.params = config.parsing_params
         self.bad_command_limit = config.bad_command_limit
-        self.reader = reader
-        self.writer = writer
+        self.write_buffer_limit = config.write_buffer_limit
+        self.reader: StreamReader | DeflateReader = reader
+        self.writer: StreamWriter | DeflateWriter = writer
+        self._set_write_buffer_limits()
         socket_info.set(sock_info)
 
     def close(self) -> None:
         self.writer.close()
 
     @classmethod
-    def _print(cls, log_format: str, output: str | bytes) -> None:
+    def _print(cls, log_format: str,
+               output: str | bytes | bytearray | memoryview) -> None:
         if _log.isEnabledFor(logging.DEBUG):
             uid = socket_info.get().unique_id.hex()
             if not isinstance(output, str):
@@ -168,32 +187,58 @@ class IMAPConnection:
             for line in lines:
                 _log.debug(log_format, uid, line)
 
+    def _set_write_buffer_limits(self) -> None:
+        transport = self.writer.transport
+        transport.set_write_buffer_limits(high=self.write_buffer_limit)
+
     def _exec(self, future: Awaitable[_Ret]) -> Awaitable[_Ret]:
         return subsystem.get().execute(future)
 
-    async def readline(self) -> memoryview:
-        buf = bytearray(await self.reader.readline())
+    def _new_buffer(self) -> CommandBuffer:
+        return CommandBuffer(self.config.spool_literal_len)
+
+    def _is_too_big(self, command: bytes | memoryview,
+                    literal_length: int) -> bool:
+        max_append_len = self.params.max_append_len
+        return max_append_len is not None \
+            and literal_length > max_append_len \
+            and self._append_command.match(command) is not None
+
+    async def _read_line(self, buf: CommandBuffer,
+                         command: bytes | memoryview | None = None) \
+            -> memoryview:
+        reader = self.reader
         while True:
-            if not buf.endswith(b'\n'):
+            line = await reader.readline()
+            if command is None:
+                command = line
+            buf.append(line)
+            if not line.endswith(b'\n'):
                 raise EOFError()
-            elif buf.endswith(b'+}\n') or buf.endswith(b'+}\r\n'):
-                lit_plus = self._literal_plus.search(buf)
+            elif line.endswith(b'+}\n') or line.endswith(b'+}\r\n'):
+                lit_plus = self._literal_plus.search(line)
             else:
                 lit_plus = None
             if lit_plus:
                 literal_length = int(lit_plus.group(1))
-                buf += await self.reader.readexactly(literal_length)
-                buf += await self.reader.readline()
+                if self._is_too_big(command, literal_length):
+                    await buf.skip_literal(reader, literal_length)
+                else:
+                    await buf.read_literal(reader, literal_length)
             else:
-                self._print('%s -->| %s', buf)
-                return memoryview(buf)
+                ret = buf.getvalue()
+                self._print('%s -->| %s', ret)
+                return ret
+
+    async def readline(self) -> memoryview:
+        return await self._read_line(self._new_buffer())
 
-    async def read_continuation(self, literal_length: int) -> memoryview:
-        extra_literal = await self.reader.readexactly(literal_length)
-        self._print('%s -->| %s', extra_literal)
-        extra_line = await self.readline()
-        extra = extra_literal + bytes(extra_line)
-        return memoryview(extra)
+    async def read_continuation(self, literal_length: int,
+                                command: memoryview | None = None) \
+            -> memoryview:
+        buf = self._new_buffer()
+        await buf.read_literal(self.reader, literal_length)
+        return await self._read_line(buf, command)
 
     async def authenticate(self, state: ConnectionState, mech_name: bytes) \
             -> ServerCredentials | None:
@@ -227,18 +272,22 @@ class IMAPConnection:
 
     async def _interrupt(self, state: ConnectionState,
                          interrupt: ParsingInterrupt,
+                         line: memoryview,
                          continuations: list[memoryview]) -> None:
         expected = interrupt.expected
         if isinstance(expected, ExpectContinuation):
             cont = ResponseContinuation(expected.message)
             await self.write_response(cont)
-            ret = await self.read_continuation(expected.literal_length)
+            ret = await self.read_continuation(
+                expected.literal_length, line)
             continuations.append(ret)
         else:
             raise TypeError(expected) from interrupt
 
-    async def read_command(self, state: ConnectionState) -> Command:
-        line = await self.readline()
+    async def read_command(self, state: ConnectionState,
+                           line: memoryview | None = None) -> Command:
+        if line is None:
+            line = await self.readline()
         conts: list[memoryview] = []
         while True:
             parsing_state = ParsingState(continuations=conts)
@@ -246,7 +295,7 @@ class IMAPConnection:
             try:
                 cmd, _ = self.commands.parse(line, params)
             except ParsingInterrupt as interrupt:
-                await self._interrupt(state, interrupt, conts)
+                await self._interrupt(state, interrupt, line, conts)
             else:
                 return cmd
 
@@ -255,20 +304,47 @@ class IMAPConnection:
         ok, _ = cmd.parse_done(buf)
         return ok
 
+    async def _drain_if_full(self, stream: ScatterStream) -> None:
+        if len(stream) < self.write_chunk_len:
+            return
+        writer = self.writer
+        writer.writelines(stream.pop())
+        if writer.transport.get_write_buffer_size() > self.write_buffer_limit:
+            await writer.drain()
+
     async def write_response(self, resp: Response) -> None:
+        writer = self.writer
+        stream = ScatterStream()
         try:
-            await resp.async_write(self.writer)
-            await self.writer.drain()
+            await resp.async_write(
+                stream, drain=partial(self._drain_if_full, stream))
+            writer.writelines(stream.pop())
+            await writer.drain()
         except ConnectionError:
             pass
         else:
-            self._print('%s <--| %s', bytes(resp))
+            if _log.isEnabledFor(logging.DEBUG):
+                self._print('%s <--| %s', bytes(resp))
 
     async def start_tls(self) -> None:
+        writer = self.writer
+        assert not isinstance(writer, DeflateWriter)
         ssl_context = self.config.ssl_context
-        await self.writer.start_tls(ssl_context)
+        await writer.start_tls(ssl_context)
+        self._set_write_buffer_limits()
         self._print('%s <->| %s', '<TLS handshake>')
 
+    def start_compress(self) -> None:
+        reader, writer = self.reader, self.writer
+        assert not isinstance(reader, DeflateReader)
+        assert not isinstance(writer, DeflateWriter)
+        level = self.config.compress_level
+        assert level is not None
+        self.reader = DeflateReader(reader)
+        self.writer = DeflateWriter(writer, level,
+                                    self.config.compress_max_memory)
+        self._print('%s <->| %s', '<COMPRESS=DEFLATE>')
+
     async def send_error_disconnect(self) -> None:
         _, exc, _ = sys.exc_info()
         if isinstance(exc, CancelledError):
@@ -348,9 +424,11 @@ class IMAPConnection:
             return
         else:
             await self.write_response(greeting)
+        pipeline = _Pipeline(self, state)
+        connection_exit.get().callback(pipeline.close)
         while True:
             try:
-                cmd = await self.read_command(state)
+                cmd, pipelined = await pipeline.read()
             except (ConnectionError, EOFError):
                 break
             except CancelledError:
@@ -362,7 +440,10 @@ class IMAPConnection:
             else:
                 prev_cmd = current_command.set(cmd)
                 try:
-                    if isinstance(cmd, AuthenticateCommand):
+                    if pipelined is not None:
+                        finish = await pipelined
+                        response = finish()
+                    elif isinstance(cmd, AuthenticateCommand):
                         creds = await self.authenticate(state, cmd.mech_name)
                         response = await self._exec(
                             state.do_authenticate(cmd, creds))
@@ -411,6 +492,96 @@ class IMAPConnection:
                             self._print('%s <->| <TLS failure: %s>',
                                         exc.reason)
                             return
+                    elif isinstance(cmd, CompressCommand) \
+                            and isinstance(response, ResponseOk):
+                        self.start_compress()
                 finally:
                     await state.do_cleanup()
                     current_command.reset(prev_cmd)
+
+
+class _Pipeline:
+    # Reads ahead of the executing commands, so that pipelined commands that
+    # are safe to run together may execute concurrently. Commands are still
+    # returned in the order they were received, so their responses are too.
+
+    __slots__ = ['conn', 'state', '_queue', '_slots', '_reader', '_running']
+
+    def __init__(self, conn: IMAPConnection, state: ConnectionState) -> None:
+        super().__init__()
+        self.conn = conn
+        self.state = state
+        self._queue: Queue[_Pipelined | None] = Queue()
+        self._slots = Semaphore(max(conn.config.pipeline_limit - 1, 0))
+        self._reader: Future[Command | memoryview] | None = None
+        self._running: set[Future[_Finish]] = set()
+
+    def _start(self, cmd: Command) -> Future[_Finish]:
+        conn, state = self.conn, self.state
+        concurrent = bool(self._running)
+        prev_cmd = current_command.set(cmd)
+        try:
+            task = asyncio.ensure_future(conn._exec(
+                state.do_pipelined(cmd, concurrent=concurrent)))
+        finally:
+            current_command.reset(prev_cmd)
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return task
+
+    def _parse(self, line: memoryview) -> Command | None:
+        parsing_state = ParsingState(continuations=[])
+        params = self.conn.params.copy(parsing_state)
+        try:
+            cmd, _ = self.conn.commands.parse(line, params)
+        except ParsingInterrupt:
+            return None
+        else:
+            return cmd
+
+    async def _read_ahead(self) -> Command | memoryview:
+        try:
+            while True:
+                await self._slots.acquire()
+                line = await self.conn.readline()
+                cmd = self._parse(line)
+                if cmd is None:
+                    # Continuation requests may not be sent until the
+                    # responses to the pipelined commands are written.
+                    return line
+                elif not self.state.can_pipeline(cmd):
+                    return cmd
+                self._queue.put_nowait((cmd, self._start(cmd)))
+        finally:
+            self._queue.put_nowait(None)
+
+    async def read(self) -> _Pipelined:
+        """Return the next command received from the client, in order, and
+        the task executing it if it was pipelined.
+
+        """
+        if self._reader is None:
+            cmd = await self.conn.read_command(self.state)
+        else:
+            item = await self._queue.get()
+            self._slots.release()
+            if item is not None:
+                return item
+            reader, self._reader = self._reader, None
+            barrier = reader.result()
+            if isinstance(barrier, Command):
+                cmd = barrier
+            else:
+                cmd = await self.conn.read_command(self.state, barrier)
+        if self.conn.config.pipeline_limit > 1 \
+                and self.state.can_pipeline(cmd):
+            task = self._start(cmd)
+            self._reader = asyncio.ensure_future(self._read_ahead())
+            return cmd, task
+        return cmd, None
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        for task in self._running:
+            task.cancel()
@@ -0,0 +1,148 @@
+"""Implements the streams used by the ``COMPRESS=DEFLATE`` extension.
+
+See Also:
+    `RFC 4978 <https://tools.ietf.org/html/rfc4978>`_
+
+"""
+
+from __future__ import annotations
+
+import zlib
+from asyncio import IncompleteReadError, StreamReader, StreamWriter, \
+    WriteTransport
+from collections.abc import Iterable
+from typing import Final
+
+__all__ = ['DeflateReader', 'DeflateWriter']
+
+
+class DeflateReader:
+    """Wraps a :class:`~asyncio.StreamReader` to decompress the data read from
+    it. Data is only decompressed as it is needed, so that the memory used is
+    bounded regardless of the compression ratio.
+
+    Args:
+        reader: The compressed input stream.
+        limit: The maximum length of a line.
+        chunk_size: The maximum number of bytes to decompress at once.
+
+    """
+
+    __slots__ = ['reader', 'limit', 'chunk_size', '_inflate', '_buf']
+
+    def __init__(self, reader: StreamReader, *, limit: int = 65536,
+                 chunk_size: int = 16384) -> None:
+        super().__init__()
+        self.reader: Final = reader
+        self.limit: Final = limit
+        self.chunk_size: Final = chunk_size
+        self._inflate = zlib.decompressobj(-15)
+        self._buf = bytearray()
+
+    async def _fill(self) -> bool:
+        inflate = self._inflate
+        data = inflate.unconsumed_tail
+        if not data:
+            data = await self.reader.read(self.chunk_size)
+            if not data:
+                return False
+        self._buf += inflate.decompress(data, self.chunk_size)
+        return True
+
+    def _take(self, length: int) -> bytes:
+        buf = self._buf
+        data = bytes(buf[0:length])
+        del buf[0:length]
+        return data
+
+    async def readline(self) -> bytes:
+        """Read one line from the stream, including its line ending. The line
+        may be incomplete if the end of the stream is reached.
+
+        Raises:
+            ValueError: The line exceeded the length limit.
+
+        """
+        buf = self._buf
+        start = 0
+        while True:
+            idx = buf.find(b'\n', start)
+            if idx >= 0:
+                return self._take(idx + 1)
+            elif len(buf) > self.limit:
+                raise ValueError('Line length limit exceeded.')
+            start = len(buf)
+            if not await self._fill():
+                return self._take(len(buf))
+
+    async def readexactly(self, n: int) -> bytes:
+        """Read exactly *n* bytes from the stream.
+
+        Args:
+            n: The number of bytes to read.
+
+        Raises:
+            :exc:`~asyncio.IncompleteReadError`
+
+        """
+        while len(self._buf) < n:
+            if not await self._fill():
+                raise IncompleteReadError(self._take(len(self._buf)), n)
+        return self._take(n)
+
+
+class DeflateWriter:
+    """Wraps a :class:`~asyncio.StreamWriter` to compress the data written to
+    it. Compressed data is flushed to the underlying stream by
+    :meth:`.drain`.
+
+    Args:
+        writer: The output stream.
+        level: The zlib compression level.
+        max_memory: The approximate maximum number of bytes used by the zlib
+            compressor, which limits its window size and memory level.
+
+    """
+
+    __slots__ = ['writer', '_deflate']
+
+    def __init__(self, writer: StreamWriter, level: int,
+                 max_memory: int) -> None:
+        super().__init__()
+        self.writer: Final = writer
+        wbits, mem_level = self._get_params(max_memory)
+        self._deflate = zlib.compressobj(level, zlib.DEFLATED, -wbits,
+                                         mem_level)
+
+    @classmethod
+    def _get_params(cls, max_memory: int) -> tuple[int, int]:
+        # Memory usage of deflate, according to zconf.h
+        wbits, mem_level = 15, 8
+        while (1 << (wbits + 2)) + (1 << (mem_level + 9)) > max_memory:
+            if wbits + 2 >= mem_level + 9 and wbits > 9:
+                wbits -= 1
+            elif mem_level > 1:
+                mem_level -= 1
+            else:
+                break
+        return wbits, mem_level
+
+    @property
+    def transport(self) -> WriteTransport:
+        """The transport of the underlying output stream."""
+        return self.writer.transport
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.writer.write(self._deflate.compress(data))
+
+    def writelines(self, data: Iterable[bytes | bytearray | memoryview]) \
+            -> None:
+        compress = self._deflate.compress
+        self.writer.writelines([compress(item) for item in data])
+
+    async def drain(self) -> None:
+        self.writer.write(self._deflate.flush(zlib.Z_SYNC_FLUSH))
+        await self.writer.drain()
+
+    def close(self) -> None:
+        self.writer.close()
@@ -0,0 +1,102 @@
+
+from __future__ import annotations
+
+from asyncio import StreamReader
+from mmap import mmap, ACCESS_READ
+from tempfile import TemporaryFile
+from typing import IO, Final
+
+from .compress import DeflateReader
+
+__all__ = ['CommandBuffer']
+
+
+class CommandBuffer:
+    """Accumulates the bytes of a command received from the client. Once a
+    literal of at least *spool_len* bytes is read, the command is written to
+    an anonymous temporary file instead of held in memory, and the result is
+    a read-only memory map of that file.
+
+    Args:
+        spool_len: The literal length that causes the command to be spooled,
+            or ``None`` to always keep it in memory.
+        chunk_size: The maximum number of bytes read from the client at once
+            while spooling or discarding a literal.
+
+    """
+
+    __slots__ = ['spool_len', 'chunk_size', '_buf', '_file']
+
+    def __init__(self, spool_len: int | None, *,
+                 chunk_size: int = 65536) -> None:
+        super().__init__()
+        self.spool_len: Final = spool_len
+        self.chunk_size: Final = chunk_size
+        self._buf = bytearray()
+        self._file: IO[bytes] | None = None
+
+    @property
+    def spooled(self) -> bool:
+        """True if the command has been written to a temporary file."""
+        return self._file is not None
+
+    def append(self, data: bytes | memoryview) -> None:
+        """Add data to the end of the command.
+
+        Args:
+            data: The data to add.
+
+        """
+        if self._file is None:
+            self._buf += data
+        else:
+            self._file.write(data)
+
+    async def read_literal(self, reader: StreamReader | DeflateReader,
+                           length: int) -> None:
+        """Read a literal of exactly *length* bytes and add it to the end of
+        the command, spooling the command if the literal is large enough.
+
+        Args:
+            reader: The input stream for the socket.
+            length: The length of the literal.
+
+        """
+        spool_len = self.spool_len
+        if self._file is None:
+            if spool_len is None or length < spool_len:
+                self._buf += await reader.readexactly(length)
+                return
+            self._file = TemporaryFile()
+            self._file.write(self._buf)
+            self._buf = bytearray()
+        while length > 0:
+            chunk = await reader.readexactly(min(length, self.chunk_size))
+            self._file.write(chunk)
+            length -= len(chunk)
+
+    async def skip_literal(self, reader: StreamReader | DeflateReader,
+                           length: int) -> None:
+        """Read a literal of exactly *length* bytes and discard it, without
+        adding it to the command.
+
+        Args:
+            reader: The input stream for the socket.
+            length: The length of the literal.
+
+        """
+        while length > 0:
+            chunk = await reader.readexactly(min(length, self.chunk_size))
+            length -= len(chunk)
+
+    def getvalue(self) -> memoryview:
+        """Return the accumulated command. If the command was spooled, the
+        temporary file is closed and its memory map is returned.
+
+        """
+        file = self._file
+        if file is None:
+            return memoryview(self._buf)
+        with file:
+            file.flush()
+            return memoryview(mmap(file.fileno(), 0, access=ACCESS_READ))
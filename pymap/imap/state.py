@@ -1,18 +1,22 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable, Iterable
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping, \
+    Sequence
 from contextlib import suppress
 from typing import TypeAlias, NoReturn
 
-from pymap.bytes import MaybeBytes
+from pymap.bytes import BytesFormat, MaybeBytes
 from pymap.concurrent import Event
 from pymap.config import IMAPConfig
-from pymap.context import socket_info, connection_exit
+from pymap.context import subsystem, socket_info, connection_exit
 from pymap.exceptions import NotAllowedError, NotSupportedError, \
     CloseConnection
-from pymap.fetch import MessageAttributes
+from pymap.fetch import ContentPrefetch, MessageAttributes, FetchRenderer
 from pymap.interfaces.login import LoginInterface
+from pymap.interfaces.mailbox import MailboxInterface
+from pymap.interfaces.message import MessageInterface
 from pymap.interfaces.session import SessionInterface
 from pymap.parsing.command import CommandAuth, CommandNonAuth, CommandSelect, \
     Command
@@ -20,22 +24,27 @@ from pymap.parsing.command.any import CapabilityCommand, LogoutCommand, \
     NoOpCommand, IdCommand
 from pymap.parsing.command.nonauth import AuthenticateCommand, LoginCommand, \
     StartTLSCommand
-from pymap.parsing.command.auth import AppendCommand, CreateCommand, \
-    DeleteCommand, ListCommand, RenameCommand, SelectCommand, StatusCommand, \
-    SubscribeCommand, UnsubscribeCommand
+from pymap.parsing import Params
+from pymap.parsing.command.auth import AppendCommand, CompressCommand, \
+    CreateCommand, DeleteCommand, EnableCommand, ListCommand, NotifyCommand, \
+    RenameCommand, SelectCommand, StatusCommand, SubscribeCommand, \
+    UnsubscribeCommand
 from pymap.parsing.command.select import CheckCommand, CloseCommand, \
     IdleCommand, ExpungeCommand, CopyCommand, MoveCommand, FetchCommand, \
-    StoreCommand, SearchCommand
+    StoreCommand, SearchCommand, SortCommand, ThreadCommand
 from pymap.parsing.commands import InvalidCommand
+from pymap.parsing.exceptions import NotParseable
 from pymap.parsing.primitives import List, Number
 from pymap.parsing.response import ResponseOk, ResponseNo, ResponseBad, \
     ResponseCode, ResponsePreAuth, CommandResponse, UntaggedResponse
 from pymap.parsing.response.code import Capability, PermanentFlags, UidNext, \
-    UidValidity, Unseen, MailboxId
+    UidValidity, Unseen, MailboxId, HighestModSeq, Modified
 from pymap.parsing.response.specials import FlagsResponse, ExistsResponse, \
-    RecentResponse, FetchResponse, ListResponse, LSubResponse, IdResponse, \
-    SearchResponse, StatusResponse
-from pymap.parsing.specials import StatusAttribute, FetchAttribute, FetchValue
+    RecentResponse, FetchResponse, UidFetchResponse, ListResponse, \
+    LSubResponse, IdResponse, SearchResponse, ESearchResponse, SortResponse, \
+    ThreadResponse, StatusResponse, VanishedResponse, EnabledResponse
+from pymap.parsing.specials import StatusAttribute, FetchAttribute, \
+    FetchRequirement, PartialRange, SearchKey, SequenceSet
 from pymap.selected import SelectedMailbox
 from pysasl.creds.plain import PlainCredentials
 from pysasl.creds.server import ServerCredentials
@@ -48,6 +57,16 @@ _CommandFunc: TypeAlias = Callable[[Command], Awaitable[_CommandRet]]
 
 _flags_attr = FetchAttribute(b'FLAGS')
 _uid_attr = FetchAttribute(b'UID')
+_modseq_attr = FetchAttribute(b'MODSEQ')
+_qresync_attrs = [_uid_attr, _flags_attr, _modseq_attr]
+_uidonly_attrs = [_flags_attr, _modseq_attr]
+_seq_commands = (CopyCommand, MoveCommand, FetchCommand, StoreCommand,
+                 SearchCommand, SortCommand, ThreadCommand)
+_search_results = frozenset([b'MIN', b'MAX', b'COUNT', b'ALL', b'SAVE',
+                             b'PARTIAL'])
+_notify_events = frozenset([b'MESSAGENEW', b'MESSAGEEXPUNGE', b'FLAGCHANGE'])
+_notify_status = [StatusAttribute(b'MESSAGES'), StatusAttribute(b'UIDNEXT'),
+                  StatusAttribute(b'UNSEEN')]
 
 
 class ConnectionState:
@@ -65,6 +84,12 @@ class ConnectionState:
         self._session: SessionInterface | None = None
         self._selected: SelectedMailbox | None = None
         self._capability = list(config.initial_capability)
+        self._compressed = False
+        self._enabled: set[bytes] = set()
+        self._notify: Mapping[str, frozenset[bytes]] = {}
+        self._notify_last: Mapping[str, MailboxInterface] = {}
+        self._notify_watch: Callable[[Event], Awaitable[bool]] | None = None
+        self._renderer = FetchRenderer()
 
     @property
     def session(self) -> SessionInterface:
@@ -97,6 +122,136 @@ class ConnectionState:
                               [b'AUTH=%b' % mech.name for mech in
                                self.auth.server_mechanisms])
 
+    @property
+    def _uidonly(self) -> bool:
+        return b'UIDONLY' in self._enabled
+
+    def _enable_condstore(self) -> None:
+        self._enabled.add(b'CONDSTORE')
+        if self._selected is not None:
+            self._selected.condstore = True
+
+    @classmethod
+    def _get_mod_seq_arg(cls, arg: List) -> int | None:
+        if len(arg.value) != 1:
+            return None
+        try:
+            return int(bytes(arg.value[0]))
+        except ValueError:
+            return None
+
+    @classmethod
+    def _get_qresync_arg(cls, arg: List) \
+            -> tuple[int, int, SequenceSet | None] | None:
+        params = Params(uid=True)
+        values = arg.value
+        if len(values) < 2:
+            return None
+        try:
+            uid_validity = int(bytes(values[0]))
+            mod_seq = int(bytes(values[1]))
+            known_uids: SequenceSet | None = None
+            if len(values) > 2 and not isinstance(values[2], List):
+                known_uids, _ = SequenceSet.parse(
+                    memoryview(bytes(values[2])), params)
+        except (ValueError, NotParseable):
+            return None
+        return uid_validity, mod_seq, known_uids
+
+    @classmethod
+    def _get_partial_arg(cls, arg: List) -> PartialRange | None:
+        if len(arg.value) != 1:
+            return None
+        try:
+            partial, _ = PartialRange.parse(
+                memoryview(bytes(arg.value[0])), Params())
+        except NotParseable:
+            return None
+        return partial
+
+    @classmethod
+    def _has_seq_key(cls, keys: Iterable[SearchKey]) -> bool:
+        for key in keys:
+            if key.value == b'SEQSET':
+                seq_set = key.filter_sequence_set
+                if not seq_set.uid and not seq_set.is_saved:
+                    return True
+            elif key.value == b'KEYSET' and \
+                    cls._has_seq_key(key.filter_key_set):
+                return True
+            elif key.value == b'OR' and \
+                    cls._has_seq_key(key.filter_key_or):
+                return True
+        return False
+
+    def _requires_uid(self, cmd: Command) -> bool:
+        if not isinstance(cmd, _seq_commands):
+            return False
+        elif not cmd.uid:
+            return True
+        elif isinstance(cmd, (SearchCommand, SortCommand, ThreadCommand)):
+            return self._has_seq_key(cmd.keys)
+        return False
+
+    def can_pipeline(self, cmd: Command) -> bool:
+        """True if the command may be executed concurrently with other
+        pipelined commands. These commands do not change the state of the
+        connection or the selected mailbox, e.g. by implicitly enabling
+        ``CONDSTORE``, and do not refer to messages by sequence number.
+
+        See Also:
+            `RFC 3501 5.5. <https://tools.ietf.org/html/rfc3501#section-5.5>`_
+
+        Args:
+            cmd: The command to check.
+
+        """
+        if self._session is None:
+            return False
+        elif b'CONDSTORE' not in self._enabled \
+                and self._enables_condstore(cmd):
+            return False
+        elif isinstance(cmd, (StatusCommand, ListCommand)):
+            return True
+        elif self._selected is None or not isinstance(cmd, _seq_commands) \
+                or not cmd.uid:
+            return False
+        elif isinstance(cmd, FetchCommand):
+            return self._selected.readonly or \
+                not any(attr.set_seen for attr in cmd.attributes)
+        elif isinstance(cmd, SearchCommand):
+            return not cmd.options.has(b'SAVE') \
+                and not self._has_seq_key(cmd.keys)
+        elif isinstance(cmd, (SortCommand, ThreadCommand)):
+            return not self._has_seq_key(cmd.keys)
+        return False
+
+    @classmethod
+    def _has_mod_seq_key(cls, keys: Iterable[SearchKey]) -> bool:
+        for key in keys:
+            if key.value == b'MODSEQ':
+                return True
+            elif key.value == b'KEYSET' and \
+                    cls._has_mod_seq_key(key.filter_key_set):
+                return True
+            elif key.value == b'OR' and \
+                    cls._has_mod_seq_key(key.filter_key_or):
+                return True
+        return False
+
+    @classmethod
+    def _enables_condstore(cls, cmd: Command) -> bool:
+        # These commands implicitly enable CONDSTORE, changing the state of
+        # the connection and the selected mailbox.
+        if isinstance(cmd, (StatusCommand, ListCommand)):
+            return any(attr == b'HIGHESTMODSEQ' for attr in cmd.status_list)
+        elif isinstance(cmd, FetchCommand):
+            return cmd.options.has(b'CHANGEDSINCE') \
+                or _modseq_attr in cmd.attributes
+        elif isinstance(cmd, SearchCommand):
+            return cls._has_mod_seq_key(cmd.keys)
+        return False
+
     async def do_cleanup(self) -> None:
         with suppress(Exception):
             await self.session.cleanup()
@@ -150,6 +305,34 @@ class ConnectionState:
         self.auth = self.config.tls_auth
         return ResponseOk(cmd.tag, b'Ready to handshake.'), None
 
+    async def do_compress(self, cmd: CompressCommand) -> _CommandRet:
+        if b'COMPRESS=' + cmd.algorithm not in self.capability:
+            return ResponseBad(cmd.tag, b'Unsupported algorithm.'), None
+        elif self._compressed:
+            return ResponseNo(cmd.tag, b'Compression already active.',
+                              ResponseCode.of(b'COMPRESSIONACTIVE')), None
+        self._compressed = True
+        return ResponseOk(cmd.tag, cmd.algorithm + b' active.'), None
+
+    async def do_enable(self, cmd: EnableCommand) -> _CommandRet:
+        capability = self.capability
+        enabled: list[bytes] = []
+        for name in cmd.capabilities:
+            if name in (b'CONDSTORE', b'QRESYNC', b'UIDONLY') \
+                    and name in capability \
+                    and name not in self._enabled and name not in enabled:
+                enabled.append(name)
+        self._enabled.update(enabled)
+        if b'QRESYNC' in self._enabled:
+            self._enabled.add(b'CONDSTORE')
+        if self._selected is not None:
+            self._selected.condstore = b'CONDSTORE' in self._enabled
+            self._selected.qresync = b'QRESYNC' in self._enabled
+            self._selected.uidonly = self._uidonly
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        resp.add_untagged(EnabledResponse(enabled))
+        return resp, None
+
     async def do_capability(self, cmd: CapabilityCommand) -> _CommandRet:
         response = ResponseOk(cmd.tag, b'Capabilities listed.')
         response.add_untagged(UntaggedResponse(self.capability.string))
@@ -157,9 +340,12 @@ class ConnectionState:
 
     async def do_noop(self, cmd: NoOpCommand) -> _CommandRet:
         updates = None
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
         if self._selected and self._session:
             updates = await self.session.check_mailbox(self.selected)
-        return ResponseOk(cmd.tag, cmd.command + b' completed.'), updates
+        if self._notify:
+            resp.add_untagged(*await self._get_notify_updates())
+        return resp, updates
 
     async def do_id(self, cmd: IdCommand) -> _CommandRet:
         response = ResponseOk(cmd.tag, cmd.command + b' completed.')
@@ -167,9 +353,24 @@ class ConnectionState:
         return response, None
 
     async def do_select(self, cmd: SelectCommand) -> _CommandRet:
+        qresync_arg = cmd.options.get(b'QRESYNC')
+        qresync: tuple[int, int, SequenceSet | None] | None = None
+        if qresync_arg is not None:
+            if b'QRESYNC' not in self._enabled:
+                return ResponseBad(cmd.tag, b'QRESYNC is not enabled.'), None
+            qresync = self._get_qresync_arg(qresync_arg)
+            if qresync is None:
+                return ResponseBad(cmd.tag, b'Invalid QRESYNC data.'), None
+        elif cmd.options.has(b'CONDSTORE'):
+            if b'CONDSTORE' not in self.capability:
+                return ResponseBad(cmd.tag, b'CONDSTORE not supported.'), None
+            self._enabled.add(b'CONDSTORE')
         self._selected = None
         mailbox, updates = await self.session.select_mailbox(
             cmd.mailbox, cmd.readonly)
+        updates.condstore = b'CONDSTORE' in self._enabled
+        updates.qresync = b'QRESYNC' in self._enabled
+        updates.uidonly = self._uidonly
         if updates.readonly:
             num_recent = mailbox.recent
             resp = ResponseOk(cmd.tag, b'Selected mailbox.',
@@ -189,12 +390,48 @@ class ConnectionState:
                              UidNext(mailbox.next_uid))
         resp.add_untagged_ok(b'UIDs valid.',
                              UidValidity(mailbox.uid_validity))
-        if mailbox.first_unseen:
+        if mailbox.first_unseen and not self._uidonly:
             resp.add_untagged_ok(b'First unseen message.',
                                  Unseen(mailbox.first_unseen))
+        if b'CONDSTORE' not in self.capability:
+            pass
+        elif mailbox.highest_mod_seq is None:
+            resp.add_untagged_ok(b'Mod-sequences not supported.',
+                                 ResponseCode.of(b'NOMODSEQ'))
+        else:
+            resp.add_untagged_ok(b'Highest mod-sequence.', HighestModSeq(
+                max(mailbox.highest_mod_seq, 1)))
         resp.add_untagged_ok(b'Object ID.', MailboxId(mailbox.mailbox_id))
+        if qresync is not None:
+            uid_validity, mod_seq, known_uids = qresync
+            if uid_validity == mailbox.uid_validity \
+                    and mailbox.highest_mod_seq is not None:
+                updates = await self._resync(resp, updates, mod_seq,
+                                             known_uids, mailbox.next_uid)
         return resp, updates
 
+    async def _resync(self, resp: ResponseOk, selected: SelectedMailbox,
+                      mod_seq: int, known_uids: SequenceSet | None,
+                      next_uid: int) -> SelectedMailbox:
+        if known_uids is None:
+            if next_uid <= 1:
+                return selected
+            known_uids = SequenceSet([(1, next_uid - 1)], uid=True)
+        vanished = selected.messages.get_vanished(known_uids)
+        if vanished is not None:
+            resp.add_untagged(VanishedResponse(vanished, earlier=True))
+        messages, selected = await self.session.fetch_messages(
+            selected, known_uids, False, changed_since=mod_seq)
+        render = self._renderer.render
+        for msg_seq, msg in messages:
+            if self._uidonly:
+                fetch_data = render(msg, selected, _uidonly_attrs)
+                resp.add_untagged(UidFetchResponse(msg.uid, fetch_data))
+            else:
+                fetch_data = render(msg, selected, _qresync_attrs)
+                resp.add_untagged(FetchResponse(msg_seq, fetch_data))
+        return selected
+
     async def do_create(self, cmd: CreateCommand) -> _CommandRet:
         if cmd.mailbox == 'INBOX':
             return ResponseNo(cmd.tag, b'Cannot create INBOX.'), None
@@ -220,8 +457,17 @@ class ConnectionState:
     async def do_status(self, cmd: StatusCommand) -> _CommandRet:
         mailbox, updates = await self.session.get_mailbox(
             cmd.mailbox, selected=self._selected)
+        data = self._get_status_data(mailbox, cmd.status_list, updates)
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        resp.add_untagged(StatusResponse(cmd.mailbox, data))
+        return resp, updates
+
+    def _get_status_data(self, mailbox: MailboxInterface,
+                         status_list: Sequence[StatusAttribute],
+                         updates: SelectedMailbox | None) \
+            -> dict[StatusAttribute, MaybeBytes]:
         data: dict[StatusAttribute, MaybeBytes] = {}
-        for attr in cmd.status_list:
+        for attr in status_list:
             if attr == b'MESSAGES':
                 data[attr] = Number(mailbox.exists)
             elif attr == b'RECENT':
@@ -237,9 +483,13 @@ class ConnectionState:
                 data[attr] = Number(mailbox.uid_validity)
             elif attr == b'MAILBOXID':
                 data[attr] = mailbox.mailbox_id.parens
-        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
-        resp.add_untagged(StatusResponse(cmd.mailbox, data))
-        return resp, updates
+            elif attr == b'HIGHESTMODSEQ':
+                self._enable_condstore()
+                if mailbox.highest_mod_seq is None:
+                    data[attr] = Number(0)
+                else:
+                    data[attr] = Number(max(mailbox.highest_mod_seq, 1))
+        return data
 
     async def do_append(self, cmd: AppendCommand) -> _CommandRet:
         if len(cmd.messages) > 1 and b'MULTIAPPEND' not in self.capability:
@@ -264,15 +514,121 @@ class ConnectionState:
         return ResponseOk(cmd.tag, cmd.command + b' completed.'), updates
 
     async def do_list(self, cmd: ListCommand) -> _CommandRet:
-        mailboxes, updates = await self.session.list_mailboxes(
-            cmd.ref_name, cmd.filter, subscribed=cmd.only_subscribed,
-            selected=self._selected)
+        listed, updates = await self.session.list_mailboxes(
+            cmd.ref_name, cmd.filters, subscribed=cmd.only_subscribed,
+            selected=self._selected,
+            select_subscribed=cmd.select_subscribed,
+            return_subscribed=cmd.return_subscribed,
+            recursive_match=cmd.recursive_match)
+        mailboxes = list(listed)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
         resp_type = LSubResponse if cmd.only_subscribed else ListResponse
-        for name, sep, attrs in mailboxes:
-            resp.add_untagged(resp_type(name, sep, attrs))
+        statuses: Mapping[str, MailboxInterface] = {}
+        if cmd.status_list:
+            names = [name for name, _, attrs, _ in mailboxes
+                     if b'Noselect' not in attrs
+                     and b'NonExistent' not in attrs]
+            statuses, updates = await self.session.get_mailboxes(
+                names, selected=updates)
+        for name, sep, attrs, child_info in mailboxes:
+            resp.add_untagged(resp_type(name, sep, attrs, child_info))
+            mailbox = statuses.get(name)
+            if mailbox is not None:
+                data = self._get_status_data(
+                    mailbox, cmd.status_list, updates)
+                resp.add_untagged(StatusResponse(name, data))
+        return resp, updates
+
+    async def do_notify(self, cmd: NotifyCommand) -> _CommandRet:
+        events = frozenset(event for group in cmd.event_groups
+                           for event in group.events)
+        if not events <= _notify_events:
+            code = ResponseCode.of(
+                b'BADEVENT (MessageNew MessageExpunge FlagChange)')
+            return ResponseNo(cmd.tag, b'Unsupported NOTIFY event.',
+                              code), None
+        notify, updates = await self._get_notify_mailboxes(cmd)
+        names = list(notify)
+        snapshots: Mapping[str, MailboxInterface] = {}
+        self._notify_watch = None
+        if names:
+            self._notify_watch = await self.session.watch_mailboxes(names)
+            snapshots, updates = await self.session.get_mailboxes(
+                names, selected=updates)
+        self._notify = notify
+        self._notify_last = snapshots
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        if cmd.status:
+            resp.add_untagged(*self._get_notify_status(snapshots.items()))
         return resp, updates
 
+    async def _get_notify_mailboxes(self, cmd: NotifyCommand) \
+            -> tuple[dict[str, frozenset[bytes]], SelectedMailbox | None]:
+        ret: dict[str, frozenset[bytes]] = {}
+        updates = self._selected
+        for group in cmd.event_groups:
+            filter_name = group.filter_name
+            names: Sequence[str]
+            if filter_name in (b'SELECTED', b'SELECTED-DELAYED'):
+                continue
+            elif filter_name == b'INBOXES':
+                names = ['INBOX']
+            elif filter_name == b'MAILBOXES':
+                names = group.mailboxes
+            else:
+                listed, updates = await self.session.list_mailboxes(
+                    '', '*', subscribed=filter_name == b'SUBSCRIBED',
+                    selected=updates)
+                names = [name for name, sep, attrs, _ in listed
+                         if b'Noselect' not in attrs
+                         and (filter_name != b'SUBTREE'
+                              or self._in_subtree(name, sep, group.mailboxes))]
+            for name in names:
+                ret.setdefault(name, group.events)
+        return {name: events for name, events in ret.items() if events}, \
+            updates
+
+    @classmethod
+    def _in_subtree(cls, name: str, sep: str | None,
+                    parents: Sequence[str]) -> bool:
+        for parent in parents:
+            if name == parent or (sep and name.startswith(parent + sep)):
+                return True
+        return False
+
+    async def _get_notify_updates(self) -> Sequence[UntaggedResponse]:
+        snapshots, _ = await self.session.get_mailboxes(list(self._notify))
+        last = self._notify_last
+        changed = [(name, mailbox) for name, mailbox in snapshots.items()
+                   if self._is_notify_changed(
+                       last.get(name), mailbox, self._notify[name])]
+        self._notify_last = snapshots
+        return self._get_notify_status(changed)
+
+    @classmethod
+    def _is_notify_changed(cls, before: MailboxInterface | None,
+                           after: MailboxInterface,
+                           events: frozenset[bytes]) -> bool:
+        if before is None:
+            return True
+        elif before.exists != after.exists \
+                or before.next_uid != after.next_uid:
+            return True
+        return b'FLAGCHANGE' in events and before.unseen != after.unseen
+
+    def _get_notify_status(
+            self, mailboxes: Iterable[tuple[str, MailboxInterface]]) \
+            -> Sequence[UntaggedResponse]:
+        selected = self._selected
+        ret: list[UntaggedResponse] = []
+        for name, mailbox in mailboxes:
+            if selected is not None \
+                    and selected.mailbox_id == mailbox.mailbox_id:
+                continue
+            data = self._get_status_data(mailbox, _notify_status, None)
+            ret.append(StatusResponse(name, data))
+        return ret
+
     async def do_check(self, cmd: CheckCommand) -> _CommandRet:
         updates = await self.session.check_mailbox(
             self.selected, housekeeping=True)
@@ -284,48 +640,134 @@ class ConnectionState:
         return ResponseOk(cmd.tag, cmd.command + b' completed.'), None
 
     async def do_expunge(self, cmd: ExpungeCommand) -> _CommandRet:
-        updates = await self.session.expunge_mailbox(
-            self.selected, cmd.uid_set)
+        uid_set = cmd.uid_set
+        if uid_set is not None:
+            uid_set = self.selected.resolve(uid_set)
+        updates = await self.session.expunge_mailbox(self.selected, uid_set)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
         return resp, updates
 
     async def do_copy(self, cmd: CopyCommand) -> _CommandRet:
+        seq_set = self.selected.resolve(cmd.sequence_set)
         copy_uid, updates = await self.session.copy_messages(
-            self.selected, cmd.sequence_set, cmd.mailbox)
+            self.selected, seq_set, cmd.mailbox)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.', copy_uid)
         return resp, updates
 
     async def do_move(self, cmd: MoveCommand) -> _CommandRet:
+        seq_set = self.selected.resolve(cmd.sequence_set)
         copy_uid, updates = await self.session.move_messages(
-            self.selected, cmd.sequence_set, cmd.mailbox)
+            self.selected, seq_set, cmd.mailbox)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
         resp.add_untagged_ok(b'Moved.', copy_uid)
         return resp, updates
 
     async def do_fetch(self, cmd: FetchCommand) -> _CommandRet:
+        seq_set = self.selected.resolve(cmd.sequence_set)
+        attributes: Sequence[FetchAttribute] = cmd.attributes
+        changed_since: int | None = None
+        changed_since_arg = cmd.options.get(b'CHANGEDSINCE')
+        vanished = cmd.options.has(b'VANISHED')
+        if changed_since_arg is not None:
+            changed_since = self._get_mod_seq_arg(changed_since_arg)
+            if changed_since is None:
+                return ResponseBad(cmd.tag, b'Invalid CHANGEDSINCE.'), None
+            if _modseq_attr not in attributes:
+                attributes = [*attributes, _modseq_attr]
+        if vanished and (not cmd.uid or changed_since is None
+                         or b'QRESYNC' not in self._enabled):
+            return ResponseBad(cmd.tag, b'Invalid VANISHED.'), None
+        partial: PartialRange | None = None
+        partial_arg = cmd.options.get(b'PARTIAL')
+        if partial_arg is not None:
+            partial = self._get_partial_arg(partial_arg)
+            if partial is None or not cmd.uid:
+                return ResponseBad(cmd.tag, b'Invalid PARTIAL.'), None
+        if _modseq_attr in attributes:
+            self._enable_condstore()
         if not cmd.uid:
             self.selected.hide_expunged = True
+        uidonly = self._uidonly
+        if uidonly:
+            attributes = [attr for attr in attributes if attr != _uid_attr]
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        if vanished:
+            vanished_uids = self.selected.messages.get_vanished(seq_set)
+            if vanished_uids is not None:
+                resp.add_untagged(VanishedResponse(vanished_uids,
+                                                   earlier=True))
+        if partial is not None:
+            page = self.selected.messages.get_partial(seq_set, partial)
+            seq_set = SequenceSet([uid for _, uid in page], uid=True)
         set_seen = not self.selected.readonly and \
-            any(attr.set_seen for attr in cmd.attributes)
+            any(attr.set_seen for attr in attributes)
         messages, updates = await self.session.fetch_messages(
-            self.selected, cmd.sequence_set, set_seen)
-        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+            self.selected, seq_set, set_seen, changed_since=changed_since)
+        requirement = FetchRequirement.reduce(
+            attr.requirement for attr in attributes)
+        if FetchRenderer.supports(attributes):
+            self._add_rendered(resp, messages, attributes)
+            return resp, updates
+        prefetch: ContentPrefetch | None = None
+        if self.config.prefetch_window > 0 \
+                and not requirement.has_none(FetchRequirement.CONTENT):
+            prefetch = ContentPrefetch(self.config.prefetch_window,
+                                       self.config.prefetch_max_bytes)
+            resp.add_cleanup(prefetch.close)
         for msg_seq, msg in messages:
             if msg.expunged:
                 resp.code = ResponseCode.of(b'EXPUNGEISSUED')
-            msg_attrs = MessageAttributes(msg, self.selected, cmd.attributes)
-            fetch_resp = FetchResponse(msg_seq, msg_attrs,
-                                       writing_hook=msg_attrs.load_hook())
+            msg_attrs = MessageAttributes(msg, self.selected, attributes,
+                                          prefetch=prefetch)
+            fetch_resp: FetchResponse
+            if uidonly:
+                fetch_resp = UidFetchResponse(
+                    msg.uid, msg_attrs, writing_hook=msg_attrs.load_hook())
+            else:
+                fetch_resp = FetchResponse(
+                    msg_seq, msg_attrs, writing_hook=msg_attrs.load_hook())
             resp.add_untagged(fetch_resp)
         return resp, updates
 
+    def _add_rendered(self, resp: ResponseOk,
+                      messages: Iterable[tuple[int, MessageInterface]],
+                      attributes: Sequence[FetchAttribute]) -> None:
+        selected = self.selected
+        render = self._renderer.render
+        uidonly = self._uidonly
+        for msg_seq, msg in messages:
+            if msg.expunged:
+                resp.code = ResponseCode.of(b'EXPUNGEISSUED')
+            fetch_data = render(msg, selected, attributes)
+            if uidonly:
+                resp.add_untagged(UidFetchResponse(msg.uid, fetch_data))
+            else:
+                resp.add_untagged(FetchResponse(msg_seq, fetch_data))
+
     async def do_search(self, cmd: SearchCommand) -> _CommandRet:
+        results = frozenset(cmd.options.value)
+        if not results <= _search_results:
+            return ResponseBad(cmd.tag, b'Unknown RETURN option.'), None
+        partial: PartialRange | None = None
+        partial_arg = cmd.options.get(b'PARTIAL')
+        if partial_arg is not None:
+            partial = self._get_partial_arg(partial_arg)
+            if partial is None or b'ALL' in results:
+                return ResponseBad(cmd.tag, b'Invalid PARTIAL.'), None
         if not cmd.uid:
             self.selected.hide_expunged = True
+        with_mod_seq = self._has_mod_seq_key(cmd.keys)
+        if with_mod_seq:
+            self._enable_condstore()
+        # Only the page is needed if no other result uses every message
+        page_only = partial is not None \
+            and results <= {b'PARTIAL', b'SAVE'}
         messages, updates = await self.session.search_mailbox(
-            self.selected, cmd.keys)
+            self.selected, cmd.keys, partial=partial if page_only else None)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
         msg_ids: list[int] = []
+        msg_uids: list[int] = []
+        mod_seq: int | None = None
         for msg_seq, msg in messages:
             if msg.expunged:
                 resp.code = ResponseCode.of(b'EXPUNGEISSUED')
@@ -333,30 +775,134 @@ class ConnectionState:
                 msg_ids.append(msg.uid)
             else:
                 msg_ids.append(msg_seq)
-        resp.add_untagged(SearchResponse(msg_ids))
+            msg_uids.append(msg.uid)
+            if with_mod_seq:
+                mod_seq = max(mod_seq or 1, msg.mod_seq)
+        if not results:
+            resp.add_untagged(SearchResponse(msg_ids, mod_seq))
+            return resp, updates
+        page_ids, page_uids = msg_ids, msg_uids
+        if partial is not None and not page_only:
+            start, stop = partial.bounds(len(msg_ids))
+            page_ids, page_uids = msg_ids[start:stop], msg_uids[start:stop]
+        if b'SAVE' in results:
+            if partial is not None:
+                updates.saved_result = page_uids
+            else:
+                updates.saved_result = self._get_saved_result(
+                    results, msg_uids)
+            results = results - {b'SAVE'}
+            if not results:
+                return resp, updates
+        data: dict[bytes, MaybeBytes] = {}
+        if partial is not None:
+            page_set = SequenceSet.build(page_ids, cmd.uid) \
+                if page_ids else b'NIL'
+            data[b'PARTIAL'] = BytesFormat(b'(%b %b)') % (partial, page_set)
+        if b'COUNT' in results:
+            data[b'COUNT'] = b'%i' % len(msg_ids)
+        if msg_ids:
+            if b'MIN' in results:
+                data[b'MIN'] = b'%i' % min(msg_ids)
+            if b'MAX' in results:
+                data[b'MAX'] = b'%i' % max(msg_ids)
+            if b'ALL' in results:
+                data[b'ALL'] = SequenceSet.build(msg_ids, cmd.uid)
+            if mod_seq is not None:
+                data[b'MODSEQ'] = b'%i' % mod_seq
+        resp.add_untagged(ESearchResponse(cmd.tag, cmd.uid, data))
+        return resp, updates
+
+    async def do_sort(self, cmd: SortCommand) -> _CommandRet:
+        if not cmd.uid:
+            self.selected.hide_expunged = True
+        messages, updates = await self.session.sort_mailbox(
+            self.selected, cmd.sort_keys, cmd.keys)
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        msg_ids: list[int] = []
+        for msg_seq, msg in messages:
+            if msg.expunged:
+                resp.code = ResponseCode.of(b'EXPUNGEISSUED')
+            msg_ids.append(msg.uid if cmd.uid else msg_seq)
+        resp.add_untagged(SortResponse(msg_ids))
         return resp, updates
 
+    async def do_thread(self, cmd: ThreadCommand) -> _CommandRet:
+        if not cmd.uid:
+            self.selected.hide_expunged = True
+        threads, updates = await self.session.thread_mailbox(
+            self.selected, cmd.algorithm, cmd.keys)
+        resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
+        if cmd.uid:
+            resp.add_untagged(ThreadResponse(
+                [thread.map(lambda pair: pair[1].uid) for thread in threads]))
+        else:
+            resp.add_untagged(ThreadResponse(
+                [thread.map(lambda pair: pair[0]) for thread in threads]))
+        return resp, updates
+
+    @classmethod
+    def _get_saved_result(cls, results: frozenset[bytes],
+                          msg_uids: Sequence[int]) -> Sequence[int]:
+        # RFC 5182 2.4: with only MIN and/or MAX, only those are saved
+        if not msg_uids or results & {b'ALL', b'COUNT'} \
+                or not results & {b'MIN', b'MAX'}:
+            return msg_uids
+        saved: list[int] = []
+        if b'MIN' in results:
+            saved.append(min(msg_uids))
+        if b'MAX' in results:
+            saved.append(max(msg_uids))
+        return saved
+
     async def do_store(self, cmd: StoreCommand) -> _CommandRet:
+        seq_set = self.selected.resolve(cmd.sequence_set)
+        unchanged_since: int | None = None
+        unchanged_since_arg = cmd.options.get(b'UNCHANGEDSINCE')
+        if unchanged_since_arg is not None:
+            unchanged_since = self._get_mod_seq_arg(unchanged_since_arg)
+            if unchanged_since is None:
+                return ResponseBad(cmd.tag, b'Invalid UNCHANGEDSINCE.'), None
+            self._enable_condstore()
+            requested = self.selected.messages.get_uids(seq_set)
         if not cmd.uid:
             self.selected.hide_expunged = True
         if cmd.silent:
-            self.selected.silence(cmd.sequence_set, cmd.flag_set, cmd.mode)
+            self.selected.silence(seq_set, cmd.flag_set, cmd.mode)
         messages, updates = await self.session.update_flags(
-            self.selected, cmd.sequence_set, cmd.flag_set, cmd.mode)
+            self.selected, seq_set, cmd.flag_set, cmd.mode,
+            unchanged_since=unchanged_since)
         resp = ResponseOk(cmd.tag, cmd.command + b' completed.')
-        session_flags = self.selected.session_flags
+        selected = self.selected
+        condstore = selected.condstore
+        uidonly = self._uidonly
+        attributes = [_flags_attr]
+        if cmd.uid and not uidonly:
+            attributes.append(_uid_attr)
+        if condstore:
+            attributes.append(_modseq_attr)
+        silent_attributes = attributes[1:]
+        render = self._renderer.render
+        updated: set[int] = set()
         for msg_seq, msg in messages:
+            updated.add(msg.uid)
             if msg.expunged:
                 resp.code = ResponseCode.of(b'EXPUNGEISSUED')
-            elif cmd.silent:
+            elif cmd.silent and not condstore:
                 continue
-            flags = msg.get_flags(session_flags)
-            fetch_data: list[FetchValue] = [
-                FetchValue.of(_flags_attr, List(flags, sort=True))]
-            if cmd.uid:
-                fetch_data.append(
-                    FetchValue.of(_uid_attr, Number(msg.uid)))
-            resp.add_untagged(FetchResponse(msg_seq, fetch_data))
+            if not cmd.silent or msg.expunged:
+                fetch_data = render(msg, selected, attributes)
+            else:
+                fetch_data = render(msg, selected, silent_attributes)
+            if uidonly:
+                resp.add_untagged(UidFetchResponse(msg.uid, fetch_data))
+            else:
+                resp.add_untagged(FetchResponse(msg_seq, fetch_data))
+        if unchanged_since is not None:
+            modified = [uid if cmd.uid else seq for seq, uid in requested
+                        if uid not in updated]
+            if modified:
+                resp.code = Modified(modified)
         return resp, updates
 
     async def do_idle(self, cmd: IdleCommand) -> _CommandRet:
@@ -370,10 +916,33 @@ class ConnectionState:
 
     async def receive_updates(self, cmd: IdleCommand, done: Event) \
             -> Iterable[UntaggedResponse]:
-        selected = await self.session.check_mailbox(
-            self.selected, wait_on=done)
+        watch = self._notify_watch
+        if watch is None:
+            selected = await self.session.check_mailbox(
+                self.selected, wait_on=done)
+            self._selected, untagged = selected.fork(cmd)
+            return untagged
+        found = subsystem.get().new_event()
+        wait_on = done.or_event(found)
+        watch_task = asyncio.create_task(
+            self._watch_notify(watch, wait_on, found))
+        try:
+            selected = await self.session.check_mailbox(
+                self.selected, wait_on=wait_on)
+        finally:
+            found.set()
+            watch_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await watch_task
         self._selected, untagged = selected.fork(cmd)
-        return untagged
+        return [*untagged, *await self._get_notify_updates()]
+
+    @classmethod
+    async def _watch_notify(cls, watch: Callable[[Event], Awaitable[bool]],
+                            wait_on: Event, found: Event) -> None:
+        while not wait_on.is_set():
+            if await watch(wait_on):
+                found.set()
 
     @classmethod
     def _get_func_name(cls, cmd: Command) -> str:
@@ -383,25 +952,63 @@ class ConnectionState:
         cmd_str = str(cmd_type.command, 'ascii').lower()
         return 'do_' + cmd_str
 
-    async def do_command(self, cmd: Command) -> CommandResponse:
+    async def _dispatch(self, cmd: Command) -> _CommandRet:
         if isinstance(cmd, InvalidCommand):
-            return ResponseBad(cmd.tag, cmd.message)
+            code = cmd.parse_exc.code if cmd.parse_exc else None
+            return ResponseBad(cmd.tag, cmd.message, code), None
         elif self._session and isinstance(cmd, CommandNonAuth):
             msg = cmd.command + b': Already authenticated.'
-            return ResponseBad(cmd.tag, msg)
+            return ResponseBad(cmd.tag, msg), None
         elif not self._session and isinstance(cmd, CommandAuth):
             msg = cmd.command + b': Must authenticate first.'
-            return ResponseBad(cmd.tag, msg)
+            return ResponseBad(cmd.tag, msg), None
         elif not self._selected and isinstance(cmd, CommandSelect):
             msg = cmd.command + b': Must select a mailbox first.'
-            return ResponseBad(cmd.tag, msg)
+            return ResponseBad(cmd.tag, msg), None
+        elif self._uidonly and self._requires_uid(cmd):
+            msg = cmd.command + b': Message sequence numbers not allowed.'
+            code = ResponseCode.of(b'UIDREQUIRED')
+            return ResponseBad(cmd.tag, msg, code), None
         func_name = self._get_func_name(cmd)
         try:
             func: _CommandFunc = getattr(self, func_name)
         except AttributeError:
-            return ResponseNo(cmd.tag, cmd.command + b': Not Implemented')
-        response, selected = await func(cmd)
+            return ResponseNo(cmd.tag, cmd.command + b': Not Implemented'), \
+                None
+        return await func(cmd)
+
+    def _finish(self, cmd: Command, response: CommandResponse,
+                selected: SelectedMailbox | None) -> CommandResponse:
         if selected is not None:
             self._selected, untagged = selected.fork(cmd)
             response.add_untagged(*untagged)
         return response
+
+    async def do_command(self, cmd: Command) -> CommandResponse:
+        response, selected = await self._dispatch(cmd)
+        return self._finish(cmd, response, selected)
+
+    async def do_pipelined(self, cmd: Command, *, concurrent: bool) \
+            -> Callable[[], CommandResponse]:
+        """Executes a command for which :meth:`.can_pipeline` is True. The
+        returned function adds the untagged updates for the selected mailbox
+        to the response, and must be called in the order that the commands
+        were received.
+
+        Args:
+            cmd: The pipelined command.
+            concurrent: True if a previously received command is still
+                executing.
+
+        """
+        if concurrent and self._selected is not None:
+            # Message sequence numbers must not change until the untagged
+            # FETCH responses of every executing command have been sent.
+            self._selected.hide_expunged = True
+        response, selected = await self._dispatch(cmd)
+
+        def finish() -> CommandResponse:
+            # The selected mailbox may have been forked by a previous command
+            updates = None if selected is None else self._selected
+            return self._finish(cmd, response, updates)
+        return finish
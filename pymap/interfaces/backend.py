@@ -5,7 +5,7 @@ from abc import abstractmethod, ABCMeta
 from argparse import Namespace, ArgumentParser
 from collections.abc import Sequence
 from contextlib import AsyncExitStack
-from typing import Protocol, Any
+from typing import Protocol, Any, ClassVar
 
 from .login import LoginInterface
 from ..config import IMAPConfig
@@ -90,6 +90,10 @@ class ServiceInterface(metaclass=ABCMeta):
 
     """
 
+    #: True if the service is started in every worker process when the server
+    #: runs more than one, otherwise it is only started in the first worker.
+    per_worker: ClassVar[bool] = False
+
     __slots__ = ['backend', 'config']
 
     def __init__(self, backend: BackendInterface, config: IMAPConfig) -> None:
@@ -92,3 +92,15 @@ class MailboxInterface(Protocol):
     def uid_validity(self) -> int:
         """The mailbox UID validity value."""
         ...
+
+    @property
+    @abstractmethod
+    def highest_mod_seq(self) -> int | None:
+        """The highest modification sequence of the mailbox, or ``None`` if
+        the backend does not track modification sequences.
+
+        See Also:
+            `RFC 7162 3.1. <https://tools.ietf.org/html/rfc7162#section-3.1>`_
+
+        """
+        ...
@@ -68,6 +68,15 @@ class CachedMessage(Protocol):
         """The message's thread object ID."""
         ...
 
+    @property
+    @abstractmethod
+    def mod_seq(self) -> int:
+        """The modification sequence of the message metadata, or ``0`` if it
+        is not known.
+
+        """
+        ...
+
     @property
     @abstractmethod
     def flags_key(self) -> FlagsKey:
@@ -142,6 +151,41 @@ class MessageInterface(Protocol):
         """
         ...
 
+    @property
+    @abstractmethod
+    def mod_seq(self) -> int:
+        """The modification sequence of the message metadata, which increases
+        every time the message flags are changed. This value is ``0`` if the
+        backend does not track modification sequences.
+
+        See Also:
+            `RFC 7162 3.1. <https://tools.ietf.org/html/rfc7162#section-3.1>`_
+
+        """
+        ...
+
+    @property
+    @abstractmethod
+    def preview(self) -> str | None:
+        """A short plain-text preview of the message content, extracted when
+        the message was added to the mailbox. This value is ``None`` if the
+        backend did not store a preview for the message.
+
+        See Also:
+            `RFC 8970 <https://tools.ietf.org/html/rfc8970>`_
+
+        """
+        ...
+
+    @property
+    @abstractmethod
+    def flags_key(self) -> FlagsKey:
+        """Hashable value that represents the current flags of this
+        message, used for detecting mailbox updates.
+
+        """
+        ...
+
     @abstractmethod
     def get_flags(self, session_flags: SessionFlags) -> frozenset[Flag]:
         """Get the full set of permanent and session flags for the message.
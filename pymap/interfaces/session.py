@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections.abc import Iterable, Sequence
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
 from typing import Any, Protocol
 
 from .filter import FilterSetInterface
@@ -11,9 +11,11 @@ from .mailbox import MailboxInterface
 from ..concurrent import Event
 from ..flags import FlagOp
 from ..parsing.message import AppendMessage
-from ..parsing.specials import SequenceSet, Flag, SearchKey, ObjectId
+from ..parsing.specials import SequenceSet, Flag, SearchKey, SortKey, \
+    ObjectId, PartialRange
 from ..parsing.response.code import AppendUid, CopyUid
 from ..selected import SelectedMailbox
+from ..threads import ThreadNode
 
 __all__ = ['SessionInterface']
 
@@ -52,24 +54,38 @@ class SessionInterface(Protocol):
         ...
 
     @abstractmethod
-    async def list_mailboxes(self, ref_name: str, filter_: str,
+    async def list_mailboxes(self, ref_name: str,
+                             filter_: str | Sequence[str],
                              subscribed: bool = False,
-                             selected: SelectedMailbox | None = None) \
-            -> tuple[Iterable[tuple[str, str | None, Sequence[bytes]]],
+                             selected: SelectedMailbox | None = None, *,
+                             select_subscribed: bool = False,
+                             return_subscribed: bool = False,
+                             recursive_match: bool = False) \
+            -> tuple[Iterable[tuple[str, str | None, Sequence[bytes],
+                                    Sequence[bytes]]],
                      SelectedMailbox | None]:
-        """List the mailboxes owned by the user.
+        """List the mailboxes owned by the user. Each listed mailbox is
+        returned as its name, hierarchy delimiter, attributes, and
+        ``CHILDINFO`` selection criteria.
 
         See Also:
             `RFC 3501 6.3.8.
             <https://tools.ietf.org/html/rfc3501#section-6.3.8>`_,
             `RFC 3501 6.3.9.
-            <https://tools.ietf.org/html/rfc3501#section-6.3.9>`_
+            <https://tools.ietf.org/html/rfc3501#section-6.3.9>`_,
+            `RFC 5258 <https://tools.ietf.org/html/rfc5258>`_
 
         Args:
             ref_name: Mailbox reference name.
-            filter_: Mailbox name with possible wildcards.
+            filter_: Mailbox name with possible wildcards, or a list of them.
             subscribed: If True, only list the subscribed mailboxes.
             selected: If applicable, the currently selected mailbox name.
+            select_subscribed: If True, list subscribed mailboxes including
+                those that do not exist, marked ``\\NonExistent``.
+            return_subscribed: If True, mark subscribed mailboxes
+                ``\\Subscribed``.
+            recursive_match: If True, with *select_subscribed*, also list
+                mailboxes with a subscribed inferior mailbox.
 
         """
         ...
@@ -92,6 +108,42 @@ class SessionInterface(Protocol):
         """
         ...
 
+    @abstractmethod
+    async def get_mailboxes(self, names: Sequence[str],
+                            selected: SelectedMailbox | None = None) \
+            -> tuple[Mapping[str, MailboxInterface], SelectedMailbox | None]:
+        """Retrieves a :class:`~pymap.interfaces.mailbox.MailboxInterface`
+        object for each of the given mailboxes, as :meth:`.get_mailbox` would.
+        Mailboxes that do not exist are left out of the result.
+
+        See Also:
+            `RFC 5819 <https://tools.ietf.org/html/rfc5819>`_
+
+        Args:
+            names: The names of the mailboxes.
+            selected: If applicable, the currently selected mailbox name.
+
+        """
+        ...
+
+    @abstractmethod
+    async def watch_mailboxes(self, names: Sequence[str]) \
+            -> Callable[[Event], Awaitable[bool]]:
+        """Start watching the given mailboxes for changes. The returned
+        function blocks for a short time, until the given event is signalled
+        or a change is found, and returns True if any of the mailboxes changed
+        since the previous call, or since this method was called. It is
+        cancelled if it is still blocked once the server stops waiting.
+
+        See Also:
+            `RFC 5465 <https://tools.ietf.org/html/rfc5465>`_
+
+        Args:
+            names: The names of the mailboxes.
+
+        """
+        ...
+
     @abstractmethod
     async def create_mailbox(self, name: str,
                              selected: SelectedMailbox | None = None) \
@@ -277,15 +329,22 @@ class SessionInterface(Protocol):
 
     @abstractmethod
     async def fetch_messages(self, selected: SelectedMailbox,
-                             sequence_set: SequenceSet, set_seen: bool) \
+                             sequence_set: SequenceSet, set_seen: bool, *,
+                             changed_since: int | None = None) \
             -> tuple[Iterable[tuple[int, MessageInterface]], SelectedMailbox]:
         """Get a list of loaded message objects corresponding to given sequence
         set.
 
+        See Also:
+            `RFC 7162 3.1.4.
+            <https://tools.ietf.org/html/rfc7162#section-3.1.4>`_
+
         Args:
             selected: The selected mailbox session.
             sequence_set: Sequence set of message sequences or UIDs.
             set_seen: True if the messages should get the ``\\Seen`` flag.
+            changed_since: If given, only messages with a greater modification
+                sequence are included.
 
         Raises:
             :class:`~pymap.exceptions.MailboxNotFound`
@@ -295,7 +354,8 @@ class SessionInterface(Protocol):
 
     @abstractmethod
     async def search_mailbox(self, selected: SelectedMailbox,
-                             keys: frozenset[SearchKey]) \
+                             keys: frozenset[SearchKey], *,
+                             partial: PartialRange | None = None) \
             -> tuple[Iterable[tuple[int, MessageInterface]], SelectedMailbox]:
         """Get the messages in the current mailbox that meet all of the
         given search criteria.
@@ -303,9 +363,56 @@ class SessionInterface(Protocol):
         See Also:
             `RFC 3501 7.2.5.
             <https://tools.ietf.org/html/rfc3501#section-7.2.5>`_
+            `RFC 9394 3.1. <https://tools.ietf.org/html/rfc9394#section-3.1>`_
+
+        Args:
+            selected: The selected mailbox session.
+            keys: Search keys specifying the message criteria.
+            partial: If given, only the matching messages in this range of
+                positions are returned.
+
+        Raises:
+            :class:`~pymap.exceptions.MailboxNotFound`
+
+        """
+        ...
+
+    @abstractmethod
+    async def sort_mailbox(self, selected: SelectedMailbox,
+                           sort_keys: Sequence[SortKey],
+                           keys: frozenset[SearchKey]) \
+            -> tuple[Sequence[tuple[int, MessageInterface]], SelectedMailbox]:
+        """Get the messages in the current mailbox that meet all of the
+        given search criteria, ordered by the sort criteria.
+
+        See Also:
+            `RFC 5256 3. <https://tools.ietf.org/html/rfc5256#section-3>`_
+
+        Args:
+            selected: The selected mailbox session.
+            sort_keys: Sort keys specifying the message order.
+            keys: Search keys specifying the message criteria.
+
+        Raises:
+            :class:`~pymap.exceptions.MailboxNotFound`
+
+        """
+        ...
+
+    @abstractmethod
+    async def thread_mailbox(self, selected: SelectedMailbox,
+                             algorithm: bytes, keys: frozenset[SearchKey]) \
+            -> tuple[Sequence[ThreadNode[tuple[int, MessageInterface]]],
+                     SelectedMailbox]:
+        """Get the messages in the current mailbox that meet all of the
+        given search criteria, grouped into threads.
+
+        See Also:
+            `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
 
         Args:
             selected: The selected mailbox session.
+            algorithm: The threading algorithm.
             keys: Search keys specifying the message criteria.
 
         Raises:
@@ -387,19 +494,25 @@ class SessionInterface(Protocol):
     async def update_flags(self, selected: SelectedMailbox,
                            sequence_set: SequenceSet,
                            flag_set: frozenset[Flag],
-                           mode: FlagOp = FlagOp.REPLACE) \
+                           mode: FlagOp = FlagOp.REPLACE, *,
+                           unchanged_since: int | None = None) \
             -> tuple[Iterable[tuple[int, MessageInterface]], SelectedMailbox]:
-        """Update the flags for the given set of messages.
+        """Update the flags for the given set of messages. Messages that were
+        not updated because of *unchanged_since* are not returned.
 
         See Also:
             `RFC 3501 6.4.6.
-            <https://tools.ietf.org/html/rfc3501#section-6.4.6>`_
+            <https://tools.ietf.org/html/rfc3501#section-6.4.6>`_,
+            `RFC 7162 3.1.3.
+            <https://tools.ietf.org/html/rfc7162#section-3.1.3>`_
 
         Args:
             selected: The selected mailbox session.
             sequence_set: Sequence set of message sequences or UIDs.
             flag_set: Set of flags to update.
             mode: Update mode for the flag set.
+            unchanged_since: If given, messages with a greater modification
+                sequence are not updated.
 
         Raises:
             :class:`~pymap.exceptions.MailboxNotFound`
@@ -20,6 +20,12 @@ class ListEntry:
             ``\\Marked``, ``\\Unmarked`` , or neither, respectively.
         has_children: Whether the mailbox should be marked ``\\HasChildren`` or
             ``\\HasNoChildren``.
+        subscribed: Whether the mailbox should be marked ``\\Subscribed``, or
+            None if subscriptions were not loaded.
+        nonexistent: True if the mailbox should be marked ``\\NonExistent``,
+            because it is only known from its subscription.
+        child_subscribed: True if a mailbox inferior to this one is
+            subscribed.
 
     """
 
@@ -27,6 +33,9 @@ class ListEntry:
     exists: bool
     marked: bool | None
     has_children: bool
+    subscribed: bool | None = None
+    nonexistent: bool = False
+    child_subscribed: bool = False
 
     @property
     def attributes(self) -> Sequence[bytes]:
@@ -38,7 +47,9 @@ class ListEntry:
 
         """
         ret: list[bytes] = []
-        if not self.exists:
+        if self.nonexistent:
+            ret.append(b'NonExistent')
+        elif not self.exists:
             ret.append(b'Noselect')
         if self.has_children:
             ret.append(b'HasChildren')
@@ -48,29 +59,61 @@ class ListEntry:
             ret.append(b'Marked')
         elif self.marked is False:
             ret.append(b'Unmarked')
+        if self.subscribed:
+            ret.append(b'Subscribed')
         return ret
 
+    @property
+    def child_info(self) -> Sequence[bytes]:
+        """The selection criteria met by mailboxes inferior to this one, for
+        the ``CHILDINFO`` extended data item of a ``LIST`` response.
+
+        See Also:
+            `RFC 5258 3.5. <https://tools.ietf.org/html/rfc5258#section-3.5>`_
+
+        """
+        if self.child_subscribed:
+            return [b'SUBSCRIBED']
+        return []
+
 
 class _TreeNode:
 
-    __slots__ = ['parent', 'name', 'exists', 'children']
+    __slots__ = ['parent', 'name', 'exists', 'listed', 'subscribed',
+                 'child_subscribed', 'children']
 
     def __init__(self, name: str, parent: _TreeNode | None = None) -> None:
         super().__init__()
         self.parent = parent
         self.name = name
         self.exists = False
+        self.listed = False
+        self.subscribed = False
+        self.child_subscribed = False
         self.children: dict[str, _TreeNode] = {}
 
-    def add(self, node_name: str, *extra: str) -> None:
+    def _get_child(self, node_name: str) -> _TreeNode:
         child = self.children.get(node_name)
         if not child:
             self.children[node_name] = child = _TreeNode(node_name, self)
+        return child
+
+    def add(self, node_name: str, *extra: str) -> None:
+        child = self._get_child(node_name)
+        child.listed = True
         if not extra:
             child.exists = True
         else:
             child.add(*extra)
 
+    def subscribe(self, node_name: str, *extra: str) -> None:
+        child = self._get_child(node_name)
+        if not extra:
+            child.subscribed = True
+        else:
+            child.child_subscribed = True
+            child.subscribe(*extra)
+
 
 class ListTree:
     """Constructs a tree of hierarchical mailbox names. If a mailbox name
@@ -84,7 +127,8 @@ class ListTree:
 
     _wildcards = re.compile(r'([\*\%])')
 
-    __slots__ = ['_delimiter', '_no_delimiter', '_root', '_marked']
+    __slots__ = ['_delimiter', '_no_delimiter', '_root', '_marked',
+                 '_subscriptions']
 
     def __init__(self, delimiter: str) -> None:
         super().__init__()
@@ -92,6 +136,7 @@ class ListTree:
         self._no_delimiter = '[^' + re.escape(delimiter) + ']*?'
         self._root = _TreeNode('')
         self._marked: dict[str, bool] = {}
+        self._subscriptions = False
 
     def update(self, *names: str) -> ListTree:
         """Add all the mailbox names to the tree, filling in any missing nodes.
@@ -105,6 +150,21 @@ class ListTree:
             self._root.add(*parts)
         return self
 
+    def set_subscribed(self, *names: str) -> ListTree:
+        """Mark the mailbox names as subscribed. Names that were not added
+        by :meth:`.update` are marked ``\\NonExistent``. Once called, every
+        entry is either marked ``\\Subscribed`` or known to be unsubscribed.
+
+        Args:
+            names: The names of the subscribed mailboxes.
+
+        """
+        self._subscriptions = True
+        for name in names:
+            parts = name.split(self._delimiter)
+            self._root.subscribe(*parts)
+        return self
+
     def set_marked(self, name: str, marked: bool = False,
                    unmarked: bool = False) -> None:
         """Add or remove the ``\\Marked`` and ``\\Unmarked`` mailbox
@@ -123,16 +183,28 @@ class ListTree:
         else:
             self._marked.pop(name, None)
 
-    def _iter(self, node: _TreeNode, name: str) -> Iterable[ListEntry]:
+    def _get_entry(self, node: _TreeNode, name: str) -> ListEntry:
+        marked = self._marked.get(name)
+        has_children = any(child.listed for child in node.children.values())
+        subscribed = node.subscribed if self._subscriptions else None
+        return ListEntry(name, node.exists, marked, has_children, subscribed,
+                         not node.listed, node.child_subscribed)
+
+    def _iter(self, node: _TreeNode, name: str,
+              subscribed: bool = False) -> Iterable[ListEntry]:
         if node.parent is not None:
-            marked = self._marked.get(name)
-            yield ListEntry(name, node.exists, marked, bool(node.children))
+            if subscribed:
+                if not node.subscribed and not node.child_subscribed:
+                    return
+            elif not node.listed:
+                return
+            yield self._get_entry(node, name)
         for child in node.children.values():
             if name:
                 child_name = self._delimiter.join((name, child.name))
             else:
                 child_name = child.name
-            for entry in self._iter(child, child_name):
+            for entry in self._iter(child, child_name, subscribed):
                 yield entry
 
     def _find(self, node: _TreeNode, node_name: str, *extra: str) -> _TreeNode:
@@ -155,8 +227,7 @@ class ListTree:
         except KeyError:
             return None
         else:
-            marked = self._marked.get(name)
-            return ListEntry(name, node.exists, marked, bool(node.children))
+            return self._get_entry(node, name)
 
     def get_renames(self, from_name: str, to_name: str) \
             -> Sequence[tuple[str, str]]:
@@ -191,30 +262,48 @@ class ListTree:
         for entry in self._iter(self._root, ''):
             yield entry
 
-    def _get_pattern(self, query: str) -> tuple[Pattern[str], Pattern[str]]:
-        pattern_parts: list[str] = []
-        for part in self._wildcards.split(query):
-            if part == '*':
-                pattern_parts.append('.*?')
-            elif part == '%':
-                pattern_parts.append(self._no_delimiter)
-            else:
-                pattern_parts.append(re.escape(part))
-        pattern = '^' + ''.join(pattern_parts) + '$'
+    def _get_pattern(self, *queries: str) \
+            -> tuple[Pattern[str], Pattern[str]]:
+        alternatives: list[str] = []
+        for query in queries:
+            pattern_parts: list[str] = []
+            for part in self._wildcards.split(query):
+                if part == '*':
+                    pattern_parts.append('.*?')
+                elif part == '%':
+                    pattern_parts.append(self._no_delimiter)
+                else:
+                    pattern_parts.append(re.escape(part))
+            alternatives.append(''.join(pattern_parts))
+        pattern = '^(?:' + '|'.join(alternatives) + ')$'
         return re.compile(pattern), re.compile(pattern, re.IGNORECASE)
 
-    def list_matching(self, ref_name: str, filter_: str) \
-            -> Iterable[ListEntry]:
-        """Return all the entries in the list tree that match the given query.
+    def list_matching(self, ref_name: str, *filters: str,
+                      subscribed: bool = False,
+                      recursive_match: bool = False) -> Iterable[ListEntry]:
+        """Return all the entries in the list tree that match any of the given
+        queries. The tree is walked only once, regardless of the number of
+        queries.
+
+        See Also:
+            `RFC 5258 3.
+            <https://tools.ietf.org/html/rfc5258#section-3>`_
 
         Args:
             ref_name: Mailbox reference name.
-            filter_: Mailbox name with possible wildcards.
+            filters: Mailbox names with possible wildcards.
+            subscribed: Only return entries marked by :meth:`.set_subscribed`.
+            recursive_match: With *subscribed*, also return entries that have
+                a subscribed inferior mailbox.
 
         """
-        canonical, canonical_i = self._get_pattern(ref_name + filter_)
-        for entry in self.list():
-            if entry.name == 'INBOX':
+        canonical, canonical_i = self._get_pattern(
+            *(ref_name + filter_ for filter_ in filters))
+        for entry in self._iter(self._root, '', subscribed):
+            if subscribed and not entry.subscribed and \
+                    not (recursive_match and entry.child_subscribed):
+                continue
+            elif entry.name == 'INBOX':
                 if canonical_i.match('INBOX'):
                     yield entry
             elif canonical.match(entry.name):
@@ -31,18 +31,21 @@ class MailboxSnapshot(MailboxInterface):
         unseen: Number of unseen messages in the mailbox.
         first_unseen: The sequence number of the first unseen message.
         next_uid: The predicted next message UID.
+        highest_mod_seq: The highest modification sequence of the mailbox, if
+            modification sequences are tracked.
 
     """
 
     __slots__ = ['mailbox_id', 'readonly', 'uid_validity', 'permanent_flags',
                  'session_flags', 'exists', 'recent', 'unseen', 'first_unseen',
-                 'next_uid']
+                 'next_uid', 'highest_mod_seq']
 
     def __init__(self, mailbox_id: ObjectId, readonly: bool, uid_validity: int,
                  permanent_flags: Iterable[Flag],
                  session_flags: frozenset[Flag],
                  exists: int, recent: int, unseen: int,
-                 first_unseen: int | None, next_uid: int) -> None:
+                 first_unseen: int | None, next_uid: int, *,
+                 highest_mod_seq: int | None = None) -> None:
         super().__init__()
         self.mailbox_id: Final = mailbox_id
         self.readonly: Final = readonly
@@ -54,6 +57,7 @@ class MailboxSnapshot(MailboxInterface):
         self.unseen: Final = unseen
         self.first_unseen: Final = first_unseen
         self.next_uid: Final = next_uid
+        self.highest_mod_seq: Final = highest_mod_seq
 
     @classmethod
     def new_uid_validity(cls) -> int:
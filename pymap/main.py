@@ -9,12 +9,14 @@ import logging.config
 import os
 import signal
 import sys
+import time
 from argparse import ArgumentParser, Namespace, ArgumentTypeError
 from asyncio import CancelledError
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from contextlib import nullcontext, suppress, AsyncExitStack
 from string import Template
-from typing import Any
+from types import FrameType
+from typing import Any, ClassVar
 
 from .__about__ import __version__
 from .backend import backends
@@ -43,6 +45,8 @@ except ImportError:
 else:
     has_passlib = True
 
+_log = logging.getLogger(__name__)
+
 
 def main() -> None:
     parser = _PymapArgumentParser(description=__doc__)
@@ -57,6 +61,8 @@ def main() -> None:
                             help='drop privileges to user name or uid')
         parser.add_argument('--set-gid', metavar='GROUP', type=_get_grp,
                             help='drop privileges to group name or gid')
+        parser.add_argument('--workers', metavar='NUM', type=_get_workers,
+                            help='fork this many worker processes')
     parser.add_argument('--logging-cfg', metavar='PATH',
                         help='config file for logging')
     parser.add_argument('--no-service', dest='skip_services', action='append',
@@ -72,7 +78,7 @@ def main() -> None:
         subparser.set_defaults(backend_type=backend_type)
     for service_type in services.values():
         service_type.add_arguments(parser)
-    parser.set_defaults(skip_services=[], passlib_cfg=None)
+    parser.set_defaults(skip_services=[], passlib_cfg=None, workers=1)
     args = parser.parse_args()
 
     if args.logging_cfg:
@@ -85,12 +91,16 @@ def main() -> None:
     service_types = [service for name, service in services.items()
                      if name not in args.skip_services]
     with PidFile(pidname=args.pid_file, force_tmpdir=True):
+        if args.workers > 1:
+            supervisor = _Supervisor(args, args.backend_type, service_types)
+            return supervisor.run()
         return asyncio.run(run(args, args.backend_type, service_types),
                            debug=False)
 
 
 async def run(args: Namespace, backend_type: type[BackendInterface],
-              service_types: Sequence[type[ServiceInterface]]) -> None:
+              service_types: Sequence[type[ServiceInterface]], *,
+              ready: Callable[[], None] = notify_ready) -> None:
     loop = asyncio.get_running_loop()
     backend, config = await backend_type.init(args)
     config.apply_context()
@@ -102,7 +112,7 @@ async def run(args: Namespace, backend_type: type[BackendInterface],
             await service.start(stack)
 
         _drop_privileges(args)
-        notify_ready()
+        ready()
         forever = asyncio.create_task(_sleep_forever())
         loop.add_signal_handler(signal.SIGINT, forever.cancel)
         loop.add_signal_handler(signal.SIGTERM, forever.cancel)
@@ -131,6 +141,15 @@ if sys.platform != 'win32' and os.name == 'posix':
         else:
             return entry.pw_uid
 
+    def _get_workers(workers: str) -> int:
+        try:
+            num = int(workers)
+        except ValueError:
+            num = 0
+        if num < 1:
+            raise ArgumentTypeError(f'Invalid number of workers: {workers}')
+        return num
+
     def _get_grp(setgid: str) -> int:
         from grp import getgrnam, getgrgid
         try:
@@ -154,6 +173,105 @@ def _drop_privileges(args: Namespace) -> None:
             os.setuid(args.set_uid)
 
 
+class _Supervisor:
+    # Forks the worker processes, each running the backend and services in
+    # its own event loop. Workers that exit are restarted, until a SIGINT or
+    # SIGTERM is forwarded to the workers so they stop serving and exit.
+    # Readiness is only signalled to systemd by the supervisor, once every
+    # worker has started its services or exited.
+
+    restart_delay: ClassVar[float] = 1.0
+
+    def __init__(self, args: Namespace,
+                 backend_type: type[BackendInterface],
+                 service_types: Sequence[type[ServiceInterface]]) -> None:
+        super().__init__()
+        self.args = args
+        self.backend_type = backend_type
+        self.service_types = service_types
+        self.workers: dict[int, int] = {}
+        self.stopping = False
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        ready_fds = [self._fork(index) for index in range(self.args.workers)]
+        for ready_fd in ready_fds:
+            self._wait_ready(ready_fd)
+        notify_ready()
+        while self.workers:
+            pid, status = os.wait()
+            try:
+                index = self.workers.pop(pid)
+            except KeyError:
+                continue
+            if self.stopping:
+                continue
+            _log.warning('Worker %d exited with code %d, restarting', index,
+                         os.waitstatus_to_exitcode(status))
+            time.sleep(self.restart_delay)
+            if not self.stopping:
+                os.close(self._fork(index))
+
+    def _stop(self, signum: int, frame: FrameType | None) -> None:
+        self.stopping = True
+        for pid in self.workers:
+            with suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    @classmethod
+    def _wait_ready(cls, ready_fd: int) -> None:
+        # Reads the byte written when the worker is ready, or the end of file
+        # if it exited first.
+        try:
+            os.read(ready_fd, 1)
+        finally:
+            os.close(ready_fd)
+
+    def _fork(self, index: int) -> int:
+        read_fd, write_fd = os.pipe()
+        signals = {signal.SIGINT, signal.SIGTERM}
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            else:
+                self.workers[pid] = index
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+        if pid == 0:
+            os.close(read_fd)
+            self._run_worker(index, write_fd)
+        os.close(write_fd)
+        return read_fd
+
+    def _run_worker(self, index: int, ready_fd: int) -> None:
+        if index == 0:
+            service_types = self.service_types
+        else:
+            service_types = [service for service in self.service_types
+                             if service.per_worker]
+
+        def ready() -> None:
+            # A restarted worker's pipe is already closed by the supervisor.
+            with suppress(OSError):
+                os.write(ready_fd, b'\x00')
+            os.close(ready_fd)
+        exit_code = 0
+        try:
+            asyncio.run(run(self.args, self.backend_type, service_types,
+                            ready=ready),
+                        debug=False)
+        except BaseException:
+            _log.exception('Worker %d failed', index)
+            exit_code = 1
+        finally:
+            logging.shutdown()
+            os._exit(exit_code)
+
+
 class _PymapArgumentParser(ArgumentParser):
 
     def __init__(self, **extra: Any) -> None:
@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Any, Final
 
 from .bytes import Writeable
+from .context import decoded_cache
 from .flags import SessionFlags
 from .interfaces.message import FlagsKey, CachedMessage, MessageInterface, \
     LoadedMessageInterface
@@ -40,23 +41,29 @@ class BaseMessage(MessageInterface, CachedMessage):
         email_id: The message content identifier for the message.
         thread_id: The thread identifier for the message.
         expunged: True if this message has been expunged from the mailbox.
+        mod_seq: The modification sequence of the message metadata.
+        preview: The preview of the message content, if available.
 
     """
 
-    __slots__ = ['uid', 'internal_date', 'expunged', '_permanent_flags',
-                 '_email_id', '_thread_id', '_flags_key']
+    __slots__ = ['uid', 'internal_date', 'expunged', '_mod_seq',
+                 '_permanent_flags', '_email_id', '_thread_id', '_preview',
+                 '_flags_key']
 
     def __init__(self, uid: int, internal_date: datetime,
                  permanent_flags: Iterable[Flag], *,
                  email_id: ObjectId | None = None,
                  thread_id: ObjectId | None = None,
-                 expunged: bool = False) -> None:
+                 expunged: bool = False, mod_seq: int = 0,
+                 preview: str | None = None) -> None:
         super().__init__()
         self.uid: Final = uid
         self.internal_date: Final = internal_date
         self.expunged: Final = expunged
+        self._mod_seq = mod_seq
         self._email_id = email_id or ObjectId(None)
         self._thread_id = thread_id or ObjectId(None)
+        self._preview = preview
         self._permanent_flags = frozenset(permanent_flags or ())
         self._flags_key = (uid, self._permanent_flags)
 
@@ -68,6 +75,18 @@ class BaseMessage(MessageInterface, CachedMessage):
     def thread_id(self) -> ObjectId:
         return self._thread_id
 
+    @property
+    def mod_seq(self) -> int:
+        return self._mod_seq
+
+    @mod_seq.setter
+    def mod_seq(self, mod_seq: int) -> None:
+        self._mod_seq = mod_seq
+
+    @property
+    def preview(self) -> str | None:
+        return self._preview
+
     @property
     def permanent_flags(self) -> frozenset[Flag]:
         return self._permanent_flags
@@ -166,7 +185,13 @@ class BaseLoadedMessage(LoadedMessageInterface):
         except (IndexError, _NoContent):
             return Writeable.empty()
         if binary:
-            decoded = MessageDecoder.of(msg.header).decode(msg.body)
+            decoder = MessageDecoder.of(msg.header)
+            cache = decoded_cache.get(None)
+            if cache is None:
+                decoded = decoder.decode(msg.body)
+            else:
+                decoded = cache.get(self.message.email_id.object_id,
+                                    section, decoder, msg.body)
             if not section:
                 return Writeable.concat((msg.header, decoded))
             else:
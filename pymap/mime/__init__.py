@@ -6,6 +6,7 @@ from collections.abc import Iterable, Mapping, Sequence
 from email.headerregistry import ContentTypeHeader
 from email.policy import SMTP
 from itertools import chain, islice
+from mmap import mmap
 from typing import TypeAlias, Any, Final
 
 from .parsed import ParsedHeaders
@@ -19,6 +20,7 @@ _default_type: Final = 'text/plain'
 _Line: TypeAlias = tuple[int, int, int]
 _Lines: TypeAlias = Sequence[_Line]
 _Folded: TypeAlias = Sequence[tuple[str, _Lines]]
+_Data: TypeAlias = bytes | mmap
 
 
 class MessageContent(Writeable):
@@ -36,7 +38,7 @@ class MessageContent(Writeable):
 
     __slots__ = ['_raw', 'lines', 'header', 'body', '__weakref__']
 
-    def __init__(self, data: bytes, header: MessageHeader,
+    def __init__(self, data: _Data, header: MessageHeader,
                  body: MessageBody) -> None:
         super().__init__()
         self._raw = get_raw(memoryview(data), header._lines, body._lines)
@@ -76,7 +78,7 @@ class MessageContent(Writeable):
                 'body': self.body.json}
 
     @classmethod
-    def from_json(cls, data: bytes, json: Mapping[str, Any]) -> MessageContent:
+    def from_json(cls, data: _Data, json: Mapping[str, Any]) -> MessageContent:
         """Recover the parsed message content without re-parsing, using the
         original raw data and the :attr:`.json`.
 
@@ -96,8 +98,10 @@ class MessageContent(Writeable):
         return cls(data, header, body)
 
     @classmethod
-    def parse(cls, data: bytes) -> MessageContent:
-        """Parse the bytestring into message content.
+    def parse(cls, data: _Data) -> MessageContent:
+        """Parse the bytestring into message content. The *data* may also be
+        a memory-mapped file, which must not be closed while the message
+        content is in use.
 
         Args:
             data: The bytestring to parse.
@@ -108,7 +112,7 @@ class MessageContent(Writeable):
         return cls._parse(data, view, lines)
 
     @classmethod
-    def _parse(cls, data: bytes, view: memoryview, lines: _Lines) \
+    def _parse(cls, data: _Data, view: memoryview, lines: _Lines) \
             -> MessageContent:
         header_lines, body_lines = cls._split_lines(data, lines)
         header = MessageHeader._parse(data, view, header_lines)
@@ -117,7 +121,7 @@ class MessageContent(Writeable):
         return cls(data, header, body)
 
     @classmethod
-    def _find_lines(cls, data: bytes) -> _Lines:
+    def _find_lines(cls, data: _Data) -> _Lines:
         start = 0
         end = len(data)
         ret: list[_Line] = []
@@ -135,7 +139,7 @@ class MessageContent(Writeable):
         return ret
 
     @classmethod
-    def _split_lines(cls, data: bytes, lines: _Lines) -> tuple[_Lines, _Lines]:
+    def _split_lines(cls, data: _Data, lines: _Lines) -> tuple[_Lines, _Lines]:
         for i, line in enumerate(lines):
             start, end, _ = line
             ws_end = find_any(data, whitespace, start, end, False, False)
@@ -144,7 +148,10 @@ class MessageContent(Writeable):
         return [], lines
 
     def write(self, writer: WriteStream) -> None:
-        writer.write(bytes(self))
+        writer.write(self._raw)
+
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        return Writeable.wrap(self._raw[start:end])
 
     def __len__(self) -> int:
         return len(self._raw)
@@ -169,7 +176,7 @@ class MessageHeader(Writeable):
 
     __slots__ = ['_raw', '_lines', '_folded', 'folded', 'parsed']
 
-    def __init__(self, data: bytes, lines: _Lines, folded: _Folded) -> None:
+    def __init__(self, data: _Data, lines: _Lines, folded: _Folded) -> None:
         super().__init__()
         view = memoryview(data)
         self._raw = get_raw(view, lines)
@@ -196,7 +203,7 @@ class MessageHeader(Writeable):
                 'folded': self._folded}
 
     @classmethod
-    def from_json(cls, data: bytes, json: Mapping[str, Any]) -> MessageHeader:
+    def from_json(cls, data: _Data, json: Mapping[str, Any]) -> MessageHeader:
         """Recover the parsed message header without re-parsing, using the
         original raw data and the :attr:`.json`.
 
@@ -224,7 +231,7 @@ class MessageHeader(Writeable):
                 for key, lines in folded]
 
     @classmethod
-    def _get_parsed(cls, data: bytes, folded: _Folded) -> ParsedHeaders:
+    def _get_parsed(cls, data: _Data, folded: _Folded) -> ParsedHeaders:
         header_map: dict[bytes, list[list[bytes]]] = {}
         for key, lines in folded:
             name = cls._to_bytes(key)
@@ -241,14 +248,14 @@ class MessageHeader(Writeable):
         return base64.b64encode(key).decode('ascii')
 
     @classmethod
-    def _parse(cls, data: bytes, view: memoryview,
+    def _parse(cls, data: _Data, view: memoryview,
                lines: _Lines) -> MessageHeader:
         folds = cls._find_folds(data, lines)
         folded = cls._find_folded(data, view, folds)
         return cls(data, lines, folded)
 
     @classmethod
-    def _find_folds(cls, data: bytes, lines: _Lines) -> Sequence[_Lines]:
+    def _find_folds(cls, data: _Data, lines: _Lines) -> Sequence[_Lines]:
         ret: list[list[tuple[int, int, int]]] = []
         if not lines:
             return []
@@ -263,7 +270,7 @@ class MessageHeader(Writeable):
         return ret
 
     @classmethod
-    def _find_folded(cls, data: bytes, view: memoryview,
+    def _find_folded(cls, data: _Data, view: memoryview,
                      folds: Sequence[_Lines]) -> _Folded:
         folded: list[tuple[str, _Lines]] = []
         for group in folds:
@@ -276,7 +283,10 @@ class MessageHeader(Writeable):
         return folded
 
     def write(self, writer: WriteStream) -> None:
-        writer.write(bytes(self))
+        writer.write(self._raw)
+
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        return Writeable.wrap(self._raw[start:end])
 
     def __len__(self) -> int:
         return len(self._raw)
@@ -297,7 +307,7 @@ class MessageBody(Writeable):
 
     __slots__ = ['_raw', '_lines', '_nested', 'content_type']
 
-    def __init__(self, data: bytes, lines: _Lines,
+    def __init__(self, data: _Data, lines: _Lines,
                  content_type: ContentTypeHeader,
                  nested: Sequence[MessageContent]) -> None:
         super().__init__()
@@ -335,7 +345,7 @@ class MessageBody(Writeable):
                 'nested': [part.json for part in self._nested]}
 
     @classmethod
-    def from_json(cls, data: bytes, json: Mapping[str, Any]) -> MessageBody:
+    def from_json(cls, data: _Data, json: Mapping[str, Any]) -> MessageBody:
         """Recover the parsed message body without re-parsing, using the
         original raw data and the :attr:`.json`.
 
@@ -360,7 +370,7 @@ class MessageBody(Writeable):
         return cls(b'', [], content_type, [])
 
     @classmethod
-    def _parse(cls, data: bytes, view: memoryview, lines: _Lines,
+    def _parse(cls, data: _Data, view: memoryview, lines: _Lines,
                content_type: ContentTypeHeader | None) -> MessageBody:
         if content_type is None:
             content_type = cls._parse_content_type(_default_type)
@@ -397,13 +407,13 @@ class MessageBody(Writeable):
         return None
 
     @classmethod
-    def _parse_rfc822(cls, data: bytes, view: memoryview, lines: _Lines,
+    def _parse_rfc822(cls, data: _Data, view: memoryview, lines: _Lines,
                       content_type: ContentTypeHeader) -> MessageBody:
         subpart = MessageContent._parse(data, view, lines)
         return cls(data, lines, content_type, [subpart])
 
     @classmethod
-    def _parse_multipart(cls, data: bytes, view: memoryview, lines: _Lines,
+    def _parse_multipart(cls, data: _Data, view: memoryview, lines: _Lines,
                          content_type: ContentTypeHeader,
                          boundary: bytes) -> MessageBody:
         parts = cls._find_parts(data, view, lines, boundary)
@@ -414,7 +424,7 @@ class MessageBody(Writeable):
         return cls(data, lines, content_type, nested)
 
     @classmethod
-    def _find_parts(cls, data: bytes, view: memoryview, lines: _Lines,
+    def _find_parts(cls, data: _Data, view: memoryview, lines: _Lines,
                     boundary: bytes) -> Sequence[_Lines]:
         ret: list[list[_Line]] = []
         part_match = (b'--%s' % boundary, b'--%s' % boundary)
@@ -431,7 +441,10 @@ class MessageBody(Writeable):
         return ret
 
     def write(self, writer: WriteStream) -> None:
-        writer.write(bytes(self))
+        writer.write(self._raw)
+
+    def slice(self, start: int, end: int | None = None) -> Writeable:
+        return Writeable.wrap(self._raw[start:end])
 
     def __len__(self) -> int:
         return len(self._raw)
@@ -1,5 +1,6 @@
 
 from collections.abc import Iterable, Sequence
+from mmap import mmap
 from typing import TypeAlias
 
 __all__ = ['whitespace', 'find_any', 'get_raw']
@@ -10,7 +11,7 @@ _Line: TypeAlias = tuple[int, int, int]
 _Lines: TypeAlias = Sequence[_Line]
 
 
-def find_any(data: bytes | memoryview, end_marker: frozenset[int],
+def find_any(data: bytes | memoryview | mmap, end_marker: frozenset[int],
              start: int, end: int, inverse: bool, reverse: bool) -> int:
     if reverse:
         range_iter: Iterable[int] = reversed(range(start, end))
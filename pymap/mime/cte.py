@@ -4,12 +4,15 @@ from __future__ import annotations
 import base64
 import quopri
 from abc import abstractmethod, ABCMeta
+from collections import OrderedDict
+from collections.abc import Sequence
 from email.headerregistry import ContentTransferEncodingHeader
+from typing import Final
 
 from . import MessageHeader, MessageBody
 from ..bytes import Writeable
 
-__all__ = ['MessageDecoder']
+__all__ = ['MessageDecoder', 'DecodedCache']
 
 
 class MessageDecoder(metaclass=ABCMeta):
@@ -97,3 +100,57 @@ class _Base64Decoder(MessageDecoder):
         raw = bytes(body)
         ret = base64.b64decode(raw)
         return Writeable.wrap(ret)
+
+
+class DecodedCache:
+    """Keeps recently decoded message bodies, keyed by email object ID and
+    section, so that a client downloading a large ``BINARY[]`` section in
+    partial chunks does not decode the whole section for every chunk.
+
+    Args:
+        max_size: The maximum total length of the decoded bodies in the
+            cache. A body larger than this is never cached.
+
+    """
+
+    __slots__ = ['max_size', '_size', '_entries']
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size: Final = max_size
+        self._size = 0
+        self._entries: OrderedDict[tuple[bytes, tuple[int, ...]],
+                                   Writeable] = OrderedDict()
+
+    def get(self, object_id: bytes | None, section: Sequence[int] | None,
+            decoder: MessageDecoder, body: MessageBody) -> Writeable:
+        """Return the decoded body from the cache, decoding and adding it to
+        the cache if it was not found. Bodies that need no decoding, and
+        bodies of messages without an object ID, are not cached.
+
+        Args:
+            object_id: The email object ID of the message.
+            section: The section of the message containing the body.
+            decoder: The decoder for the body.
+            body: The message body.
+
+        """
+        if object_id is None:
+            return decoder.decode(body)
+        key = (object_id, tuple(section or ()))
+        entries = self._entries
+        decoded = entries.get(key)
+        if decoded is not None:
+            entries.move_to_end(key)
+            return decoded
+        decoded = decoder.decode(body)
+        if decoded is body:
+            return decoded
+        size = len(decoded)
+        if size <= self.max_size:
+            entries[key] = decoded
+            self._size += size
+            while self._size > self.max_size:
+                _, evicted = entries.popitem(last=False)
+                self._size -= len(evicted)
+        return decoded
@@ -0,0 +1,72 @@
+
+from __future__ import annotations
+
+import re
+from html import unescape
+from typing import Final
+
+from . import MessageContent
+from .cte import MessageDecoder
+
+__all__ = ['get_preview']
+
+#: The maximum length of a message preview, in characters.
+max_preview_len: Final = 200
+
+_html_ignore = re.compile(r'<(style|script)\b.*?</\1\s*>|<!--.*?-->',
+                          re.I | re.S)
+_html_tag = re.compile(r'<[^>]*>')
+_whitespace = re.compile(r'\s+')
+
+
+def _find_text_part(content: MessageContent, subtype: str) \
+        -> MessageContent | None:
+    for part in content.walk():
+        content_type = part.body.content_type
+        if content_type.maintype != 'text' \
+                or content_type.subtype != subtype:
+            continue
+        disposition = part.header.parsed.content_disposition
+        if disposition is not None \
+                and disposition.content_disposition == 'attachment':
+            continue
+        return part
+    return None
+
+
+def _decode_part(part: MessageContent) -> str:
+    charset = part.body.content_type.params.get('charset', 'us-ascii')
+    decoded = bytes(MessageDecoder.of(part.header).decode(part.body))
+    try:
+        return decoded.decode(charset, 'replace')
+    except LookupError:
+        return decoded.decode('utf-8', 'replace')
+
+
+def get_preview(content: MessageContent) -> str:
+    """Extract a short plain-text preview of the message, suitable for
+    displaying in a message list. The first ``text/plain`` part is used,
+    falling back to the first ``text/html`` part with markup removed.
+
+    See Also:
+        `RFC 8970 <https://tools.ietf.org/html/rfc8970>`_
+
+    Args:
+        content: The message content.
+
+    """
+    is_html = False
+    part = _find_text_part(content, 'plain')
+    if part is None:
+        part = _find_text_part(content, 'html')
+        is_html = True
+    if part is None:
+        return ''
+    try:
+        text = _decode_part(part)
+    except (NotImplementedError, ValueError):
+        return ''
+    if is_html:
+        text = unescape(_html_tag.sub(' ', _html_ignore.sub(' ', text)))
+    text = _whitespace.sub(' ', text).strip()
+    return text[:max_preview_len]
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from typing import ClassVar
 
 from . import CommandAuth
@@ -10,13 +11,31 @@ from .. import Space, EndLine, Params
 from ..exceptions import NotParseable, UnexpectedType, InvalidContent
 from ..message import AppendMessage
 from ..modutf7 import modutf7_decode
-from ..primitives import List, String, LiteralString
+from ..primitives import Atom, List, String, LiteralString
 from ..specials import Mailbox, DateTime, Flag, StatusAttribute, \
     ExtensionOption, ExtensionOptions
 
-__all__ = ['AppendCommand', 'CreateCommand', 'DeleteCommand', 'ExamineCommand',
-           'ListCommand', 'LSubCommand', 'RenameCommand', 'SelectCommand',
-           'StatusCommand', 'SubscribeCommand', 'UnsubscribeCommand']
+__all__ = ['AppendCommand', 'CompressCommand', 'CreateCommand',
+           'DeleteCommand', 'EnableCommand', 'ExamineCommand', 'ListCommand',
+           'LSubCommand', 'NotifyCommand', 'NotifyEventGroup',
+           'RenameCommand', 'SelectCommand', 'StatusCommand',
+           'SubscribeCommand', 'UnsubscribeCommand']
+
+
+@dataclass(frozen=True)
+class NotifyEventGroup:
+    """One mailbox filter and its events from a ``NOTIFY SET`` command.
+
+    Args:
+        filter_name: The mailbox filter name, e.g. ``PERSONAL``.
+        mailboxes: The mailbox names given with ``SUBTREE`` or ``MAILBOXES``.
+        events: The upper-case event names, empty for ``NONE``.
+
+    """
+
+    filter_name: bytes
+    mailboxes: Sequence[str]
+    events: frozenset[bytes]
 
 
 class CommandMailboxArg(CommandAuth):
@@ -106,12 +125,12 @@ class AppendCommand(CommandAuth):
             message, buf = LiteralString.parse(buf, params)
         except NotParseable as exc:
             if options:
-                literal = b''
+                literal: bytes | memoryview = b''
             else:
                 raise exc
         else:
-            literal = message.value
-            if literal == b'':
+            literal = message.buffer
+            if not literal:
                 return None, buf
         append_msg = AppendMessage(literal, date_time, flags, options)
         return append_msg, buf
@@ -140,6 +159,35 @@ class AppendCommand(CommandAuth):
         return cls(params.tag, mailbox, messages, cancelled, error), buf
 
 
+class CompressCommand(CommandAuth):
+    """The ``COMPRESS`` command starts compressing all data sent and received
+    on the IMAP session. Compression should begin immediately after the server
+    issues a :class:`~pymap.parsing.response.ResponseOk`.
+
+    See Also:
+        `RFC 4978 <https://tools.ietf.org/html/rfc4978>`_
+
+    Args:
+        tag: The command tag.
+        algorithm: The compression algorithm name.
+
+    """
+
+    command = b'COMPRESS'
+
+    def __init__(self, tag: bytes, algorithm: bytes) -> None:
+        super().__init__(tag)
+        self.algorithm = algorithm
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[CompressCommand, memoryview]:
+        _, buf = Space.parse(buf, params)
+        atom, buf = Atom.parse(buf, params)
+        _, buf = EndLine.parse(buf, params)
+        return cls(params.tag, atom.value.upper()), buf
+
+
 class CreateCommand(CommandMailboxArg):
     """The ``CREATE`` command creates a new mailbox."""
 
@@ -166,13 +214,58 @@ class DeleteCommand(CommandMailboxArg):
     command = b'DELETE'
 
 
+class EnableCommand(CommandAuth):
+    """The ``ENABLE`` command enables server extensions that change how the
+    server responds to other commands.
+
+    See Also:
+        `RFC 5161 <https://tools.ietf.org/html/rfc5161>`_
+
+    Args:
+        tag: The command tag.
+        capabilities: The capability names to enable.
+
+    """
+
+    command = b'ENABLE'
+
+    def __init__(self, tag: bytes, capabilities: Sequence[bytes]) -> None:
+        super().__init__(tag)
+        self.capabilities = capabilities
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[EnableCommand, memoryview]:
+        capabilities: list[bytes] = []
+        while True:
+            try:
+                _, buf = Space.parse(buf, params)
+            except NotParseable:
+                break
+            atom, buf = Atom.parse(buf, params)
+            capabilities.append(atom.value.upper())
+        if not capabilities:
+            raise NotParseable(buf)
+        _, buf = EndLine.parse(buf, params)
+        return cls(params.tag, capabilities), buf
+
+
 class ListCommand(CommandAuth):
     """The ``LIST`` command lists existing mailboxes.
 
+    See Also:
+        `RFC 5258 <https://tools.ietf.org/html/rfc5258>`_,
+        `RFC 5819 <https://tools.ietf.org/html/rfc5819>`_
+
     Args:
         tag: The command tag.
         ref_name: The mailbox reference name.
-        filter_: The mailbox filter string.
+        filter_: The mailbox filter string, or a list of filter strings.
+        selection: The ``LIST-EXTENDED`` selection options.
+        return_options: The ``LIST-EXTENDED`` return options, other than
+            ``STATUS``.
+        status_list: The status attributes to return for each mailbox, from
+            the ``RETURN (STATUS (...))`` option.
 
     """
 
@@ -181,30 +274,151 @@ class ListCommand(CommandAuth):
     #: All mailboxes may be listed, not only subscribed mailboxes.
     only_subscribed: ClassVar[bool] = False
 
+    #: The supported selection options.
+    selection_options: ClassVar[frozenset[bytes]] = frozenset(
+        [b'SUBSCRIBED', b'REMOTE', b'RECURSIVEMATCH'])
+
+    #: The supported return options, other than ``STATUS``.
+    return_options_supported: ClassVar[frozenset[bytes]] = frozenset(
+        [b'SUBSCRIBED', b'CHILDREN'])
+
     _list_mailbox_pattern = re.compile(br'[\x21\x23-\x27\x2A-\x5B'
                                        br'\x5D-\x7A\x7C\x7E]+')
 
-    def __init__(self, tag: bytes, ref_name: str, filter_: str) -> None:
+    def __init__(self, tag: bytes, ref_name: str,
+                 filter_: str | Sequence[str], *,
+                 selection: Iterable[bytes] = (),
+                 return_options: Iterable[bytes] = (),
+                 status_list: Sequence[StatusAttribute] = ()) -> None:
         super().__init__(tag)
         self.ref_name = ref_name
-        self.filter = filter_
+        if isinstance(filter_, str):
+            self.filters: Sequence[str] = [filter_]
+        else:
+            self.filters = filter_
+        self.selection = frozenset(selection)
+        self.return_options = frozenset(return_options)
+        self.status_list = status_list
+
+    @property
+    def filter(self) -> str:
+        """The first mailbox filter string."""
+        return self.filters[0] if self.filters else ''
+
+    @property
+    def select_subscribed(self) -> bool:
+        """Only subscribed mailboxes are listed."""
+        return b'SUBSCRIBED' in self.selection
+
+    @property
+    def recursive_match(self) -> bool:
+        """Mailboxes with a subscribed inferior mailbox are also listed."""
+        return b'RECURSIVEMATCH' in self.selection
+
+    @property
+    def return_subscribed(self) -> bool:
+        """Listed mailboxes are marked ``\\Subscribed`` if subscribed."""
+        return self.select_subscribed \
+            or b'SUBSCRIBED' in self.return_options
+
+    @classmethod
+    def _parse_selection(cls, buf: memoryview, params: Params) \
+            -> tuple[frozenset[bytes], memoryview]:
+        start = cls._whitespace_length(buf)
+        if bytes(buf[start:start + 1]) != b'(':
+            return frozenset(), buf
+        params_copy = params.copy(expected=[Atom])
+        options_p, buf = List.parse(buf, params_copy)
+        options = [atom.value.upper() for atom in options_p.get_as(Atom)]
+        selection = frozenset(options)
+        if len(selection) != len(options) \
+                or not selection <= cls.selection_options:
+            raise NotParseable(buf)
+        elif b'RECURSIVEMATCH' in selection \
+                and b'SUBSCRIBED' not in selection:
+            raise NotParseable(buf)
+        _, buf = Space.parse(buf, params)
+        return selection, buf
+
+    @classmethod
+    def _parse_pattern(cls, buf: memoryview, params: Params) \
+            -> tuple[str, memoryview]:
+        match = cls._list_mailbox_pattern.match(buf)
+        if match:
+            return modutf7_decode(match.group(0)), buf[match.end(0):]
+        filter_str, buf = String.parse(buf, params)
+        return modutf7_decode(filter_str.value), buf
+
+    @classmethod
+    def _parse_patterns(cls, buf: memoryview, params: Params,
+                        extended: bool) -> tuple[Sequence[str], memoryview]:
+        if not extended or bytes(buf[0:1]) != b'(':
+            filter_, buf = cls._parse_pattern(buf, params)
+            return [filter_], buf
+        buf = buf[1:]
+        filters: list[str] = []
+        while bytes(buf[0:1]) != b')':
+            if filters:
+                _, buf = Space.parse(buf, params)
+            filter_, buf = cls._parse_pattern(buf, params)
+            filters.append(filter_)
+        if not filters:
+            raise NotParseable(buf)
+        return filters, buf[1:]
+
+    @classmethod
+    def _parse_return(cls, buf: memoryview, params: Params) \
+            -> tuple[frozenset[bytes], Sequence[StatusAttribute], memoryview]:
+        start = cls._whitespace_length(buf)
+        if bytes(buf[start:start + 6]).upper() != b'RETURN':
+            return frozenset(), [], buf
+        _, buf = Space.parse(buf[start + 6:], params)
+        if bytes(buf[0:1]) != b'(':
+            raise NotParseable(buf)
+        buf = buf[1:]
+        return_options: set[bytes] = set()
+        status_list: Sequence[StatusAttribute] = []
+        num_options = 0
+        while bytes(buf[0:1]) != b')':
+            if num_options:
+                _, buf = Space.parse(buf, params)
+            atom, after = Atom.parse(buf, params)
+            option = atom.value.upper()
+            if option == b'STATUS' and not status_list:
+                _, after = Space.parse(after, params)
+                params_copy = params.copy(expected=[StatusAttribute])
+                status_list_p, after = List.parse(after, params_copy)
+                if not status_list_p.value:
+                    raise NotParseable(buf)
+                status_list = status_list_p.get_as(StatusAttribute)
+            elif option in cls.return_options_supported \
+                    and option not in return_options:
+                return_options.add(option)
+            else:
+                raise NotParseable(buf)
+            buf = after
+            num_options += 1
+        return frozenset(return_options), status_list, buf[1:]
 
     @classmethod
     def parse(cls, buf: memoryview, params: Params) \
             -> tuple[ListCommand, memoryview]:
+        extended = not cls.only_subscribed
         _, buf = Space.parse(buf, params)
+        selection: frozenset[bytes] = frozenset()
+        if extended:
+            selection, buf = cls._parse_selection(buf, params)
         ref_name, buf = Mailbox.parse(buf, params)
         _, buf = Space.parse(buf, params)
-        match = cls._list_mailbox_pattern.match(buf)
-        if match:
-            filter_raw = match.group(0)
-            buf = buf[match.end(0):]
-            filter_ = modutf7_decode(filter_raw)
-        else:
-            filter_str, buf = String.parse(buf, params)
-            filter_ = modutf7_decode(filter_str.value)
+        filters, buf = cls._parse_patterns(buf, params, extended)
+        return_options: frozenset[bytes] = frozenset()
+        status_list: Sequence[StatusAttribute] = []
+        if extended:
+            return_options, status_list, buf = cls._parse_return(buf, params)
         _, buf = EndLine.parse(buf, params)
-        return cls(params.tag, ref_name.value, filter_), buf
+        return cls(params.tag, ref_name.value, filters, selection=selection,
+                   return_options=return_options,
+                   status_list=status_list), buf
 
 
 class LSubCommand(ListCommand):
@@ -217,6 +431,122 @@ class LSubCommand(ListCommand):
     only_subscribed: ClassVar[bool] = True
 
 
+class NotifyCommand(CommandAuth):
+    """The ``NOTIFY`` command requests that the server send unsolicited
+    updates about changes to mailboxes other than the selected mailbox.
+
+    See Also:
+        `RFC 5465 <https://tools.ietf.org/html/rfc5465>`_
+
+    Args:
+        tag: The command tag.
+        event_groups: The mailbox filters and their events, or an empty
+            list for ``NOTIFY NONE``.
+        status: True if ``STATUS`` responses should be sent immediately for
+            every mailbox matched by the filters.
+
+    """
+
+    command = b'NOTIFY'
+
+    #: The mailbox filter names, which are followed by mailbox names when
+    #: mapped to True.
+    filter_names: ClassVar[Mapping[bytes, bool]] = {
+        b'SELECTED': False, b'SELECTED-DELAYED': False, b'INBOXES': False,
+        b'PERSONAL': False, b'SUBSCRIBED': False, b'SUBTREE': True,
+        b'MAILBOXES': True}
+
+    def __init__(self, tag: bytes, event_groups: Sequence[NotifyEventGroup],
+                 *, status: bool = False) -> None:
+        super().__init__(tag)
+        self.event_groups = event_groups
+        self.status = status
+
+    @classmethod
+    def _parse_mailboxes(cls, buf: memoryview, params: Params) \
+            -> tuple[Sequence[str], memoryview]:
+        if bytes(buf[0:1]) != b'(':
+            mailbox, buf = Mailbox.parse(buf, params)
+            return [mailbox.value], buf
+        buf = buf[1:]
+        mailboxes: list[str] = []
+        while bytes(buf[0:1]) != b')':
+            if mailboxes:
+                _, buf = Space.parse(buf, params)
+            mailbox, buf = Mailbox.parse(buf, params)
+            mailboxes.append(mailbox.value)
+        if not mailboxes:
+            raise NotParseable(buf)
+        return mailboxes, buf[1:]
+
+    @classmethod
+    def _parse_events(cls, buf: memoryview, params: Params) \
+            -> tuple[frozenset[bytes], memoryview]:
+        if bytes(buf[0:1]) != b'(':
+            atom, after = Atom.parse(buf, params)
+            if atom.value.upper() != b'NONE':
+                raise NotParseable(buf)
+            return frozenset(), after
+        params_copy = params.copy(expected=[Atom])
+        events_p, after = List.parse(buf, params_copy)
+        events = frozenset(atom.value.upper()
+                           for atom in events_p.get_as(Atom))
+        if not events:
+            raise NotParseable(buf)
+        elif (b'MESSAGENEW' in events) != (b'MESSAGEEXPUNGE' in events):
+            raise NotParseable(buf)
+        elif b'FLAGCHANGE' in events and b'MESSAGENEW' not in events:
+            raise NotParseable(buf)
+        return events, after
+
+    @classmethod
+    def _parse_group(cls, buf: memoryview, params: Params) \
+            -> tuple[NotifyEventGroup, memoryview]:
+        if bytes(buf[0:1]) != b'(':
+            raise NotParseable(buf)
+        atom, after = Atom.parse(buf[1:], params)
+        filter_name = atom.value.upper()
+        try:
+            has_mailboxes = cls.filter_names[filter_name]
+        except KeyError as exc:
+            raise NotParseable(buf) from exc
+        mailboxes: Sequence[str] = []
+        if has_mailboxes:
+            _, after = Space.parse(after, params)
+            mailboxes, after = cls._parse_mailboxes(after, params)
+        _, after = Space.parse(after, params)
+        events, after = cls._parse_events(after, params)
+        if bytes(after[0:1]) != b')':
+            raise NotParseable(after)
+        return NotifyEventGroup(filter_name, mailboxes, events), after[1:]
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[NotifyCommand, memoryview]:
+        _, buf = Space.parse(buf, params)
+        atom, buf = Atom.parse(buf, params)
+        action = atom.value.upper()
+        if action == b'NONE':
+            _, buf = EndLine.parse(buf, params)
+            return cls(params.tag, []), buf
+        elif action != b'SET':
+            raise NotParseable(buf)
+        _, buf = Space.parse(buf, params)
+        status = bytes(buf[0:6]).upper() == b'STATUS'
+        if status:
+            _, buf = Space.parse(buf[6:], params)
+        event_groups: list[NotifyEventGroup] = []
+        while True:
+            group, buf = cls._parse_group(buf, params)
+            event_groups.append(group)
+            try:
+                _, buf = Space.parse(buf, params)
+            except NotParseable:
+                break
+        _, buf = EndLine.parse(buf, params)
+        return cls(params.tag, event_groups, status=status), buf
+
+
 class RenameCommand(CommandAuth):
     """The ``RENAME`` command renames an existing mailbox.
 
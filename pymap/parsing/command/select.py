@@ -10,13 +10,14 @@ from .. import Params, Space, EndLine
 from ..exceptions import NotParseable
 from ..primitives import Atom, List
 from ..specials import AString, Mailbox, SequenceSet, Flag, FetchAttribute, \
-    SearchKey, ExtensionOptions
+    SearchKey, SortKey, ExtensionOption, ExtensionOptions
 from ...flags import FlagOp
 
 __all__ = ['CheckCommand', 'CloseCommand', 'ExpungeCommand', 'CopyCommand',
            'MoveCommand', 'FetchCommand', 'StoreCommand', 'SearchCommand',
-           'UidCommand', 'UidCopyCommand', 'UidMoveCommand',
-           'UidExpungeCommand', 'UidFetchCommand', 'UidSearchCommand',
+           'SortCommand', 'ThreadCommand', 'UidCommand', 'UidCopyCommand',
+           'UidMoveCommand', 'UidExpungeCommand', 'UidFetchCommand',
+           'UidSearchCommand', 'UidSortCommand', 'UidThreadCommand',
            'UidStoreCommand', 'IdleCommand']
 
 
@@ -311,11 +312,14 @@ class SearchCommand(CommandSelect):
 
     See Also:
         `RFC 3501 6.4.4. <https://tools.ietf.org/html/rfc3501#section-6.4.4>`_
+        `RFC 4731 3.1. <https://tools.ietf.org/html/rfc4731#section-3.1>`_
 
     Args:
         tag: The command tag.
         keys: The search keys.
         charset: The charset in use by the search keys.
+        options: The ``RETURN`` result options. An empty ``RETURN ()`` is
+            parsed as ``RETURN (ALL)``.
 
     """
 
@@ -354,8 +358,11 @@ class SearchCommand(CommandSelect):
     def _parse_options(cls, buf: memoryview, params: Params) \
             -> tuple[ExtensionOptions, memoryview]:
         start = cls._whitespace_length(buf)
-        if buf[start:start + 6] == b'RETURN':
-            return ExtensionOptions.parse(buf[start + 6:], params)
+        if bytes(buf[start:start + 6]) == b'RETURN':
+            options, buf = ExtensionOptions.parse(buf[start + 6:], params)
+            if not options:
+                options = ExtensionOptions([ExtensionOption(b'ALL', List([]))])
+            return options, buf
         else:
             options, _ = ExtensionOptions.parse(memoryview(b''), params)
             return options, buf
@@ -379,6 +386,117 @@ class SearchCommand(CommandSelect):
         return cls(params.tag, search_keys, charset, options), buf
 
 
+class _SearchKeysCommand(CommandSelect):
+
+    @classmethod
+    def _parse_charset(cls, buf: memoryview, params: Params) \
+            -> tuple[str, memoryview]:
+        _, buf = Space.parse(buf, params)
+        string, after = AString.parse(buf, params)
+        charset = str(string.value, 'ascii')
+        try:
+            b' '.decode(charset)
+        except LookupError as exc:
+            raise NotParseable(buf, b'BADCHARSET') from exc
+        return charset, after
+
+    @classmethod
+    def _parse_keys(cls, buf: memoryview, params: Params) \
+            -> tuple[Sequence[SearchKey], memoryview]:
+        search_keys = []
+        while True:
+            try:
+                _, buf = Space.parse(buf, params)
+                key, buf = SearchKey.parse(buf, params)
+                search_keys.append(key)
+            except NotParseable:
+                if not search_keys:
+                    raise
+                break
+        _, buf = EndLine.parse(buf, params)
+        return search_keys, buf
+
+
+class SortCommand(_SearchKeysCommand):
+    """The ``SORT`` command searches the messages in the selected mailbox
+    based on a set of search criteria, and returns them in a sorted order.
+
+    See Also:
+        `RFC 5256 3. <https://tools.ietf.org/html/rfc5256#section-3>`_
+
+    Args:
+        tag: The command tag.
+        sort_keys: The sort criteria.
+        keys: The search keys.
+        charset: The charset in use by the search keys.
+
+    """
+
+    command = b'SORT'
+    uid: ClassVar[bool] = False
+
+    def __init__(self, tag: bytes, sort_keys: Sequence[SortKey],
+                 keys: Iterable[SearchKey], charset: str) -> None:
+        super().__init__(tag)
+        self.sort_keys = sort_keys
+        self.keys = frozenset(keys)
+        self.charset = charset
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[SortCommand, memoryview]:
+        _, buf = Space.parse(buf, params)
+        sort_list, buf = List.parse(buf, params.copy(expected=[SortKey]))
+        sort_keys = sort_list.get_as(SortKey)
+        if not sort_keys:
+            raise NotParseable(buf)
+        charset, buf = cls._parse_charset(buf, params)
+        search_keys, buf = cls._parse_keys(buf, params.copy(charset=charset))
+        return cls(params.tag, sort_keys, search_keys, charset), buf
+
+
+class ThreadCommand(_SearchKeysCommand):
+    """The ``THREAD`` command searches the messages in the selected mailbox
+    based on a set of search criteria, and returns them grouped into
+    threads.
+
+    See Also:
+        `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
+
+    Args:
+        tag: The command tag.
+        algorithm: The threading algorithm.
+        keys: The search keys.
+        charset: The charset in use by the search keys.
+
+    """
+
+    command = b'THREAD'
+    uid: ClassVar[bool] = False
+
+    #: The supported threading algorithms.
+    algorithms = {b'ORDEREDSUBJECT', b'REFERENCES'}
+
+    def __init__(self, tag: bytes, algorithm: bytes,
+                 keys: Iterable[SearchKey], charset: str) -> None:
+        super().__init__(tag)
+        self.algorithm = algorithm
+        self.keys = frozenset(keys)
+        self.charset = charset
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[ThreadCommand, memoryview]:
+        _, buf = Space.parse(buf, params)
+        atom, after = Atom.parse(buf, params)
+        algorithm = atom.value.upper()
+        if algorithm not in cls.algorithms:
+            raise NotParseable(buf)
+        charset, buf = cls._parse_charset(after, params)
+        search_keys, buf = cls._parse_keys(buf, params.copy(charset=charset))
+        return cls(params.tag, algorithm, search_keys, charset), buf
+
+
 class UidCommand(CommandSelect):
     """The ``UID`` command precedes one of the ``COPY``, ``EXPUNGE``,
     ``FETCH``, ``SEARCH``, or ``STORE`` commands and indicates that the
@@ -495,6 +613,44 @@ class UidSearchCommand(SearchCommand):
         return ret, buf
 
 
+class UidSortCommand(SortCommand):
+    """The ``UID SORT`` variant of the ``SORT`` command, which uses message
+    UIDs instead of sequence numbers.
+
+    """
+
+    command = b'UID SORT'
+    delegate = SortCommand
+    uid = True
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[UidSortCommand, memoryview]:
+        ret, buf = super().parse(buf, params.copy(uid=True))
+        if not isinstance(ret, UidSortCommand):
+            raise TypeError(ret)
+        return ret, buf
+
+
+class UidThreadCommand(ThreadCommand):
+    """The ``UID THREAD`` variant of the ``THREAD`` command, which uses
+    message UIDs instead of sequence numbers.
+
+    """
+
+    command = b'UID THREAD'
+    delegate = ThreadCommand
+    uid = True
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[UidThreadCommand, memoryview]:
+        ret, buf = super().parse(buf, params.copy(uid=True))
+        if not isinstance(ret, UidThreadCommand):
+            raise TypeError(ret)
+        return ret, buf
+
+
 class UidStoreCommand(StoreCommand):
     """The ``UID STORE`` variant of the ``STORE`` command, which uses message
     UIDs instead of sequence numbers.
@@ -7,14 +7,16 @@ from . import Space, Params
 from .command import Command
 from .command.any import CapabilityCommand, LogoutCommand, NoOpCommand, \
     IdCommand
-from .command.auth import AppendCommand, CreateCommand, DeleteCommand, \
-    ExamineCommand, ListCommand, LSubCommand, RenameCommand, SelectCommand, \
-    StatusCommand, SubscribeCommand, UnsubscribeCommand
+from .command.auth import AppendCommand, CompressCommand, CreateCommand, \
+    DeleteCommand, EnableCommand, ExamineCommand, ListCommand, LSubCommand, \
+    NotifyCommand, RenameCommand, SelectCommand, StatusCommand, \
+    SubscribeCommand, UnsubscribeCommand
 from .command.nonauth import AuthenticateCommand, LoginCommand, StartTLSCommand
 from .command.select import CheckCommand, CloseCommand, ExpungeCommand, \
     CopyCommand, MoveCommand, FetchCommand, StoreCommand, SearchCommand, \
-    UidCommand, UidCopyCommand, UidMoveCommand, UidExpungeCommand, \
-    UidFetchCommand, UidSearchCommand, UidStoreCommand, IdleCommand
+    SortCommand, ThreadCommand, UidCommand, UidCopyCommand, UidMoveCommand, \
+    UidExpungeCommand, UidFetchCommand, UidSearchCommand, UidSortCommand, \
+    UidThreadCommand, UidStoreCommand, IdleCommand
 from .exceptions import NotParseable
 from .primitives import Atom
 from .specials import Tag
@@ -25,13 +27,15 @@ __all__ = ['builtin_commands', 'InvalidCommand', 'Commands']
 #: new :class:`Commands` object.
 builtin_commands: Collection[type[Command]] = [
     CapabilityCommand, LogoutCommand, NoOpCommand, IdCommand, AppendCommand,
-    CreateCommand, DeleteCommand, ExamineCommand, ListCommand, LSubCommand,
-    RenameCommand, SelectCommand, StatusCommand, SubscribeCommand,
-    UnsubscribeCommand, AuthenticateCommand, LoginCommand, StartTLSCommand,
-    CheckCommand, CloseCommand, ExpungeCommand, CopyCommand, MoveCommand,
-    FetchCommand, StoreCommand, SearchCommand, UidCommand, UidCopyCommand,
-    UidMoveCommand, UidExpungeCommand, UidFetchCommand, UidSearchCommand,
-    UidStoreCommand, IdleCommand]
+    CompressCommand, CreateCommand, DeleteCommand, EnableCommand,
+    ExamineCommand, ListCommand, LSubCommand, NotifyCommand, RenameCommand,
+    SelectCommand, StatusCommand, SubscribeCommand, UnsubscribeCommand,
+    AuthenticateCommand, LoginCommand, StartTLSCommand, CheckCommand,
+    CloseCommand, ExpungeCommand, CopyCommand, MoveCommand, FetchCommand,
+    StoreCommand, SearchCommand, SortCommand, ThreadCommand, UidCommand,
+    UidCopyCommand, UidMoveCommand, UidExpungeCommand, UidFetchCommand,
+    UidSearchCommand, UidSortCommand, UidThreadCommand, UidStoreCommand,
+    IdleCommand]
 
 
 class InvalidCommand(Command):
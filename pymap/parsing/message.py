@@ -3,25 +3,58 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from io import BufferedReader, RawIOBase
+from typing import TYPE_CHECKING, BinaryIO
 
 from ..parsing.specials import Flag, ExtensionOptions
 
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
 __all__ = ['AppendMessage']
 
 
+class _LiteralReader(RawIOBase):
+
+    def __init__(self, literal: bytes | memoryview) -> None:
+        super().__init__()
+        self._view = memoryview(literal)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buf: WriteableBuffer) -> int:
+        with memoryview(buf) as view:
+            pos = self._pos
+            data = self._view[pos:pos + len(view)]
+            num = len(data)
+            view[0:num] = data
+        self._pos = pos + num
+        return num
+
+
 @dataclass(frozen=True)
 class AppendMessage:
     """A single message from the APPEND command.
 
     Args:
-        literal: The message literal.
+        literal: The message literal, which may reference a read-only buffer
+            such as a literal that was spooled to a temporary file.
         when: The internal timestamp to assign to the message.
         flag_set: The flags to assign to the message.
         options: The extension options in use for the message.
 
     """
 
-    literal: bytes
+    literal: bytes | memoryview
     when: datetime | None = None
     flag_set: frozenset[Flag] = field(default_factory=frozenset)
     options: ExtensionOptions = field(default_factory=ExtensionOptions.empty)
+
+    def open(self) -> BinaryIO:
+        """Open the message literal as a binary stream, so that it may be
+        consumed without copying it.
+
+        """
+        return BufferedReader(_LiteralReader(self.literal))
@@ -278,7 +278,7 @@ class QuotedString(String):
     def parse(cls, buf: memoryview, params: Params) \
             -> tuple[QuotedString, memoryview]:
         start = cls._whitespace_length(buf)
-        if buf[start:start + 1] != b'"':
+        if bytes(buf[start:start + 1]) != b'"':
             raise NotParseable(buf)
         marker = start + 1
         unquoted = bytearray()
@@ -317,6 +317,10 @@ class LiteralString(String):
     """Represents a string object from an IMAP stream that used the literal
     syntax.
 
+    When parsed from a read-only buffer, such as a literal that was spooled
+    to a temporary file, the string value references the buffer instead of
+    copying it.
+
     Args:
         string: The literal string value.
         binary: True if the string is considered binary data.
@@ -327,7 +331,7 @@ class LiteralString(String):
 
     __slots__ = ['_string', '_length', '_binary', '_raw']
 
-    def __init__(self, string: bytes | Writeable,
+    def __init__(self, string: bytes | memoryview | Writeable,
                  binary: bool = False) -> None:
         super().__init__()
         self._string = string
@@ -339,6 +343,17 @@ class LiteralString(String):
     def value(self) -> bytes:
         return bytes(self._string)
 
+    @property
+    def buffer(self) -> bytes | memoryview:
+        """The literal string value, without copying it if it references a
+        read-only buffer.
+
+        """
+        string = self._string
+        if isinstance(string, (bytes, memoryview)):
+            return string
+        return bytes(string)
+
     @property
     def binary(self) -> bool:
         return self._binary
@@ -373,17 +388,18 @@ class LiteralString(String):
             raise NotParseable(buf, b'TOOBIG')
         elif match.group(3) == b'+':
             buf = buf[match.end(0):]
-            literal = bytes(buf[0:literal_length])
         elif len(buf) > match.end(0):
             raise NotParseable(buf[match.end(0):])
         elif params.allow_continuations:
             expected = ExpectContinuation(b'Literal string', literal_length)
             buf = expected.expect(params.state)
-            literal = bytes(buf[0:literal_length])
         else:
             raise NotParseable(buf)
+        literal: bytes | memoryview = buf[0:literal_length]
         if len(literal) != literal_length:
             raise NotParseable(buf)
+        elif isinstance(literal, memoryview) and not literal.readonly:
+            literal = bytes(literal)
         return cls(literal, binary), buf[literal_length:]
 
     def write(self, writer: WriteStream) -> None:
@@ -449,7 +465,7 @@ class List(Parseable[frozenlist[MaybeBytes]]):
     def parse(cls, buf: memoryview, params: Params) \
             -> tuple[List, memoryview]:
         start = cls._whitespace_length(buf)
-        if buf[start:start + 1] != b'(':
+        if bytes(buf[start:start + 1]) != b'(':
             raise NotParseable(buf)
         items: list[AnyParseable] = []
         buf = buf[start + 1:]
@@ -1,7 +1,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Hashable, AsyncIterator
+from collections.abc import Awaitable, Callable, Hashable, AsyncIterator
 from contextlib import asynccontextmanager, AbstractAsyncContextManager
 from typing import overload, TypeAlias, TypeVar, Final
 
@@ -16,6 +16,7 @@ ResponseT = TypeVar('ResponseT', bound='Response')
 
 _Mergeable: TypeAlias = dict[tuple[type['Response'], Hashable], int]
 _WritingHook: TypeAlias = AbstractAsyncContextManager[None]
+_Drain: TypeAlias = Callable[[], Awaitable[None]]
 
 
 class ResponseCode:
@@ -127,12 +128,15 @@ class Response(Writeable):
         """
         return False
 
-    async def async_write(self, writer: WriteStream) -> None:
+    async def async_write(self, writer: WriteStream, *,
+                          drain: _Drain | None = None) -> None:
         """Like :meth:`~pymap.bytes.Writeable.write`, but allows for
         asynchronous processing that might be necessary for some responses.
 
         Args:
             writer: The output stream.
+            drain: Called between untagged responses, to wait until the output
+                stream is ready for more data.
 
         """
         self.write(writer)
@@ -161,6 +165,7 @@ class CommandResponse(Response):
         super().__init__(tag, text, code)
         self._untagged: list[UntaggedResponse] = []
         self._mergeable: _Mergeable = {}
+        self._cleanup: list[Callable[[], None]] = []
 
     def add_untagged(self, *responses: UntaggedResponse) -> None:
         """Add an untagged response. These responses are shown before the
@@ -188,6 +193,16 @@ class CommandResponse(Response):
                     self._untagged[untagged_idx] = merged
         self._raw = None
 
+    def add_cleanup(self, callback: Callable[[], None]) -> None:
+        """Add a callback to run when :meth:`.async_write` finishes, whether
+        or not the response was written successfully.
+
+        Args:
+            callback: The cleanup callback.
+
+        """
+        self._cleanup.append(callback)
+
     def add_untagged_ok(self, text: MaybeBytes,
                         code: ResponseCode | None = None) -> None:
         """Add an untagged ``OK`` response.
@@ -210,10 +225,20 @@ class CommandResponse(Response):
                 return True
         return super().is_terminal
 
-    async def async_write(self, writer: WriteStream) -> None:
-        for untagged in self._untagged:
-            await untagged.async_write(writer)
-        super().write(writer)
+    async def async_write(self, writer: WriteStream, *,
+                          drain: _Drain | None = None) -> None:
+        try:
+            for untagged in self._untagged:
+                if untagged.writing_hook is None:
+                    untagged.write(writer)
+                else:
+                    await untagged.async_write(writer)
+                if drain is not None:
+                    await drain()
+            super().write(writer)
+        finally:
+            for callback in self._cleanup:
+                callback()
 
     def write(self, writer: WriteStream) -> None:
         for untagged in self._untagged:
@@ -274,10 +299,11 @@ class UntaggedResponse(Response):
         """
         raise TypeError(self)
 
-    async def async_write(self, writer: WriteStream) -> None:
+    async def async_write(self, writer: WriteStream, *,
+                          drain: _Drain | None = None) -> None:
         writing_hook = self.writing_hook or self._noop_cm()
         async with writing_hook:
-            await super().async_write(writer)
+            await super().async_write(writer, drain=drain)
 
 
 class ResponseContinuation(Response):
@@ -9,7 +9,7 @@ from ..specials import SequenceSet, ObjectId
 from ...bytes import MaybeBytes, BytesFormat
 
 __all__ = ['Capability', 'PermanentFlags', 'UidNext', 'UidValidity', 'Unseen',
-           'AppendUid', 'CopyUid', 'MailboxId']
+           'AppendUid', 'CopyUid', 'MailboxId', 'HighestModSeq', 'Modified']
 
 
 class Capability(ResponseCode):
@@ -177,3 +177,43 @@ class MailboxId(ResponseCode):
 
     def __bytes__(self) -> bytes:
         return self._raw
+
+
+class HighestModSeq(ResponseCode):
+    """Indicates the highest modification sequence of the mailbox.
+
+    Args:
+        mod_seq: The highest modification sequence.
+
+    See Also:
+        `RFC 7162 3.1.2. <https://tools.ietf.org/html/rfc7162#section-3.1.2>`_
+
+    """
+
+    def __init__(self, mod_seq: int) -> None:
+        super().__init__()
+        self._raw = b'[HIGHESTMODSEQ %i]' % mod_seq
+
+    def __bytes__(self) -> bytes:
+        return self._raw
+
+
+class Modified(ResponseCode):
+    """Indicates the messages that were not updated by a conditional
+    ``STORE`` command, because they had been modified since the given
+    modification sequence.
+
+    Args:
+        seqs: The message sequence numbers or UIDs.
+
+    See Also:
+        `RFC 7162 3.1.3. <https://tools.ietf.org/html/rfc7162#section-3.1.3>`_
+
+    """
+
+    def __init__(self, seqs: Iterable[int]) -> None:
+        super().__init__()
+        self._raw = BytesFormat(b'[MODIFIED %b]') % SequenceSet.build(seqs)
+
+    def __bytes__(self) -> bytes:
+        return self._raw
@@ -1,7 +1,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Mapping, Sequence
 from contextlib import AbstractAsyncContextManager
 from itertools import chain
 from typing import TypeAlias, ClassVar, Final, SupportsBytes
@@ -9,13 +9,16 @@ from typing import TypeAlias, ClassVar, Final, SupportsBytes
 from . import UntaggedResponse
 from ..modutf7 import modutf7_encode
 from ..primitives import Nil, List, QuotedString, String
-from ..specials import Mailbox, FetchAttribute, FetchValue, StatusAttribute
+from ..specials import Mailbox, FetchAttribute, FetchValue, \
+    SequenceSet, StatusAttribute
 from ...bytes import MaybeBytes, BytesFormat, WriteStream
+from ...threads import ThreadNode
 
 __all__ = ['FlagsResponse', 'ExistsResponse', 'RecentResponse',
-           'ExpungeResponse', 'FetchResponse', 'SearchResponse',
-           'ESearchResponse', 'StatusResponse', 'ListResponse',
-           'LSubResponse', 'IdResponse']
+           'ExpungeResponse', 'VanishedResponse', 'FetchResponse',
+           'UidFetchResponse', 'SearchResponse', 'ESearchResponse',
+           'SortResponse', 'ThreadResponse', 'StatusResponse',
+           'ListResponse', 'LSubResponse', 'IdResponse', 'EnabledResponse']
 
 _WritingHook: TypeAlias = AbstractAsyncContextManager[None]
 
@@ -92,6 +95,34 @@ class ExpungeResponse(UntaggedResponse):
         return super().text + b'%i EXPUNGE' % self.seq
 
 
+class VanishedResponse(UntaggedResponse):
+    """Constructs the special VANISHED response, which replaces EXPUNGE
+    responses once the ``QRESYNC`` extension is enabled.
+
+    See Also:
+        `RFC 7162 3.2. <https://tools.ietf.org/html/rfc7162#section-3.2>`_
+
+    Args:
+        uids: The UIDs of the expunged messages.
+        earlier: True if the messages may have been expunged before the
+            current command, which does not change the message sequence
+            numbers.
+
+    """
+
+    def __init__(self, uids: SequenceSet, earlier: bool = False) -> None:
+        super().__init__()
+        self.uids = uids
+        self.earlier = earlier
+
+    @property
+    def text(self) -> bytes:
+        if self.earlier:
+            return super().text + b'VANISHED (EARLIER) %b' % bytes(self.uids)
+        else:
+            return super().text + b'VANISHED %b' % bytes(self.uids)
+
+
 class FetchResponse(UntaggedResponse):
     """Constructs the special FETCH response used by the STORE and FETCH
     commands.
@@ -135,18 +166,43 @@ class FetchResponse(UntaggedResponse):
             raise ValueError(other)
         new_data = self.data | other.data
         writing_hook = other.writing_hook or self.writing_hook
-        return FetchResponse(self.seq, new_data.values(),
-                             writing_hook=writing_hook)
+        return type(self)(self.seq, new_data.values(),
+                          writing_hook=writing_hook)
 
     @property
     def text(self) -> bytes:
         return b'%i FETCH' % (self.seq, )
 
     def write(self, writer: WriteStream) -> None:
-        writer.write(b'%b %b ' % (self.tag, self.text))
-        data_list = List(self.data.values())
-        data_list.write(writer)
-        writer.write(b'\r\n')
+        writer.write(b'%b %b (' % (self.tag, self.text))
+        is_first = True
+        for value in self.data.values():
+            if is_first:
+                is_first = False
+            else:
+                writer.write(b' ')
+            value.write(writer)
+        writer.write(b')\r\n')
+
+
+class UidFetchResponse(FetchResponse):
+    """Constructs the special UIDFETCH response, which replaces FETCH
+    responses once the ``UIDONLY`` extension is enabled.
+
+    See Also:
+        `RFC 9586 3.3. <https://tools.ietf.org/html/rfc9586#section-3.3>`_
+
+    Args:
+        uid: The message UID.
+        data: Fetch attributes and values for the message.
+        writing_hook: An async context manager to enter while the untagged
+            response is being written.
+
+    """
+
+    @property
+    def text(self) -> bytes:
+        return b'%i UIDFETCH' % (self.seq, )
 
 
 class SearchResponse(UntaggedResponse):
@@ -154,17 +210,24 @@ class SearchResponse(UntaggedResponse):
 
     Args:
         seqs: List of message sequence integers.
+        mod_seq: The highest modification sequence of the messages, if the
+            search criteria included a modification sequence.
 
     """
 
-    def __init__(self, seqs: Iterable[int]) -> None:
+    def __init__(self, seqs: Iterable[int],
+                 mod_seq: int | None = None) -> None:
         super().__init__()
         self.seqs = seqs
+        self.mod_seq = mod_seq
 
     @property
     def text(self) -> bytes:
+        suffix = []
+        if self.mod_seq is not None:
+            suffix = [b'(MODSEQ %i)' % self.mod_seq]
         text = BytesFormat(b' ').join(
-            [b'SEARCH'], [b'%i' % seq for seq in self.seqs])
+            [b'SEARCH'], [b'%i' % seq for seq in self.seqs], suffix)
         return super().text + text
 
 
@@ -191,7 +254,7 @@ class ESearchResponse(UntaggedResponse):
 
     @property
     def text(self) -> bytes:
-        prefixes: list[bytes] = []
+        prefixes = [b'ESEARCH']
         if self.issuer_tag is not None:
             prefixes += [BytesFormat(b'(TAG "%b")') % self.issuer_tag]
         if self.uid:
@@ -201,6 +264,67 @@ class ESearchResponse(UntaggedResponse):
         return super().text + BytesFormat(b' ').join(prefixes, *parts)
 
 
+class SortResponse(UntaggedResponse):
+    """Constructs the special SORT response used by the SORT command.
+
+    See Also:
+        `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
+
+    Args:
+        seqs: List of message sequence integers, in sorted order.
+
+    """
+
+    def __init__(self, seqs: Iterable[int]) -> None:
+        super().__init__()
+        self.seqs = seqs
+
+    @property
+    def text(self) -> bytes:
+        text = BytesFormat(b' ').join(
+            [b'SORT'], [b'%i' % seq for seq in self.seqs])
+        return super().text + text
+
+
+class ThreadResponse(UntaggedResponse):
+    """Constructs the special THREAD response used by the THREAD command.
+
+    See Also:
+        `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
+
+    Args:
+        threads: The message sequence integers, grouped into threads.
+
+    """
+
+    def __init__(self, threads: Iterable[ThreadNode[int]]) -> None:
+        super().__init__()
+        self.threads = threads
+
+    @classmethod
+    def _get_thread(cls, node: ThreadNode[int]) -> bytes:
+        parts: list[bytes] = []
+        while True:
+            if node.value is not None:
+                parts.append(b'%i' % node.value)
+            if node.value is not None and len(node.children) == 1:
+                node = node.children[0]
+            else:
+                break
+        if node.children:
+            parts.append(b''.join(b'(%b)' % cls._get_thread(child)
+                                  for child in node.children))
+        return b' '.join(parts)
+
+    @property
+    def text(self) -> bytes:
+        threads = b''.join(b'(%b)' % self._get_thread(thread)
+                           for thread in self.threads)
+        if threads:
+            return super().text + b'THREAD ' + threads
+        return super().text + b'THREAD'
+
+
 class StatusResponse(UntaggedResponse):
     """Constructs the special STATUS response used by the STATUS command.
 
@@ -230,17 +354,21 @@ class ListResponse(UntaggedResponse):
         mailbox: The mailbox name.
         sep: The heirarchy separation character.
         attrs: The attribute flags associated with the mailbox.
+        child_info: The selection criteria met by inferior mailboxes, sent
+            in a ``CHILDINFO`` extended data item.
 
     """
 
     _name: ClassVar[bytes] = b'LIST'
 
     def __init__(self, mailbox: str, sep: str | None,
-                 attrs: Iterable[bytes]) -> None:
+                 attrs: Iterable[bytes],
+                 child_info: Sequence[bytes] = ()) -> None:
         super().__init__()
         self.mailbox = mailbox
         self.sep = sep
         self.attrs = attrs
+        self.child_info = child_info
 
     @property
     def text(self) -> bytes:
@@ -249,8 +377,13 @@ class ListResponse(UntaggedResponse):
         else:
             sep_obj = Nil()
         attrs_obj = List([b'\\' + attr for attr in self.attrs])
-        return super().text + BytesFormat(b' ').join(
-            (self._name, attrs_obj, sep_obj, Mailbox(self.mailbox)))
+        parts: list[MaybeBytes] = [self._name, attrs_obj, sep_obj,
+                                   Mailbox(self.mailbox)]
+        if self.child_info:
+            child_info = List([QuotedString(item)
+                               for item in self.child_info])
+            parts.append(List([QuotedString(b'CHILDINFO'), child_info]))
+        return super().text + BytesFormat(b' ').join(parts)
 
 
 class LSubResponse(ListResponse):
@@ -283,3 +416,24 @@ class IdResponse(UntaggedResponse):
             value = List(String.build(token) for token in
                          chain.from_iterable(parameters.items()))
         return b'ID %s' % value
+
+
+class EnabledResponse(UntaggedResponse):
+    """Constructs the untagged ENABLED response used by the ENABLE command.
+
+    See Also:
+        `RFC 5161 3.2. <https://tools.ietf.org/html/rfc5161#section-3.2>`_
+
+    Args:
+        capabilities: The capabilities that were enabled.
+
+    """
+
+    def __init__(self, capabilities: Iterable[bytes]) -> None:
+        super().__init__()
+        self.capabilities = capabilities
+
+    @property
+    def text(self) -> bytes:
+        return super().text + BytesFormat(b' ').join(
+            [b'ENABLED'], self.capabilities)
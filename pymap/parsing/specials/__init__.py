@@ -4,9 +4,9 @@ primitives.
 """
 
 __all__ = ['AString', 'DateTime', 'FetchRequirement', 'FetchAttribute',
-           'FetchValue', 'Flag', 'Mailbox', 'SearchKey', 'SequenceSet',
-           'StatusAttribute', 'Tag', 'ExtensionOption', 'ExtensionOptions',
-           'ObjectId']
+           'FetchValue', 'Flag', 'Mailbox', 'PartialRange', 'SearchKey',
+           'SequenceSet', 'SortKey', 'StatusAttribute', 'Tag',
+           'ExtensionOption', 'ExtensionOptions', 'ObjectId']
 
 from .astring import AString
 from .datetime_ import DateTime
@@ -14,8 +14,10 @@ from .fetchattr import FetchRequirement, FetchAttribute, FetchValue
 from .flag import Flag
 from .mailbox import Mailbox
 from .objectid import ObjectId
+from .partialrange import PartialRange
 from .searchkey import SearchKey
 from .sequenceset import SequenceSet
+from .sortkey import SortKey
 from .statusattr import StatusAttribute
 from .options import ExtensionOption, ExtensionOptions
 from .tag import Tag
@@ -12,7 +12,7 @@ from . import AString
 from .. import Params, Parseable
 from ..exceptions import NotParseable
 from ..primitives import Atom, List
-from ...bytes import BytesFormat, MaybeBytes, Writeable
+from ...bytes import BytesFormat, MaybeBytes, Writeable, WriteStream
 
 __all__ = ['FetchPartial', 'FetchRequirement', 'FetchAttribute', 'FetchValue']
 
@@ -131,6 +131,7 @@ class FetchAttribute(Parseable[bytes]):
     _section_start_pattern = re.compile(br' *\[ *')
     _section_end_pattern = re.compile(br' *\]')
     _partial_pattern = re.compile(br'< *(\d+) *\. *(\d+) *>')
+    _preview_mod_pattern = re.compile(br' +\( *LAZY *\)', re.I)
 
     _sec_part_pattern = re.compile(br'([1-9]\d* *(?:\. *[1-9]\d*)*) *(\.)? *')
 
@@ -143,6 +144,7 @@ class FetchAttribute(Parseable[bytes]):
         self.partial = partial
         self._raw: bytes | None = None
         self._for_response: FetchAttribute | None = None
+        self._hash: int | None = None
 
     @property
     def value(self) -> bytes:
@@ -174,7 +176,8 @@ class FetchAttribute(Parseable[bytes]):
     def requirement(self) -> FetchRequirement:
         """Indicates the data required to fulfill this fetch attribute."""
         attr_name = self.attribute
-        if attr_name in (b'UID', b'FLAGS', b'INTERNALDATE'):
+        if attr_name in (b'UID', b'FLAGS', b'INTERNALDATE', b'MODSEQ',
+                         b'PREVIEW'):
             return FetchRequirement.METADATA
         elif attr_name in (b'ENVELOPE', b'RFC822.HEADER'):
             return FetchRequirement.HEADER
@@ -224,7 +227,9 @@ class FetchAttribute(Parseable[bytes]):
         return raw
 
     def __hash__(self) -> int:
-        return hash((self.value, self.section, self.partial))
+        if self._hash is None:
+            self._hash = hash((self.value, self.section, self.partial))
+        return self._hash
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, FetchAttribute):
@@ -279,7 +284,12 @@ class FetchAttribute(Parseable[bytes]):
         after = buf[match.end(0):]
         if attr in (b'ENVELOPE', b'FLAGS', b'INTERNALDATE', b'UID',
                     b'RFC822.SIZE', b'BODYSTRUCTURE', b'EMAILID',
-                    b'THREADID'):
+                    b'THREADID', b'MODSEQ'):
+            return cls(attr), after
+        elif attr == b'PREVIEW':
+            match = cls._preview_mod_pattern.match(after)
+            if match:
+                after = after[match.end(0):]
             return cls(attr), after
         elif attr == b'RFC822':
             section = cls.Section([])
@@ -342,6 +352,13 @@ class FetchValue(Writeable):
             -> FetchValue:
         return _StaticFetchValue(attribute, value)
 
+    def _write_value(self, writer: WriteStream, value: MaybeBytes) -> None:
+        writer.write(bytes(self.attribute.for_response) + b' ')
+        if isinstance(value, Writeable):
+            value.write(writer)
+        else:
+            writer.write(bytes(value))
+
 
 class _StaticFetchValue(FetchValue):
 
@@ -351,6 +368,9 @@ class _StaticFetchValue(FetchValue):
         super().__init__(attribute)
         self._value: Final = value
 
+    def write(self, writer: WriteStream) -> None:
+        self._write_value(writer, self._value)
+
     def __bytes__(self) -> bytes:
         attr = self.attribute.for_response
         return BytesFormat(b'%b %b') % (attr, self._value)
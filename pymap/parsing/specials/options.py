@@ -4,7 +4,7 @@ from __future__ import annotations
 import re
 from collections.abc import Iterable, Mapping
 
-from . import AString, SequenceSet
+from . import AString, PartialRange, SequenceSet
 from .. import Params, Parseable
 from ..exceptions import NotParseable
 from ..primitives import Number, List
@@ -51,7 +51,7 @@ class ExtensionOption(Parseable[bytes]):
                 self._raw_arg = b''
             elif len(self.arg) == 1:
                 arg_0 = self.arg.value[0]
-                if isinstance(arg_0, (Number, SequenceSet)):
+                if isinstance(arg_0, (Number, SequenceSet, PartialRange)):
                     self._raw_arg = bytes(arg_0)
                 else:
                     self._raw_arg = bytes(self.arg)
@@ -77,7 +77,14 @@ class ExtensionOption(Parseable[bytes]):
             arg = List([seq_set])
             return arg, buf
         try:
-            params_copy = params.copy(expected=[AString, List])
+            partial, buf = PartialRange.parse(buf, params)
+        except NotParseable:
+            pass
+        else:
+            arg = List([partial])
+            return arg, buf
+        try:
+            params_copy = params.copy(expected=[SequenceSet, AString, List])
             return List.parse(buf, params_copy)
         except NotParseable:
             pass
@@ -0,0 +1,77 @@
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .. import Params, Parseable
+from ..exceptions import NotParseable
+
+__all__ = ['PartialRange']
+
+
+class PartialRange(Parseable[tuple[int, int]]):
+    """Represents a range of positions in a list of results, counted from
+    the first result if positive or from the last result if negative.
+
+    See Also:
+        `RFC 9394 3.1. <https://tools.ietf.org/html/rfc9394#section-3.1>`_
+
+    Args:
+        first: The first position, starting at ``1`` or ``-1``.
+        last: The last position, with the same sign as *first*.
+
+    """
+
+    _pattern = re.compile(br'(-?)([1-9]\d*):(-?)([1-9]\d*)')
+
+    def __init__(self, first: int, last: int) -> None:
+        super().__init__()
+        if first == 0 or last == 0 or (first < 0) != (last < 0):
+            raise ValueError((first, last))
+        self.first = min(first, last, key=abs)
+        self.last = max(first, last, key=abs)
+
+    @property
+    def value(self) -> tuple[int, int]:
+        """The first and last positions of the range."""
+        return self.first, self.last
+
+    @property
+    def from_end(self) -> bool:
+        """True if the positions are counted from the last result."""
+        return self.first < 0
+
+    def bounds(self, total: int) -> tuple[int, int]:
+        """Return the zero-based start and stop indexes of the range in a
+        list of results.
+
+        Args:
+            total: The number of results in the list.
+
+        """
+        if self.from_end:
+            return max(total + self.last, 0), max(total + self.first + 1, 0)
+        return min(self.first - 1, total), min(self.last, total)
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[PartialRange, memoryview]:
+        start = cls._whitespace_length(buf)
+        match = cls._pattern.match(buf, start)
+        if not match or match.group(1) != match.group(3):
+            raise NotParseable(buf)
+        first = int(match.group(1) + match.group(2))
+        last = int(match.group(3) + match.group(4))
+        return cls(first, last), buf[match.end(0):]
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PartialRange):
+            return self.value == other.value
+        return super().__eq__(other)
+
+    def __bytes__(self) -> bytes:
+        return b'%i:%i' % self.value
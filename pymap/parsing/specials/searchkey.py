@@ -40,6 +40,7 @@ class SearchKey(Parseable[bytes]):
     """
 
     _not_pattern = re.compile(br'NOT +', re.I)
+    _entry_types = frozenset([b'priv', b'shared', b'all'])
 
     def __init__(self, key: bytes,
                  filter_: _FilterType | None = None,
@@ -173,7 +174,7 @@ class SearchKey(Parseable[bytes]):
             inverse = True
             buf = buf[match.end(0):]
         try:
-            seq_set, buf = SequenceSet.parse(buf, params)
+            seq_set, buf = SequenceSet.parse(buf, params.copy(uid=False))
         except NotParseable:
             pass
         else:
@@ -218,6 +219,19 @@ class SearchKey(Parseable[bytes]):
             _, buf = Space.parse(after, params)
             num, buf = Number.parse(buf, params)
             return cls(key, num.value, inverse), buf
+        elif key == b'MODSEQ':
+            _, buf = Space.parse(after, params)
+            try:
+                num, buf = Number.parse(buf, params)
+            except NotParseable as exc:
+                _, buf = QuotedString.parse(buf, params)
+                _, buf = Space.parse(buf, params)
+                entry_type, buf = Atom.parse(buf, params)
+                if entry_type.value.lower() not in cls._entry_types:
+                    raise NotParseable(buf) from exc
+                _, buf = Space.parse(buf, params)
+                num, buf = Number.parse(buf, params)
+            return cls(key, num.value, inverse), buf
         elif key == b'UID':
             _, buf = Space.parse(after, params)
             seq_set, buf = SequenceSet.parse(buf, params.copy(uid=True))
@@ -54,6 +54,16 @@ class SequenceSet(Parseable[Sequence[_SeqElem]]):
         """A sequence set intended to contain all values."""
         return _AllSequenceSet(uid)
 
+    @classmethod
+    def saved(cls, uid: bool = False) -> SequenceSet:
+        """A sequence set that refers to the saved search result, ``$``.
+
+        See Also:
+            `RFC 5182 <https://tools.ietf.org/html/rfc5182>`_
+
+        """
+        return _SavedSequenceSet(uid)
+
     @property
     def value(self) -> Sequence[_SeqElem]:
         """The sequence set data."""
@@ -69,10 +79,20 @@ class SequenceSet(Parseable[Sequence[_SeqElem]]):
         :meth:`.iter`.
 
         """
+        if not self.sequences:
+            return False
         first = self.sequences[0]
         return isinstance(first, tuple) \
             and first[0] == 1 and isinstance(first[1], MaxValue)
 
+    @property
+    def is_saved(self) -> bool:
+        """True if the sequence set refers to the saved search result, and
+        must be resolved by the selected mailbox before use.
+
+        """
+        return False
+
     @classmethod
     def _get_range(cls, elem: _SeqElem, max_value: int) -> Iterable[int]:
         if isinstance(elem, int):
@@ -95,6 +115,46 @@ class SequenceSet(Parseable[Sequence[_SeqElem]]):
             else:
                 return ()
 
+    @classmethod
+    def _get_bounds(cls, elem: _SeqElem, max_value: int) \
+            -> tuple[int, int] | None:
+        if isinstance(elem, tuple):
+            left, right = elem
+        else:
+            left = right = elem
+        if isinstance(left, MaxValue):
+            left = max_value
+        if isinstance(right, MaxValue):
+            right = max_value
+        low = max(min(left, right), 1)
+        high = min(max(left, right), max_value)
+        if low > high:
+            return None
+        return low, high
+
+    def ranges(self, max_value: int) -> Sequence[tuple[int, int]]:
+        """Return the sorted, non-overlapping ranges of values contained in
+        the sequence set, bounded by the given maximum value (in place of any
+        ``*``). Each range is a tuple of its inclusive low and high values.
+
+        Unlike :meth:`.flatten`, the cost of this method is proportional to
+        the number of groups in the sequence set, not the number of values.
+
+        Args:
+            max_value: The maximum value of the set.
+
+        """
+        bounds = sorted(filter(None, (self._get_bounds(elem, max_value)
+                                      for elem in self.sequences)))
+        ret: list[tuple[int, int]] = []
+        for low, high in bounds:
+            if ret and low <= ret[-1][1] + 1:
+                prev_low, prev_high = ret[-1]
+                ret[-1] = (prev_low, max(prev_high, high))
+            else:
+                ret.append((low, high))
+        return ret
+
     def flatten(self, max_value: int) -> frozenset[int]:
         """Return a set of all values contained in the sequence set.
 
@@ -208,6 +268,8 @@ class SequenceSet(Parseable[Sequence[_SeqElem]]):
             _, buf = Space.parse(buf, params)
         except NotParseable:
             pass
+        if buf and buf[0] == 0x24:
+            return cls.saved(params.uid), buf[1:]
         sequences = []
         while buf:
             item, buf = cls._parse_part(buf)
@@ -225,6 +287,9 @@ class _AllSequenceSet(SequenceSet):
     def __init__(self, uid: bool) -> None:
         super().__init__([(1, self._max)], uid)
 
+    def ranges(self, max_value: int) -> Sequence[tuple[int, int]]:
+        return [(1, max_value)] if max_value > 0 else []
+
     def iter(self, max_value: int) -> Iterator[int]:
         return iter(range(1, max_value + 1))
 
@@ -233,3 +298,19 @@ class _AllSequenceSet(SequenceSet):
 
     def __repr__(self) -> str:
         return '<SequenceSet set=all>'
+
+
+class _SavedSequenceSet(SequenceSet):
+
+    def __init__(self, uid: bool) -> None:
+        super().__init__([], uid)
+
+    @property
+    def is_saved(self) -> bool:
+        return True
+
+    def __bytes__(self) -> bytes:
+        return b'$'
+
+    def __repr__(self) -> str:
+        return '<SequenceSet set=saved>'
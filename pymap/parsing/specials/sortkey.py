@@ -0,0 +1,71 @@
+
+from __future__ import annotations
+
+from typing import Any
+
+from .. import Params, Parseable, Space
+from ..exceptions import NotParseable, InvalidContent
+from ..primitives import Atom
+
+__all__ = ['SortKey']
+
+
+class SortKey(Parseable[bytes]):
+    """Represents a sort criterion from an IMAP stream.
+
+    See Also:
+        `RFC 5256 3. <https://tools.ietf.org/html/rfc5256#section-3>`_
+
+    Args:
+        key: The sort key string.
+        reverse: True if the sort order of this key is reversed.
+
+    """
+
+    #: The set of valid sort keys.
+    valid_keys = {b'ARRIVAL', b'CC', b'DATE', b'FROM', b'SIZE', b'SUBJECT',
+                  b'TO'}
+
+    def __init__(self, key: bytes, reverse: bool = False) -> None:
+        super().__init__()
+        key = key.upper()
+        if key not in self.valid_keys:
+            raise ValueError(key)
+        self.key = key
+        self.reverse = reverse
+
+    @property
+    def value(self) -> bytes:
+        """The sort key string."""
+        return self.key
+
+    @classmethod
+    def parse(cls, buf: memoryview, params: Params) \
+            -> tuple[SortKey, memoryview]:
+        try:
+            _, buf = Space.parse(buf, params)
+        except NotParseable:
+            pass
+        atom, after = Atom.parse(buf, params)
+        reverse = atom.value.upper() == b'REVERSE'
+        if reverse:
+            _, after = Space.parse(after, params)
+            atom, after = Atom.parse(after, params)
+        try:
+            return cls(atom.value, reverse), after
+        except ValueError as exc:
+            raise InvalidContent(buf) from exc
+
+    def __hash__(self) -> int:
+        return hash((self.value, self.reverse))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SortKey):
+            return self.value == other.value \
+                and self.reverse == other.reverse
+        return super().__eq__(other)
+
+    def __bytes__(self) -> bytes:
+        if self.reverse:
+            return b'REVERSE ' + self.value
+        return self.value
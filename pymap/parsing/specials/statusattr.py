@@ -20,7 +20,7 @@ class StatusAttribute(Parseable[bytes]):
 
     #: The set of valid status attributes.
     valid_statuses = {b'MESSAGES', b'RECENT', b'UIDNEXT', b'UIDVALIDITY',
-                      b'UNSEEN', b'MAILBOXID'}
+                      b'UNSEEN', b'MAILBOXID', b'HIGHESTMODSEQ'}
 
     def __init__(self, status: bytes) -> None:
         super().__init__()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from abc import abstractmethod, ABCMeta
 from collections.abc import Iterable
 from datetime import datetime
@@ -146,6 +147,8 @@ class SearchCriteria(metaclass=ABCMeta):
             return SizeSearchCriteria(key.filter_int, '<', params)
         elif key_name == b'LARGER':
             return SizeSearchCriteria(key.filter_int, '>', params)
+        elif key_name == b'MODSEQ':
+            return ModSeqSearchCriteria(key.filter_int, params)
         elif key_name in (b'BCC', b'CC', b'FROM', b'SUBJECT', b'TO'):
             return EnvelopeSearchCriteria(key_name, key.filter_str, params)
         elif key_name == b'HEADER':
@@ -186,6 +189,21 @@ class SearchCriteriaSet(SearchCriteria):
         else:
             return seqset_crit.seq_set
 
+    @property
+    def sequence_only(self) -> bool:
+        """True if every message in :attr:`.sequence_set` matches the search
+        criteria set, so the matching messages can be found without
+        checking each message.
+
+        """
+        num_seqset = 0
+        for crit in self.all_criteria:
+            if isinstance(crit, SequenceSetSearchCriteria):
+                num_seqset += 1
+            elif not isinstance(crit, AllSearchCriteria):
+                return False
+        return bool(self.all_criteria) and num_seqset <= 1
+
     def matches(self, msg_seq: int, msg: MessageInterface,
                 loaded_msg: LoadedMessageInterface) -> bool:
         """The message matches if all the defined search key criteria match.
@@ -239,18 +257,23 @@ class SequenceSetSearchCriteria(SearchCriteria):
 
     def __init__(self, seq_set: SequenceSet, params: SearchParams) -> None:
         super().__init__(params)
-        self.seq_set = seq_set
+        self.seq_set = seq_set = params.selected.resolve(seq_set)
         if seq_set.uid:
-            self.flat = seq_set.flatten(params.max_uid)
+            self.ranges = seq_set.ranges(params.max_uid)
         else:
-            self.flat = seq_set.flatten(params.max_seq)
+            self.ranges = seq_set.ranges(params.max_seq)
+        self._lows = [low for low, _ in self.ranges]
+
+    def _contains(self, value: int) -> bool:
+        idx = bisect_right(self._lows, value) - 1
+        return idx >= 0 and value <= self.ranges[idx][1]
 
     def matches(self, msg_seq: int, msg: MessageInterface,
                 loaded_msg: LoadedMessageInterface) -> bool:
         if self.seq_set.uid:
-            return msg.uid in self.flat
+            return self._contains(msg.uid)
         else:
-            return msg_seq in self.flat
+            return self._contains(msg_seq)
 
 
 class HasEmailIdSearchCriteria(SearchCriteria):
@@ -374,6 +397,21 @@ class SizeSearchCriteria(SearchCriteria):
         raise ValueError(self.op)
 
 
+class ModSeqSearchCriteria(SearchCriteria):
+    """Matches messages with a modification sequence greater than or equal
+    to the given value.
+
+    """
+
+    def __init__(self, mod_seq: int, params: SearchParams) -> None:
+        super().__init__(params)
+        self.mod_seq = mod_seq
+
+    def matches(self, msg_seq: int, msg: MessageInterface,
+                loaded_msg: LoadedMessageInterface) -> bool:
+        return msg.mod_seq >= self.mod_seq
+
+
 class EnvelopeSearchCriteria(SearchCriteria):
     """Matches by checking for strings within various fields of the envelope
     structure.
@@ -2,25 +2,33 @@
 from __future__ import annotations
 
 from bisect import bisect_right
-from collections.abc import Iterable, MutableSet, Sequence, Set
-from itertools import chain, groupby, islice
-from typing import Any
-from weakref import WeakSet
-
+from collections.abc import Awaitable, Callable, Iterable, Iterator, \
+    Mapping, MutableSet, \
+    Sequence, Set
+from itertools import chain, groupby
+from typing import Any, ClassVar, Final
+from weakref import WeakSet, WeakValueDictionary
+
+from .concurrent import Event
+from .context import subsystem
 from .flags import FlagOp, PermanentFlags, SessionFlags
-from .interfaces.message import CachedMessage, FlagsKey
+from .interfaces.message import CachedMessage
 from .parsing.command import Command
-from .parsing.primitives import List, Number
+from .parsing.primitives import List
 from .parsing.response import UntaggedResponse, ResponseBye
 from .parsing.response.specials import ExistsResponse, RecentResponse, \
-    ExpungeResponse, FetchResponse
+    ExpungeResponse, FetchResponse, UidFetchResponse, VanishedResponse
 from .parsing.specials import ObjectId, FetchAttribute, FetchValue, \
-    Flag, SequenceSet
+    Flag, PartialRange, SequenceSet
+from .seqindex import SequenceIndex
 
 __all__ = ['SelectedSet', 'SynchronizedMessages', 'SelectedMailbox']
 
 _flags_attr = FetchAttribute(b'FLAGS')
 _uid_attr = FetchAttribute(b'UID')
+_modseq_attr = FetchAttribute(b'MODSEQ')
+_missing: Final[Any] = object()
+_unknown: Final = 0xffffffff
 
 
 class SelectedSet:
@@ -28,13 +36,50 @@ class SelectedSet:
     a mailbox, across all sessions. This is useful for assigning the
     ``\\Recent`` flag, as well as notifying other sessions about updates.
 
+    The set also holds the versioned message state of the mailbox, which is
+    shared by every :class:`SynchronizedMessages` in the set so that updates
+    from the backend are applied only once.
+
     """
 
-    __slots__ = ['_set']
+    __slots__ = ['_set', '_state', '_updated', '_watching', '__weakref__']
+
+    #: The maximum time, in seconds, that a waiting session blocks before
+    #: checking if it should take over watching for external changes.
+    watch_interval: ClassVar[float] = 1.0
 
     def __init__(self) -> None:
         super().__init__()
         self._set: MutableSet[SelectedMailbox] = WeakSet()
+        self._state = _SharedState()
+        self._updated = subsystem.get().new_event()
+        self._watching = False
+
+    @classmethod
+    def for_mailbox(cls, mailbox_id: ObjectId) -> SelectedSet:
+        """Return the selected set for the mailbox, shared by all sessions in
+        the process that have selected it. A new set is created if no other
+        references to one exist.
+
+        Args:
+            mailbox_id: The mailbox object ID.
+
+        """
+        try:
+            return _selected_sets[mailbox_id]
+        except KeyError:
+            _selected_sets[mailbox_id] = selected_set = cls()
+            return selected_set
+
+    @property
+    def notified(self) -> int:
+        """The number of times :meth:`.notify` has been called."""
+        return self._state.notified
+
+    @property
+    def updated(self) -> Event:
+        """The event signalled the next time :meth:`.notify` is called."""
+        return self._updated
 
     def add(self, selected: SelectedMailbox, *,
             replace: SelectedMailbox | None = None) -> None:
@@ -51,6 +96,56 @@ class SelectedSet:
             self._set.discard(replace)
         self._set.add(selected)
 
+    def notify(self) -> None:
+        """Signal that the mailbox has changed, waking any sessions blocked in
+        :meth:`.wait_updated`.
+
+        """
+        self._state.notified += 1
+        updated, self._updated = self._updated, subsystem.get().new_event()
+        updated.set()
+
+    async def wait_updated(
+            self, selected: SelectedMailbox, wait_on: Event,
+            watch: Callable[[Event], Awaitable[bool]] | None = None) -> None:
+        """Block until *wait_on* is signalled, :meth:`.notify` is called, or
+        another session has synchronized updates that *selected* has not yet
+        seen. Returns immediately if :meth:`.notify` was called since the last
+        time *selected* waited.
+
+        Changes made by other processes will not call :meth:`.notify`, so a
+        backend that allows them should provide *watch*. Only one waiting
+        session calls it at a time, so watching for changes costs the same
+        regardless of how many sessions are waiting.
+
+        Args:
+            selected: The selected mailbox session.
+            wait_on: The event to wait on, e.g. the end of ``IDLE``.
+            watch: Blocks for a short time, until the given event is signalled
+                or a change to the mailbox is found, and returns True if
+                a change was found.
+
+        """
+        messages = selected.messages
+        state = messages._state
+        notified, messages._notified = messages._notified, state.notified
+        if notified != state.notified or messages._view is not state.latest:
+            return
+        either_event = wait_on.or_event(self._updated)
+        while not either_event.is_set():
+            if watch is None:
+                await either_event.wait()
+            elif self._watching:
+                await either_event.wait(timeout=self.watch_interval)
+            else:
+                self._watching = True
+                try:
+                    if await watch(either_event):
+                        self.notify()
+                finally:
+                    self._watching = False
+        messages._notified = state.notified
+
     @property
     def any_selected(self) -> SelectedMailbox | None:
         """A single, random object in the set of selected mailbox objects.
@@ -64,6 +159,138 @@ class SelectedSet:
         return None
 
 
+_selected_sets: WeakValueDictionary[ObjectId, SelectedSet] = \
+    WeakValueDictionary()
+
+
+class _Version:
+
+    __slots__ = ['number', 'index', 'pending']
+
+    def __init__(self, number: int, index: SequenceIndex,
+                 pending: frozenset[int] = frozenset()) -> None:
+        super().__init__()
+        self.number = number
+        self.index = index
+        self.pending = pending
+
+
+class _SharedState:
+
+    #: Old change records are discarded every time this many new versions
+    #: have been created.
+    collect_interval: ClassVar[int] = 64
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.latest = _Version(0, SequenceIndex())
+        self.mod_sequence: Any = None
+        self.notified = 0
+        self.cache: dict[int, CachedMessage] = {}
+        self.flag_sets: list[frozenset[Flag]] = []
+        self.flag_lists: dict[frozenset[Flag], bytes] = {}
+        self.views: MutableSet[SynchronizedMessages] = WeakSet()
+        self._interned: dict[frozenset[Flag], int] = {}
+        self._changes: dict[int, frozenset[int]] = {}
+        self._expunged: dict[int, int] = {}
+
+    def _intern(self, flags: frozenset[Flag]) -> int:
+        try:
+            return self._interned[flags]
+        except KeyError:
+            self._interned[flags] = flag_id = len(self.flag_sets)
+            self.flag_sets.append(flags)
+            return flag_id
+
+    def render_flags(self, flags: frozenset[Flag]) -> bytes:
+        try:
+            return self.flag_lists[flags]
+        except KeyError:
+            self.flag_lists[flags] = raw = bytes(List(flags, sort=True))
+            return raw
+
+    def changed_since(self, before: int, after: int) -> set[int]:
+        changes = self._changes
+        return set(chain.from_iterable(
+            changes.get(number, ()) for number in range(before + 1,
+                                                        after + 1)))
+
+    def apply(self, messages: Iterable[CachedMessage],
+              expunged: Iterable[int], mod_sequence: Any,
+              uids: Iterable[int] = (), *, base: int | None = None) -> None:
+        # An update read at an older base version is re-based onto the
+        # latest version. Messages changed since then keep the newer of the
+        # two, by mod-sequence, and messages expunged since then stay gone.
+        # The mod_sequence of the latest version is kept.
+        stale: Set[int] = frozenset()
+        if base is not None and base != self.latest.number:
+            stale = self.changed_since(base, self.latest.number)
+        elif mod_sequence is not _missing:
+            self.mod_sequence = mod_sequence
+        index = self.latest.index
+        cache = self.cache
+        updated: dict[int, int] = {}
+        added: dict[int, int] = {}
+        for msg in messages:
+            msg_uid = msg.uid
+            if msg_uid in stale:
+                if msg_uid not in index:
+                    continue
+                cached = cache.get(msg_uid)
+                if cached is not None and msg.mod_seq <= cached.mod_seq:
+                    continue
+            flag_id = self._intern(msg.permanent_flags)
+            cache[msg_uid] = msg
+            try:
+                if index.get_value(msg_uid) != flag_id:
+                    updated[msg_uid] = flag_id
+            except KeyError:
+                added[msg_uid] = flag_id
+                self._expunged.pop(msg_uid, None)
+        for msg_uid in uids:
+            if msg_uid not in index and msg_uid not in stale:
+                added.setdefault(msg_uid, _unknown)
+                self._expunged.pop(msg_uid, None)
+        removed: list[int] = []
+        for msg_uid in expunged:
+            if msg_uid in index:
+                updated.pop(msg_uid, None)
+                removed.append(msg_uid)
+            elif added.pop(msg_uid, None) is not None:
+                cache.pop(msg_uid, None)
+        if not updated and not added and not removed:
+            return
+        number = self.latest.number + 1
+        new_index = index.copy()
+        for msg_uid, flag_id in updated.items():
+            new_index.set_value(msg_uid, flag_id)
+        new_index.update(added.keys(), added.values())
+        for msg_uid in removed:
+            new_index.remove(msg_uid)
+            self._expunged[msg_uid] = number
+        self._changes[number] = frozenset(chain(updated, added, removed))
+        self.latest = _Version(number, new_index)
+        if number % self.collect_interval == 0:
+            self._collect()
+
+    def _collect(self) -> None:
+        views = list(self.views)
+        oldest = min((view._forked.number for view in views),
+                     default=self.latest.number)
+        changes = self._changes
+        for number in [number for number in changes if number <= oldest]:
+            del changes[number]
+        pending = frozenset(chain.from_iterable(
+            chain(view._view.pending, view._forked.pending)
+            for view in views))
+        cache = self.cache
+        expunged = self._expunged
+        for msg_uid in [msg_uid for msg_uid, number in expunged.items()
+                        if number <= oldest and msg_uid not in pending]:
+            del expunged[msg_uid]
+            cache.pop(msg_uid, None)
+
+
 class _Frozen:
 
     def __init__(self, selected: SelectedMailbox) -> None:
@@ -71,91 +298,217 @@ class _Frozen:
         messages = selected.messages
         session_flags = selected.session_flags
         self.is_deleted = selected._is_deleted
-        self.uids = messages._uids.copy()
-        self.seqs_cache = messages._seqs_cache.copy()
-        self.flags = messages._flags_key_set.copy()
-        self.recent = session_flags.recent_uids & self.uids
+        self.recent = frozenset(uid for uid in session_flags.recent_uids
+                                if uid in messages._view.index)
         self.sflags = frozenset(session_flags.flags.items())
 
 
+class _Changes:
+
+    __slots__ = ['added', 'expunged', 'flags']
+
+    def __init__(self, added: Set[int], expunged: Sequence[tuple[int, int]],
+                 flags: Mapping[int, int | None]) -> None:
+        super().__init__()
+        self.added = added
+        self.expunged = expunged
+        self.flags = flags
+
+
 class SynchronizedMessages:
-    """Manages the message data that has been synchronized with the client."""
+    """Manages the message data that has been synchronized with the client.
 
-    def __init__(self) -> None:
+    The messages are a view of a versioned state that is shared by every
+    session that has selected the mailbox. Each version is a
+    :class:`~pymap.seqindex.SequenceIndex` of message UIDs, where each
+    distinct set of permanent flags is interned and referenced by a small
+    integer ID. New versions share unmodified blocks of the index with the
+    previous version, and a session only holds a reference to the version it
+    last synchronized with the client.
+
+    The UIDs changed by each version are recorded, so that
+    :meth:`SelectedMailbox.fork` can produce untagged responses without
+    comparing the entire state of the mailbox.
+
+    Messages added with :meth:`SelectedMailbox.set_uids` have no cached
+    metadata until it is loaded by
+    :meth:`~pymap.backend.mailbox.MailboxDataInterface.get_cached`.
+
+    Once :attr:`.uidonly` is set, the changes taken for each fork no longer
+    look up the message sequence numbers of expunged or updated messages.
+
+    Args:
+        selected_set: The selected set that holds the shared state.
+
+    """
+
+    def __init__(self, selected_set: SelectedSet | None = None) -> None:
         super().__init__()
-        self._uids: set[int] = set()
-        self._sorted: list[int] = []
-        self._seqs_cache: dict[int, int] = {}
-        self._cache: dict[int, CachedMessage] = {}
-        self._flags_key_map: dict[int, FlagsKey] = {}
-        self._flags_key_set: set[FlagsKey] = set()
-        self._pending_remove: set[int] = set()
+        if selected_set is None:
+            state = _SharedState()
+        else:
+            state = selected_set._state
+        self._state = state
+        self._view = self._forked = state.latest
+        self._read_version = state.latest.number
+        self._notified = state.notified
+        self._uidonly = False
+        state.views.add(self)
+
+    @property
+    def uidonly(self) -> bool:
+        """If True, the client only refers to messages by UID and message
+        sequence numbers are not tracked.
+
+        See Also:
+            `RFC 9586 <https://tools.ietf.org/html/rfc9586>`_
+
+        """
+        return self._uidonly
+
+    @uidonly.setter
+    def uidonly(self, uidonly: bool) -> None:
+        self._uidonly = uidonly
 
     @property
     def exists(self) -> int:
         """The total number of messages in the mailbox."""
-        return len(self._uids)
+        return len(self._view.index)
 
     @property
     def max_uid(self) -> int:
         """The highest message UID value of the mailbox."""
         try:
-            return self._sorted[-1]
+            return self._view.index[-1]
         except IndexError:
             return 0
 
-    def _update(self, messages: Iterable[CachedMessage]) -> None:
-        lowest_idx: int | None = None
-        for msg in messages:
-            msg_uid = msg.uid
-            if msg_uid not in self._uids:
-                self._uids.add(msg_uid)
-                idx = bisect_right(self._sorted, msg_uid)
-                if lowest_idx is None or lowest_idx > idx:
-                    lowest_idx = idx
-                self._sorted.insert(idx, msg_uid)
-            self._cache[msg_uid] = msg
-            new_flags_key = msg.flags_key
-            old_flags_key = self._flags_key_map.get(msg_uid)
-            if old_flags_key is not None:
-                self._flags_key_set.discard(old_flags_key)
-            self._flags_key_map[msg_uid] = new_flags_key
-            self._flags_key_set.add(new_flags_key)
-        if lowest_idx is not None:
-            needs_reset = islice(self._sorted, lowest_idx, len(self._sorted))
-            for seq, uid in enumerate(needs_reset, lowest_idx + 1):
-                self._seqs_cache[uid] = seq
-
-    def _remove(self, uids: Iterable[int], pending: bool) -> None:
-        if pending:
-            self._pending_remove.update(uids)
+    def _read_mod_sequence(self) -> Any:
+        state = self._state
+        self._read_version = state.latest.number
+        return state.mod_sequence
+
+    def _apply(self, messages: Iterable[CachedMessage],
+               expunged: Iterable[int], mod_sequence: Any,
+               pending: bool, uids: Iterable[int] = ()) -> frozenset[int]:
+        state = self._state
+        state.apply(messages, expunged, mod_sequence, uids,
+                    base=self._read_version)
+        self._read_version = state.latest.number
+        return self._advance(pending)
+
+    def _advance(self, pending: bool) -> frozenset[int]:
+        view = self._view
+        latest = self._state.latest
+        if view is latest:
+            return frozenset()
+        view_index = view.index
+        latest_index = latest.index
+        changed = self._state.changed_since(view.number, latest.number)
+        removed = frozenset(uid for uid in chain(changed, view.pending)
+                            if uid in view_index and uid not in latest_index)
+        if pending and removed:
+            index = latest_index.copy()
+            for uid in removed:
+                index.add(uid, view_index.get_value(uid))
+            self._view = _Version(latest.number, index, removed)
         else:
-            any_removed = False
-            for msg_uid in chain(uids, self._pending_remove):
-                try:
-                    self._uids.remove(msg_uid)
-                except KeyError:
-                    pass
-                else:
-                    flags_key = self._flags_key_map[msg_uid]
-                    self._flags_key_set.remove(flags_key)
-                    del self._flags_key_map[msg_uid]
-                    del self._cache[msg_uid]
-                    any_removed = True
-            self._pending_remove.clear()
-            if any_removed:
-                self._sorted = sorted_uids = sorted(self._uids)
-                self._seqs_cache = {uid: seq for seq, uid in
-                                    enumerate(sorted_uids, 1)}
+            self._view = latest
+        return removed
+
+    def _take_changes(self) -> _Changes:
+        before = self._forked
+        after = self._view
+        self._forked = after
+        added: set[int] = set()
+        expunged: list[tuple[int, int]] = []
+        flags: dict[int, int | None] = {}
+        if before is after:
+            return _Changes(added, expunged, flags)
+        before_index = before.index
+        after_index = after.index
+        uidonly = self._uidonly
+        changed = self._state.changed_since(before.number, after.number)
+        changed.update(before.pending, after.pending)
+        for uid in changed:
+            in_after = uid in after_index
+            try:
+                prev_flag_id = before_index.get_value(uid)
+            except KeyError:
+                if in_after:
+                    added.add(uid)
+                    flags[uid] = None
+            else:
+                if not in_after:
+                    seq = 0 if uidonly else before_index.index(uid) + 1
+                    expunged.append((seq, uid))
+                elif after_index.get_value(uid) != prev_flag_id:
+                    flags[uid] = prev_flag_id
+        expunged.sort(reverse=True)
+        return _Changes(added, expunged, flags)
+
+    def get_permanent_flags(self, uid: int) -> frozenset[Flag]:
+        """Return the permanent flags of the message, as last synchronized
+        with the client.
+
+        Args:
+            uid: The message UID.
+
+        Raises:
+            KeyError: The UID does not exist.
+
+        """
+        state = self._state
+        flag_id = self._view.index.get_value(uid)
+        if flag_id == _unknown:
+            msg = state.cache.get(uid)
+            return frozenset() if msg is None else msg.permanent_flags
+        return state.flag_sets[flag_id]
+
+    def render_flags(self, flags: frozenset[Flag]) -> bytes:
+        """Return the flag list for the flag set, rendered as it is sent in
+        a ``FLAGS`` fetch value. The rendered lists are shared by every view
+        of the mailbox.
+
+        Args:
+            flags: The message flags.
+
+        """
+        return self._state.render_flags(flags)
 
     def get(self, uid: int) -> CachedMessage | None:
-        """Return the given cached message.
+        """Return the given cached message, if its metadata is loaded.
+
+        Args:
+            uid: The message UID.
+
+        """
+        if uid in self._view.index:
+            return self._state.cache.get(uid)
+        return None
+
+    def get_seq(self, uid: int) -> int:
+        """Return the message sequence number of the given UID.
 
         Args:
             uid: The message UID.
 
+        Raises:
+            ValueError: The UID does not exist.
+
         """
-        return self._cache.get(uid)
+        return self._view.index.index(uid) + 1
+
+    def _find(self, seq_set: SequenceSet) -> Iterator[tuple[int, int]]:
+        index = self._view.index
+        if seq_set.uid:
+            for low, high in seq_set.ranges(self.max_uid):
+                start = index.bisect_left(low)
+                end = index.bisect_right(high)
+                yield from enumerate(index.islice(start, end), start + 1)
+        else:
+            for low, high in seq_set.ranges(self.exists):
+                yield from enumerate(index.islice(low - 1, high), low)
 
     def get_uids(self, seq_set: SequenceSet) -> Sequence[tuple[int, int]]:
         """Return the message sequence numbers and their UIDs for the given
@@ -165,34 +518,132 @@ class SynchronizedMessages:
             seq_set: The message sequence set.
 
         """
+        return list(self._find(seq_set))
+
+    def get_partial(self, seq_set: SequenceSet, partial: PartialRange) \
+            -> Sequence[tuple[int, int]]:
+        """Like :meth:`.get_uids`, but only the messages in the given range of
+        positions within the sequence set are returned. The positions are
+        found by counting the messages in each range of the sequence set, so
+        the cost is proportional to the size of the *partial* range, not the
+        size of the sequence set.
+
+        Args:
+            seq_set: The message sequence set.
+            partial: The range of positions in the sequence set.
+
+        """
+        index = self._view.index
+        if seq_set.uid:
+            spans = [(index.bisect_left(low), index.bisect_right(high))
+                     for low, high in seq_set.ranges(self.max_uid)]
+        else:
+            spans = [(low - 1, high)
+                     for low, high in seq_set.ranges(self.exists)]
+        total = sum(stop - start for start, stop in spans)
+        skip, stop = partial.bounds(total)
+        remaining = stop - skip
+        ret: list[tuple[int, int]] = []
+        for span_start, span_stop in spans:
+            if remaining <= 0:
+                break
+            size = span_stop - span_start
+            if skip >= size:
+                skip -= size
+                continue
+            start = span_start + skip
+            end = min(span_stop, start + remaining)
+            ret.extend(enumerate(index.islice(start, end), start + 1))
+            remaining -= end - start
+            skip = 0
+        return ret
+
+    def find_uids(self, seq_set: SequenceSet, uids: Iterable[int]) \
+            -> Sequence[tuple[int, int]]:
+        """Return the message sequence numbers and UIDs of the given message
+        UIDs that exist and are contained in the sequence set. Unlike
+        :meth:`.get_uids`, the cost is proportional to the number of *uids*,
+        not the size of the sequence set.
+
+        Args:
+            seq_set: The message sequence set.
+            uids: The message UIDs to look for.
+
+        """
+        index = self._view.index
         if seq_set.uid:
-            all_uids = seq_set.flatten(self.max_uid) & self._uids
-            return [(seq, uid) for seq, uid in enumerate(self._sorted, 1)
-                    if uid in all_uids]
+            ranges = seq_set.ranges(self.max_uid)
         else:
-            all_seqs = seq_set.flatten(self.exists)
-            return [(seq, uid) for seq, uid in enumerate(self._sorted, 1)
-                    if seq in all_seqs]
+            ranges = seq_set.ranges(self.exists)
+        lows = [low for low, _ in ranges]
+        ret: list[tuple[int, int]] = []
+        for uid in sorted(uids):
+            if uid not in index:
+                continue
+            seq = index.index(uid) + 1
+            value = uid if seq_set.uid else seq
+            idx = bisect_right(lows, value) - 1
+            if idx >= 0 and value <= ranges[idx][1]:
+                ret.append((seq, uid))
+        return ret
+
+    def get_vanished(self, uid_set: SequenceSet) -> SequenceSet | None:
+        """Return the UIDs in the given set that do not exist, as last
+        synchronized with the client. This may include UIDs that were never
+        assigned to a message, which is allowed by the ``VANISHED`` response.
+
+        See Also:
+            `RFC 7162 3.2.10.
+            <https://tools.ietf.org/html/rfc7162#section-3.2.10>`_
+
+        Args:
+            uid_set: The message UID set.
+
+        """
+        index = self._view.index
+        max_uid = max(chain([self.max_uid], (
+            value for elem in uid_set.value
+            for value in (elem if isinstance(elem, tuple) else (elem, ))
+            if isinstance(value, int))))
+        vanished: list[int | tuple[int, int]] = []
+        for low, high in uid_set.ranges(max_uid):
+            start = index.bisect_left(low)
+            end = index.bisect_right(high)
+            prev = low - 1
+            for uid in chain(index.islice(start, end), [high + 1]):
+                if uid == prev + 2:
+                    vanished.append(prev + 1)
+                elif uid > prev + 2:
+                    vanished.append((prev + 1, uid - 1))
+                prev = uid
+        if not vanished:
+            return None
+        return SequenceSet(vanished, uid=True)
+
+    def get_unloaded(self, seq_set: SequenceSet) -> Sequence[int]:
+        """Return the message UIDs in the given sequence set that have no
+        cached metadata loaded.
+
+        Args:
+            seq_set: The message sequence set.
+
+        """
+        cache = self._state.cache
+        return [uid for _, uid in self._find(seq_set) if uid not in cache]
 
     def get_all(self, seq_set: SequenceSet) \
             -> Sequence[tuple[int, CachedMessage]]:
         """Return the cached messages, and their sequence numbers, for the
-        given sequence set.
+        given sequence set. Messages with no cached metadata loaded are not
+        included.
 
         Args:
             seq_set: The message sequence set.
 
         """
-        if seq_set.uid:
-            all_uids = seq_set.flatten(self.max_uid) & self._uids
-            return [(seq, self._cache[uid])
-                    for seq, uid in enumerate(self._sorted, 1)
-                    if uid in all_uids]
-        else:
-            all_seqs = seq_set.flatten(self.exists)
-            return [(seq, self._cache[uid])
-                    for seq, uid in enumerate(self._sorted, 1)
-                    if seq in all_seqs]
+        cache = self._state.cache
+        return [(seq, cache[uid]) for seq, uid in self._find(seq_set)
+                if uid in cache]
 
 
 class SelectedMailbox:
@@ -218,6 +669,7 @@ class SelectedMailbox:
     __slots__ = ['_mailbox_id', '_readonly', '_permanent_flags',
                  '_session_flags', '_selected_set', '_kwargs', '_lookup',
                  '_mod_sequence', '_is_deleted', '_hide_expunged',
+                 '_condstore', '_qresync', '_saved_result',
                  '_silenced_flags', '_silenced_sflags', '_prev', '_messages',
                  '__weakref__']
 
@@ -234,16 +686,20 @@ class SelectedMailbox:
         self._selected_set = selected_set
         self._kwargs = kwargs
         self._lookup: Any = lookup
-        self._mod_sequence = kwargs.get('_mod_sequence')
+        self._mod_sequence: Any = _missing
         self._is_deleted = False
         self._hide_expunged = False
+        self._condstore = False
+        self._qresync = False
+        self._saved_result = SequenceSet([], uid=True)
         self._silenced_flags: set[tuple[int, frozenset[Flag]]] = set()
         self._silenced_sflags: set[tuple[int, frozenset[Flag]]] = set()
         self._prev: _Frozen | None = kwargs.get('_prev')
         try:
             self._messages: SynchronizedMessages = kwargs['_messages']
         except KeyError:
-            self._messages = SynchronizedMessages()
+            self._messages = SynchronizedMessages(selected_set)
+        self._messages._read_mod_sequence()
         if selected_set is not None:
             selected_set.add(self)
 
@@ -272,8 +728,13 @@ class SelectedMailbox:
 
     @property
     def mod_sequence(self) -> Any:
-        """The highest modification sequence of the mailbox."""
-        return self._mod_sequence
+        """The highest modification sequence of the mailbox, as last applied to
+        the state shared by all sessions. If another session applies updates
+        after this value is read, the next :meth:`.add_updates` is ignored
+        and the messages are synchronized with that session's updates instead.
+
+        """
+        return self._messages._read_mod_sequence()
 
     @mod_sequence.setter
     def mod_sequence(self, mod_sequence: Any) -> None:
@@ -281,9 +742,9 @@ class SelectedMailbox:
 
     @property
     def hide_expunged(self) -> bool:
-        """If True, no untagged ``EXPUNGE`` responses will be generated, and
-        message sequence numbers will not be adjusted, until the next
-        :meth:`.fork`.
+        """If True, messages expunged after this is set will not generate
+        untagged ``EXPUNGE`` responses, and message sequence numbers will not
+        be adjusted, until the next :meth:`.fork`.
 
         """
         return self._hide_expunged
@@ -292,6 +753,87 @@ class SelectedMailbox:
     def hide_expunged(self, hide_expunged: bool) -> None:
         self._hide_expunged = hide_expunged
 
+    @property
+    def condstore(self) -> bool:
+        """If True, untagged ``FETCH`` responses will include the ``MODSEQ``
+        of the message.
+
+        See Also:
+            `RFC 7162 3.1.
+            <https://tools.ietf.org/html/rfc7162#section-3.1>`_
+
+        """
+        return self._condstore
+
+    @condstore.setter
+    def condstore(self, condstore: bool) -> None:
+        self._condstore = condstore
+
+    @property
+    def qresync(self) -> bool:
+        """If True, expunged messages will be reported with an untagged
+        ``VANISHED`` response instead of ``EXPUNGE`` responses, and untagged
+        ``FETCH`` responses will always include the ``UID``.
+
+        See Also:
+            `RFC 7162 3.2.
+            <https://tools.ietf.org/html/rfc7162#section-3.2>`_
+
+        """
+        return self._qresync
+
+    @qresync.setter
+    def qresync(self, qresync: bool) -> None:
+        self._qresync = qresync
+
+    @property
+    def uidonly(self) -> bool:
+        """If True, expunged messages will be reported with an untagged
+        ``VANISHED`` response and updated messages with an untagged
+        ``UIDFETCH`` response, without looking up their message sequence
+        numbers.
+
+        See Also:
+            `RFC 9586 <https://tools.ietf.org/html/rfc9586>`_
+
+        """
+        return self._messages.uidonly
+
+    @uidonly.setter
+    def uidonly(self, uidonly: bool) -> None:
+        self._messages.uidonly = uidonly
+
+    @property
+    def saved_result(self) -> SequenceSet:
+        """The UIDs of the messages saved by the last ``SEARCH`` command that
+        used the ``SAVE`` result option.
+
+        See Also:
+            `RFC 5182 2.1. <https://tools.ietf.org/html/rfc5182#section-2.1>`_
+
+        """
+        return self._saved_result
+
+    @saved_result.setter
+    def saved_result(self, uids: Iterable[int]) -> None:
+        uids_list = list(uids)
+        if uids_list:
+            self._saved_result = SequenceSet.build(uids_list, uid=True)
+        else:
+            self._saved_result = SequenceSet([], uid=True)
+
+    def resolve(self, seq_set: SequenceSet) -> SequenceSet:
+        """Return the :attr:`.saved_result` if the sequence set refers to it
+        with ``$``, otherwise the sequence set is returned unchanged.
+
+        Args:
+            seq_set: The message sequence set.
+
+        """
+        if seq_set.is_saved:
+            return self._saved_result
+        return seq_set
+
     def add_updates(self, messages: Iterable[CachedMessage],
                     expunged: Iterable[int]) -> None:
         """Update the messages in the selected mailboxes. The ``messages``
@@ -303,7 +845,10 @@ class SelectedMailbox:
         or messages with metadata updates.  This minimizes the comparison
         needed to determine what untagged responses are necessary. The
         :attr:`.mod_sequence` attribute may be used to support this
-        optimization.
+        optimization. If another session applied updates after
+        :attr:`.mod_sequence` was read, these updates are still applied, but
+        a message changed by both keeps the version with the higher
+        :attr:`~pymap.interfaces.message.CachedMessage.mod_seq`.
 
         If a backend implementation lacks the ability to determine the subset
         of messages that have been updated, it should instead use
@@ -314,10 +859,17 @@ class SelectedMailbox:
             expunged: The set of message UIDs that have been expunged.
 
         """
-        self._messages._update(messages)
-        self._messages._remove(expunged, self._hide_expunged)
+        self._add_updates(messages, expunged)
+
+    def _add_updates(self, messages: Iterable[CachedMessage],
+                     expunged: Iterable[int], uids: Iterable[int] = ()) \
+            -> None:
+        mod_sequence = self._mod_sequence
+        self._mod_sequence = _missing
+        removed = self._messages._apply(messages, expunged, mod_sequence,
+                                        self._hide_expunged, uids)
         if not self._hide_expunged:
-            self._session_flags.remove(expunged)
+            self._session_flags.remove(removed)
 
     def set_messages(self, messages: Sequence[CachedMessage]) -> None:
         """This is the non-optimized alternative to :meth:`.add_updates` for
@@ -333,9 +885,45 @@ class SelectedMailbox:
 
         """
         uids = {msg.uid for msg in messages}
-        expunged = self._messages._uids - uids
+        expunged = [uid for uid in self._messages._state.latest.index
+                    if uid not in uids]
         return self.add_updates(messages, expunged)
 
+    def set_uids(self, uids: Iterable[int]) -> None:
+        """This is the lazy alternative to :meth:`.set_messages`, for backend
+        implementations that can list the message UIDs in the mailbox much
+        faster than their metadata. Metadata is loaded later, as the messages
+        are accessed, by
+        :meth:`~pymap.backend.mailbox.MailboxDataInterface.get_cached`.
+
+        The ``uids`` should contain every message UID in the mailbox. Any UID
+        that previously existed and is not included will be expunged, and
+        existing messages are otherwise unchanged.
+
+        Args:
+            uids: The entire set of message UIDs.
+
+        """
+        uids = frozenset(uids)
+        expunged = [uid for uid in self._messages._state.latest.index
+                    if uid not in uids]
+        self._add_updates((), expunged, uids)
+
+    def add_cached(self, messages: Iterable[CachedMessage]) -> None:
+        """Add the metadata of messages that were added by :meth:`.set_uids`.
+        Unlike :meth:`.add_updates`, this does not produce any untagged
+        responses.
+
+        Args:
+            messages: The cached message objects that were loaded.
+
+        """
+        index = self._messages._view.index
+        cache = self._messages._state.cache
+        for msg in messages:
+            if msg.uid in index:
+                cache[msg.uid] = msg
+
     @property
     def readonly(self) -> bool:
         """Indicates the mailbox is selected as read-only."""
@@ -399,45 +987,66 @@ class SelectedMailbox:
 
         """
         frozen = _Frozen(self)
+        changes = self._messages._take_changes()
         cls = type(self)
         copy = cls(self._mailbox_id, self._readonly, self._permanent_flags,
                    self._session_flags, self._selected_set, self._lookup,
-                   _mod_sequence=self._mod_sequence,
                    _prev=frozen, _messages=self._messages)
+        copy._condstore = self._condstore
+        copy._qresync = self._qresync
+        copy._saved_result = self._saved_result
         if self._prev is not None:
             with_uid: bool = getattr(command, 'uid', False)
-            untagged = self._compare(self._prev, frozen, with_uid)
+            untagged = self._compare(self._prev, frozen, changes, with_uid)
         else:
             untagged = []
         return copy, untagged
 
-    def _compare(self, before: _Frozen, after: _Frozen,
-                 with_uid: bool) -> Iterable[UntaggedResponse]:
+    def _compare(self, before: _Frozen, after: _Frozen, changes: _Changes,
+                 with_uid: bool) -> Sequence[UntaggedResponse]:
         if after.is_deleted:
-            yield ResponseBye(b'Selected mailbox no longer exists.')
-            return
-        cache = self._messages._cache
+            return [ResponseBye(b'Selected mailbox no longer exists.')]
+        messages = self._messages
+        get_permanent_flags = messages.get_permanent_flags
+        silenced_flags = self._silenced_flags
         session_flags = self._session_flags
-        expunged_uids = before.uids - after.uids
-        new_uids = after.uids - before.uids
-        if not self._hide_expunged and expunged_uids:
-            for uid in sorted(expunged_uids, reverse=True):
-                yield ExpungeResponse(before.seqs_cache[uid])
-        if new_uids:
-            yield ExistsResponse(len(after.uids))
+        untagged: list[UntaggedResponse] = []
+        if not changes.expunged:
+            pass
+        elif self._qresync or messages.uidonly:
+            untagged.append(VanishedResponse(SequenceSet.build(
+                (uid for _, uid in changes.expunged), uid=True)))
+        else:
+            untagged.extend(ExpungeResponse(seq)
+                            for seq, _ in changes.expunged)
+        if changes.added:
+            untagged.append(ExistsResponse(messages.exists))
         if len(after.recent) != len(before.recent):
-            yield RecentResponse(len(after.recent))
+            untagged.append(RecentResponse(len(after.recent)))
         new_recent = (after.recent - before.recent)
-        new_flags = (after.flags - before.flags - self._silenced_flags)
+        index = messages._view.index
+        new_flags = [uid for uid, prev_id in changes.flags.items()
+                     if index.get_value(uid) not in (prev_id, _unknown)
+                     and (uid, get_permanent_flags(uid)) not in silenced_flags]
         new_sflags = (after.sflags - before.sflags - self._silenced_sflags)
-        fetch_uids = chain(new_recent,
-                           (uid for uid, _ in new_flags),
+        fetch_uids = chain(new_recent, new_flags,
                            (uid for uid, _ in new_sflags))
+        uidonly = messages.uidonly
+        render_flags = messages.render_flags
         for uid, _ in groupby(sorted(fetch_uids)):
-            seq = after.seqs_cache[uid]
-            msg_flags = cache[uid].get_flags(session_flags)
+            msg_flags = get_permanent_flags(uid) | session_flags.get(uid)
             fetch_data: list[FetchValue] = [
-                FetchValue.of(_flags_attr, List(msg_flags, sort=True))]
-            if with_uid:
-                fetch_data.append(FetchValue.of(_uid_attr, Number(uid)))
-            yield FetchResponse(seq, fetch_data)
+                FetchValue.of(_flags_attr, render_flags(msg_flags))]
+            if (with_uid or self._qresync) and not uidonly:
+                fetch_data.append(FetchValue.of(_uid_attr, b'%i' % uid))
+            if self._condstore:
+                msg = messages.get(uid)
+                mod_seq = msg.mod_seq if msg is not None else 0
+                fetch_data.append(FetchValue.of(
+                    _modseq_attr, b'(%i)' % max(mod_seq, 1)))
+            if uidonly:
+                untagged.append(UidFetchResponse(uid, fetch_data))
+            else:
+                seq = messages.get_seq(uid)
+                untagged.append(FetchResponse(seq, fetch_data))
+        return untagged
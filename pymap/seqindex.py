@@ -0,0 +1,388 @@
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import ClassVar, Self
+
+__all__ = ['SequenceIndex']
+
+
+class SequenceIndex:
+    """An ordered set of message UIDs that can efficiently translate between
+    a UID and its message sequence number, as messages are added and removed.
+
+    UIDs are kept in sorted ``array('I')`` blocks of bounded size, alongside
+    an unsigned integer value for each UID, using eight bytes per message in
+    total. The block sizes are tracked with a Fenwick tree. Looking up a UID
+    by position, or the position of a UID, takes ``O(log n)`` time, as do
+    inserts and removals anywhere in the mailbox. Positions are zero-based, so
+    the sequence number of a UID is its position plus one.
+
+    Blocks are shared between an index and its :meth:`.copy`, and are only
+    copied when one of the indexes modifies them.
+
+    Args:
+        uids: The initial message UIDs.
+        values: The values associated with each initial UID, in the same
+            order.
+
+    """
+
+    __slots__ = ['_lists', '_values', '_maxes', '_owned', '_tree', '_len']
+
+    #: The target number of UIDs in each block.
+    load: ClassVar[int] = 1000
+
+    def __init__(self, uids: Iterable[int] = (),
+                 values: Iterable[int] | None = None) -> None:
+        super().__init__()
+        self._lists: list[array[int]] = []
+        self._values: list[array[int]] = []
+        self._maxes: list[int] = []
+        self._owned: list[bool] = []
+        self._tree: list[int] | None = None
+        self._len = 0
+        self.update(uids, values)
+
+    def copy(self) -> Self:
+        """Return a copy of the index, in ``O(n / load)`` time. The blocks
+        of UIDs are shared by both indexes until they are modified.
+
+        """
+        cls = type(self)
+        copy = cls.__new__(cls)
+        copy._lists = self._lists.copy()
+        copy._values = self._values.copy()
+        copy._maxes = self._maxes.copy()
+        copy._owned = [False] * len(self._lists)
+        self._owned = [False] * len(self._lists)
+        copy._tree = None if self._tree is None else self._tree.copy()
+        copy._len = self._len
+        return copy
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._lists)
+
+    def __contains__(self, uid: object) -> bool:
+        if not isinstance(uid, int):
+            return False
+        maxes = self._maxes
+        idx = bisect_left(maxes, uid)
+        if idx == len(maxes):
+            return False
+        block = self._lists[idx]
+        return block[bisect_left(block, uid)] == uid
+
+    def __getitem__(self, pos: int) -> int:
+        if pos < 0:
+            pos += self._len
+        if pos < 0 or pos >= self._len:
+            raise IndexError(pos)
+        if pos == self._len - 1:
+            return self._maxes[-1]
+        idx, offset = self._locate(pos)
+        return self._lists[idx][offset]
+
+    def _build_tree(self) -> list[int]:
+        tree = [len(block) for block in self._lists]
+        size = len(tree)
+        for i in range(size):
+            parent = i | (i + 1)
+            if parent < size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        return tree
+
+    def _tree_add(self, idx: int, delta: int) -> None:
+        tree = self._tree
+        if tree is not None:
+            size = len(tree)
+            while idx < size:
+                tree[idx] += delta
+                idx |= idx + 1
+
+    def _prefix(self, idx: int) -> int:
+        tree = self._tree
+        if tree is None:
+            tree = self._build_tree()
+        total = 0
+        while idx > 0:
+            total += tree[idx - 1]
+            idx &= idx - 1
+        return total
+
+    def _locate(self, pos: int) -> tuple[int, int]:
+        tree = self._tree
+        if tree is None:
+            tree = self._build_tree()
+        size = len(tree)
+        idx = 0
+        step = 1 << (size.bit_length() - 1)
+        while step:
+            next_idx = idx + step
+            if next_idx <= size and tree[next_idx - 1] <= pos:
+                pos -= tree[next_idx - 1]
+                idx = next_idx
+            step >>= 1
+        return idx, pos
+
+    def _own(self, idx: int) -> None:
+        owned = self._owned
+        if not owned[idx]:
+            self._lists[idx] = self._lists[idx][:]
+            self._values[idx] = self._values[idx][:]
+            owned[idx] = True
+
+    def _split(self, idx: int) -> None:
+        block = self._lists[idx]
+        load = self.load
+        if len(block) > load * 2:
+            values = self._values[idx]
+            self._lists.insert(idx + 1, block[load:])
+            self._values.insert(idx + 1, values[load:])
+            self._owned.insert(idx + 1, True)
+            del block[load:]
+            del values[load:]
+            self._maxes.insert(idx, block[-1])
+            self._tree = None
+
+    def _join(self, idx: int) -> None:
+        lists = self._lists
+        values = self._values
+        maxes = self._maxes
+        owned = self._owned
+        if not lists[idx]:
+            del lists[idx]
+            del values[idx]
+            del maxes[idx]
+            del owned[idx]
+            self._tree = None
+        elif len(lists[idx]) < self.load // 2 and len(lists) > 1:
+            if idx == 0:
+                idx = 1
+            self._own(idx - 1)
+            prev = lists[idx - 1]
+            prev.extend(lists[idx])
+            values[idx - 1].extend(values[idx])
+            maxes[idx - 1] = prev[-1]
+            del lists[idx]
+            del values[idx]
+            del maxes[idx]
+            del owned[idx]
+            self._tree = None
+            self._split(idx - 1)
+
+    def _find(self, uid: int) -> tuple[int, int]:
+        maxes = self._maxes
+        idx = bisect_left(maxes, uid)
+        if idx < len(maxes):
+            block = self._lists[idx]
+            pos = bisect_left(block, uid)
+            if block[pos] == uid:
+                return idx, pos
+        raise KeyError(uid)
+
+    def add(self, uid: int, value: int = 0) -> bool:
+        """Add a message UID to the index.
+
+        Args:
+            uid: The message UID.
+            value: An unsigned integer value associated with the UID.
+
+        Returns:
+            True if the UID was added, False if it already existed.
+
+        """
+        lists = self._lists
+        maxes = self._maxes
+        if not maxes:
+            lists.append(array('I', [uid]))
+            self._values.append(array('I', [value]))
+            self._owned.append(True)
+            maxes.append(uid)
+            self._tree = None
+            self._len = 1
+            return True
+        idx = bisect_left(maxes, uid)
+        if idx == len(maxes):
+            idx -= 1
+            self._own(idx)
+            lists[idx].append(uid)
+            self._values[idx].append(value)
+            maxes[idx] = uid
+        else:
+            block = lists[idx]
+            pos = bisect_left(block, uid)
+            if block[pos] == uid:
+                return False
+            self._own(idx)
+            block = lists[idx]
+            block.insert(pos, uid)
+            self._values[idx].insert(pos, value)
+        self._len += 1
+        self._tree_add(idx, 1)
+        self._split(idx)
+        return True
+
+    def update(self, uids: Iterable[int],
+               values: Iterable[int] | None = None) -> None:
+        """Add many message UIDs to the index. This is fastest when the UIDs
+        are all higher than any existing UID, as is the case when a mailbox is
+        first loaded.
+
+        Args:
+            uids: The message UIDs.
+            values: The values associated with each UID, in the same order.
+
+        """
+        if values is None:
+            new_items = dict.fromkeys(uids, 0)
+        else:
+            new_items = dict(zip(uids, values, strict=True))
+        items = sorted(new_items.items())
+        if not items:
+            return
+        elif self._maxes and items[0][0] <= self._maxes[-1]:
+            for uid, value in items:
+                self.add(uid, value)
+            return
+        load = self.load
+        for i in range(0, len(items), load):
+            chunk = items[i:i + load]
+            block = array('I', [uid for uid, _ in chunk])
+            self._lists.append(block)
+            self._values.append(array('I', [value for _, value in chunk]))
+            self._owned.append(True)
+            self._maxes.append(block[-1])
+        self._len += len(items)
+        self._tree = None
+
+    def remove(self, uid: int) -> int:
+        """Remove a message UID from the index.
+
+        Args:
+            uid: The message UID.
+
+        Returns:
+            The value that was associated with the UID.
+
+        Raises:
+            KeyError: The UID was not in the index.
+
+        """
+        idx, pos = self._find(uid)
+        self._own(idx)
+        block = self._lists[idx]
+        values = self._values[idx]
+        value = values[pos]
+        del block[pos]
+        del values[pos]
+        self._len -= 1
+        self._tree_add(idx, -1)
+        if block:
+            self._maxes[idx] = block[-1]
+        self._join(idx)
+        return value
+
+    def get_value(self, uid: int) -> int:
+        """Return the value associated with the message UID.
+
+        Args:
+            uid: The message UID.
+
+        Raises:
+            KeyError: The UID was not in the index.
+
+        """
+        idx, pos = self._find(uid)
+        return self._values[idx][pos]
+
+    def set_value(self, uid: int, value: int) -> None:
+        """Change the value associated with the message UID.
+
+        Args:
+            uid: The message UID.
+            value: An unsigned integer value associated with the UID.
+
+        Raises:
+            KeyError: The UID was not in the index.
+
+        """
+        idx, pos = self._find(uid)
+        self._own(idx)
+        self._values[idx][pos] = value
+
+    def index(self, uid: int) -> int:
+        """Return the zero-based position of the message UID.
+
+        Args:
+            uid: The message UID.
+
+        Raises:
+            ValueError: The UID was not in the index.
+
+        """
+        try:
+            idx, pos = self._find(uid)
+        except KeyError as exc:
+            raise ValueError(uid) from exc
+        return self._prefix(idx) + pos
+
+    def bisect_left(self, uid: int) -> int:
+        """Return the position where the message UID would be inserted, before
+        any existing entry for the UID.
+
+        Args:
+            uid: The message UID.
+
+        """
+        maxes = self._maxes
+        idx = bisect_left(maxes, uid)
+        if idx == len(maxes):
+            return self._len
+        return self._prefix(idx) + bisect_left(self._lists[idx], uid)
+
+    def bisect_right(self, uid: int) -> int:
+        """Return the position where the message UID would be inserted, after
+        any existing entry for the UID.
+
+        Args:
+            uid: The message UID.
+
+        """
+        maxes = self._maxes
+        idx = bisect_right(maxes, uid)
+        if idx == len(maxes):
+            return self._len
+        return self._prefix(idx) + bisect_right(self._lists[idx], uid)
+
+    def islice(self, start: int, stop: int) -> Iterator[int]:
+        """Iterate the message UIDs from position ``start`` up to, but not
+        including, position ``stop``.
+
+        Args:
+            start: The starting position.
+            stop: The stopping position.
+
+        """
+        stop = min(stop, self._len)
+        if start >= stop:
+            return
+        lists = self._lists
+        idx, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            part = lists[idx][offset:offset + remaining]
+            yield from part
+            remaining -= len(part)
+            idx += 1
+            offset = 0
@@ -50,6 +50,8 @@ class ManageSieveService(ServiceInterface):  # pragma: no cover
 
     """
 
+    per_worker = True
+
     @classmethod
     def add_arguments(cls, parser: ArgumentParser) -> None:
         group = parser.add_argument_group('managesieve service')
@@ -67,7 +69,8 @@ class ManageSieveService(ServiceInterface):  # pragma: no cover
         host: str | None = config.args.sieve_host
         port: str | int = config.args.sieve_port
         server = await asyncio.start_server(
-            managesieve_server_cb, host=host, port=port)
+            managesieve_server_cb, host=host, port=port,
+            reuse_port=config.workers > 1)
         await stack.enter_async_context(server)
         task = asyncio.create_task(server.serve_forever())
         stack.callback(task.cancel)
@@ -158,7 +161,8 @@ class ManageSieveConnection:
         return ret
 
     @classmethod
-    def _print(cls, log_format: str, output: str | bytes) -> None:
+    def _print(cls, log_format: str,
+               output: str | bytes | bytearray | memoryview) -> None:
         if _log.isEnabledFor(logging.DEBUG):
             fd = socket_info.get().socket.fileno()
             if not isinstance(output, str):
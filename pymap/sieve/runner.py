@@ -26,7 +26,7 @@ class SieveRunner:
                     append_msg: AppendMessage) -> Sequence[Command]:
         actions: list[Command] = []
         try:
-            content = MessageContent.parse(append_msg.literal)
+            content = MessageContent.parse(bytes(append_msg.literal))
             self._get_actions(actions, sender, recipient, append_msg, content)
         except StopRunning:
             pass
@@ -0,0 +1,441 @@
+"""Utilities for sorting and threading messages with the ``SORT`` and
+``THREAD`` commands.
+
+See Also:
+    `RFC 5256 <https://tools.ietf.org/html/rfc5256>`_
+
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timezone
+from email.headerregistry import AddressHeader
+from typing import Any, Final, TypeAlias
+
+from .interfaces.message import MessageInterface, LoadedMessageInterface
+from .parsing.specials import ObjectId, SortKey
+from .threads import ThreadNode
+
+__all__ = ['SortHeaders', 'SortHeadersCache', 'SortedMessage',
+           'sort_messages', 'thread_messages']
+
+#: A message sequence number, message, and its sort headers.
+SortedMessage: TypeAlias = tuple[int, MessageInterface, 'SortHeaders']
+
+_Thread: TypeAlias = ThreadNode[tuple[int, MessageInterface]]
+
+
+class SortHeaders:
+    """The values derived from the headers of a message that are used to sort
+    and thread it. These values never change for a given
+    :attr:`~pymap.interfaces.message.MessageInterface.email_id`, so they may
+    be cached with :class:`SortHeadersCache`.
+
+    Args:
+        date: The ``Date`` header value, if valid.
+        subject: The base subject, with ``Re:`` and similar removed.
+        is_reply: True if the subject indicated a reply or forward.
+        from_: The mailbox of the first ``From`` address.
+        to: The mailbox of the first ``To`` address.
+        cc: The mailbox of the first ``Cc`` address.
+        message_id: The ``Message-Id`` header value.
+        references: The message IDs of the parents of the message.
+        size: The size of the message, if it was loaded.
+
+    """
+
+    __slots__ = ['date', 'subject', 'is_reply', 'from_', 'to', 'cc',
+                 'message_id', 'references', 'size']
+
+    _whitespace = re.compile(r'\s+')
+    _msg_id_pattern = re.compile(r'<[^>]*>')
+    _blob = r'\[[^\[\]]*\]\s*'
+    _trailer_pattern = re.compile(r'\s*\(fwd\)\s*$', re.I)
+    _refwd_pattern = re.compile(
+        r'(?:%s)*(?:re|fwd?)\s*(?:%s)?:\s*' % (_blob, _blob), re.I)
+    _blob_pattern = re.compile(_blob)
+    _fwd_pattern = re.compile(r'\[fwd:(.*)\]', re.I)
+
+    def __init__(self, date: datetime | None, subject: bytes,
+                 is_reply: bool, from_: bytes, to: bytes, cc: bytes,
+                 message_id: str | None, references: Sequence[str],
+                 size: int | None) -> None:
+        super().__init__()
+        self.date: Final = date
+        self.subject: Final = subject
+        self.is_reply: Final = is_reply
+        self.from_: Final = from_
+        self.to: Final = to
+        self.cc: Final = cc
+        self.message_id: Final = message_id
+        self.references: Final = references
+        self.size: Final = size
+
+    @classmethod
+    def get_base_subject(cls, subject: str) -> tuple[str, bool]:
+        """Return the base subject used to sort and thread messages, and
+        whether the subject indicated a reply or forward.
+
+        See Also:
+            `RFC 5256 2.1. <https://tools.ietf.org/html/rfc5256#section-2.1>`_
+
+        Args:
+            subject: The decoded ``Subject`` header value.
+
+        """
+        subject = cls._whitespace.sub(' ', subject).strip()
+        is_reply = False
+        while True:
+            while True:
+                match = cls._trailer_pattern.search(subject)
+                if match is None:
+                    break
+                subject = subject[:match.start(0)]
+                is_reply = True
+            while True:
+                before = subject
+                match = cls._refwd_pattern.match(subject)
+                if match is not None:
+                    subject = subject[match.end(0):]
+                    is_reply = True
+                match = cls._blob_pattern.match(subject)
+                if match is not None and match.end(0) < len(subject):
+                    subject = subject[match.end(0):]
+                if subject == before:
+                    break
+            match = cls._fwd_pattern.fullmatch(subject)
+            if match is None:
+                return subject, is_reply
+            subject = match.group(1).strip()
+            is_reply = True
+
+    @classmethod
+    def _get_mailbox(cls, headers: Sequence[AddressHeader] | None) -> bytes:
+        for header in headers or []:
+            for address in header.addresses:
+                return address.username.encode('utf-8', 'replace').upper()
+        return b''
+
+    @classmethod
+    def _get_msg_ids(cls, value: Any) -> Sequence[str]:
+        if value is None:
+            return []
+        return [cls._whitespace.sub('', match.group(0))
+                for match in cls._msg_id_pattern.finditer(str(value))]
+
+    @classmethod
+    def parse(cls, loaded: LoadedMessageInterface, *,
+              with_size: bool = False) -> SortHeaders:
+        """Parse the sort headers from the loaded message content.
+
+        Args:
+            loaded: The loaded message content.
+            with_size: True if the message size should be included, which
+                requires the message body.
+
+        """
+        envelope = loaded.get_envelope_structure()
+        date: datetime | None = None
+        if envelope.date is not None:
+            date = envelope.date.datetime
+        base_subject, is_reply = cls.get_base_subject(
+            str(envelope.subject or ''))
+        subject = base_subject.encode('utf-8', 'replace').upper()
+        message_ids = cls._get_msg_ids(envelope.message_id)
+        references: Sequence[str] = [
+            msg_id for header in loaded.get_header(b'references')
+            for msg_id in cls._get_msg_ids(header)]
+        if not references:
+            references = cls._get_msg_ids(envelope.in_reply_to)[0:1]
+        size = loaded.get_size() if with_size else None
+        return cls(date, subject, is_reply, cls._get_mailbox(envelope.from_),
+                   cls._get_mailbox(envelope.to),
+                   cls._get_mailbox(envelope.cc),
+                   message_ids[0] if message_ids else None, references, size)
+
+    def get_sent_date(self, msg: MessageInterface) -> datetime:
+        """The date the message was sent, falling back to the internal date of
+        the message if the ``Date`` header was missing or invalid.
+
+        Args:
+            msg: The message.
+
+        """
+        return _utc(self.date or msg.internal_date)
+
+
+class SortHeadersCache:
+    """Caches the :class:`SortHeaders` of messages by email object ID, so
+    that repeated ``SORT`` and ``THREAD`` commands do not need to load and
+    parse the message headers again.
+
+    Args:
+        max_size: The maximum number of entries in the cache.
+
+    """
+
+    __slots__ = ['max_size', '_cache']
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size: Final = max_size
+        self._cache: OrderedDict[ObjectId, SortHeaders] = OrderedDict()
+
+    def get(self, email_id: ObjectId) -> SortHeaders | None:
+        """Return the cached sort headers of the email, if available.
+
+        Args:
+            email_id: The email object ID.
+
+        """
+        headers = self._cache.get(email_id)
+        if headers is not None:
+            self._cache.move_to_end(email_id)
+        return headers
+
+    def add(self, email_id: ObjectId, headers: SortHeaders) -> None:
+        """Add the sort headers of the email to the cache, evicting the least
+        recently used entries as needed.
+
+        Args:
+            email_id: The email object ID.
+            headers: The sort headers of the email.
+
+        """
+        if self.max_size <= 0:
+            return
+        cache = self._cache
+        cache[email_id] = headers
+        cache.move_to_end(email_id)
+        while len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+
+def _utc(when: datetime) -> datetime:
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when
+
+
+def _get_sort_func(key: bytes) -> Callable[[SortedMessage], Any]:
+    if key == b'ARRIVAL':
+        return lambda item: _utc(item[1].internal_date)
+    elif key == b'DATE':
+        return lambda item: item[2].get_sent_date(item[1])
+    elif key == b'SIZE':
+        return lambda item: item[2].size or 0
+    elif key == b'SUBJECT':
+        return lambda item: item[2].subject
+    elif key == b'FROM':
+        return lambda item: item[2].from_
+    elif key == b'TO':
+        return lambda item: item[2].to
+    elif key == b'CC':
+        return lambda item: item[2].cc
+    raise ValueError(key)
+
+
+def sort_messages(messages: Iterable[SortedMessage],
+                  sort_keys: Sequence[SortKey]) -> Sequence[SortedMessage]:
+    """Sort the messages by the given sort criteria. Messages that are equal
+    by every sort criteria are ordered by message sequence number.
+
+    Args:
+        messages: The messages to sort.
+        sort_keys: The sort criteria, in order of precedence.
+
+    """
+    ret = sorted(messages, key=lambda item: item[0])
+    for sort_key in reversed(sort_keys):
+        ret.sort(key=_get_sort_func(sort_key.value), reverse=sort_key.reverse)
+    return ret
+
+
+class _Container:
+
+    __slots__ = ['item', 'parent', 'children']
+
+    def __init__(self, item: SortedMessage | None = None) -> None:
+        super().__init__()
+        self.item = item
+        self.parent: _Container | None = None
+        self.children: list[_Container] = []
+
+    @property
+    def first(self) -> SortedMessage:
+        if self.item is not None:
+            return self.item
+        return self.children[0].first
+
+    def has_descendant(self, other: _Container) -> bool:
+        node: _Container | None = other
+        while node is not None:
+            if node is self:
+                return True
+            node = node.parent
+        return False
+
+    def set_parent(self, parent: _Container | None) -> None:
+        if self.parent is not None:
+            self.parent.children.remove(self)
+        self.parent = parent
+        if parent is not None:
+            parent.children.append(self)
+
+    def sort(self) -> None:
+        for child in self.children:
+            child.sort()
+        self.children.sort(key=_Container.sort_key)
+
+    def sort_key(self) -> tuple[datetime, int]:
+        seq, msg, headers = self.first
+        return headers.get_sent_date(msg), seq
+
+    def to_node(self) -> _Thread:
+        children = [child.to_node() for child in self.children]
+        if self.item is None:
+            return ThreadNode(None, children)
+        seq, msg, _ = self.item
+        return ThreadNode((seq, msg), children)
+
+
+def _thread_ordered_subject(messages: Iterable[SortedMessage]) \
+        -> Sequence[_Container]:
+    roots: dict[bytes, _Container] = {}
+    for item in sorted(messages, key=lambda item: (
+            item[2].get_sent_date(item[1]), item[0])):
+        subject = item[2].subject
+        root = roots.get(subject)
+        if root is None:
+            roots[subject] = _Container(item)
+        else:
+            _Container(item).set_parent(root)
+    return list(roots.values())
+
+
+def _prune(containers: Iterable[_Container], is_root: bool) \
+        -> list[_Container]:
+    ret: list[_Container] = []
+    for container in containers:
+        container.children = _prune(container.children, False)
+        if container.item is None:
+            if not container.children:
+                continue
+            elif not is_root or len(container.children) == 1:
+                for child in container.children:
+                    child.parent = container.parent
+                ret.extend(container.children)
+                continue
+        ret.append(container)
+    return ret
+
+
+def _merge_subjects(roots: list[_Container]) -> list[_Container]:
+    subjects: dict[bytes, _Container] = {}
+    for root in roots:
+        _, _, headers = root.first
+        if not headers.subject:
+            continue
+        old = subjects.get(headers.subject)
+        if old is None or (root.item is None and old.item is not None) or \
+                (old.first[2].is_reply and not headers.is_reply):
+            subjects[headers.subject] = root
+    for root in list(roots):
+        _, _, headers = root.first
+        other = subjects.get(headers.subject)
+        if other is None or other is root or not headers.subject:
+            continue
+        if root.item is None and other.item is None:
+            for child in list(root.children):
+                child.set_parent(other)
+        elif other.item is None:
+            root.set_parent(other)
+        elif root.item is None:
+            other.set_parent(root)
+            subjects[headers.subject] = root
+        elif not other.first[2].is_reply and headers.is_reply:
+            root.set_parent(other)
+        elif other.first[2].is_reply and not headers.is_reply:
+            other.set_parent(root)
+            subjects[headers.subject] = root
+        else:
+            dummy = _Container()
+            other.set_parent(dummy)
+            root.set_parent(dummy)
+            roots.append(dummy)
+            subjects[headers.subject] = dummy
+    return [root for root in roots
+            if root.parent is None and (root.item or root.children)]
+
+
+def _thread_references(messages: Iterable[SortedMessage]) \
+        -> Sequence[_Container]:
+    table: dict[str, _Container] = {}
+    containers: list[_Container] = []
+
+    def get_container(msg_id: str) -> _Container:
+        container = table.get(msg_id)
+        if container is None:
+            table[msg_id] = container = _Container()
+            containers.append(container)
+        return container
+
+    for item in sorted(messages, key=lambda item: item[0]):
+        headers = item[2]
+        msg_id = headers.message_id
+        existing = table.get(msg_id) if msg_id is not None else None
+        if msg_id is not None and (existing is None or existing.item is None):
+            container = get_container(msg_id)
+        else:
+            container = _Container()
+            containers.append(container)
+        container.item = item
+        parent: _Container | None = None
+        for ref_id in headers.references:
+            ref = get_container(ref_id)
+            if parent is not None and ref.parent is None \
+                    and not ref.has_descendant(parent):
+                ref.set_parent(parent)
+            parent = ref
+        if parent is not None and container.has_descendant(parent):
+            parent = None
+        container.set_parent(parent)
+    roots = _prune((container for container in containers
+                    if container.parent is None), True)
+    for root in roots:
+        root.sort()
+    roots.sort(key=_Container.sort_key)
+    return _merge_subjects(roots)
+
+
+def thread_messages(messages: Iterable[SortedMessage], algorithm: bytes) \
+        -> Sequence[_Thread]:
+    """Group the messages into threads with the given algorithm. The threads,
+    and the messages within each thread, are ordered by the date the messages
+    were sent.
+
+    See Also:
+        `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
+
+    Args:
+        messages: The messages to thread.
+        algorithm: The threading algorithm, ``ORDEREDSUBJECT`` or
+            ``REFERENCES``.
+
+    Raises:
+        ValueError: The threading algorithm was not recognized.
+
+    """
+    if algorithm == b'ORDEREDSUBJECT':
+        roots = _thread_ordered_subject(messages)
+    elif algorithm == b'REFERENCES':
+        roots = _thread_references(messages)
+    else:
+        raise ValueError(algorithm)
+    for root in roots:
+        root.sort()
+    return [root.to_node()
+            for root in sorted(roots, key=_Container.sort_key)]
@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable, Iterator, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from re import Match, Pattern
-from typing import Final, Any
+from typing import Final, Any, Generic, TypeVar
 
 from .mime import MessageHeader
 
-__all__ = ['ThreadKey']
+__all__ = ['ThreadKey', 'ThreadNode']
+
+_T = TypeVar('_T')
+_U = TypeVar('_U')
 
 
 class ThreadKey(Iterable[str]):
@@ -97,3 +100,49 @@ class ThreadKey(Iterable[str]):
             for match in cls._pattern.finditer(str(references)):
                 ret.append(cls(cls._encode(match.group(0)), subject_key))
         return ret
+
+
+class ThreadNode(Generic[_T]):
+    """A node in a tree of messages grouped into a thread by the ``THREAD``
+    command.
+
+    See Also:
+        `RFC 5256 4. <https://tools.ietf.org/html/rfc5256#section-4>`_
+
+    Args:
+        value: The message identifier, or None for a placeholder parent of
+            messages that are not otherwise linked.
+        children: The child nodes, e.g. replies to the message.
+
+    """
+
+    __slots__ = ['value', 'children']
+
+    def __init__(self, value: _T | None,
+                 children: Sequence[ThreadNode[_T]] = ()) -> None:
+        super().__init__()
+        self.value: Final = value
+        self.children: Final = children
+
+    def map(self, func: Callable[[_T], _U]) -> ThreadNode[_U]:
+        """Return a copy of the thread with each message identifier converted
+        by *func*.
+
+        Args:
+            func: Converts each message identifier.
+
+        """
+        value = func(self.value) if self.value is not None else None
+        return ThreadNode(value, [child.map(func) for child in self.children])
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ThreadNode):
+            return self.value == other.value \
+                and list(self.children) == list(other.children)
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((self.value, tuple(self.children)))
+
+    def __repr__(self) -> str:
+        return f'<ThreadNode value={self.value!r} {self.children!r}>'
@@ -6,6 +6,7 @@ import re
 import socket
 import traceback
 from collections import deque
+from collections.abc import Iterable
 from itertools import zip_longest
 from typing import overload, Any, Literal, NoReturn
 
@@ -57,6 +58,8 @@ class MockTransport:
         self.socket = _Socket(fd)
         self._write_batch: list[bytes] = []
         self._select_count = 0
+        self._draining = False
+        self._drained = asyncio.Event()
 
     @classmethod
     def _caller(cls, frame) -> str:
@@ -160,6 +163,8 @@ class MockTransport:
             b'* OK [UIDNEXT ', uidnext, b'] Predicted next UID.\r\n'
             b'* OK [UIDVALIDITY ', (br'\d+', ), b'] UIDs valid.\r\n',
             unseen_line,
+            b'* OK [HIGHESTMODSEQ ', (br'\d+', ), b'] '
+            b'Highest mod-sequence.\r\n'
             b'* OK [MAILBOXID (', (br'F[a-f0-9]+', b'mbxid%i' % (n, )), b')] '
             b'Object ID.\r\n',
             tag, b' OK [', ok_code, b'] Selected mailbox.\r\n',
@@ -258,7 +263,16 @@ class MockTransport:
         elif name == 'sockname':
             return ('5.6.7.8', 5678)
 
+    async def _wait_for_read(self) -> None:
+        # Pipelined commands are read ahead of the responses to the previous
+        # commands, which the client has not yet sent.
+        while self._draining or \
+                (self.queue and self.queue[0][0] == _Type.DRAIN):
+            self._drained.clear()
+            await self._drained.wait()
+
     async def readline(self) -> bytes:
+        await self._wait_for_read()
         _, where, data, wait, set = self._pop_expected(_Type.READLINE)
         if set:
             set.set()
@@ -287,8 +301,23 @@ class MockTransport:
                            '\nWhere:   ' + where)
         return data
 
-    def write(self, data: bytes) -> None:
-        self._write_batch.append(data)
+    @property
+    def transport(self) -> 'MockTransport':
+        return self
+
+    def set_write_buffer_limits(self, high: int | None = None,
+                                low: int | None = None) -> None:
+        pass
+
+    def get_write_buffer_size(self) -> int:
+        return sum(len(data) for data in self._write_batch)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self._write_batch.append(bytes(data))
+
+    def writelines(self, data: Iterable[bytes | bytearray | memoryview]) \
+            -> None:
+        self._write_batch.extend(bytes(item) for item in data)
 
     async def drain(self) -> None:
         _, where, expected, wait, set = self._pop_expected(_Type.DRAIN)
@@ -298,10 +327,14 @@ class MockTransport:
         if set:
             set.set()
         if wait:
+            self._draining = True
             try:
                 await asyncio.wait_for(wait.wait(), timeout=1.0)
             except asyncio.TimeoutError:
                 self._fail('\nTimeout: 1.0s')
+            finally:
+                self._draining = False
+        self._drained.set()
 
     def at_eof(self) -> Literal[False]:
         return False
@@ -46,6 +46,29 @@ class TestExpunge(TestBase):
         transport.push_logout()
         await self.run(transport)
 
+    async def test_expunge_uidonly(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'enable1 ENABLE UIDONLY\r\n')
+        transport.push_write(
+            b'* ENABLED UIDONLY\r\n'
+            b'enable1 OK ENABLE completed.\r\n')
+        transport.push_select(b'INBOX', unseen=False)
+        transport.push_readline(
+            b'store1 UID STORE 104 +FLAGS (\\Deleted)\r\n')
+        transport.push_write(
+            b'* 104 UIDFETCH (FLAGS (\\Deleted \\Recent))\r\n'
+            b'store1 OK UID STORE completed.\r\n')
+        transport.push_readline(
+            b'expunge1 EXPUNGE\r\n')
+        transport.push_write(
+            b'* VANISHED 104\r\n'
+            b'* 0 RECENT\r\n'
+            b'expunge1 OK EXPUNGE completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
     async def test_concurrent_expunge_responses(
             self, imap_server: IMAPServer) -> None:
         transport = self.new_transport(imap_server)
@@ -1,7 +1,13 @@
 
+from contextlib import AsyncExitStack
+
 from .base import TestBase
 
+from pymap.context import connection_exit
 from pymap.imap import IMAPServer
+from pymap.imap.state import ConnectionState
+from pymap.parsing import Params
+from pymap.parsing.command import Command
 
 
 class TestFetch(TestBase):
@@ -21,6 +27,128 @@ class TestFetch(TestBase):
         transport.push_logout()
         await self.run(transport)
 
+    async def test_uid_fetch_partial(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'fetch1 UID FETCH 1:* (FLAGS) (PARTIAL -1:-2)\r\n')
+        transport.push_write(
+            b'* 3 FETCH (FLAGS (\\Flagged) UID 103)\r\n'
+            b'* 4 FETCH (FLAGS (\\Recent) UID 104)\r\n'
+            b'fetch1 OK UID FETCH completed.\r\n')
+        transport.push_readline(
+            b'fetch2 UID FETCH 102:* (FLAGS) (PARTIAL 1:1)\r\n')
+        transport.push_write(
+            b'* 2 FETCH (FLAGS (\\Answered \\Seen) UID 102)\r\n'
+            b'fetch2 OK UID FETCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_uid_fetch_pipelined(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'fetch1 UID FETCH 101:102 (FLAGS)\r\n')
+        transport.push_readline(
+            b'fetch2 UID FETCH 103:104 (FLAGS)\r\n')
+        transport.push_readline(
+            b'fetch3 FETCH 1 (UID)\r\n')
+        transport.push_write(
+            b'* 1 FETCH (FLAGS (\\Seen) UID 101)\r\n'
+            b'* 2 FETCH (FLAGS (\\Answered \\Seen) UID 102)\r\n'
+            b'fetch1 OK UID FETCH completed.\r\n')
+        transport.push_write(
+            b'* 3 FETCH (FLAGS (\\Flagged) UID 103)\r\n'
+            b'* 4 FETCH (FLAGS (\\Recent) UID 104)\r\n'
+            b'fetch2 OK UID FETCH completed.\r\n')
+        transport.push_write(
+            b'* 1 FETCH (UID 101)\r\n'
+            b'fetch3 OK FETCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_can_pipeline_condstore(self, backend) -> None:
+        config = backend.config
+        state = ConnectionState(backend.login, config)
+
+        def parse(line: bytes) -> Command:
+            cmd, _ = config.commands.parse(memoryview(line), Params())
+            return cmd
+        async with AsyncExitStack() as stack:
+            connection_exit.set(stack)
+            await state.do_command(
+                parse(b'login1 LOGIN testuser testpass\r\n'))
+            await state.do_command(parse(b'select1 SELECT INBOX\r\n'))
+            fetch = parse(b'fetch1 UID FETCH 1:* (FLAGS)\r\n')
+            modseq_cmds = [
+                parse(b'fetch2 UID FETCH 1:* (MODSEQ)\r\n'),
+                parse(b'fetch3 UID FETCH 1:* (FLAGS) (CHANGEDSINCE 1)\r\n'),
+                parse(b'search1 UID SEARCH MODSEQ 1\r\n'),
+                parse(b'status1 STATUS INBOX (HIGHESTMODSEQ)\r\n')]
+            assert state.can_pipeline(fetch)
+            for cmd in modseq_cmds:
+                assert not state.can_pipeline(cmd)
+            await state.do_command(parse(b'enable1 ENABLE CONDSTORE\r\n'))
+            for cmd in modseq_cmds:
+                assert state.can_pipeline(cmd)
+
+    async def test_uid_fetch_uidonly(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'enable1 ENABLE UIDONLY\r\n')
+        transport.push_write(
+            b'* ENABLED UIDONLY\r\n'
+            b'enable1 OK ENABLE completed.\r\n')
+        transport.push_select(b'INBOX', unseen=False)
+        transport.push_readline(
+            b'fetch1 UID FETCH 102:103 (FLAGS)\r\n')
+        transport.push_write(
+            b'* 102 UIDFETCH (FLAGS (\\Answered \\Seen))\r\n'
+            b'* 103 UIDFETCH (FLAGS (\\Flagged))\r\n'
+            b'fetch1 OK UID FETCH completed.\r\n')
+        transport.push_readline(
+            b'fetch2 FETCH 1:* (FLAGS)\r\n')
+        transport.push_write(
+            b'fetch2 BAD [UIDREQUIRED] FETCH: '
+            b'Message sequence numbers not allowed.\r\n')
+        transport.push_readline(
+            b'search1 UID SEARCH 1:2\r\n')
+        transport.push_write(
+            b'search1 BAD [UIDREQUIRED] UID SEARCH: '
+            b'Message sequence numbers not allowed.\r\n')
+        transport.push_readline(
+            b'search2 UID SEARCH UID 102:103\r\n')
+        transport.push_write(
+            b'* SEARCH 102 103\r\n'
+            b'search2 OK UID SEARCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_fetch_preview(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'fetch1 FETCH 1:3 (PREVIEW)\r\n')
+        transport.push_write(
+            b'* 1 FETCH (PREVIEW "Well, I don\'t know that! '
+            b'*AAAAAGGGGGHHHHHH*")\r\n'
+            b'* 2 FETCH (PREVIEW "What is the average airspeed velocity '
+            b'of an unladen swallow?")\r\n'
+            b'* 3 FETCH (PREVIEW "This is some important stuff!")\r\n'
+            b'fetch1 OK FETCH completed.\r\n')
+        transport.push_readline(
+            b'fetch2 FETCH 3 (FLAGS PREVIEW (LAZY))\r\n')
+        transport.push_write(
+            b'* 3 FETCH (FLAGS (\\Flagged) '
+            b'PREVIEW "This is some important stuff!")\r\n'
+            b'fetch2 OK FETCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
     async def test_fetch_full(self, imap_server: IMAPServer) -> None:
         transport = self.new_transport(imap_server)
         transport.push_login()
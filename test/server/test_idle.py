@@ -1,7 +1,16 @@
 
+import asyncio
+from contextlib import AsyncExitStack
+
 from .base import TestBase
 
+from pymap.concurrent import Event
+from pymap.context import connection_exit, subsystem
 from pymap.imap import IMAPServer
+from pymap.imap.state import ConnectionState
+from pymap.parsing import Params
+from pymap.parsing.command import Command
+from pymap.parsing.command.select import IdleCommand
 
 
 class TestIdle(TestBase):
@@ -123,3 +132,31 @@ class TestIdle(TestBase):
         transport.push_logout()
 
         await self.run(transport, concurrent)
+
+    async def test_idle_notify_cancel(self, backend) -> None:
+        config = backend.config
+        state = ConnectionState(backend.login, config)
+
+        def parse(line: bytes) -> Command:
+            cmd, _ = config.commands.parse(memoryview(line), Params())
+            return cmd
+
+        async def watch(wait_on: Event) -> bool:
+            # Like a blocking read that does not check the event.
+            await asyncio.sleep(10.0)
+            return False
+        async with AsyncExitStack() as stack:
+            connection_exit.set(stack)
+            await state.do_command(
+                parse(b'login1 LOGIN testuser testpass\r\n'))
+            await state.do_command(parse(b'select1 SELECT INBOX\r\n'))
+            await state.do_command(parse(
+                b'notify1 NOTIFY SET STATUS (personal (MessageNew))\r\n'))
+            state._notify_watch = watch
+            idle = IdleCommand(b'idle1')
+            done = subsystem.get().new_event()
+            done.set()
+            await state.receive_updates(idle, done)
+            done = subsystem.get().new_event()
+            asyncio.get_running_loop().call_later(0.05, done.set)
+            await asyncio.wait_for(state.receive_updates(idle, done), 1.0)
@@ -1,6 +1,8 @@
 
 from textwrap import dedent
 
+import pytest
+
 from .base import TestBase
 
 from pymap.imap import IMAPServer
@@ -32,6 +34,119 @@ class TestMailbox(TestBase):
         transport.push_logout()
         await self.run(transport)
 
+    async def test_list_status(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'list1 LIST "" * RETURN (STATUS (MESSAGES UNSEEN))\r\n')
+        transport.push_write(
+            b'* LIST (\\HasNoChildren) "/" INBOX\r\n'
+            b'* STATUS INBOX (MESSAGES 4 UNSEEN 2)\r\n'
+            b'* LIST (\\HasNoChildren) "/" Sent\r\n'
+            b'* STATUS Sent (MESSAGES 2 UNSEEN 1)\r\n'
+            b'* LIST (\\HasNoChildren) "/" Trash\r\n'
+            b'* STATUS Trash (MESSAGES 1 UNSEEN 1)\r\n'
+            b'list1 OK LIST completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_status_pipelined(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'status1 STATUS Sent (MESSAGES)\r\n')
+        transport.push_readline(
+            b'status2 STATUS Trash (MESSAGES)\r\n')
+        transport.push_readline(
+            b'list1 LIST "" {5}\r\n')
+        transport.push_write(
+            b'* STATUS Sent (MESSAGES 2)\r\n'
+            b'status1 OK STATUS completed.\r\n')
+        transport.push_write(
+            b'* STATUS Trash (MESSAGES 1)\r\n'
+            b'status2 OK STATUS completed.\r\n')
+        transport.push_write(
+            b'+ Literal string\r\n')
+        transport.push_readexactly(
+            b'INBOX')
+        transport.push_readline(
+            b'\r\n')
+        transport.push_write(
+            b'* LIST (\\HasNoChildren) "/" INBOX\r\n'
+            b'list1 OK LIST completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_list_extended(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'subscribe1 SUBSCRIBE "Sent"\r\n')
+        transport.push_write(
+            b'subscribe1 OK SUBSCRIBE completed.\r\n')
+        transport.push_readline(
+            b'list1 LIST (SUBSCRIBED) "" *\r\n')
+        transport.push_write(
+            b'* LIST (\\HasNoChildren \\Subscribed) "/" INBOX\r\n'
+            b'* LIST (\\HasNoChildren \\Subscribed) "/" Sent\r\n'
+            b'list1 OK LIST completed.\r\n')
+        transport.push_readline(
+            b'list2 LIST "" (INBOX Trash) RETURN (SUBSCRIBED)\r\n')
+        transport.push_write(
+            b'* LIST (\\HasNoChildren \\Subscribed) "/" INBOX\r\n'
+            b'* LIST (\\HasNoChildren) "/" Trash\r\n'
+            b'list2 OK LIST completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_notify(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        message = b'test message\r\n'
+        transport.push_login()
+        transport.push_readline(
+            b'notify1 NOTIFY SET STATUS (personal '
+            b'(MessageNew MessageExpunge FlagChange))\r\n')
+        transport.push_write(
+            b'* STATUS INBOX (MESSAGES 4 UIDNEXT 105 UNSEEN 2)\r\n'
+            b'* STATUS Sent (MESSAGES 2 UIDNEXT ', (br'\d+', ),
+            b' UNSEEN 1)\r\n'
+            b'* STATUS Trash (MESSAGES 1 UIDNEXT ', (br'\d+', ),
+            b' UNSEEN 1)\r\n'
+            b'notify1 OK NOTIFY completed.\r\n')
+        transport.push_readline(
+            b'append1 APPEND Sent {%i}\r\n' % len(message))
+        transport.push_write(
+            b'+ Literal string\r\n')
+        transport.push_readexactly(message)
+        transport.push_readline(
+            b'\r\n')
+        transport.push_write(
+            b'append1 OK [APPENDUID ', (br'\d+ \d+', ), b']'
+            b' APPEND completed.\r\n')
+        transport.push_readline(
+            b'noop1 NOOP\r\n')
+        transport.push_write(
+            b'* STATUS Sent (MESSAGES 3 UIDNEXT ', (br'\d+', ),
+            b' UNSEEN 2)\r\n'
+            b'noop1 OK NOOP completed.\r\n')
+        transport.push_readline(
+            b'notify2 NOTIFY NONE\r\n')
+        transport.push_write(
+            b'notify2 OK NOTIFY completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_notify_badevent(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_readline(
+            b'notify1 NOTIFY SET (subscribed (MailboxName))\r\n')
+        transport.push_write(
+            b'notify1 NO [BADEVENT (MessageNew MessageExpunge FlagChange)]'
+            b' Unsupported NOTIFY event.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
     async def test_create(self, imap_server: IMAPServer) -> None:
         transport = self.new_transport(imap_server)
         transport.push_login()
@@ -394,3 +509,47 @@ class TestMailbox(TestBase):
         assert self.matches['id4'] == self.matches['id5']
         assert self.matches['id4'] == self.matches['id6']
         assert self.matches['id4'] == self.matches['id7']
+
+
+class TestMailboxLiterals(TestBase):
+
+    @pytest.fixture
+    def overrides(self):
+        return {'max_append_len': 40, 'spool_literal_len': 20}
+
+    async def test_append_spooled(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        message = b'Subject: spooled\r\n\r\ntest message\r\n'
+        transport.push_login()
+        transport.push_readline(
+            b'append1 APPEND INBOX {%i+}\r\n' % len(message))
+        transport.push_readexactly(message)
+        transport.push_readline(
+            b'\r\n')
+        transport.push_write(
+            b'append1 OK [APPENDUID ', (br'\d+', ), b' 105]'
+            b' APPEND completed.\r\n')
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'fetch1 UID FETCH 105 (BODY.PEEK[])\r\n')
+        transport.push_write(
+            b'* 5 FETCH (BODY[] {%i}\r\n' % len(message)
+            + message + b' UID 105)\r\n'
+            b'fetch1 OK UID FETCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_append_too_big(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        message = b'x' * 41
+        transport.push_login()
+        transport.push_readline(
+            b'append1 APPEND INBOX {%i+}\r\n' % len(message))
+        transport.push_readexactly(message)
+        transport.push_readline(
+            b'\r\n')
+        transport.push_write(
+            b'append1 BAD [TOOBIG] APPEND: Invalid arguments.\r\n')
+        transport.push_select(b'INBOX', 4, 1, 105)
+        transport.push_logout()
+        await self.run(transport)
@@ -296,3 +296,65 @@ class TestSearch(TestBase):
             b'search2 OK SEARCH completed.\r\n')
         transport.push_logout()
         await self.run(transport)
+
+    async def test_search_return(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'search1 UID SEARCH RETURN (MIN MAX COUNT ALL) ALL\r\n')
+        transport.push_write(
+            b'* ESEARCH (TAG "search1") UID ALL 101:104 COUNT 4 MAX 104 '
+            b'MIN 101\r\n'
+            b'search1 OK UID SEARCH completed.\r\n')
+        transport.push_readline(
+            b'search2 SEARCH RETURN () UNSEEN\r\n')
+        transport.push_write(
+            b'* ESEARCH (TAG "search2") ALL 3:4\r\n'
+            b'search2 OK SEARCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_search_partial(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'search1 UID SEARCH RETURN (PARTIAL -1:-2) ALL\r\n')
+        transport.push_write(
+            b'* ESEARCH (TAG "search1") UID PARTIAL (-1:-2 103:104)\r\n'
+            b'search1 OK UID SEARCH completed.\r\n')
+        transport.push_readline(
+            b'search2 SEARCH RETURN (COUNT PARTIAL 2:5) UNSEEN\r\n')
+        transport.push_write(
+            b'* ESEARCH (TAG "search2") COUNT 2 PARTIAL (2:5 4)\r\n'
+            b'search2 OK SEARCH completed.\r\n')
+        transport.push_readline(
+            b'search3 SEARCH RETURN (PARTIAL 5:10) ALL\r\n')
+        transport.push_write(
+            b'* ESEARCH (TAG "search3") PARTIAL (5:10 NIL)\r\n'
+            b'search3 OK SEARCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_search_save(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'search1 SEARCH RETURN (SAVE) UNSEEN\r\n')
+        transport.push_write(
+            b'search1 OK SEARCH completed.\r\n')
+        transport.push_readline(
+            b'fetch1 UID FETCH $ (FLAGS)\r\n')
+        transport.push_write(
+            b'* 3 FETCH (FLAGS (\\Flagged) UID 103)\r\n'
+            b'* 4 FETCH (FLAGS (\\Recent) UID 104)\r\n'
+            b'fetch1 OK UID FETCH completed.\r\n')
+        transport.push_readline(
+            b'search2 SEARCH $ RECENT\r\n')
+        transport.push_write(
+            b'* SEARCH 4\r\n'
+            b'search2 OK SEARCH completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
@@ -0,0 +1,41 @@
+
+from .base import TestBase
+
+from pymap.imap import IMAPServer
+
+
+class TestSort(TestBase):
+
+    async def test_sort(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'sort1 SORT (FROM SUBJECT) UTF-8 ALL\r\n')
+        transport.push_write(
+            b'* SORT 3 4 1 2\r\n'
+            b'sort1 OK SORT completed.\r\n')
+        transport.push_readline(
+            b'sort2 UID SORT (REVERSE DATE) UTF-8 NOT SEEN\r\n')
+        transport.push_write(
+            b'* SORT 104 103\r\n'
+            b'sort2 OK UID SORT completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
+
+    async def test_thread(self, imap_server: IMAPServer) -> None:
+        transport = self.new_transport(imap_server)
+        transport.push_login()
+        transport.push_select(b'INBOX')
+        transport.push_readline(
+            b'thread1 THREAD ORDEREDSUBJECT UTF-8 ALL\r\n')
+        transport.push_write(
+            b'* THREAD (1 2)(3)(4)\r\n'
+            b'thread1 OK THREAD completed.\r\n')
+        transport.push_readline(
+            b'thread2 UID THREAD REFERENCES UTF-8 ALL\r\n')
+        transport.push_write(
+            b'* THREAD (102 101)(103)(104)\r\n'
+            b'thread2 OK UID THREAD completed.\r\n')
+        transport.push_logout()
+        await self.run(transport)
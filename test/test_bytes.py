@@ -0,0 +1,65 @@
+
+import unittest
+
+from pymap.bytes import Writeable, ScatterStream
+
+
+class TestScatterStream(unittest.TestCase):
+
+    def test_pop(self) -> None:
+        data = memoryview(b'x' * 16)
+        stream = ScatterStream(16)
+        stream.write(b'* 1 FETCH (')
+        stream.write(b'BODY[] {16}\r\n')
+        stream.write(data)
+        stream.write(b')\r\n')
+        self.assertEqual(43, len(stream))
+        segments = stream.pop()
+        self.assertEqual([b'* 1 FETCH (BODY[] {16}\r\n', data, b')\r\n'],
+                         segments)
+        self.assertIs(data, segments[1])
+        self.assertEqual([], stream.pop())
+        self.assertEqual(0, len(stream))
+
+    def test_writeable(self) -> None:
+        data = b'y' * 2048
+        writeable = Writeable.concat([Writeable.wrap(b'abc'),
+                                      Writeable.wrap(data),
+                                      Writeable.wrap(b'def')])
+        stream = ScatterStream()
+        writeable.write(stream)
+        self.assertEqual(bytes(writeable), b''.join(stream.pop()))
+        self.assertEqual(2054, len(writeable))
+
+
+class TestWriteableSlice(unittest.TestCase):
+
+    def test_wrap(self) -> None:
+        writeable = Writeable.wrap(b'abcdef')
+        self.assertEqual(b'bcd', bytes(writeable.slice(1, 4)))
+        self.assertEqual(b'cdef', bytes(writeable.slice(2)))
+        self.assertEqual(b'', bytes(writeable.slice(10)))
+
+    def test_wrap_memoryview(self) -> None:
+        data = b'abcdef'
+        writeable = Writeable.wrap(memoryview(data))
+        stream = ScatterStream(1)
+        writeable.slice(1, 4).write(stream)
+        segments = stream.pop()
+        self.assertEqual([b'bcd'], segments)
+        segment = segments[0]
+        assert isinstance(segment, memoryview)
+        self.assertIs(data, segment.obj)
+
+    def test_concat(self) -> None:
+        writeable = Writeable.concat([Writeable.wrap(b'abc'),
+                                      Writeable.wrap(b'def'),
+                                      Writeable.wrap(b'ghi')])
+        full = bytes(writeable)
+        for start, end in [(0, 9), (1, 4), (3, 6), (4, 5), (2, None),
+                           (7, 20), (9, None), (5, 5)]:
+            self.assertEqual(full[start:end],
+                             bytes(writeable.slice(start, end)))
+
+    def test_empty(self) -> None:
+        self.assertEqual(b'', bytes(Writeable.empty().slice(0, 10)))
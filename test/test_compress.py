@@ -0,0 +1,95 @@
+
+import asyncio
+import unittest
+import zlib
+
+from pymap.imap.compress import DeflateReader, DeflateWriter
+
+
+class _Writer:
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    def writelines(self, data) -> None:
+        for item in data:
+            self.data += item
+
+    async def drain(self) -> None:
+        pass
+
+
+class TestDeflateReader(unittest.TestCase):
+
+    def _new_reader(self, data: bytes, **kwargs) -> DeflateReader:
+        deflate = zlib.compressobj(6, zlib.DEFLATED, -15)
+        compressed = deflate.compress(data) + deflate.flush()
+        reader = asyncio.StreamReader()
+        reader.feed_data(compressed)
+        reader.feed_eof()
+        return DeflateReader(reader, **kwargs)
+
+    def test_readline(self) -> None:
+        async def run() -> list[bytes]:
+            reader = self._new_reader(b'one\r\ntwo\r\nthree')
+            return [await reader.readline() for _ in range(4)]
+        self.assertEqual([b'one\r\n', b'two\r\n', b'three', b''],
+                         asyncio.run(run()))
+
+    def test_readline_limit(self) -> None:
+        async def run() -> None:
+            reader = self._new_reader(b'x' * 1000 + b'\r\n', limit=100,
+                                      chunk_size=10)
+            await reader.readline()
+        with self.assertRaises(ValueError):
+            asyncio.run(run())
+
+    def test_readexactly(self) -> None:
+        async def run() -> bytes:
+            reader = self._new_reader(b'{5}\r\nhello\r\n' + b'x' * 100000,
+                                      chunk_size=16)
+            line = await reader.readline()
+            return line + await reader.readexactly(5)
+        self.assertEqual(b'{5}\r\nhello', asyncio.run(run()))
+
+    def test_readexactly_incomplete(self) -> None:
+        async def run() -> None:
+            reader = self._new_reader(b'abc')
+            await reader.readexactly(5)
+        with self.assertRaises(asyncio.IncompleteReadError):
+            asyncio.run(run())
+
+
+class TestDeflateWriter(unittest.TestCase):
+
+    def test_write(self) -> None:
+        raw = _Writer()
+        writer = DeflateWriter(raw, 6, 262144)  # type: ignore
+        inflate = zlib.decompressobj(-15)
+
+        async def run() -> list[bytes]:
+            ret = []
+            for data in (b'* OK one\r\n', b'* OK two\r\n'):
+                writer.write(data)
+                await writer.drain()
+                ret.append(inflate.decompress(bytes(raw.data)))
+                raw.data.clear()
+            return ret
+        self.assertEqual([b'* OK one\r\n', b'* OK two\r\n'],
+                         asyncio.run(run()))
+
+    def test_writelines(self) -> None:
+        raw = _Writer()
+        writer = DeflateWriter(raw, 6, 262144)  # type: ignore
+        inflate = zlib.decompressobj(-15)
+        writer.writelines([b'* OK ', memoryview(b'one'), b'\r\n'])
+        asyncio.run(writer.drain())
+        self.assertEqual(b'* OK one\r\n', inflate.decompress(raw.data))
+
+    def test_max_memory(self) -> None:
+        self.assertEqual((15, 8), DeflateWriter._get_params(262144))
+        self.assertEqual((13, 6), DeflateWriter._get_params(65536))
+        self.assertEqual((9, 1), DeflateWriter._get_params(0))
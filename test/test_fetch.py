@@ -0,0 +1,248 @@
+
+import asyncio
+import unittest
+from contextvars import copy_context
+from datetime import datetime
+
+from pymap.bytes import ScatterStream
+from pymap.context import decoded_cache
+from pymap.fetch import ContentPrefetch, MessageAttributes, FetchRenderer
+from pymap.flags import PermanentFlags, SessionFlags
+from pymap.message import BaseMessage, BaseLoadedMessage
+from pymap.mime import MessageContent
+from pymap.mime.cte import DecodedCache
+from pymap.parsing.response import ResponseOk
+from pymap.parsing.response.specials import FetchResponse
+from pymap.parsing.specials import FetchAttribute, FetchRequirement, \
+    ObjectId
+from pymap.parsing.specials.fetchattr import FetchPartial
+from pymap.parsing.specials.flag import Flagged, Recent, Seen
+from pymap.selected import SelectedMailbox
+
+_content = MessageContent.parse(b'Subject: test\r\n\r\ntest body\r\n')
+_size_attr = FetchAttribute(b'RFC822.SIZE')
+_body_attr = FetchAttribute(b'BODY', FetchAttribute.Section(()))
+
+
+class _Message(BaseMessage):
+
+    started = 0
+    loading = 0
+    max_loading = 0
+    loaded: list[int] = []
+
+    async def load_content(self, requirement):
+        cls = type(self)
+        cls.started += 1
+        cls.loading += 1
+        cls.max_loading = max(cls.max_loading, cls.loading)
+        await asyncio.sleep(0.01)
+        cls.loading -= 1
+        cls.loaded.append(self.uid)
+        return BaseLoadedMessage(self, requirement, _content)
+
+
+class TestContentPrefetch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _Message.started = 0
+        _Message.loading = 0
+        _Message.max_loading = 0
+        _Message.loaded = []
+        self.selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                                        PermanentFlags([]), SessionFlags([]))
+
+    def _write_all(self, prefetch: ContentPrefetch, count: int) \
+            -> list[tuple[int, bytes]]:
+        responses = []
+        for uid in range(1, count + 1):
+            msg = _Message(uid, datetime.now(), [])
+            attrs = MessageAttributes(msg, self.selected, [_size_attr],
+                                      prefetch=prefetch)
+            hook = attrs.load_hook()
+            responses.append((FetchResponse(uid, attrs, writing_hook=hook),
+                              hook))
+
+        async def run() -> list[tuple[int, bytes]]:
+            ret = []
+            for resp, hook in responses:
+                async with hook:
+                    await asyncio.sleep(0)
+                    ret.append((_Message.started, bytes(resp)))
+            return ret
+        return asyncio.run(run())
+
+    def test_window(self) -> None:
+        written = self._write_all(ContentPrefetch(4, 1000000), 10)
+        self.assertEqual(5, _Message.max_loading)
+        self.assertEqual(list(range(1, 11)), _Message.loaded)
+        self.assertEqual([5, 6, 7, 8, 9, 10, 10, 10, 10, 10],
+                         [started for started, _ in written])
+        self.assertEqual(b'* 1 FETCH (RFC822.SIZE 28)\r\n', written[0][1])
+
+    def test_max_bytes(self) -> None:
+        written = self._write_all(ContentPrefetch(4, 0), 10)
+        self.assertEqual(list(range(1, 11)), _Message.loaded)
+        self.assertEqual([5, 5, 5, 5, 9, 10, 10, 10, 10, 10],
+                         [started for started, _ in written])
+
+    def test_disabled(self) -> None:
+        self._write_all(ContentPrefetch(0, 0), 10)
+        self.assertEqual(1, _Message.max_loading)
+        self.assertEqual(list(range(1, 11)), _Message.loaded)
+
+    def test_close(self) -> None:
+        cancelled: list[int] = []
+
+        class _SlowMessage(BaseMessage):
+            async def load_content(self, requirement):
+                try:
+                    await asyncio.sleep(0 if self.uid == 1 else 10)
+                except asyncio.CancelledError:
+                    cancelled.append(self.uid)
+                    raise
+                return BaseLoadedMessage(self, requirement, _content)
+
+        prefetch = ContentPrefetch(4, 1000000)
+        resp = ResponseOk(b'.', b'FETCH completed.')
+        resp.add_cleanup(prefetch.close)
+        for uid in range(1, 11):
+            msg = _SlowMessage(uid, datetime.now(), [])
+            attrs = MessageAttributes(msg, self.selected, [_size_attr],
+                                      prefetch=prefetch)
+            resp.add_untagged(FetchResponse(
+                uid, attrs, writing_hook=attrs.load_hook()))
+
+        async def drain() -> None:
+            raise ConnectionError()
+
+        async def run() -> list[int]:
+            with self.assertRaises(ConnectionError):
+                await resp.async_write(ScatterStream(), drain=drain)
+            await asyncio.sleep(0)
+            return sorted(cancelled)
+        self.assertEqual([2, 3, 4, 5], asyncio.run(run()))
+
+
+class TestFetchWrite(unittest.TestCase):
+
+    def test_body_zero_copy(self) -> None:
+        data = b'Subject: test\r\n\r\n' + b'x' * 4096 + b'\r\n'
+        content = MessageContent.parse(data)
+
+        class _BodyMessage(BaseMessage):
+            async def load_content(self, requirement):
+                return BaseLoadedMessage(self, requirement, content)
+
+        selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                                   PermanentFlags([]), SessionFlags([]))
+        msg = _BodyMessage(1, datetime.now(), [])
+        attrs = MessageAttributes(msg, selected, [_body_attr])
+        hook = attrs.load_hook()
+        resp = FetchResponse(1, attrs, writing_hook=hook)
+        stream = ScatterStream()
+
+        async def run() -> bytes:
+            async with hook:
+                resp.write(stream)
+                return bytes(resp)
+        expected = asyncio.run(run())
+        segments = stream.pop()
+        self.assertEqual(expected, b''.join(segments))
+        self.assertTrue(any(isinstance(view, memoryview) and view.obj is data
+                            for view in segments))
+
+    def test_partial_zero_copy(self) -> None:
+        data = b'Subject: test\r\n\r\n' + b'x' * 4096 + b'\r\n'
+        content = MessageContent.parse(data)
+
+        class _BodyMessage(BaseMessage):
+            async def load_content(self, requirement):
+                return BaseLoadedMessage(self, requirement, content)
+
+        selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                                   PermanentFlags([]), SessionFlags([]))
+        msg = _BodyMessage(1, datetime.now(), [])
+        attr = FetchAttribute(b'BODY', FetchAttribute.Section(()),
+                              FetchPartial(1000, 2000))
+        attrs = MessageAttributes(msg, selected, [attr])
+        hook = attrs.load_hook()
+        resp = FetchResponse(1, attrs, writing_hook=hook)
+        stream = ScatterStream()
+
+        async def run() -> None:
+            async with hook:
+                resp.write(stream)
+        asyncio.run(run())
+        segments = stream.pop()
+        self.assertEqual(b'* 1 FETCH (BODY[]<1000> {2000}\r\n'
+                         + data[1000:3000] + b')\r\n', b''.join(segments))
+        self.assertTrue(any(isinstance(view, memoryview) and view.obj is data
+                            and len(view) == 2000 for view in segments))
+
+    def _get_binary(self, cache: DecodedCache | None) -> tuple[bytes, bool]:
+        content = MessageContent.parse(
+            b'Content-Transfer-Encoding: base64\r\n\r\n'
+            b'dGVzdCBib2R5\r\n')
+        msg = _Message(1, datetime.now(), [],
+                       email_id=ObjectId(b'Mdecodedcache'))
+        loaded = BaseLoadedMessage(msg, FetchRequirement.CONTENT, content)
+        context = copy_context()
+        if cache is not None:
+            context.run(decoded_cache.set, cache)
+        first = context.run(loaded.get_body, [1], True)
+        second = context.run(loaded.get_body, [1], True)
+        self.assertEqual(b'body', bytes(first.slice(5, 9)))
+        return bytes(first), first is second
+
+    def test_binary_decoded_cache(self) -> None:
+        self.assertEqual((b'test body', True),
+                         self._get_binary(DecodedCache(1024)))
+        self.assertEqual((b'test body', False),
+                         self._get_binary(DecodedCache(4)))
+        self.assertEqual((b'test body', False), self._get_binary(None))
+
+
+class TestFetchRenderer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.selected = SelectedMailbox(ObjectId.random_mailbox_id(), False,
+                                        PermanentFlags([Seen, Flagged]),
+                                        SessionFlags([]))
+        self.selected.session_flags.add_recent(2)
+        self.attrs = [FetchAttribute(b'UID'), FetchAttribute(b'FLAGS'),
+                      FetchAttribute(b'INTERNALDATE'),
+                      FetchAttribute(b'MODSEQ')]
+
+    def test_supports(self) -> None:
+        self.assertTrue(FetchRenderer.supports(self.attrs))
+        self.assertFalse(FetchRenderer.supports([*self.attrs, _size_attr]))
+
+    def test_render(self) -> None:
+        renderer = FetchRenderer()
+        when = datetime(2020, 1, 2, 3, 4, 5).astimezone()
+        for uid in (1, 2):
+            msg = _Message(uid, when, [Seen, Flagged])
+            expected = FetchResponse(uid, MessageAttributes(
+                msg, self.selected, self.attrs))
+            resp = FetchResponse(uid, renderer.render(
+                msg, self.selected, self.attrs))
+            self.assertEqual(bytes(expected), bytes(resp))
+
+    def test_cache(self) -> None:
+        renderer = FetchRenderer(max_cached=2)
+        when = datetime(2020, 1, 2, 3, 4, 5).astimezone()
+        date = renderer.render_internal_date(when)
+        self.assertTrue(date.startswith(b'INTERNALDATE "02-Jan-2020 '))
+        self.assertIs(date, renderer.render_internal_date(when))
+        renderer.render_internal_date(datetime(2021, 1, 1).astimezone())
+        renderer.render_internal_date(datetime(2022, 1, 1).astimezone())
+        self.assertIsNot(date, renderer.render_internal_date(when))
+
+    def test_render_shared_flags(self) -> None:
+        renderer = FetchRenderer()
+        msg = _Message(2, datetime.now().astimezone(), [Seen])
+        flags = self.selected.messages.render_flags(frozenset([Seen, Recent]))
+        values = renderer.render(msg, self.selected,
+                                 [FetchAttribute(b'FLAGS')])
+        self.assertEqual([b'FLAGS ' + flags], [bytes(val) for val in values])
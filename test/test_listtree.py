@@ -17,6 +17,11 @@ class TestListEntry(unittest.TestCase):
                          ListEntry('', True, True, False).attributes)
         self.assertEqual([b'HasNoChildren', b'Unmarked'],
                          ListEntry('', True, False, False).attributes)
+        self.assertEqual([b'HasNoChildren', b'Subscribed'],
+                         ListEntry('', True, None, False, True).attributes)
+        self.assertEqual([b'NonExistent', b'HasNoChildren', b'Subscribed'],
+                         ListEntry('', False, None, False, True,
+                                   True).attributes)
 
 
 class TestListTree(unittest.TestCase):
@@ -65,3 +70,31 @@ class TestListTree(unittest.TestCase):
                          self.tree.get_renames('Important', 'Trivial'))
         self.assertEqual([('Important/Two/Three', 'Trivial/Two/Three')],
                          self.tree.get_renames('Important/Two', 'Trivial/Two'))
+
+    def test_list_matching_multiple(self) -> None:
+        self.assertEqual([ListEntry('INBOX', True, None, False),
+                          ListEntry('Sent', True, None, False),
+                          ListEntry('Important/One', True, None, False)],
+                         list(self.tree.list_matching(
+                             '', 'inbox', 'Sent', 'Important/O*')))
+
+    def test_list_matching_subscribed(self) -> None:
+        self.tree.set_subscribed('INBOX', 'Important/Two/Three', 'Missing')
+        self.assertEqual([ListEntry('INBOX', True, None, False, True),
+                          ListEntry('Important/Two/Three', True, None, False,
+                                    True),
+                          ListEntry('Missing', False, None, False, True,
+                                    True)],
+                         list(self.tree.list_matching(
+                             '', '*', subscribed=True)))
+        self.assertEqual([ListEntry('INBOX', True, None, False, True),
+                          ListEntry('Important', False, None, True, False,
+                                    False, True),
+                          ListEntry('Missing', False, None, False, True,
+                                    True)],
+                         list(self.tree.list_matching(
+                             '', '%', subscribed=True,
+                             recursive_match=True)))
+        self.assertEqual([ListEntry('INBOX', True, None, False, True),
+                          ListEntry('Sent', True, None, False, False)],
+                         list(self.tree.list_matching('', 'INBOX', 'Sent')))
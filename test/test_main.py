@@ -0,0 +1,93 @@
+
+import os
+import signal
+import tempfile
+import unittest
+from argparse import ArgumentTypeError, Namespace
+from unittest.mock import patch
+
+from pymap.config import IMAPConfig
+from pymap.main import _get_workers, _Supervisor
+
+
+class _TestSupervisor(_Supervisor):
+
+    restart_delay = 0.0
+
+    def __init__(self, workers: int, marker_dir: str) -> None:
+        super().__init__(Namespace(workers=workers), None, [])  # type: ignore
+        self.marker_dir = marker_dir
+        self.forked: list[int] = []
+
+    def _fork(self, index: int) -> int:
+        self.forked.append(index)
+        return super()._fork(index)
+
+    def _run_worker(self, index: int, ready_fd: int) -> None:
+        # Worker 0 exits right away the first time it runs. When restarted,
+        # it asks the supervisor to shut down.
+        try:
+            restarted = self.forked.count(index) > 1
+            with open(os.path.join(self.marker_dir, str(index)), 'w'):
+                pass
+            try:
+                os.write(ready_fd, b'\x00')
+            except OSError:
+                pass
+            os.close(ready_fd)
+            if index == 0 and not restarted:
+                os._exit(3)
+            elif index == 0:
+                os.kill(os.getppid(), signal.SIGTERM)
+            while True:
+                signal.pause()
+        finally:
+            os._exit(0)
+
+
+class TestSupervisor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._handlers = {signum: signal.getsignal(signum)
+                          for signum in (signal.SIGINT, signal.SIGTERM)}
+        self._tmp = tempfile.TemporaryDirectory()
+        self.marker_dir = self._tmp.name
+
+    def tearDown(self) -> None:
+        for signum, handler in self._handlers.items():
+            signal.signal(signum, handler)
+        self._tmp.cleanup()
+
+    def test_run(self) -> None:
+        supervisor = _TestSupervisor(2, self.marker_dir)
+        notified: list[list[str]] = []
+
+        def notify_ready() -> None:
+            notified.append(sorted(os.listdir(self.marker_dir)))
+        with patch('pymap.main.notify_ready', notify_ready), \
+                self.assertLogs('pymap.main', 'WARNING') as logs:
+            supervisor.run()
+        self.assertEqual([['0', '1']], notified)
+        self.assertEqual([0, 1, 0], supervisor.forked)
+        self.assertTrue(supervisor.stopping)
+        self.assertEqual({}, supervisor.workers)
+        self.assertEqual(
+            ['WARNING:pymap.main:Worker 0 exited with code 3, restarting'],
+            logs.output)
+
+
+class TestWorkers(unittest.TestCase):
+
+    def test_get_workers(self) -> None:
+        self.assertEqual(1, _get_workers('1'))
+        self.assertEqual(4, _get_workers('4'))
+        for value in ('0', '-1', 'two', ''):
+            with self.assertRaises(ArgumentTypeError):
+                _get_workers(value)
+
+    def test_cpu_subsystem(self) -> None:
+        with patch('pymap.config.os.cpu_count', return_value=9), \
+                patch('pymap.config.ThreadPoolExecutor') as executor:
+            for workers, expected in ((1, 8), (4, 2), (16, 1)):
+                IMAPConfig._get_cpu_subsystem(workers)
+                executor.assert_called_with(max_workers=expected)
@@ -2,7 +2,7 @@
 import unittest
 
 from pymap.mime import MessageContent
-from pymap.mime.cte import MessageDecoder
+from pymap.mime.cte import MessageDecoder, DecodedCache
 
 _7bit_body = b"""Testing 7bit\n"""
 _8bit_body = b"""Testing\x008bit\x00\n"""
@@ -35,3 +35,33 @@ class TestMessageDecoder(unittest.TestCase):
         msg = MessageContent.parse(data)
         decoded = MessageDecoder.of(msg.header).decode(msg.body)
         self.assertEqual(b'Testing\x01\x00\nBase 64 \n', bytes(decoded))
+
+
+class TestDecodedCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        data = b'Content-Transfer-Encoding: base64\n\n' + _b64_body
+        self.msg = MessageContent.parse(data)
+        self.decoder = MessageDecoder.of(self.msg.header)
+
+    def test_get(self) -> None:
+        cache = DecodedCache(100)
+        decoded = cache.get(b'id1', [1], self.decoder, self.msg.body)
+        self.assertEqual(b'Testing\x01\x00\nBase 64 \n', bytes(decoded))
+        self.assertIs(decoded,
+                      cache.get(b'id1', [1], self.decoder, self.msg.body))
+        self.assertIsNot(decoded,
+                         cache.get(b'id1', [2], self.decoder, self.msg.body))
+        self.assertIsNot(decoded,
+                         cache.get(None, [1], self.decoder, self.msg.body))
+
+    def test_get_max_size(self) -> None:
+        cache = DecodedCache(30)
+        first = cache.get(b'id1', None, self.decoder, self.msg.body)
+        cache.get(b'id2', None, self.decoder, self.msg.body)
+        self.assertIsNot(first,
+                         cache.get(b'id1', None, self.decoder, self.msg.body))
+        cache = DecodedCache(10)
+        first = cache.get(b'id1', None, self.decoder, self.msg.body)
+        self.assertIsNot(first,
+                         cache.get(b'id1', None, self.decoder, self.msg.body))
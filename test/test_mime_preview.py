@@ -0,0 +1,70 @@
+
+import unittest
+
+from pymap.mime import MessageContent
+from pymap.mime.preview import get_preview
+
+_multipart = b"""Content-Type: multipart/mixed; boundary=abc
+
+--abc
+Content-Type: text/html
+
+<html><style>p { color: red; }</style><p>Ignored &amp; html</p></html>
+--abc
+Content-Type: text/plain; charset=utf-8
+Content-Transfer-Encoding: base64
+
+SGVsbG8sIHfDtnJsZCEK
+--abc--
+"""
+
+_html = b"""Content-Type: text/html; charset=utf-8
+Content-Transfer-Encoding: quoted-printable
+
+<html><head><style>p { color: red; }</style></head>
+<body><p>Caf=C3=A9 &amp; <b>bistro</b></p></body></html>
+"""
+
+_attachment = b"""Content-Type: multipart/mixed; boundary=abc
+
+--abc
+Content-Type: text/plain
+Content-Disposition: attachment; filename=notes.txt
+
+Attached notes
+--abc
+Content-Type: application/octet-stream
+
+AAAA
+--abc--
+"""
+
+
+class TestPreview(unittest.TestCase):
+
+    def test_plain(self) -> None:
+        msg = MessageContent.parse(b'Subject: test\n\n  one\n\ttwo  \n')
+        self.assertEqual('one two', get_preview(msg))
+
+    def test_multipart(self) -> None:
+        msg = MessageContent.parse(_multipart)
+        self.assertEqual('Hello, wörld!', get_preview(msg))
+
+    def test_html(self) -> None:
+        msg = MessageContent.parse(_html)
+        self.assertEqual('Café & bistro', get_preview(msg))
+
+    def test_attachment(self) -> None:
+        msg = MessageContent.parse(_attachment)
+        self.assertEqual('', get_preview(msg))
+
+    def test_truncated(self) -> None:
+        msg = MessageContent.parse(b'\n' + b'abc ' * 100)
+        preview = get_preview(msg)
+        self.assertEqual(200, len(preview))
+        self.assertTrue(preview.startswith('abc abc '))
+
+    def test_unknown_cte(self) -> None:
+        msg = MessageContent.parse(
+            b'Content-Transfer-Encoding: x-unknown\n\ntesting\n')
+        self.assertEqual('', get_preview(msg))
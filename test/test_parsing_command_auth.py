@@ -5,7 +5,8 @@ from datetime import datetime, timezone
 from pymap.parsing import Params
 from pymap.parsing.exceptions import NotParseable
 from pymap.parsing.command.auth import CreateCommand, AppendCommand, \
-    ListCommand, RenameCommand, StatusCommand
+    CompressCommand, EnableCommand, ListCommand, LSubCommand, NotifyCommand, \
+    NotifyEventGroup, RenameCommand, StatusCommand
 from pymap.parsing.specials import StatusAttribute, Flag
 from pymap.parsing.state import ParsingState, ParsingInterrupt, \
     ExpectContinuation
@@ -19,6 +20,30 @@ class TestCommandMailboxArg(unittest.TestCase):
         self.assertEqual(b'  ', buf)
 
 
+class TestCompressCommand(unittest.TestCase):
+
+    def test_parse(self):
+        ret, buf = CompressCommand.parse(b' deflate\n  ', Params())
+        self.assertEqual(b'DEFLATE', ret.algorithm)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_error(self):
+        with self.assertRaises(NotParseable):
+            CompressCommand.parse(b'\n', Params())
+
+
+class TestEnableCommand(unittest.TestCase):
+
+    def test_parse(self):
+        ret, buf = EnableCommand.parse(b' condstore QRESYNC\n  ', Params())
+        self.assertEqual([b'CONDSTORE', b'QRESYNC'], ret.capabilities)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_error(self):
+        with self.assertRaises(NotParseable):
+            EnableCommand.parse(b'\n', Params())
+
+
 class TestAppendCommand(unittest.TestCase):
 
     _epoch = datetime(1970, 1, 1, 1, 1, tzinfo=timezone.utc)
@@ -36,6 +61,15 @@ class TestAppendCommand(unittest.TestCase):
         self.assertEqual(self._epoch, ret.messages[0].when)
         self.assertEqual(b'  ', buf)
 
+    def test_parse_buffer(self):
+        data = b' inbox {10+}\ntest test!\n  '
+        ret, buf = AppendCommand.parse(memoryview(data), Params())
+        self.assertEqual(1, len(ret.messages))
+        literal = ret.messages[0].literal
+        self.assertIsInstance(literal, memoryview)
+        self.assertEqual(b'test test!', literal)
+        self.assertEqual(b'test test!', ret.messages[0].open().read())
+
     def test_parse_multi(self):
         state = ParsingState(continuations=[b'test test! {14}\n'])
         with self.assertRaises(ParsingInterrupt) as raised:
@@ -75,6 +109,84 @@ class TestListCommand(unittest.TestCase):
         self.assertEqual('two*', ret.filter)
         self.assertEqual(b'  ', buf)
 
+    def test_parse_return_status(self):
+        ret, buf = ListCommand.parse(
+            b' "" % RETURN (STATUS (MESSAGES UNSEEN))\n  ', Params())
+        self.assertEqual('%', ret.filter)
+        self.assertEqual([StatusAttribute(b'MESSAGES'),
+                          StatusAttribute(b'UNSEEN')], list(ret.status_list))
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_return_error(self):
+        with self.assertRaises(NotParseable):
+            ListCommand.parse(b' "" % RETURN (STATUS ())\n', Params())
+        with self.assertRaises(NotParseable):
+            ListCommand.parse(b' "" % RETURN (UNKNOWN)\n', Params())
+
+    def test_parse_extended(self):
+        ret, buf = ListCommand.parse(
+            b' (SUBSCRIBED RECURSIVEMATCH) "" ("one" two/%)'
+            b' RETURN (CHILDREN)\n  ', Params())
+        self.assertEqual(['one', 'two/%'], ret.filters)
+        self.assertEqual('one', ret.filter)
+        self.assertTrue(ret.select_subscribed)
+        self.assertTrue(ret.recursive_match)
+        self.assertTrue(ret.return_subscribed)
+        self.assertEqual(frozenset([b'CHILDREN']), ret.return_options)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_return_subscribed(self):
+        ret, buf = ListCommand.parse(
+            b' "" * RETURN (SUBSCRIBED)\n  ', Params())
+        self.assertFalse(ret.select_subscribed)
+        self.assertTrue(ret.return_subscribed)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_extended_error(self):
+        with self.assertRaises(NotParseable):
+            ListCommand.parse(b' (RECURSIVEMATCH) "" %\n', Params())
+        with self.assertRaises(NotParseable):
+            ListCommand.parse(b' (UNKNOWN) "" %\n', Params())
+        with self.assertRaises(NotParseable):
+            ListCommand.parse(b' "" ()\n', Params())
+        with self.assertRaises(NotParseable):
+            LSubCommand.parse(b' "" (one)\n', Params())
+
+
+class TestNotifyCommand(unittest.TestCase):
+
+    def test_parse(self):
+        ret, buf = NotifyCommand.parse(
+            b' SET STATUS (selected (MessageNew MessageExpunge))'
+            b' (subtree (one "two") NONE)'
+            b' (mailboxes three (MessageNew MessageExpunge FlagChange))\n  ',
+            Params())
+        self.assertTrue(ret.status)
+        self.assertEqual([
+            NotifyEventGroup(b'SELECTED', [], frozenset(
+                [b'MESSAGENEW', b'MESSAGEEXPUNGE'])),
+            NotifyEventGroup(b'SUBTREE', ['one', 'two'], frozenset()),
+            NotifyEventGroup(b'MAILBOXES', ['three'], frozenset(
+                [b'MESSAGENEW', b'MESSAGEEXPUNGE', b'FLAGCHANGE']))],
+            ret.event_groups)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_none(self):
+        ret, buf = NotifyCommand.parse(b' NONE\n  ', Params())
+        self.assertFalse(ret.status)
+        self.assertEqual([], ret.event_groups)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_error(self):
+        with self.assertRaises(NotParseable):
+            NotifyCommand.parse(b' SET\n', Params())
+        with self.assertRaises(NotParseable):
+            NotifyCommand.parse(b' SET (unknown NONE)\n', Params())
+        with self.assertRaises(NotParseable):
+            NotifyCommand.parse(b' SET (personal (MessageNew))\n', Params())
+        with self.assertRaises(NotParseable):
+            NotifyCommand.parse(b' SET (personal (FlagChange))\n', Params())
+
 
 class TestRenameCommand(unittest.TestCase):
 
@@ -7,8 +7,9 @@ from pymap.parsing.exceptions import NotParseable
 from pymap.parsing.command.select import ExpungeCommand, CopyCommand, \
     MoveCommand, FetchCommand, StoreCommand, SearchCommand, \
     UidExpungeCommand, UidCopyCommand, UidMoveCommand, UidFetchCommand, \
-    UidStoreCommand, UidSearchCommand, IdleCommand
-from pymap.parsing.specials import FetchAttribute, SearchKey, Flag
+    UidStoreCommand, UidSearchCommand, IdleCommand, SortCommand, \
+    UidSortCommand, ThreadCommand, UidThreadCommand
+from pymap.parsing.specials import FetchAttribute, SearchKey, Flag, SortKey
 
 
 class TestExpungeCommand(unittest.TestCase):
@@ -175,11 +176,76 @@ class TestSearchCommand(unittest.TestCase):
         ret, buf = UidSearchCommand.parse(b' ALL\n  ', Params())
         self.assertTrue(ret.uid)
 
+    def test_parse_return(self):
+        ret, buf = SearchCommand.parse(
+            b' RETURN (MIN COUNT SAVE) ALL\n  ', Params())
+        self.assertEqual({b'MIN', b'COUNT', b'SAVE'}, set(ret.options.value))
+        self.assertSetEqual({SearchKey(b'ALL')}, ret.keys)
+
+    def test_parse_return_partial(self):
+        ret, buf = SearchCommand.parse(
+            b' RETURN (PARTIAL -1:-50 COUNT) ALL\n  ', Params())
+        self.assertEqual({b'PARTIAL', b'COUNT'}, set(ret.options.value))
+        partial = ret.options.get(b'PARTIAL')
+        self.assertEqual(b'-1:-50', bytes(partial.value[0]))
+
+    def test_parse_return_empty(self):
+        ret, buf = SearchCommand.parse(b' RETURN () ALL\n  ', Params())
+        self.assertEqual({b'ALL'}, set(ret.options.value))
+
+    def test_parse_saved(self):
+        ret, buf = SearchCommand.parse(b' $ UNSEEN\n  ', Params())
+        keys = {key.value: key for key in ret.keys}
+        self.assertTrue(keys[b'SEQSET'].filter_sequence_set.is_saved)
+
     def test_parse_error(self):
         with self.assertRaises(NotParseable):
             SearchCommand.parse(b' TEST\n', Params())
 
 
+class TestSortCommand(unittest.TestCase):
+
+    def test_parse(self):
+        ret, buf = SortCommand.parse(
+            b' (REVERSE DATE SUBJECT) UTF-8 ALL\n  ', Params())
+        self.assertFalse(ret.uid)
+        self.assertEqual([SortKey(b'DATE', True), SortKey(b'SUBJECT')],
+                         list(ret.sort_keys))
+        self.assertSetEqual({SearchKey(b'ALL')}, ret.keys)
+        self.assertEqual('UTF-8', ret.charset)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_uid(self):
+        ret, buf = UidSortCommand.parse(b' (SIZE) UTF-8 ALL\n  ', Params())
+        self.assertTrue(ret.uid)
+
+    def test_parse_error(self):
+        with self.assertRaises(NotParseable):
+            SortCommand.parse(b' (TEST) UTF-8 ALL\n', Params())
+        with self.assertRaises(NotParseable):
+            SortCommand.parse(b' (DATE) TEST ALL\n', Params())
+
+
+class TestThreadCommand(unittest.TestCase):
+
+    def test_parse(self):
+        ret, buf = ThreadCommand.parse(
+            b' references UTF-8 ALL\n  ', Params())
+        self.assertFalse(ret.uid)
+        self.assertEqual(b'REFERENCES', ret.algorithm)
+        self.assertSetEqual({SearchKey(b'ALL')}, ret.keys)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_uid(self):
+        ret, buf = UidThreadCommand.parse(
+            b' ORDEREDSUBJECT UTF-8 ALL\n  ', Params())
+        self.assertTrue(ret.uid)
+
+    def test_parse_error(self):
+        with self.assertRaises(NotParseable):
+            ThreadCommand.parse(b' TEST UTF-8 ALL\n', Params())
+
+
 class TestIdleCommand(unittest.TestCase):
 
     def test_parse(self):
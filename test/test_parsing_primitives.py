@@ -117,6 +117,18 @@ class TestString(unittest.TestCase):
         self.assertFalse(ret.binary)
         self.assertEqual(b'abc', buf)
 
+    def test_literal_plus_buffer(self):
+        data = b'{5+}\r\ntest\x01abc'
+        ret, buf = String.parse(memoryview(data), Params())
+        self.assertIsInstance(ret, LiteralString)
+        self.assertIsInstance(ret.buffer, memoryview)
+        self.assertIs(data, ret.buffer.obj)
+        self.assertEqual(b'test\x01', ret.buffer)
+        self.assertEqual(b'test\x01', ret.value)
+        ret, buf = String.parse(memoryview(bytearray(data)), Params())
+        self.assertIsInstance(ret.buffer, bytes)
+        self.assertEqual(b'test\x01', ret.buffer)
+
     def test_literal_binary(self):
         state = ParsingState(continuations=[b'\x00\x01\02abc'])
         ret, buf = String.parse(b'~{3}\r\n', Params(state))
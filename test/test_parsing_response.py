@@ -1,5 +1,7 @@
 
+import asyncio
 import unittest
+from io import BytesIO
 
 from pymap.parsing.response import CommandResponse, ResponseContinuation, \
     ResponseBad, ResponseNo, ResponseOk, ResponseBye, ResponseCode
@@ -22,6 +24,22 @@ class TestResponse(unittest.TestCase):
                          b'* OK test data 2\r\n'
                          b'tag response test\r\n', bytes(resp))
 
+    def test_async_write_drain(self):
+        resp = CommandResponse(b'tag', b'response test')
+        resp.add_untagged_ok(b'test data 1')
+        resp.add_untagged_ok(b'test data 2')
+        writer = BytesIO()
+        drained: list[bytes] = []
+
+        async def drain() -> None:
+            drained.append(writer.getvalue())
+
+        asyncio.run(resp.async_write(writer, drain=drain))
+        self.assertEqual([b'* OK test data 1\r\n',
+                          b'* OK test data 1\r\n'
+                          b'* OK test data 2\r\n'], drained)
+        self.assertEqual(bytes(resp), writer.getvalue())
+
 
 class TestResponseContinuation(unittest.TestCase):
 
@@ -3,8 +3,11 @@ import unittest
 
 from pymap.parsing.response.specials import FlagsResponse, ExistsResponse, \
     RecentResponse, ExpungeResponse, FetchResponse, SearchResponse, \
-    ESearchResponse, ListResponse, LSubResponse, IdResponse
-from pymap.parsing.specials import FetchAttribute, FetchValue
+    ESearchResponse, ListResponse, LSubResponse, IdResponse, \
+    VanishedResponse, EnabledResponse, SortResponse, ThreadResponse, \
+    UidFetchResponse
+from pymap.parsing.specials import FetchAttribute, FetchValue, SequenceSet
+from pymap.threads import ThreadNode
 
 
 class TestFlagsResponse(unittest.TestCase):
@@ -43,18 +46,83 @@ class TestFetchResponse(unittest.TestCase):
         self.assertEqual(b'* 56 FETCH (KEY1 VAL1)\r\n', bytes(resp))
 
 
+class TestUidFetchResponse(unittest.TestCase):
+
+    def test_bytes(self):
+        resp = UidFetchResponse(119, [
+            FetchValue.of(FetchAttribute(b'KEY1'), b'VAL1')])
+        self.assertEqual(b'* 119 UIDFETCH (KEY1 VAL1)\r\n', bytes(resp))
+
+    def test_merge(self):
+        resp1 = UidFetchResponse(119, [
+            FetchValue.of(FetchAttribute(b'KEY1'), b'VAL1')])
+        resp2 = UidFetchResponse(119, [
+            FetchValue.of(FetchAttribute(b'KEY2'), b'VAL2')])
+        merged = resp1.merge(resp2)
+        self.assertIsInstance(merged, UidFetchResponse)
+        self.assertEqual(b'* 119 UIDFETCH (KEY1 VAL1 KEY2 VAL2)\r\n',
+                         bytes(merged))
+
+
 class TestSearchResponse(unittest.TestCase):
 
     def test_bytes(self):
         resp = SearchResponse([4, 8, 15, 16, 23, 42])
         self.assertEqual(b'* SEARCH 4 8 15 16 23 42\r\n', bytes(resp))
 
+    def test_bytes_mod_seq(self):
+        resp = SearchResponse([4, 8], 15)
+        self.assertEqual(b'* SEARCH 4 8 (MODSEQ 15)\r\n', bytes(resp))
+
 
 class TestESearchResponse(unittest.TestCase):
 
     def test_bytes(self):
         resp = ESearchResponse(b'tag', True, {b'one': b'2', b'three': b'4'})
-        self.assertEqual(b'* (TAG "tag") UID ONE 2 THREE 4\r\n', bytes(resp))
+        self.assertEqual(b'* ESEARCH (TAG "tag") UID ONE 2 THREE 4\r\n',
+                         bytes(resp))
+
+    def test_bytes_partial(self):
+        resp = ESearchResponse(b'tag', True,
+                               {b'PARTIAL': b'(-1:-2 103:104)'})
+        self.assertEqual(b'* ESEARCH (TAG "tag") UID PARTIAL '
+                         b'(-1:-2 103:104)\r\n', bytes(resp))
+
+
+class TestSortResponse(unittest.TestCase):
+
+    def test_bytes(self):
+        resp = SortResponse([5, 3, 4, 1, 2])
+        self.assertEqual(b'* SORT 5 3 4 1 2\r\n', bytes(resp))
+
+
+class TestThreadResponse(unittest.TestCase):
+
+    def test_bytes(self):
+        resp = ThreadResponse([
+            ThreadNode(2),
+            ThreadNode(3, [ThreadNode(6, [
+                ThreadNode(4, [ThreadNode(23)]),
+                ThreadNode(44, [ThreadNode(7, [ThreadNode(96)])])])]),
+            ThreadNode(None, [ThreadNode(5), ThreadNode(8)])])
+        self.assertEqual(b'* THREAD (2)(3 6 (4 23)(44 7 96))((5)(8))\r\n',
+                         bytes(resp))
+
+
+class TestVanishedResponse(unittest.TestCase):
+
+    def test_bytes(self):
+        resp = VanishedResponse(SequenceSet([(1, 3), 5], uid=True))
+        self.assertEqual(b'* VANISHED 1:3,5\r\n', bytes(resp))
+        resp = VanishedResponse(SequenceSet([7], uid=True), earlier=True)
+        self.assertEqual(b'* VANISHED (EARLIER) 7\r\n', bytes(resp))
+
+
+class TestEnabledResponse(unittest.TestCase):
+
+    def test_bytes(self):
+        resp = EnabledResponse([b'CONDSTORE', b'QRESYNC'])
+        self.assertEqual(b'* ENABLED CONDSTORE QRESYNC\r\n', bytes(resp))
 
 
 class TestListResponse(unittest.TestCase):
@@ -67,6 +135,11 @@ class TestListResponse(unittest.TestCase):
         self.assertEqual(b'* LIST (\\Marked \\Noinferior \\Noselect) '
                          b'"." Other.Stuff\r\n', bytes(resp2))
 
+    def test_bytes_child_info(self):
+        resp = ListResponse('Foo', '/', [b'HasChildren'], [b'SUBSCRIBED'])
+        self.assertEqual(b'* LIST (\\HasChildren) "/" Foo '
+                         b'("CHILDINFO" ("SUBSCRIBED"))\r\n', bytes(resp))
+
 
 class TestLSubResponse(unittest.TestCase):
 
@@ -7,9 +7,11 @@ from pymap.parsing import Params
 from pymap.parsing.exceptions import NotParseable, UnexpectedType, \
     InvalidContent
 from pymap.parsing.specials import AString, Tag, Mailbox, DateTime, Flag, \
-    StatusAttribute, SequenceSet, SearchKey, ObjectId, ExtensionOptions
+    StatusAttribute, SequenceSet, SearchKey, ObjectId, ExtensionOptions, \
+    SortKey, PartialRange
 from pymap.parsing.state import ParsingState
-from pymap.parsing.specials.fetchattr import FetchPartial, FetchAttribute
+from pymap.parsing.specials.fetchattr import FetchPartial, FetchAttribute, \
+    FetchRequirement
 from pymap.parsing.specials.sequenceset import MaxValue
 
 
@@ -196,6 +198,72 @@ class TestStatusAttribute(unittest.TestCase):
         self.assertEqual(b'MESSAGES', bytes(attr))
 
 
+class TestSortKey(unittest.TestCase):
+
+    def test_valueerror(self):
+        with self.assertRaises(ValueError):
+            SortKey(b'TEST')
+        SortKey(b'SUBJECT')
+
+    def test_parse(self):
+        ret, buf = SortKey.parse(b'  subject  ', Params())
+        self.assertEqual(b'SUBJECT', ret.value)
+        self.assertFalse(ret.reverse)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_reverse(self):
+        ret, buf = SortKey.parse(b'REVERSE date  ', Params())
+        self.assertEqual(b'DATE', ret.value)
+        self.assertTrue(ret.reverse)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_invalid(self):
+        with self.assertRaises(InvalidContent):
+            SortKey.parse(b'test', Params())
+
+    def test_bytes(self):
+        self.assertEqual(b'SIZE', bytes(SortKey(b'SIZE')))
+        self.assertEqual(b'REVERSE SIZE', bytes(SortKey(b'SIZE', True)))
+
+
+class TestPartialRange(unittest.TestCase):
+
+    def test_valueerror(self):
+        with self.assertRaises(ValueError):
+            PartialRange(0, 5)
+        with self.assertRaises(ValueError):
+            PartialRange(-1, 5)
+
+    def test_parse(self):
+        ret, buf = PartialRange.parse(b' 50:1  ', Params())
+        self.assertEqual((1, 50), ret.value)
+        self.assertFalse(ret.from_end)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_from_end(self):
+        ret, buf = PartialRange.parse(b'-1:-50  ', Params())
+        self.assertEqual((-1, -50), ret.value)
+        self.assertTrue(ret.from_end)
+        self.assertEqual(b'  ', buf)
+
+    def test_parse_invalid(self):
+        with self.assertRaises(NotParseable):
+            PartialRange.parse(b'-1:50', Params())
+        with self.assertRaises(NotParseable):
+            PartialRange.parse(b'0:5', Params())
+
+    def test_bounds(self):
+        self.assertEqual((0, 10), PartialRange(1, 10).bounds(100))
+        self.assertEqual((5, 7), PartialRange(6, 10).bounds(7))
+        self.assertEqual((7, 7), PartialRange(8, 10).bounds(7))
+        self.assertEqual((90, 100), PartialRange(-1, -10).bounds(100))
+        self.assertEqual((0, 3), PartialRange(-1, -10).bounds(3))
+
+    def test_bytes(self):
+        self.assertEqual(b'1:50', bytes(PartialRange(50, 1)))
+        self.assertEqual(b'-1:-50', bytes(PartialRange(-50, -1)))
+
+
 class TestSequenceSet(unittest.TestCase):
 
     def test_parse(self):
@@ -242,6 +310,16 @@ class TestFetchAttribute(unittest.TestCase):
         self.assertIsNone(ret2.section)
         self.assertIsNone(ret2.partial)
 
+    def test_parse_preview(self):
+        ret1, buf1 = FetchAttribute.parse(b'PREVIEW UID', Params())
+        self.assertEqual(b'PREVIEW', ret1.value)
+        self.assertEqual(FetchRequirement.METADATA, ret1.requirement)
+        self.assertEqual(b' UID', buf1)
+        ret2, buf2 = FetchAttribute.parse(b'preview (lazy) UID', Params())
+        self.assertEqual(b'PREVIEW', ret2.value)
+        self.assertEqual(b'PREVIEW', bytes(ret2))
+        self.assertEqual(b' UID', buf2)
+
     def test_parse_sections(self):
         ret1, _ = FetchAttribute.parse(b'BODY[1.2]', Params())
         self.assertEqual(b'BODY', ret1.value)
@@ -306,6 +384,12 @@ class TestSearchKey(unittest.TestCase):
         self.assertEqual([1, 2, 3], ret.filter.value)
         self.assertTrue(ret.inverse)
 
+    def test_parse_seqset_uid(self):
+        ret1, _ = SearchKey.parse(b'1:2', Params(uid=True))
+        self.assertFalse(ret1.filter.uid)
+        ret2, _ = SearchKey.parse(b'UID 1:2', Params(uid=True))
+        self.assertTrue(ret2.filter.uid)
+
     def test_parse_keyset(self):
         ret, buf = SearchKey.parse(b'(4,5,6 NOT 1,2,3)', Params())
         self.assertEqual(b'KEYSET', ret.value)
@@ -416,6 +500,13 @@ class TestExtensionOptions(unittest.TestCase):
         self.assertEqual({b'ONE': [b'two', [b'three']]}, ret.value)
         self.assertEqual(b'abc', buf)
 
+    def test_parse_nested_seqset(self):
+        ret, buf = ExtensionOptions.parse(
+            b'(qresync (67890007 90 1:* (1,3:5 7:*)))abc', Params())
+        self.assertEqual({b'QRESYNC': [b'67890007', b'90', b'1:*',
+                                       [b'1,3:5', b'7:*']]}, ret.value)
+        self.assertEqual(b'abc', buf)
+
     def test_bytes(self):
         ret, _ = ExtensionOptions.parse(b'()', Params())
         self.assertEqual(b'()', bytes(ret))
@@ -1,14 +1,17 @@
 
+import asyncio
 import unittest
 from datetime import datetime
 
+from pymap.concurrent import Event
 from pymap.flags import FlagOp, PermanentFlags, SessionFlags
 from pymap.message import BaseMessage
 from pymap.parsing.command.select import SearchCommand, UidSearchCommand
 from pymap.parsing.response import ResponseOk
-from pymap.parsing.specials import SequenceSet, ObjectId
+from pymap.parsing.specials import SequenceSet, ObjectId, PartialRange
+from pymap.parsing.specials.sequenceset import MaxValue
 from pymap.parsing.specials.flag import Seen, Flagged, Flag
-from pymap.selected import SelectedMailbox
+from pymap.selected import SelectedSet, SelectedMailbox
 
 _Keyword = Flag(b'$Keyword')
 
@@ -25,10 +28,13 @@ class TestSelectedMailbox(unittest.TestCase):
         self.response = ResponseOk(b'.', b'testing')
 
     @classmethod
-    def new_selected(cls, guid: bytes = b'test') -> SelectedMailbox:
+    def new_selected(cls, guid: bytes = b'test',
+                     selected_set: SelectedSet | None = None) \
+            -> SelectedMailbox:
         return SelectedMailbox(ObjectId(guid), False,
                                PermanentFlags([Seen, Flagged]),
-                               SessionFlags([_Keyword]))
+                               SessionFlags([_Keyword]),
+                               selected_set=selected_set)
 
     @classmethod
     def set_messages(cls, selected: SelectedMailbox,
@@ -45,6 +51,76 @@ class TestSelectedMailbox(unittest.TestCase):
     def uid_command(self) -> SearchCommand:
         return UidSearchCommand(b'.', [], None)
 
+    def test_get_uids(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(3, []), (10, []), (11, []), (500, []),
+                           (1000000, [])])
+        messages = selected.messages
+        self.assertEqual([(1, 3), (2, 10), (3, 11), (4, 500), (5, 1000000)],
+                         messages.get_uids(SequenceSet.all(uid=True)))
+        self.assertEqual([(2, 10), (3, 11), (5, 1000000)],
+                         messages.get_uids(SequenceSet(
+                             [(11, 4), (600, MaxValue())], uid=True)))
+        self.assertEqual([], messages.get_uids(SequenceSet(
+            [(12, 499), 1000001], uid=True)))
+        self.assertEqual([(2, 10), (3, 11), (5, 1000000)],
+                         messages.get_uids(SequenceSet(
+                             [(3, 2), MaxValue(), 7])))
+        self.assertEqual([], messages.get_uids(SequenceSet([6])))
+
+    def test_get_all(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(3, []), (10, []), (11, []), (500, [])])
+        messages = selected.messages
+        self.assertEqual([(2, 10), (4, 500)],
+                         [(seq, msg.uid) for seq, msg in messages.get_all(
+                             SequenceSet([10, (12, MaxValue())], uid=True))])
+        self.assertEqual([(1, 3), (2, 10)],
+                         [(seq, msg.uid) for seq, msg in messages.get_all(
+                             SequenceSet([(1, 2)]))])
+
+    def test_get_partial(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(3, []), (10, []), (11, []), (500, []),
+                           (1000000, [])])
+        messages = selected.messages
+        self.assertEqual([(1, 3), (2, 10)], messages.get_partial(
+            SequenceSet.all(uid=True), PartialRange(1, 2)))
+        self.assertEqual([(4, 500), (5, 1000000)], messages.get_partial(
+            SequenceSet.all(uid=True), PartialRange(-2, -1)))
+        self.assertEqual([(2, 10), (4, 500)], messages.get_partial(
+            SequenceSet([(1, 10), (400, 600)], uid=True),
+            PartialRange(2, 5)))
+        self.assertEqual([(1, 3), (4, 500)], messages.get_partial(
+            SequenceSet([1, (4, 5)]), PartialRange(-3, -2)))
+        self.assertEqual([], messages.get_partial(
+            SequenceSet([(1, 2)]), PartialRange(3, 4)))
+
+    def test_find_uids(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(3, []), (10, []), (11, []), (500, [])])
+        messages = selected.messages
+        self.assertEqual([(2, 10), (4, 500)], messages.find_uids(
+            SequenceSet([10, (12, MaxValue())], uid=True), [500, 10, 7]))
+        self.assertEqual([(1, 3)], messages.find_uids(
+            SequenceSet([(1, 2)]), [3, 11]))
+
+    def test_get_vanished(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(3, []), (10, []), (11, []), (500, [])])
+        messages = selected.messages
+        self.assertEqual(b'1:2,4:9,12:499', messages.get_vanished(
+            SequenceSet.all(uid=True)))
+        self.assertEqual(b'501:600', messages.get_vanished(
+            SequenceSet([(500, 600)], uid=True)))
+        self.assertIsNone(messages.get_vanished(
+            SequenceSet([10, 11], uid=True)))
+
     def test_add_untagged_recent_equal(self) -> None:
         selected = self.new_selected()
         selected.session_flags.add_recent(1)
@@ -101,6 +177,35 @@ class TestSelectedMailbox(unittest.TestCase):
                          b'* 1 RECENT\r\n'
                          b'. OK testing\r\n', bytes(self.response))
 
+    def test_add_untagged_vanished(self) -> None:
+        selected = self.new_selected()
+        selected.condstore = True
+        selected.qresync = True
+        self.set_messages(selected, [],
+                          [(1, []), (2, []), (3, []), (4, [])])
+        forked, _ = selected.fork(self.command)
+        self.set_messages(forked, [2, 3], [])
+        _, untagged = forked.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* VANISHED 2:3\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
+    def test_add_untagged_uidonly(self) -> None:
+        selected = self.new_selected()
+        selected.uidonly = True
+        self.set_messages(selected, [],
+                          [(10, []), (20, []), (30, []), (40, [])])
+        forked, _ = selected.fork(self.uid_command)
+        self.set_messages(forked, [20, 30], [(40, [Seen]), (50, [])])
+        forked, untagged = forked.fork(self.uid_command)
+        self.assertTrue(forked.uidonly)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* VANISHED 20,30\r\n'
+                         b'* 3 EXISTS\r\n'
+                         b'* 40 UIDFETCH (FLAGS (\\Seen))\r\n'
+                         b'* 50 UIDFETCH (FLAGS ())\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
     def test_add_untagged_equal(self) -> None:
         selected = self.new_selected()
         self.set_messages(selected, [],
@@ -178,6 +283,19 @@ class TestSelectedMailbox(unittest.TestCase):
                          b'* 5 FETCH (FLAGS (\\Flagged))\r\n'
                          b'. OK testing\r\n', bytes(self.response))
 
+    def test_add_untagged_expunge_hidden_after(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(1, []), (2, []), (3, []), (4, [])])
+        forked, _ = selected.fork(self.command)
+        self.set_messages(forked, [2], [])
+        forked.hide_expunged = True
+        self.set_messages(forked, [3], [])
+        _, untagged = forked.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 2 EXPUNGE\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
     def test_add_untagged_expunge(self) -> None:
         selected = self.new_selected()
         self.set_messages(selected, [],
@@ -193,6 +311,23 @@ class TestSelectedMailbox(unittest.TestCase):
                          b'* 3 FETCH (FLAGS ())\r\n'
                          b'. OK testing\r\n', bytes(self.response))
 
+    def test_add_untagged_journal(self) -> None:
+        selected = self.new_selected()
+        self.set_messages(selected, [],
+                          [(1, []), (2, []), (3, []), (4, [])])
+        forked, _ = selected.fork(self.command)
+        self.set_messages(forked, [2], [(5, []), (3, [Seen])])
+        self.set_messages(forked, [5], [(6, []), (3, [])])
+        self.set_messages(forked, [4], [(1, [Flagged])])
+        _, untagged = forked.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 4 EXPUNGE\r\n'
+                         b'* 2 EXPUNGE\r\n'
+                         b'* 3 EXISTS\r\n'
+                         b'* 1 FETCH (FLAGS (\\Flagged))\r\n'
+                         b'* 3 FETCH (FLAGS ())\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
     def test_add_untagged_all(self) -> None:
         selected = self.new_selected()
         self.set_messages(selected, [],
@@ -227,3 +362,147 @@ class TestSelectedMailbox(unittest.TestCase):
         self.response.add_untagged(*untagged)
         self.assertEqual(b'* BYE Selected mailbox no longer exists.\r\n'
                          b'. OK testing\r\n', bytes(self.response))
+
+    def test_shared_updates(self) -> None:
+        selected_set = SelectedSet()
+        selected1 = self.new_selected(selected_set=selected_set)
+        self.set_messages(selected1, [],
+                          [(1, []), (2, []), (3, [])])
+        selected2 = self.new_selected(selected_set=selected_set)
+        self.assertEqual(3, selected2.messages.exists)
+        forked1, _ = selected1.fork(self.command)
+        forked2, _ = selected2.fork(self.command)
+        self.set_messages(forked1, [2], [(3, [Seen]), (4, [])])
+        self.set_messages(forked2, [], [])
+        _, untagged = forked2.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 2 EXPUNGE\r\n'
+                         b'* 3 EXISTS\r\n'
+                         b'* 2 FETCH (FLAGS (\\Seen))\r\n'
+                         b'* 3 FETCH (FLAGS ())\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+        self.assertEqual(frozenset({Seen}),
+                         forked1.messages.get_permanent_flags(3))
+
+    def test_render_flags(self) -> None:
+        selected_set = SelectedSet()
+        selected1 = self.new_selected(selected_set=selected_set)
+        selected2 = self.new_selected(selected_set=selected_set)
+        flags = selected1.messages.render_flags(frozenset([Seen, Flagged]))
+        self.assertEqual(b'(\\Flagged \\Seen)', flags)
+        self.assertIs(flags, selected2.messages.render_flags(
+            frozenset([Flagged, Seen])))
+
+    def test_shared_stale_updates(self) -> None:
+        selected_set = SelectedSet()
+        selected1 = self.new_selected(selected_set=selected_set)
+        selected2 = self.new_selected(selected_set=selected_set)
+        selected1.mod_sequence = 1
+        self.set_messages(selected1, [], [(1, [])])
+        self.assertEqual(1, selected2.mod_sequence)
+        selected2.mod_sequence = 1
+        self.assertEqual(1, selected1.mod_sequence)
+        selected1.mod_sequence = 2
+        self.set_messages(selected1, [], [(1, [Seen])])
+        selected2.mod_sequence = 2
+        self.set_messages(selected2, [], [(1, [Flagged])])
+        self.assertEqual(2, selected2.mod_sequence)
+        self.assertEqual(frozenset({Seen}),
+                         selected2.messages.get_permanent_flags(1))
+
+    def test_shared_rebased_updates(self) -> None:
+        selected_set = SelectedSet()
+        selected1 = self.new_selected(selected_set=selected_set)
+        selected2 = self.new_selected(selected_set=selected_set)
+        selected1.mod_sequence = 1
+        selected1.add_updates([_Message(1, datetime.now(), [], mod_seq=1),
+                               _Message(2, datetime.now(), [], mod_seq=1),
+                               _Message(3, datetime.now(), [], mod_seq=1)],
+                              [])
+        forked1, _ = selected1.fork(self.command)
+        self.assertEqual(1, selected2.mod_sequence)
+        self.assertEqual(1, forked1.mod_sequence)
+        selected2.mod_sequence = 2
+        selected2.add_updates([_Message(1, datetime.now(), [Flagged],
+                                        mod_seq=2),
+                               _Message(4, datetime.now(), [], mod_seq=2)],
+                              [3])
+        forked1.mod_sequence = 3
+        forked1.add_updates([_Message(1, datetime.now(), [Seen], mod_seq=3),
+                             _Message(2, datetime.now(), [Seen], mod_seq=3),
+                             _Message(3, datetime.now(), [Seen], mod_seq=3)],
+                            [])
+        self.assertEqual(2, forked1.mod_sequence)
+        _, untagged = forked1.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 3 EXPUNGE\r\n'
+                         b'* 3 EXISTS\r\n'
+                         b'* 1 FETCH (FLAGS (\\Seen))\r\n'
+                         b'* 2 FETCH (FLAGS (\\Seen))\r\n'
+                         b'* 3 FETCH (FLAGS ())\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
+    def test_shared_expunge_hidden(self) -> None:
+        selected_set = SelectedSet()
+        selected1 = self.new_selected(selected_set=selected_set)
+        self.set_messages(selected1, [],
+                          [(1, []), (2, []), (3, [])])
+        selected2 = self.new_selected(selected_set=selected_set)
+        forked1, _ = selected1.fork(self.command)
+        self.set_messages(forked1, [2], [])
+        forked2, _ = selected2.fork(self.command)
+        forked2.hide_expunged = True
+        self.set_messages(forked2, [], [(4, [])])
+        self.assertEqual(4, forked2.messages.exists)
+        self.assertEqual(2, forked1.messages.exists)
+        forked2, untagged = forked2.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.set_messages(forked2, [], [])
+        _, untagged = forked2.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 4 EXISTS\r\n'
+                         b'* 4 FETCH (FLAGS ())\r\n'
+                         b'* 2 EXPUNGE\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
+    def test_set_uids(self) -> None:
+        selected = self.new_selected()
+        selected.set_uids([1, 2, 3, 4])
+        messages = selected.messages
+        self.assertEqual(4, messages.exists)
+        self.assertEqual([2, 3], messages.get_unloaded(SequenceSet([(2, 3)])))
+        self.assertEqual([], messages.get_all(SequenceSet([(2, 3)])))
+        selected.add_cached([_Message(2, datetime.now(), [Seen]),
+                             _Message(3, datetime.now(), [])])
+        self.assertEqual([], messages.get_unloaded(SequenceSet([(2, 3)])))
+        self.assertEqual([(2, 2), (3, 3)],
+                         [(seq, msg.uid) for seq, msg in messages.get_all(
+                             SequenceSet([(2, 3)]))])
+        self.assertEqual(frozenset({Seen}), messages.get_permanent_flags(2))
+        forked, _ = selected.fork(self.command)
+        forked.set_uids([1, 2, 4, 5])
+        self.set_messages(forked, [], [(4, [Flagged])])
+        _, untagged = forked.fork(self.command)
+        self.response.add_untagged(*untagged)
+        self.assertEqual(b'* 3 EXPUNGE\r\n'
+                         b'* 4 EXISTS\r\n'
+                         b'* 3 FETCH (FLAGS (\\Flagged))\r\n'
+                         b'. OK testing\r\n', bytes(self.response))
+
+    def test_wait_updated(self) -> None:
+        selected_set = SelectedSet()
+        selecteds = [self.new_selected(selected_set=selected_set)
+                     for _ in range(10)]
+        done = Event.for_asyncio()
+        watched: list[int] = []
+
+        async def watch(event: Event) -> bool:
+            watched.append(len(watched))
+            return len(watched) == 3
+
+        async def run() -> None:
+            waiters = [selected_set.wait_updated(selected, done, watch)
+                       for selected in selecteds]
+            await asyncio.wait_for(asyncio.gather(*waiters), 1.0)
+        asyncio.run(run())
+        self.assertEqual([0, 1, 2], watched)
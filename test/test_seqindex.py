@@ -0,0 +1,115 @@
+
+import random
+import unittest
+from bisect import bisect_left, bisect_right
+
+from pymap.seqindex import SequenceIndex
+
+
+class _SmallIndex(SequenceIndex):
+    load = 4
+
+
+class TestSequenceIndex(unittest.TestCase):
+
+    def test_empty(self) -> None:
+        index = SequenceIndex()
+        self.assertEqual(0, len(index))
+        self.assertFalse(index)
+        self.assertNotIn(1, index)
+        self.assertEqual([], list(index))
+        self.assertEqual(0, index.bisect_left(1))
+        self.assertEqual([], list(index.islice(0, 10)))
+        with self.assertRaises(IndexError):
+            index[-1]
+        with self.assertRaises(ValueError):
+            index.index(1)
+        with self.assertRaises(KeyError):
+            index.remove(1)
+
+    def test_add_remove(self) -> None:
+        index = _SmallIndex([5, 10, 15, 20, 25, 30, 35, 40, 45, 50])
+        self.assertTrue(index.add(12))
+        self.assertFalse(index.add(12))
+        self.assertTrue(index.add(1))
+        index.remove(30)
+        self.assertEqual([1, 5, 10, 12, 15, 20, 25, 35, 40, 45, 50],
+                         list(index))
+        self.assertEqual(0, index.index(1))
+        self.assertEqual(3, index.index(12))
+        self.assertEqual(10, index.index(50))
+        self.assertEqual(12, index[3])
+        self.assertEqual(50, index[-1])
+        self.assertEqual(7, index.bisect_left(35))
+        self.assertEqual(8, index.bisect_right(35))
+        self.assertEqual(7, index.bisect_right(30))
+        self.assertEqual([20, 25, 35], list(index.islice(5, 8)))
+        self.assertIn(35, index)
+        self.assertNotIn(30, index)
+
+    def test_values(self) -> None:
+        index = _SmallIndex([1, 2, 3], [10, 20, 30])
+        index.update([5, 4], [50, 40])
+        self.assertTrue(index.add(0, 7))
+        self.assertEqual(7, index.get_value(0))
+        self.assertEqual(40, index.get_value(4))
+        index.set_value(4, 44)
+        self.assertEqual(44, index.get_value(4))
+        self.assertEqual(20, index.remove(2))
+        self.assertEqual([0, 1, 3, 4, 5], list(index))
+        self.assertEqual([7, 10, 30, 44, 50],
+                         [index.get_value(uid) for uid in index])
+        with self.assertRaises(KeyError):
+            index.get_value(2)
+        with self.assertRaises(KeyError):
+            index.set_value(6, 1)
+
+    def test_random(self) -> None:
+        rand = random.Random(0)  # noqa: S311
+        index = _SmallIndex()
+        expected: list[int] = []
+        for _ in range(2000):
+            uid = rand.randint(1, 300)
+            if uid in expected:
+                index.remove(uid)
+                expected.remove(uid)
+            else:
+                index.add(uid, uid * 2)
+                expected.append(uid)
+                expected.sort()
+            self.assertEqual(len(expected), len(index))
+            if expected:
+                pos = rand.randrange(len(expected))
+                self.assertEqual(expected[pos], index[pos])
+                self.assertEqual(pos, index.index(expected[pos]))
+                self.assertEqual(expected[pos] * 2,
+                                 index.get_value(expected[pos]))
+                self.assertEqual(expected[pos:pos + 7],
+                                 list(index.islice(pos, pos + 7)))
+            self.assertEqual(bisect_left(expected, uid),
+                             index.bisect_left(uid))
+            self.assertEqual(bisect_right(expected, uid),
+                             index.bisect_right(uid))
+        self.assertEqual(expected, list(index))
+
+    def test_copy(self) -> None:
+        rand = random.Random(1)  # noqa: S311
+        index = _SmallIndex(range(1, 40), range(1, 40))
+        copies: list[tuple[SequenceIndex, list[int]]] = []
+        for _ in range(300):
+            uid = rand.randint(1, 60)
+            if uid in index:
+                index.remove(uid)
+            else:
+                index.add(uid, uid)
+            if rand.random() < 0.1:
+                copy = index.copy()
+                copies.append((index, list(index)))
+                index = copy
+            if rand.random() < 0.1 and index:
+                uid = index[rand.randrange(len(index))]
+                index.set_value(uid, 0)
+                index.set_value(uid, uid)
+        for old, expected in copies:
+            self.assertEqual(expected, list(old))
+            self.assertEqual(expected, [old.get_value(uid) for uid in old])
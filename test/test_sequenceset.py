@@ -1,6 +1,7 @@
 
 import unittest
 
+from pymap.parsing import Params
 from pymap.parsing.specials.sequenceset import MaxValue, SequenceSet
 
 
@@ -62,6 +63,15 @@ class TestSequenceSet(unittest.TestCase):
         self.assertEqual(b'12,*,1:*', bytes(seq))
         self.assertEqual(b'12,*,1:*', bytes(seq))
 
+    def test_saved(self) -> None:
+        seq, buf = SequenceSet.parse(memoryview(b'$ '), Params(uid=True))
+        self.assertTrue(seq.is_saved)
+        self.assertTrue(seq.uid)
+        self.assertEqual(b'$', bytes(seq))
+        self.assertEqual([], seq.ranges(100))
+        self.assertEqual(b' ', buf)
+        self.assertFalse(SequenceSet([1]).is_saved)
+
     def test_build(self) -> None:
         seq = SequenceSet.build([1])
         self.assertEqual(b'1', bytes(seq))
@@ -76,3 +86,18 @@ class TestSequenceSet(unittest.TestCase):
         seq = SequenceSet.build([1, 3, 5])
         self.assertEqual(b'1,3,5', bytes(seq))
         seq = SequenceSet.build([1, 2, 3, 4, 5])
+
+    def test_ranges(self) -> None:
+        set1 = SequenceSet([12])
+        self.assertEqual([(12, 12)], set1.ranges(100))
+        self.assertEqual([], set1.ranges(10))
+        set2 = SequenceSet([(MaxValue(), 50), (60, 10)])
+        self.assertEqual([(10, 100)], set2.ranges(100))
+        set3 = SequenceSet([(7, 8), 5, (1, 2), 3, 9])
+        self.assertEqual([(1, 3), (5, 5), (7, 9)], set3.ranges(100))
+        set4 = SequenceSet([(1, MaxValue())])
+        self.assertEqual([], set4.ranges(0))
+        self.assertEqual([(1, 1000000)], set4.ranges(1000000))
+        set5 = SequenceSet.all()
+        self.assertEqual([], set5.ranges(0))
+        self.assertEqual([(1, 1000000)], set5.ranges(1000000))
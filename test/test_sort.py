@@ -0,0 +1,115 @@
+
+import unittest
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+
+from pymap.frozen import frozenlist
+from pymap.message import BaseMessage
+from pymap.parsing.specials import ObjectId, SortKey
+from pymap.sort import SortHeaders, SortHeadersCache, sort_messages, \
+    thread_messages
+
+_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class _Message(BaseMessage):
+
+    async def load_content(self, requirement):
+        raise RuntimeError()
+
+
+def _item(seq: int, subject: str, days: int, msg_id: str | None = None,
+          references: Sequence[str] = (), from_: bytes = b'',
+          size: int = 0) -> tuple[int, _Message, SortHeaders]:
+    base_subject, is_reply = SortHeaders.get_base_subject(subject)
+    headers = SortHeaders(_date + timedelta(days=days),
+                          base_subject.upper().encode('ascii'), is_reply,
+                          from_, b'', b'', msg_id, references, size)
+    return seq, _Message(seq, _date, []), headers
+
+
+class TestSortHeaders(unittest.TestCase):
+
+    def test_get_base_subject(self) -> None:
+        self.assertEqual(('hello', False),
+                         SortHeaders.get_base_subject('  hello  '))
+        self.assertEqual(('hello world', True),
+                         SortHeaders.get_base_subject('Re: hello   world'))
+        self.assertEqual(('hello', True), SortHeaders.get_base_subject(
+            'Re: [list] Fwd: hello (fwd)'))
+        self.assertEqual(('foo', True),
+                         SortHeaders.get_base_subject('[fwd: Re: foo]'))
+        self.assertEqual(('[list]', False),
+                         SortHeaders.get_base_subject('[list]'))
+        self.assertEqual(('', True), SortHeaders.get_base_subject('re:'))
+
+    def test_cache(self) -> None:
+        cache = SortHeadersCache(2)
+        ids = [ObjectId.random_email_id() for _ in range(3)]
+        for email_id in ids:
+            cache.add(email_id, _item(1, '', 0)[2])
+        self.assertIsNone(cache.get(ids[0]))
+        self.assertIsNotNone(cache.get(ids[1]))
+        self.assertIsNotNone(cache.get(ids[2]))
+
+
+class TestSortMessages(unittest.TestCase):
+
+    def test_sort(self) -> None:
+        items = [_item(1, 'b', 3, from_=b'X'),
+                 _item(2, 'Re: a', 1, from_=b'Y'),
+                 _item(3, 'a', 2, from_=b'X'),
+                 _item(4, 'b', 0, from_=b'Y')]
+        self.assertEqual([4, 2, 3, 1], [seq for seq, _, _ in sort_messages(
+            items, [SortKey(b'DATE')])])
+        self.assertEqual([3, 2, 1, 4], [seq for seq, _, _ in sort_messages(
+            items, [SortKey(b'SUBJECT'), SortKey(b'DATE', True)])])
+        self.assertEqual([1, 3, 2, 4], [seq for seq, _, _ in sort_messages(
+            items, [SortKey(b'FROM')])])
+
+    def test_sort_frozenlist(self) -> None:
+        items = [_item(1, 'b', 3), _item(2, 'a', 1), _item(3, 'a', 2)]
+        sort_keys = frozenlist([SortKey(b'SUBJECT'), SortKey(b'DATE', True)])
+        self.assertEqual([3, 2, 1], [seq for seq, _, _ in sort_messages(
+            items, sort_keys)])
+
+
+class TestThreadMessages(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.items = [
+            _item(1, 'hello', 0, '<1>'),
+            _item(2, 'Re: hello', 2, '<2>', ['<1>']),
+            _item(3, 'other', 1, '<3>'),
+            _item(4, 'Re: hello', 3, '<4>', ['<1>', '<2>']),
+            _item(5, 'Re: hello', 4, '<5>', ['<1>']),
+            _item(6, 'Re: lost', 5, '<6>', ['<missing>']),
+            _item(7, 'Re: lost', 6, '<7>', ['<missing>', '<6>']),
+            _item(8, 'Re: other', 7, '<8>', ['<unknown>'])]
+
+    @classmethod
+    def _get_seqs(cls, threads) -> list:
+        return [thread.map(lambda pair: pair[0]) for thread in threads]
+
+    def test_ordered_subject(self) -> None:
+        threads = self._get_seqs(thread_messages(
+            self.items, b'ORDEREDSUBJECT'))
+        self.assertEqual(3, len(threads))
+        self.assertEqual(1, threads[0].value)
+        self.assertEqual([2, 4, 5], [c.value for c in threads[0].children])
+        self.assertEqual(3, threads[1].value)
+        self.assertEqual([8], [c.value for c in threads[1].children])
+        self.assertEqual(6, threads[2].value)
+        self.assertEqual([7], [c.value for c in threads[2].children])
+
+    def test_references(self) -> None:
+        threads = self._get_seqs(thread_messages(self.items, b'REFERENCES'))
+        self.assertEqual(3, len(threads))
+        self.assertEqual(1, threads[0].value)
+        self.assertEqual([2, 5], [c.value for c in threads[0].children])
+        self.assertEqual([4], [c.value
+                               for c in threads[0].children[0].children])
+        self.assertEqual(3, threads[1].value)
+        self.assertEqual([8], [c.value for c in threads[1].children])
+        self.assertEqual(6, threads[2].value)
+        self.assertEqual([7], [c.value for c in threads[2].children])
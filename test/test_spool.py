@@ -0,0 +1,75 @@
+
+import asyncio
+import unittest
+
+from pymap.imap.spool import CommandBuffer
+
+
+class TestCommandBuffer(unittest.TestCase):
+
+    def _new_reader(self, data: bytes) -> asyncio.StreamReader:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return reader
+
+    def test_read_literal(self) -> None:
+        async def run() -> tuple[CommandBuffer, bytes]:
+            reader = self._new_reader(b'hello\r\n')
+            buf = CommandBuffer(10)
+            buf.append(b'a {5+}\r\n')
+            await buf.read_literal(reader, 5)
+            buf.append(await reader.readline())
+            return buf, await reader.read()
+        buf, rest = asyncio.run(run())
+        self.assertFalse(buf.spooled)
+        view = buf.getvalue()
+        self.assertFalse(view.readonly)
+        self.assertEqual(b'a {5+}\r\nhello\r\n', view)
+        self.assertEqual(b'', rest)
+
+    def test_read_literal_spooled(self) -> None:
+        async def run() -> tuple[CommandBuffer, bytes]:
+            reader = self._new_reader(b'x' * 100 + b'\r\nextra')
+            buf = CommandBuffer(10, chunk_size=16)
+            buf.append(b'a {100+}\r\n')
+            await buf.read_literal(reader, 100)
+            buf.append(await reader.readline())
+            return buf, await reader.read()
+        buf, rest = asyncio.run(run())
+        self.assertTrue(buf.spooled)
+        view = buf.getvalue()
+        self.assertTrue(view.readonly)
+        self.assertEqual(b'a {100+}\r\n' + b'x' * 100 + b'\r\n', view)
+        self.assertEqual(b'extra', rest)
+
+    def test_read_literal_spool_disabled(self) -> None:
+        async def run() -> CommandBuffer:
+            reader = self._new_reader(b'x' * 100)
+            buf = CommandBuffer(None)
+            await buf.read_literal(reader, 100)
+            return buf
+        buf = asyncio.run(run())
+        self.assertFalse(buf.spooled)
+        self.assertEqual(b'x' * 100, buf.getvalue())
+
+    def test_skip_literal(self) -> None:
+        async def run() -> tuple[CommandBuffer, bytes]:
+            reader = self._new_reader(b'x' * 100 + b'\r\n')
+            buf = CommandBuffer(10, chunk_size=16)
+            buf.append(b'a {100+}\r\n')
+            await buf.skip_literal(reader, 100)
+            buf.append(await reader.readline())
+            return buf, await reader.read()
+        buf, rest = asyncio.run(run())
+        self.assertFalse(buf.spooled)
+        self.assertEqual(b'a {100+}\r\n\r\n', buf.getvalue())
+        self.assertEqual(b'', rest)
+
+    def test_read_literal_incomplete(self) -> None:
+        async def run() -> None:
+            reader = self._new_reader(b'x' * 50)
+            buf = CommandBuffer(10, chunk_size=16)
+            await buf.read_literal(reader, 100)
+        with self.assertRaises(asyncio.IncompleteReadError):
+            asyncio.run(run())